@@ -0,0 +1,113 @@
+"""
+NexSupply Bulk Catalog Analysis
+Upload a CSV/XLSX of products, volumes and target markets; every row is
+classified and priced with the rule-based calculator, results stream in
+chunk by chunk. AI insights are optional and limited to the first rows.
+"""
+
+import streamlit as st
+import pandas as pd
+
+from utils.catalog_analysis import (
+    COLUMN_ALIASES,
+    DEFAULT_INSIGHT_WORKERS,
+    MAX_INSIGHT_ROWS,
+    analyze_catalog_file,
+    catalog_results_to_csv,
+    generate_catalog_insights,
+)
+from utils.config import AppSettings
+
+
+def _render_upload_help() -> None:
+    st.markdown(f"""
+        <div style="font-size: 0.85rem; color: #64748B; line-height: 1.6;">
+            One product per row. Required column: <strong>product</strong>
+            (or {', '.join(COLUMN_ALIASES['product'][1:4])}).
+            Optional: <strong>units</strong>, <strong>target_market</strong>, <strong>retail_price</strong>,
+            <strong>sku</strong>, <strong>route</strong>, <strong>channel</strong>, <strong>hs_code</strong>,
+            <strong>unit_weight_kg</strong>. Empty cells use the defaults below.
+        </div>
+    """, unsafe_allow_html=True)
+
+
+def render_bulk_analysis_page() -> None:
+    """Bulk catalog page. Called from streamlit_app.py when page == "bulk"."""
+    st.markdown("""
+        <div style="padding: 24px 0 12px 0;">
+            <h2 style="font-weight: 800; color: #0EA5E9; margin: 0;">📦 Bulk Catalog Analysis</h2>
+            <p style="color: #64748B; margin-top: 8px;">
+                Landed cost and margin for every SKU in your catalog (rule-based, ±20-25%).
+            </p>
+        </div>
+    """, unsafe_allow_html=True)
+
+    if st.button("← Back to single product"):
+        st.session_state.page = "home"
+        st.rerun()
+
+    _render_upload_help()
+    uploaded = st.file_uploader("Catalog file", type=["csv", "xlsx"], label_visibility="collapsed")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        default_units = st.number_input(
+            "Default units", min_value=1, value=AppSettings.DEFAULT_VOLUME_UNITS, step=500
+        )
+    with col2:
+        default_market = st.text_input("Default target market", value=AppSettings.DEFAULT_TARGET_MARKET)
+    with col3:
+        include_insights = st.checkbox(
+            f"AI insights (first {MAX_INSIGHT_ROWS} rows)", value=False,
+            help="Runs the full AI analysis per row in a small parallel pool; slower."
+        )
+
+    if not uploaded or not st.button("🔍 Analyze catalog", type="primary"):
+        return
+
+    progress = st.progress(0.0, text="Reading catalog...")
+    table = st.empty()
+    results = []
+    try:
+        chunks = analyze_catalog_file(
+            uploaded.getvalue(),
+            uploaded.name,
+            default_units=int(default_units),
+            default_target_market=default_market or None,
+        )
+        for chunk in chunks:
+            results.extend(chunk)
+            progress.progress(0.5 if include_insights else 0.99, text=f"Priced {len(results):,} rows...")
+            table.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
+    except ValueError as e:
+        progress.empty()
+        st.error(f"Could not read the catalog: {e}")
+        return
+
+    failed = sum(1 for r in results if r["error"])
+    if include_insights:
+        by_row = {r["row"]: r for r in results}
+        requested = min(len(results) - failed, MAX_INSIGHT_ROWS)
+        finished = 0
+        for number, insights, error in generate_catalog_insights(
+            results, max_workers=DEFAULT_INSIGHT_WORKERS, max_rows=MAX_INSIGHT_ROWS
+        ):
+            finished += 1
+            row = by_row[number]
+            if insights:
+                row.update({f"ai_{k}": v for k, v in insights.items() if not isinstance(v, list)})
+            else:
+                row["ai_error"] = error
+            progress.progress(
+                0.5 + 0.5 * finished / max(requested, 1),
+                text=f"AI insights {finished}/{requested}...",
+            )
+            table.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
+
+    progress.progress(1.0, text=f"Done: {len(results):,} rows, {failed:,} with errors")
+    st.download_button(
+        "⬇️ Download results (CSV)",
+        data=catalog_results_to_csv(results),
+        file_name="nexsupply_catalog_results.csv",
+        mime="text/csv",
+    )
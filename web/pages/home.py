@@ -114,6 +114,97 @@ def convert_api_response(data: dict) -> dict:
     }
 
 
+# Results-page order of the streamed insight sections (utils.json_stream.INSIGHT_SECTIONS)
+STREAMED_SECTION_ORDER = ("product", "market_snapshot", "hidden_costs", "suppliers", "risk_overview")
+
+
+def _render_product_section(values: dict) -> None:
+    st.markdown(f"### 🏷️ {values.get('product_name') or 'Product'}")
+
+
+def _render_market_section(values: dict) -> None:
+    st.markdown("#### 📈 Market Snapshot")
+    margin = values.get("margin_range_percent") or []
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Demand", values.get("demand_level") or "n/a")
+    col2.metric("Margin", f"{margin[0]}–{margin[1]}%" if len(margin) == 2 else "n/a")
+    col3.metric("Competition", values.get("competition_level") or "n/a")
+    for note in (values.get("demand_notes"), values.get("competition_notes")):
+        if note:
+            st.caption(note)
+
+
+def _render_hidden_costs_section(values: dict) -> None:
+    st.markdown("#### ⚠️ Hidden Cost Alerts")
+    alerts = values.get("hidden_cost_alerts") or []
+    if not alerts:
+        st.caption("No hidden cost alerts.")
+    for alert in alerts:
+        if isinstance(alert, dict):
+            alert = f"**{alert.get('cost_type', 'Cost')}** – {alert.get('explanation', '')}"
+        st.markdown(f"- {alert}")
+
+
+def _render_suppliers_section(values: dict) -> None:
+    st.markdown("#### 🏭 Supplier Shortlist")
+    suppliers = values.get("suppliers") or []
+    if not suppliers:
+        st.caption("No suppliers shortlisted; the report lists example suppliers.")
+    for s in suppliers:
+        location = s.get("location") or {}
+        if isinstance(location, dict):
+            location = ", ".join(v for v in (location.get("city"), location.get("country")) if v)
+        details = " · ".join(str(v) for v in (
+            location,
+            f"MOQ {s['moq_units']:,}" if isinstance(s.get("moq_units"), int) else None,
+            s.get("price_band_fob_usd"),
+        ) if v)
+        st.markdown(f"- **{s.get('display_name') or s.get('name', 'Supplier')}** {details}")
+
+
+def _render_risk_section(values: dict) -> None:
+    st.markdown("#### 🛡️ Risk Overview")
+    risk = values.get("risk_overview") or {}
+    axes = risk.get("axes") or {}
+    cols = st.columns(len(axes) + 1)
+    cols[0].metric("Overall", risk.get("overall_level") or "n/a")
+    for col, (axis, level) in zip(cols[1:], axes.items()):
+        col.metric(axis.replace("_", " ").title(), level)
+    for comment in risk.get("comments") or []:
+        st.markdown(f"- {comment}")
+
+
+STREAMED_SECTION_RENDERERS = {
+    "product": _render_product_section,
+    "market_snapshot": _render_market_section,
+    "hidden_costs": _render_hidden_costs_section,
+    "suppliers": _render_suppliers_section,
+    "risk_overview": _render_risk_section,
+}
+
+
+def streamed_section_renderer(container):
+    """
+    on_section callback that renders each insight section in full as soon as
+    it completes, into its own placeholder in `container`.
+
+    Placeholders are created up front in results-page order, so sections that
+    arrive out of order still land in place. These are the raw AI sections;
+    the results dashboard (landed cost, lead time, verified suppliers) needs
+    the complete, converted result and still opens once the analysis finishes.
+    """
+    with container:
+        placeholders = {name: st.empty() for name in STREAMED_SECTION_ORDER}
+
+    def on_section(name: str, values: dict) -> None:
+        render = STREAMED_SECTION_RENDERERS.get(name)
+        if render is not None:
+            with placeholders[name].container():
+                render(values)
+
+    return on_section
+
+
 # =============================================================================
 # CSS - Refined and Polished
 # =============================================================================
@@ -442,6 +533,11 @@ def render_home_page():
                     use_container_width=True
                 )
         
+        # Bulk mode: whole catalog from a CSV/XLSX file
+        if st.button("📦 Analyze a whole catalog (CSV / XLSX)", use_container_width=True):
+            st.session_state.page = "bulk"
+            st.rerun()
+        
         # 🔴 [수정] 폼 바깥에서 로직 처리 (폼 제출 후 실행)
         if analyze_clicked:
             # 입력값 세션 상태에 저장
@@ -481,7 +577,8 @@ def render_home_page():
                             print(f"[Project Creation Error] {e}")
                 
                 # === STEP-BY-STEP PROGRESS (Security-Aware Messages) ===
-                with st.status("🔎 AI is building your Sourcing Blueprint...", expanded=True) as status:
+                progress_area, streamed_sections = st.container(), st.container()
+                with progress_area, st.status("🔎 AI is building your Sourcing Blueprint...", expanded=True) as status:
                     st.write("⏱️ *This analysis takes 10-20 seconds*")
                     st.write("")
                     st.write("📊 **Step 1/3:** Calculating Landed Cost & Margin Estimate...")
@@ -506,7 +603,7 @@ def render_home_page():
                             if email_for_report and "@" in email_for_report:
                                 st.info("✅ We'll email you the report when ready. Continuing analysis...")
                         
-                        result = service.analyze_product(state.get_input())
+                        result = service.analyze_product(state.get_input(), on_section=streamed_section_renderer(streamed_sections))
                         
                         # Step 3
                         elapsed = int(time.time() - start_time)
@@ -6,6 +6,7 @@ Philosophy: "Not a perfect answer, but structure and insights to help you dream.
 If you're ready to move forward, let us do the legwork."
 """
 
+import math
 import streamlit as st
 import plotly.graph_objects as go
 from typing import Dict, List
@@ -671,6 +672,11 @@ def render_market_snapshot(data: Dict) -> None:
         # Calculate weeks consistently with lead_time_section
         total_weeks = total_days // 7
         total_weeks_high = (total_days + 14) // 7  # Match lead_time_section calculation
+        days_low, days_high = total_days, total_days + 10
+        if lead_time.get("p50_days") and lead_time.get("p90_days"):
+            # Simulated P50–P90 band
+            days_low, days_high = int(lead_time["p50_days"]), int(math.ceil(lead_time["p90_days"]))
+            total_weeks, total_weeks_high = days_low // 7, math.ceil(days_high / 7)
         
         st.markdown(f"""
             <div class="metric-card">
@@ -680,7 +686,7 @@ def render_market_snapshot(data: Dict) -> None:
                 </div>
                 <div class="metric-value" style="color: #0369A1;">{total_weeks}–{total_weeks_high} weeks</div>
                 <div class="metric-subtitle" style="color: #0EA5E9;">
-                    ~{total_days}–{total_days + 10} days
+                    ~{days_low}–{days_high} days
                 </div>
                 <div class="metric-desc">Production + shipping + customs buffer</div>
                 <div class="metric-extra"></div>
@@ -718,6 +724,16 @@ def render_lead_time_section(data: Dict) -> None:
     total_days = production_days + shipping_days + customs_days + buffer_days
     total_weeks = total_days // 7
     total_weeks_high = (total_days + 14) // 7  # Upper bound (consistent with Market Snapshot)
+    days_low, days_high = total_days, total_days + 14
+    band_label = ""
+    if lead_time.get("p50_days") and lead_time.get("p90_days"):
+        # Simulated P50–P90 band; the stage cards add up to the P90
+        days_low, days_high = int(lead_time["p50_days"]), int(math.ceil(lead_time["p90_days"]))
+        total_weeks, total_weeks_high = days_low // 7, math.ceil(days_high / 7)
+        band_label = "P50–P90, simulated"
+        on_time = lead_time.get("on_time_probability")
+        if on_time is not None:
+            band_label += f" · {on_time:.0%} on time"
     
     st.markdown(f"""
         <div class="section-header">
@@ -738,8 +754,9 @@ def render_lead_time_section(data: Dict) -> None:
                     WEEKS TOTAL
                 </div>
                 <div style="font-size: 0.75rem; color: #94A3B8; margin-top: 4px;">
-                    (~{total_days}–{total_days + 14} days)
+                    (~{days_low}–{days_high} days)
                 </div>
+                <div style="font-size: 0.7rem; color: #94A3B8;">{band_label}</div>
             </div>
         """, unsafe_allow_html=True)
     
@@ -970,9 +987,123 @@ def render_landed_cost_panel(data: Dict) -> None:
             </div>
         """, unsafe_allow_html=True)
     
+    render_compliance_requirements(landed_cost.get("compliance"))
+    render_volume_curve(landed_cost.get("volume_curve"))
+    
     st.markdown("<div style='height: 24px;'></div>", unsafe_allow_html=True)
 
 
+def render_compliance_requirements(compliance: Dict) -> None:
+    """Render required certifications for the target market from the compliance index."""
+    if not compliance or not compliance.get("certifications"):
+        return
+    
+    rows = []
+    for cert in compliance["certifications"]:
+        if "cost_low_usd" in cert:
+            cost = f"${cert['cost_low_usd']:,.0f}–${cert['cost_high_usd']:,.0f}"
+            weeks = f"{cert['timeline_weeks']} wk" if cert.get("timeline_weeks") else "—"
+        else:
+            cost, weeks = "—", "—"
+        rows.append(f"""
+                    <tr>
+                        <td class="label"><strong>{cert['code']}</strong> · {cert.get('name', '')}</td>
+                        <td class="value">{cost}</td>
+                        <td class="pct">{weeks}</td>
+                    </tr>""")
+    
+    total = compliance.get("cert_cost_usd")
+    summary = (
+        f"Estimated ${total['low']:,.0f}–${total['high']:,.0f} per SKU · "
+        f"about {compliance.get('timeline_weeks', 0)} weeks (tests run in parallel)"
+        if total else "Certification costs are not on file for this market yet"
+    )
+    flags = compliance.get("high_risk_flags", [])
+    flags_html = (
+        '<ul style="margin: 10px 0 0 0; padding-left: 20px; color: #78350F; font-size: 0.85rem;">'
+        + ''.join(f'<li>{flag}</li>' for flag in flags[:4])
+        + '</ul>'
+    ) if flags else ""
+    
+    st.markdown(f"""
+        <div style="background: #F8FAFC; border: 1px solid #E2E8F0; border-radius: 10px; padding: 18px; margin-top: 20px;">
+            <div style="font-weight: 600; color: #0F172A; margin-bottom: 6px; font-size: 0.95rem;">
+                🛡️ Compliance Requirements · {compliance.get('market', '')}
+            </div>
+            <div style="font-size: 0.85rem; color: #475569; margin-bottom: 10px;">{summary}</div>
+            <table class="cost-table">
+                <tbody>{''.join(rows)}
+                </tbody>
+            </table>
+            {flags_html}
+        </div>
+    """, unsafe_allow_html=True)
+
+
+def render_volume_curve(curve: Dict) -> None:
+    """Render per-unit landed cost vs. order volume from the precomputed curve."""
+    if not curve or not curve.get("units"):
+        return
+    
+    units = curve["units"]
+    components = curve.get("components_per_unit_usd", {})
+    labels = {
+        "product": t('manufacturing_cost'),
+        "packing": "Packing",
+        "shipping": t('total_freight'),
+        "handling": t('insurance_handling'),
+        "duty_and_tax": t('customs_duty'),
+    }
+    colors = ['#0EA5E9', '#94A3B8', '#38BDF8', '#7DD3FC', '#BAE6FD']
+    
+    fig = go.Figure()
+    for (key, label), color in zip(labels.items(), colors):
+        if key in components:
+            fig.add_trace(go.Scatter(
+                x=units,
+                y=components[key],
+                name=label,
+                mode='lines',
+                stackgroup='per_unit',
+                line=dict(width=0.5, color=color),
+                hovertemplate=f'{label}: $%{{y:.3f}}<extra></extra>'
+            ))
+    fig.add_trace(go.Scatter(
+        x=units,
+        y=curve["landed_cost_per_unit_usd"],
+        name=t('per_unit'),
+        mode='lines',
+        line=dict(width=2.5, color='#0F172A'),
+        hovertemplate='%{x:,} units: <b>$%{y:.3f}</b>/unit<extra></extra>'
+    ))
+    
+    threshold_units = curve.get("units_for_fixed_share_threshold")
+    if threshold_units and units[0] <= threshold_units <= units[-1]:
+        fig.add_vline(
+            x=threshold_units,
+            line=dict(color='#F59E0B', width=1.5, dash='dash'),
+            annotation_text=f"Fixed costs < {curve['fixed_share_threshold_percent']:g}%",
+            annotation_font=dict(size=10, color='#92400E')
+        )
+    
+    fig.update_layout(
+        xaxis=dict(title='Order volume (units)', type='log'),
+        yaxis=dict(title='USD per unit', rangemode='tozero'),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.45, xanchor="center", x=0.5, font=dict(size=10)),
+        margin=dict(t=30, b=40, l=40, r=20),
+        height=340,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    st.markdown("""
+        <div style="font-weight: 600; color: #0F172A; margin-top: 20px; font-size: 0.95rem;">
+            📉 Volume Price Breaks
+        </div>
+    """, unsafe_allow_html=True)
+    st.plotly_chart(fig, use_container_width=True)
+
+
 # =============================================================================
 # BLOCK 4: VERIFIED SUPPLIERS
 # =============================================================================
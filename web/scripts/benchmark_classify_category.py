@@ -0,0 +1,92 @@
+"""
+Benchmark: keyword automaton vs. the per-keyword substring scan in classify_category,
+plus the top-k BM25 classifier in batch mode.
+
+Runs over categories.txt plus Korean / Chinese / Japanese queries and
+checks that the automaton and the scan give the same category for every query.
+
+Usage (from the web/ directory):
+    python scripts/benchmark_classify_category.py [repeats]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.category_classifier import get_category_classifier
+from utils.cost_tables import CATEGORY_KEYWORDS, classify_category, get_category_automaton
+
+CATEGORIES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "categories.txt")
+
+MULTILINGUAL_QUERIES = [
+    "유아용 실리콘 치발기 5000개 미국 아마존",
+    "LED 데스크 램프 USB 충전 3000개",
+    "강아지 장난감 로프 대량 주문",
+    "婴儿牙胶 硅胶 5000个",
+    "宠物玩具 狗咬绳 亚马逊",
+    "不锈钢保温杯 印刷logo",
+    "スマホケース iPhone 15 2000個",
+    "Yoga mat 요가매트 TPE 6mm",
+]
+
+
+def scan_classify(query: str) -> str:
+    """The previous implementation: one substring search per keyword."""
+    query_lower = query.lower()
+    scores = {}
+    for cat_id, keywords in CATEGORY_KEYWORDS.items():
+        score = sum(1 for kw in keywords if kw.lower() in query_lower)
+        if score > 0:
+            scores[cat_id] = score
+    if scores:
+        return max(scores, key=scores.get)
+    return "generic_consumer_product"
+
+
+def load_corpus() -> list:
+    with open(CATEGORIES_PATH, encoding="utf-8") as f:
+        queries = [line.split(". ", 1)[-1].strip() for line in f if line.strip()]
+    return queries + MULTILINGUAL_QUERIES
+
+
+def time_per_call(fn, queries: list, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) / (repeats * len(queries))
+
+
+def main(repeats: int = 20) -> None:
+    queries = load_corpus()
+    
+    start = time.perf_counter()
+    get_category_automaton.cache_clear()
+    automaton = get_category_automaton()
+    build_s = time.perf_counter() - start
+    
+    mismatches = [q for q in queries if scan_classify(q) != classify_category(q)]
+    assert not mismatches, f"automaton differs from scan for: {mismatches[:5]}"
+    
+    scan_s = time_per_call(scan_classify, queries, repeats)
+    automaton_s = time_per_call(classify_category, queries, repeats)
+    
+    print(f"queries:             {len(queries):,} ({len(MULTILINGUAL_QUERIES)} CJK/Hangul)")
+    print(f"automaton states:    {len(automaton.goto):,} ({len(automaton.pattern_categories)} keywords)")
+    print(f"automaton build:     {build_s * 1000:9.2f} ms (once per process)")
+    print(f"substring scan:      {scan_s * 1e6:9.2f} us/call")
+    print(f"automaton:           {automaton_s * 1e6:9.2f} us/call  ({scan_s / automaton_s:4.1f}x faster)")
+    
+    classifier = get_category_classifier()
+    start = time.perf_counter()
+    results = classifier.classify_batch(queries)
+    batch_s = time.perf_counter() - start
+    confident = sum(r["confident"] for r in results)
+    ambiguous = sum(r["ambiguous"] for r in results)
+    print(f"top-k classifier:    {batch_s * 1000:9.2f} ms for the corpus "
+          f"({batch_s / len(queries) * 1e6:.2f} us/query; {confident} confident, {ambiguous} ambiguous)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
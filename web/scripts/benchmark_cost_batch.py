@@ -0,0 +1,51 @@
+"""
+Benchmark: batch landed-cost engine vs. a Python loop over compute_landed_cost.
+
+Usage (from the web/ directory):
+    python scripts/benchmark_cost_batch.py [rows]
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cost_calculator import OrderParams, compute_landed_cost, compute_landed_cost_batch
+from utils.cost_tables import list_available_categories, list_available_routes
+
+
+def main(rows: int = 10000) -> None:
+    rng = random.Random(42)
+    categories = list_available_categories()
+    routes = list_available_routes()
+    
+    category_ids = [rng.choice(categories) for _ in range(rows)]
+    units = [rng.randint(500, 100000) for _ in range(rows)]
+    route_col = [rng.choice(routes) for _ in range(rows)]
+    
+    start = time.perf_counter()
+    loop_results = [
+        compute_landed_cost(OrderParams(category_id=c, units=u, route=r))
+        for c, u, r in zip(category_ids, units, route_col)
+    ]
+    loop_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = compute_landed_cost_batch(category_ids, units, routes=route_col)
+    batch_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    records = batch.to_records()
+    records_s = time.perf_counter() - start
+    
+    assert records == loop_results, "batch records differ from scalar results"
+    
+    print(f"rows:                 {rows:,}")
+    print(f"python loop:          {loop_s * 1000:9.1f} ms")
+    print(f"batch (columnar):     {batch_s * 1000:9.1f} ms  ({loop_s / batch_s:5.1f}x faster)")
+    print(f"batch + to_records(): {(batch_s + records_s) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,90 @@
+"""
+Benchmark: sequential vs. overlapped Gemini calls in GeminiService.analyze_product.
+
+The model is a stub that sleeps instead of calling the API, so only the
+orchestration is measured (no API key or network needed).
+
+Usage (from the web/ directory):
+    python scripts/benchmark_gemini_calls.py [extraction_s] [insight_s] [runs]
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.data_logger as data_logger
+import services.gemini_service as gemini_service
+from utils.query_understanding import parse_query
+
+
+QUERY = "Silicone baby teether, 5000 units for Amazon FBA in the US"
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Sleeps like the API; the extraction prompt is recognised by its header."""
+
+    def __init__(self, extraction_s: float, insight_s: float):
+        self.extraction_s = extraction_s
+        self.insight_s = insight_s
+
+    def generate_content(self, contents, **kwargs):
+        prompt = contents[0] if isinstance(contents, list) else contents
+        if "AI parser" in prompt:
+            time.sleep(self.extraction_s)
+            return StubResponse(json.dumps({"volume": 5000, "channel": "Amazon FBA", "target_market": "USA"}))
+        time.sleep(self.insight_s)
+        return StubResponse(json.dumps({"product_name": "Silicone baby teether"}))
+
+
+def main(extraction_s: float = 2.0, insight_s: float = 8.0, runs: int = 3) -> None:
+    model = StubModel(extraction_s, insight_s)
+
+    class StubService(gemini_service.GeminiService):
+        is_configured = True
+
+        def __init__(self):
+            super().__init__()
+            self._model = model
+
+    gemini_service.get_gemini_service = StubService
+    data_logger.log_analysis = lambda **kwargs: None
+    os.environ["NEXSUPPLY_INSIGHT_CACHE_DISABLED"] = "1"  # every run must reach the model
+    service = StubService()
+
+    sequential = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        # Previous flow: extraction finishes before the hybrid call starts
+        done = Future()
+        done.set_result(service.extract_order_parameters(QUERY))
+        gemini_service.analyze_with_hybrid_system(QUERY, parsed_query=parse_query(QUERY), extraction=done)
+        sequential.append(time.perf_counter() - start)
+
+    overlapped = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = service.analyze_product({"query": QUERY})
+        overlapped.append(time.perf_counter() - start)
+    assert result["success"], result
+
+    seq_s, ovl_s = min(sequential), min(overlapped)
+    print(f"stub latency: extraction {extraction_s:.1f}s, insights {insight_s:.1f}s")
+    print(f"sequential:   {seq_s:6.2f} s")
+    print(f"overlapped:   {ovl_s:6.2f} s  (saved {seq_s - ovl_s:.2f} s, {1 - ovl_s / seq_s:.0%})")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        float(args[0]) if len(args) > 0 else 2.0,
+        float(args[1]) if len(args) > 1 else 8.0,
+        int(args[2]) if len(args) > 2 else 3,
+    )
@@ -0,0 +1,115 @@
+"""
+Benchmark: hybrid insight prompt size before/after compaction.
+
+For a fixed query set, builds the previous prompt (system prompt + full
+landed cost as indented JSON) and the budgeted one, and reports estimated
+input tokens and build time. With --live (GEMINI_API_KEY required) it
+also counts tokens with the API and times one uncached insight request
+per prompt (previous: max_output_tokens 16384; new: per-mode limit).
+
+Usage (from the web/ directory):
+    python scripts/benchmark_hybrid_prompt.py [--live]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import AppSettings
+from utils.cost_cache import compute_landed_cost_cached
+from utils.cost_calculator import OrderParams
+from utils.cost_tables import get_category_config
+from utils.prompt_budget import build_budgeted_hybrid_prompt, estimate_tokens, generation_config_for_mode
+from utils.prompts import HYBRID_SYSTEM_PROMPT, build_hybrid_prompt
+from utils.query_understanding import parse_query
+
+
+QUERIES = [
+    "Silicone baby teether, 5000 units for Amazon FBA in the US",
+    "TPE yoga mat 10000 units to Europe, landed cost and duty",
+    "Verify this alibaba supplier for stainless steel water bottles",
+    "Market analysis for LED desk lamps, online retail, UK",
+    "How long is the lead time for 3000 ceramic coffee mugs to the US",
+    "미국 편의점 시장에 젤리 200만개 수출 비용",
+    "Bluetooth earbuds 20k units, Amazon FBA, competition and margin",
+    "Dog chew toys 8000 units to Canada, wholesale",
+]
+
+
+def _prompts(query: str):
+    parsed = parse_query(query)
+    params = parsed.input_parameters()
+    result = compute_landed_cost_cached(OrderParams(
+        category_id=parsed.category_id,
+        units=params.get("volume_units", AppSettings.DEFAULT_VOLUME_UNITS),
+        route=params.get("route", AppSettings.DEFAULT_ROUTE),
+        incoterm=AppSettings.DEFAULT_INCOTERM,
+        channel=params.get("channel", AppSettings.DEFAULT_CHANNEL),
+        target_market=params.get("target_market", AppSettings.DEFAULT_TARGET_MARKET),
+    ))
+    label = get_category_config(parsed.category_id)["label"]
+
+    start = time.perf_counter()
+    before = HYBRID_SYSTEM_PROMPT + "\n\n" + build_hybrid_prompt(
+        user_input=query,
+        category_id=parsed.category_id,
+        category_label=label,
+        landed_cost_json=json.dumps(result, indent=2),
+    )
+    before_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = build_budgeted_hybrid_prompt(query, parsed.category_id, label, result, mode=parsed.mode)
+    after_s = time.perf_counter() - start
+    return parsed.mode, before, before_s, after, after_s
+
+
+def _live_model():
+    import google.generativeai as genai
+    from services.gemini_service import GeminiService, configure_gemini
+
+    if not configure_gemini():
+        raise SystemExit("--live needs GEMINI_API_KEY")
+    return genai.GenerativeModel(GeminiService.MODEL_NAME, generation_config=GeminiService.GENERATION_CONFIG)
+
+
+def _timed(model, prompt: str, **kwargs) -> float:
+    start = time.perf_counter()
+    model.generate_content(prompt, **kwargs)
+    return time.perf_counter() - start
+
+
+def main(live: bool = False) -> None:
+    model = _live_model() if live else None
+    totals = {"before": 0, "after": 0, "before_s": 0.0, "after_s": 0.0}
+    print(f"{'mode':9} {'before':>7} {'after':>6} {'drop':>5}  query")
+    for query in QUERIES:
+        mode, before, before_s, after, after_s = _prompts(query)
+        if model is not None:
+            before_tokens = model.count_tokens(before).total_tokens
+            after_tokens = model.count_tokens(after.text).total_tokens
+            totals["before_s"] += _timed(model, before)
+            totals["after_s"] += _timed(model, after.text, generation_config=generation_config_for_mode(mode))
+        else:
+            before_tokens, after_tokens = estimate_tokens(before), after.tokens
+            totals["before_s"] += before_s
+            totals["after_s"] += after_s
+        totals["before"] += before_tokens
+        totals["after"] += after_tokens
+        print(f"{mode:9} {before_tokens:7,} {after_tokens:6,} {1 - after_tokens / before_tokens:5.0%}  {query[:48]}")
+
+    n = len(QUERIES)
+    kind = "API-counted" if live else "estimated"
+    print(f"\ninput tokens ({kind}): {totals['before'] / n:,.0f} -> {totals['after'] / n:,.0f} per prompt "
+          f"({1 - totals['after'] / totals['before']:.0%} fewer)")
+    if live:
+        print(f"insight latency: {totals['before_s'] / n:.2f} s -> {totals['after_s'] / n:.2f} s per request")
+    else:
+        print(f"prompt build: {totals['before_s'] / n * 1000:.2f} ms -> {totals['after_s'] / n * 1000:.2f} ms "
+              f"(run with --live for model latency)")
+
+
+if __name__ == "__main__":
+    main("--live" in sys.argv[1:])
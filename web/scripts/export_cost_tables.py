@@ -0,0 +1,37 @@
+"""
+Restamp a cost table snapshot after editing it.
+
+data/cost_tables.json is the only source of the cost tables. Edit its
+"categories", then run this script: it validates the tables, sets the new
+version and recomputes the checksum. The running app picks the file up
+without a restart (see utils/cost_store.py); until it is restamped, the
+edited file fails the checksum check and the old tables stay in service.
+
+Usage (from the web/ directory):
+    python scripts/export_cost_tables.py VERSION [source] [path]
+
+    source defaults to data/cost_tables.json and path to source; use a
+    .gz path for a compressed snapshot.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cost_store import DEFAULT_COST_TABLES_PATH, read_cost_table_snapshot, write_cost_table_snapshot
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    version = sys.argv[1]
+    source = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_COST_TABLES_PATH
+    path = sys.argv[3] if len(sys.argv) > 3 else source
+    _, _, categories, routes = read_cost_table_snapshot(source, verify=False)
+    checksum = write_cost_table_snapshot(path, categories, version, routes)
+    print(f"Wrote {path} (version {version}, checksum {checksum}, {len(categories)} categories)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,33 @@ from services.gemini_service import (
     detect_analysis_mode,
 )
 
+from services.response_cache import (
+    ResponseCache,
+    get_response_cache,
+    get_response_cache_stats,
+)
+
+from services.insight_cache import (
+    InsightSimilarityCache,
+    get_insight_cache,
+    get_insight_cache_stats,
+)
+
+from services.llm_gateway import (
+    LLMGateway,
+    get_llm_gateway,
+    get_llm_gateway_stats,
+)
+
+from services.llm_retry import (
+    BudgetExhausted,
+    Deadline,
+    RetryPolicy,
+    analysis_deadline,
+    call_with_retries,
+    get_llm_call_stats,
+)
+
 from services.email_service import (
     send_email_report,
     send_internal_notification,
@@ -37,6 +64,25 @@ __all__ = [
     "get_gemini_api_key",
     "configure_gemini",
     "detect_analysis_mode",
+    # Response Cache
+    "ResponseCache",
+    "get_response_cache",
+    "get_response_cache_stats",
+    # Insight Cache
+    "InsightSimilarityCache",
+    "get_insight_cache",
+    "get_insight_cache_stats",
+    # LLM Gateway
+    "LLMGateway",
+    "get_llm_gateway",
+    "get_llm_gateway_stats",
+    # LLM Retry / Deadlines
+    "BudgetExhausted",
+    "Deadline",
+    "RetryPolicy",
+    "analysis_deadline",
+    "call_with_retries",
+    "get_llm_call_stats",
     # Email Service
     "send_email_report",
     "send_internal_notification",
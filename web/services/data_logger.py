@@ -776,6 +776,36 @@ def render_analytics_dashboard():
         else:
             st.info("No data yet")
         
+        from services.response_cache import get_response_cache_stats
+        cache_stats = get_response_cache_stats()
+        if cache_stats:
+            st.caption(
+                f"AI response cache: {cache_stats['hit_rate']:.0%} hit rate "
+                f"({cache_stats['hits']:,} hits / {cache_stats['misses']:,} misses), "
+                f"{cache_stats['entries']:,} entries"
+            )
+        from services.insight_cache import get_insight_cache_stats
+        insight_stats = get_insight_cache_stats()
+        if insight_stats:
+            st.caption(
+                f"Similar-query insight reuse: {insight_stats['hit_rate']:.0%} hit rate "
+                f"(threshold {insight_stats['threshold']:.2f}, {insight_stats['entries']:,} queries indexed)"
+            )
+        from services.llm_gateway import get_llm_gateway_stats
+        gateway_stats = get_llm_gateway_stats()
+        st.caption(
+            f"Model calls this process: {gateway_stats['upstream_calls']:,} upstream, "
+            f"{gateway_stats['coalesced']:,} coalesced, peak {gateway_stats['peak_active']}"
+            f"/{gateway_stats['max_concurrency']} in flight"
+        )
+        from services.llm_retry import get_llm_call_stats
+        for label, call_stats in get_llm_call_stats().items():
+            if call_stats["p95_s"] is not None:
+                st.caption(
+                    f"{label}: P95 {call_stats['p95_s']:.1f}s, {call_stats.get('ok', 0):,} ok, "
+                    f"{call_stats.get('budget_exhausted', 0):,} over budget, {call_stats.get('failed', 0):,} failed"
+                )
+        
         st.markdown("---")
         
         # Mode Distribution
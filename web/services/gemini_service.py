@@ -6,11 +6,15 @@ from __future__ import annotations
 
 import os
 import json
+import asyncio
+import threading
 import re
 import logging
 import functools
+import time
 import streamlit as st
-from typing import Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -18,6 +22,18 @@ import google.generativeai as genai
 
 # Import centralized prompts
 from utils.prompts import build_analysis_prompt, build_image_analysis_prompt
+from utils.query_understanding import ANALYSIS_MODES, ParsedQuery, parse_query
+from services.response_cache import CachedModel, get_response_cache
+from services.insight_cache import get_insight_cache
+from services.llm_gateway import GatewayModel, get_llm_gateway
+from services.llm_retry import (
+    BudgetExhausted,
+    Deadline,
+    analysis_deadline,
+    call_with_retries,
+    stream_with_retries,
+    upstream_timeout,
+)
 
 # Load .env for local development
 load_dotenv(override=False)
@@ -168,42 +184,39 @@ def configure_gemini() -> bool:
 # MODE DETECTION
 # =============================================================================
 
-ANALYSIS_MODES = {
-    "verify": {
-        "keywords": ["verify", "verification", "check", "legitimate", "real factory", 
-                     "trading company", "alibaba supplier", "검증", "확인", "scam", "fraud"],
-    },
-    "cost": {
-        "keywords": ["cost", "landed cost", "calculate", "price", "freight", "customs", 
-                     "FOB", "duty", "tariff", "비용", "가격", "랜딩", "관세"],
-    },
-    "market": {
-        "keywords": ["market", "analysis", "demand", "trend", "competition", "margin",
-                     "opportunity", "시장", "분석", "트렌드", "수요"],
-    },
-    "leadtime": {
-        "keywords": ["lead time", "delivery", "timeline", "shipping", "production time",
-                     "when", "how long", "리드타임", "배송", "일정", "납기"],
-    }
-}
-
+# Mode keywords live in utils.query_understanding (ANALYSIS_MODES)
 
 def detect_analysis_mode(query: str) -> str:
     """Detect analysis mode from query content."""
-    query_lower = query.lower()
-    
-    for mode, config in ANALYSIS_MODES.items():
-        for keyword in config["keywords"]:
-            if keyword.lower() in query_lower:
-                return mode
-    
-    return "general"
+    return parse_query(query).mode
 
 
 # =============================================================================
 # GEMINI SERVICE CLASS
 # =============================================================================
 
+# One model (and client) per model name per process, see GeminiService._get_model
+_shared_models: Dict[str, Any] = {}
+_shared_models_lock = threading.Lock()
+
+# Background parameter extraction, shared by all analyses. Never joined on
+# exit of an analysis: a call still running at the deadline finishes (or
+# gives up at its own deadline) without holding up the result.
+EXTRACTION_WORKERS = 4
+_extraction_pool: Optional[ThreadPoolExecutor] = None
+_extraction_pool_lock = threading.Lock()
+
+
+def _get_extraction_pool() -> ThreadPoolExecutor:
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ThreadPoolExecutor(
+                max_workers=EXTRACTION_WORKERS, thread_name_prefix="gemini-extract"
+            )
+        return _extraction_pool
+
+
 class GeminiService:
     """
     Production-ready B2B sourcing analysis service.
@@ -211,6 +224,11 @@ class GeminiService:
     """
     
     MODEL_NAME = "gemini-2.5-flash"
+    GENERATION_CONFIG = {
+        "temperature": 0.7,
+        "top_p": 0.95,
+        "max_output_tokens": 16384,  # Increased for detailed responses
+    }
     
     def __init__(self):
         self._model = None
@@ -225,21 +243,47 @@ class GeminiService:
             return False
     
     def _get_model(self):
-        """Get or create model instance."""
+        """
+        Get the process-wide model: response cache → LLM gateway (concurrency
+        limit, request coalescing) → GenerativeModel. Built once per process.
+        """
         if self._model is None:
-            if not configure_gemini():
-                raise RuntimeError("Failed to configure Gemini API")
-            
-            self._model = genai.GenerativeModel(
-                model_name=self.MODEL_NAME,
-                generation_config={
-                    "temperature": 0.7,
-                    "top_p": 0.95,
-                    "max_output_tokens": 16384,  # Increased for detailed responses
-                }
-            )
+            with _shared_models_lock:
+                model = _shared_models.get(self.MODEL_NAME)
+                if model is None:
+                    if not configure_gemini():
+                        raise RuntimeError("Failed to configure Gemini API")
+                    
+                    model = genai.GenerativeModel(
+                        model_name=self.MODEL_NAME,
+                        generation_config=self.GENERATION_CONFIG
+                    )
+                    model = GatewayModel(model, get_llm_gateway(), self.MODEL_NAME, self.GENERATION_CONFIG)
+                    cache = get_response_cache()
+                    if cache is not None:
+                        model = CachedModel(
+                            model, cache, self.MODEL_NAME, self.GENERATION_CONFIG,
+                            accept=lambda text: self._parse_json_response(text)[1] is None
+                        )
+                    _shared_models[self.MODEL_NAME] = model
+            self._model = model
         return self._model
     
+    async def generate_async(self, contents: Any, **kwargs: Any) -> Any:
+        """Awaitable generate_content on the shared model (non-streaming)."""
+        return await self._get_model().generate_content_async(contents, **kwargs)
+    
+    async def analyze_product_async(
+        self,
+        input_data: Dict[str, Any],
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        analyze_product for asyncio callers. The pipeline runs in a worker
+        thread; its model calls share the gateway's limit and coalescing.
+        """
+        return await asyncio.to_thread(self.analyze_product, input_data, on_section)
+    
     def _clean_json_response(self, response_text: str) -> str:
         """Extract pure JSON from AI response."""
         cleaned = response_text.strip()
@@ -274,7 +318,68 @@ class GeminiService:
         except json.JSONDecodeError as e:
             return None, f"JSON parsing failed: {str(e)}"
     
-    def analyze_product(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def extract_order_parameters(
+        self,
+        query: str,
+        model=None,
+        deadline: Optional[Deadline] = None,
+        llm_calls: Optional[list] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        LLM extraction of volume_units, channel, target_market and route.
+        
+        Safe to run in a worker thread (no Streamlit calls). Returns None when
+        the call fails, the time budget runs out or nothing valid comes back;
+        callers then use the rule-based parse. The call record is appended
+        to llm_calls.
+        """
+        extracted_values = None
+        try:
+            from utils.extraction_prompts import (
+                EXTRACTION_USER_PROMPT_TEMPLATE,
+                normalize_extracted_values,
+                validate_and_normalize_extraction
+            )
+            
+            # Build extraction prompt with user message
+            extraction_prompt = EXTRACTION_USER_PROMPT_TEMPLATE.format(user_message=query)
+            
+            model = model or self._get_model()
+            deadline = deadline or analysis_deadline()
+            response = call_with_retries(
+                "extraction",
+                _bounded_call(model.generate_content, extraction_prompt, deadline),
+                deadline,
+                fresh_start=_fresh_start(model, extraction_prompt, deadline),
+                sink=llm_calls,
+            )
+            
+            if response and response.text:
+                # Use Pydantic validation
+                extracted_dict, error = validate_and_normalize_extraction(response.text)
+                if not error and extracted_dict:
+                    extracted_values = extracted_dict
+                    logger.info(f"Successfully extracted: {extracted_values}")
+                elif error:
+                    # Fallback to old parsing if validation fails
+                    logger.warning(f"Extraction validation failed: {error}, using fallback parser")
+                    data, parse_error = self._parse_json_response(response.text)
+                    if not parse_error and data:
+                        extracted_values = normalize_extracted_values(data)
+                        logger.info(f"Fallback extraction successful: {extracted_values}")
+        except ImportError as e:
+            logger.warning(f"Extraction module not available: {e}, using fallback parser")
+        except BudgetExhausted as e:
+            logger.warning(f"Extraction skipped: {e}, using fallback parser")
+        except Exception as e:
+            logger.warning(f"Extraction failed: {e}, using fallback parser", exc_info=True)
+        return extracted_values
+    
+    def analyze_product(
+        self,
+        input_data: Dict[str, Any],
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Analyze a product sourcing query using hybrid system (rule-based + AI).
         
@@ -283,6 +388,8 @@ class GeminiService:
         
         Args:
             input_data: Dict with query, file_bytes, file_mime_type
+            on_section: Optional callback for insight sections as they stream
+                in (see analyze_with_hybrid_system)
         
         Returns:
             {"success": True/False, "data": result_or_error, "mode": analysis_mode}
@@ -294,74 +401,43 @@ class GeminiService:
         if not query and not file_bytes:
             return {"success": False, "data": "Please provide a query or upload a file.", "mode": "general"}
         
-        # Detect analysis mode
-        mode = detect_analysis_mode(query) if query else "general"
+        started = time.perf_counter()
+        
+        # One time budget for every model call of this analysis
+        deadline = analysis_deadline()
+        llm_calls = []
+        
+        # Parse the query once: mode, category, volume, market, channel
+        parsed_query = parse_query(query)
+        mode = parsed_query.mode
         
         try:
-            # Step 1: Extract structured data from user input using LLM
-            extracted_values = None
+            # Step 1: LLM extraction of volume/channel/market/route runs in the
+            # background while the hybrid analysis prices the order and asks for
+            # insights; the hybrid step reconciles both once they are done
+            extraction = None
             if query and self.is_configured:
-                try:
-                    from utils.extraction_prompts import (
-                        EXTRACTION_USER_PROMPT_TEMPLATE,
-                        normalize_extracted_values,
-                        validate_and_normalize_extraction
-                    )
-                    
-                    # Build extraction prompt with user message
-                    extraction_prompt = EXTRACTION_USER_PROMPT_TEMPLATE.format(user_message=query)
-                    
-                    model = self._get_model()
-                    response = model.generate_content(extraction_prompt)
-                    
-                    if response and response.text:
-                        # Use Pydantic validation
-                        extracted_dict, error = validate_and_normalize_extraction(response.text)
-                        if not error and extracted_dict:
-                            extracted_values = extracted_dict
-                            logger.info(f"Successfully extracted: {extracted_values}")
-                        elif error:
-                            # Fallback to old parsing if validation fails
-                            logger.warning(f"Extraction validation failed: {error}, using fallback parser")
-                            data, parse_error = self._parse_json_response(response.text)
-                            if not parse_error and data:
-                                extracted_values = normalize_extracted_values(data)
-                                logger.info(f"Fallback extraction successful: {extracted_values}")
-                except ImportError as e:
-                    logger.warning(f"Extraction module not available: {e}, using fallback parser")
-                except Exception as e:
-                    logger.warning(f"Extraction failed: {e}, using fallback parser", exc_info=True)
+                extraction = _get_extraction_pool().submit(
+                    self.extract_order_parameters, query, self._get_model(), deadline, llm_calls
+                )
             
-            # Step 2: Use extracted values or fallback to input parser
-            if extracted_values:
-                units = extracted_values.get("volume_units")
-                channel = extracted_values.get("channel")
-                target_market = extracted_values.get("target_market")
-                route = extracted_values.get("route")
-            else:
-                # Fallback to input parser
-                from utils.input_parser import parse_input_parameters
-                parsed = parse_input_parameters(query)
-                units = parsed.get("volume_units")
-                channel = parsed.get("channel")
-                target_market = parsed.get("target_market")
-                route = parsed.get("route")
-            
-            # Step 3: Parse research data from context
+            # Step 2: Parse research data from context
             from utils.research_data import parse_research_data_from_text
             context_query = input_data.get("context_query", "") or query
             research_data = parse_research_data_from_text(context_query)
             
-            # Step 4: Use hybrid system with extracted values
+            # Step 3: Hybrid analysis (extraction reconciled inside; a late
+            # extraction is left running, not waited for)
             result = analyze_with_hybrid_system(
                 query=query,
-                units=units,
-                route=route,
-                target_market=target_market,
-                channel=channel,
                 retail_price=None,
                 file_bytes=file_bytes,
-                research_data=research_data
+                research_data=research_data,
+                parsed_query=parsed_query,
+                extraction=extraction,
+                on_section=on_section,
+                deadline=deadline,
+                llm_calls=llm_calls
             )
             
             if result["success"]:
@@ -377,13 +453,23 @@ class GeminiService:
                     log_analysis(
                         query=query or "Image analysis",
                         mode=mode,
-                        json_data=dashboard_data
+                        json_data=dashboard_data,
+                        processing_time_ms=int((time.perf_counter() - started) * 1000)
                     )
                 except (ImportError, OSError, ValueError) as log_err:
                     # Don't break main flow if logging fails
                     logger.warning(f"Logging skipped: {log_err}")
                 
-                return {"success": True, "data": dashboard_data, "mode": mode}
+                timings = dict(result.get("timings") or {}, total_s=round(time.perf_counter() - started, 3))
+                logger.info(f"Analysis timings: {timings}, model calls: {llm_calls}")
+                return {
+                    "success": True,
+                    "data": dashboard_data,
+                    "mode": mode,
+                    "timings": timings,
+                    "llm_calls": llm_calls,
+                    "budget_exhausted": result.get("budget_exhausted", False)
+                }
             else:
                 return result
         
@@ -595,15 +681,95 @@ class GeminiService:
 # CONVENIENCE FUNCTIONS
 # =============================================================================
 
+_service: Optional[GeminiService] = None
+
+
 def get_gemini_service() -> GeminiService:
-    """Get a GeminiService instance."""
-    return GeminiService()
+    """Get the process-wide GeminiService (all instances share one model client)."""
+    global _service
+    if _service is None:
+        _service = GeminiService()
+    return _service
 
 
 # =============================================================================
 # HYBRID ANALYSIS (Calculator + AI Insights)
 # =============================================================================
 
+def _bounded_call(method, contents, deadline: Deadline, **kwargs) -> Callable[[], Any]:
+    """
+    Zero-argument model call whose upstream request times out with its
+    attempt (request_options timeout from upstream_timeout, taken when the
+    attempt starts), so an abandoned attempt frees its gateway slot.
+    """
+    stream = bool(kwargs.get("stream"))
+    return lambda: method(
+        contents, request_options={"timeout": upstream_timeout(deadline, stream=stream)}, **kwargs
+    )
+
+
+def _fresh_start(model, contents, deadline: Deadline, **kwargs) -> Optional[Callable[[], Any]]:
+    """The call for retries and hedged requests: bypasses request coalescing, if the model offers it."""
+    uncoalesced = getattr(model, "generate_content_uncoalesced", None)
+    if uncoalesced is None:
+        return None
+    return _bounded_call(uncoalesced, contents, deadline, **kwargs)
+
+
+def _stream_insight_sections(
+    model,
+    contents,
+    on_section: Callable[[str, Dict[str, Any]], None],
+    timings: Dict[str, float],
+    start: float,
+    deadline: Deadline,
+    llm_calls: Optional[list] = None,
+    generation_config: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Stream the insight response, passing each completed section to
+    on_section. Records first_content_s / first_section_s in `timings`
+    and returns the full response text. Raises BudgetExhausted when the
+    stream does not finish before the deadline.
+    """
+    from utils.json_stream import IncrementalJSONObjectParser, SectionCollector
+    
+    parser = IncrementalJSONObjectParser()
+    collector = SectionCollector()
+    parts = []
+    
+    def emit(sections):
+        for name, values in sections:
+            timings.setdefault("first_section_s", round(time.perf_counter() - start, 3))
+            try:
+                on_section(name, values)
+            except Exception as e:
+                # Rendering problems must not break the analysis
+                logger.warning(f"Section callback failed for {name}: {e}")
+    
+    chunks = stream_with_retries(
+        "insights_stream",
+        _bounded_call(model.generate_content, contents, deadline, stream=True, generation_config=generation_config),
+        deadline,
+        fresh_start=_fresh_start(model, contents, deadline, stream=True, generation_config=generation_config),
+        sink=llm_calls,
+    )
+    for chunk in chunks:
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunk without text parts (e.g. only safety metadata)
+            continue
+        if not text:
+            continue
+        timings.setdefault("first_content_s", round(time.perf_counter() - start, 3))
+        parts.append(text)
+        for key, value in parser.feed(text):
+            emit(collector.add(key, value))
+    emit(collector.flush())
+    return "".join(parts)
+
+
 def analyze_with_hybrid_system(
     query: str,
     units: int = None,
@@ -612,7 +778,12 @@ def analyze_with_hybrid_system(
     channel: str = None,
     retail_price: Optional[float] = None,
     file_bytes: Optional[bytes] = None,
-    research_data: Optional[Dict[str, Any]] = None
+    research_data: Optional[Dict[str, Any]] = None,
+    parsed_query: Optional[ParsedQuery] = None,
+    extraction: Optional[Future] = None,
+    on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    deadline: Optional[Deadline] = None,
+    llm_calls: Optional[list] = None
 ) -> Dict[str, Any]:
     """
     Hybrid analysis: Rule-based cost calculation + AI insights.
@@ -630,71 +801,138 @@ def analyze_with_hybrid_system(
         channel: Sales channel (defaults to AppSettings.DEFAULT_CHANNEL)
         retail_price: Expected retail price
         file_bytes: Optional image data
+        parsed_query: parse_query(query) if the caller already has it
+        extraction: Pending GeminiService.extract_order_parameters() result;
+            awaited after the insight call, so both requests overlap
+        on_section: Called as on_section(name, values) for each insight
+            section (utils.json_stream.INSIGHT_SECTIONS) as soon as it has
+            streamed in; without it the response is awaited in one piece
+        deadline: Time budget shared with the extraction call (a fresh
+            analysis_deadline() by default). When it runs out the result is
+            built from the rule-based calculation alone.
+        llm_calls: List receiving the model call records (attempts, latencies)
     
     Returns:
         Complete analysis result
     """
     from utils.config import AppSettings
-    from utils.cost_tables import classify_category, get_category_config
-    from utils.cost_calculator import OrderParams, compute_landed_cost
+    from utils.cost_tables import get_category_config
+    from utils.cost_calculator import OrderParams
+    from utils.cost_cache import compute_landed_cost_cached
     from utils.result_builder import build_nexsupply_result, convert_to_dashboard_format
-    from utils.prompts import build_hybrid_prompt, HYBRID_SYSTEM_PROMPT
+    from utils.prompt_budget import build_budgeted_hybrid_prompt, generation_config_for_mode
     
-    # Step 1: Classify category
-    category_id = classify_category(query)
+    # Step 1: Classify category (from the single query parse)
+    if parsed_query is None:
+        parsed_query = parse_query(query)
+    category_id = parsed_query.category_id
     cfg = get_category_config(category_id)
     
     # Step 2: Use fallback values for initial calculation (will be updated after AI extraction)
-    from utils.input_parser import parse_input_parameters
-    parsed = parse_input_parameters(query) if not (units and target_market and channel) else {}
+    parsed = parsed_query.input_parameters()
     
     temp_units = units or parsed.get("volume_units", AppSettings.DEFAULT_VOLUME_UNITS)
     temp_route = route or parsed.get("route", AppSettings.DEFAULT_ROUTE)
     temp_target_market = target_market or parsed.get("target_market", AppSettings.DEFAULT_TARGET_MARKET)
     temp_channel = channel or parsed.get("channel", AppSettings.DEFAULT_CHANNEL)
     
-    # Step 3: Compute initial landed cost (rule-based) with temp values
+    # Step 3: Landed cost of the rule-based order, for the insight prompt only.
+    # The prompt is sent before the LLM extraction is awaited so both calls
+    # overlap; the returned figures are priced from the final values in Step 6.
     order = OrderParams(
         category_id=category_id,
         units=temp_units,
         route=temp_route,
         incoterm=AppSettings.DEFAULT_INCOTERM,
-        retail_price_per_unit=retail_price
+        retail_price_per_unit=retail_price,
+        channel=temp_channel,
+        target_market=temp_target_market,
     )
-    landed_cost_result = compute_landed_cost(order)
+    landed_cost_result = compute_landed_cost_cached(order)
     
     # Step 4: Get AI insights (if API configured) - AI will extract volume, channel, target_market
     ai_insights = None
+    insight_match = None
+    prompt_stats = None
+    timings: Dict[str, float] = {}
     service = get_gemini_service()
-    
-    if service.is_configured:
+    if deadline is None:
+        deadline = analysis_deadline()
+    if llm_calls is None:
+        llm_calls = []
+    budget_exhausted = False
+    
+    # Near-duplicate text queries with the same category, route and mode reuse
+    # earlier insights; the landed cost above is still computed fresh
+    insight_cache = None
+    if service.is_configured and not (file_bytes or research_data):
+        insight_cache = get_insight_cache()
+    if insight_cache is not None:
+        ai_insights = insight_cache.lookup(query, category_id, temp_route, parsed_query.mode)
+        if ai_insights is not None:
+            insight_match = ai_insights.pop("_insight_cache")
+            logger.info(f"Reusing AI insights: {insight_match}")
+    
+    if service.is_configured and ai_insights is None:
         try:
-            # Build hybrid prompt with research data
-            prompt = build_hybrid_prompt(
+            # System + hybrid prompt with a compact landed cost, fitted to
+            # the mode's token budget; output is capped per mode as well
+            prompt = build_budgeted_hybrid_prompt(
                 user_input=query,
                 category_id=category_id,
                 category_label=cfg["label"],
-                landed_cost_json=json.dumps(landed_cost_result, indent=2),
-                image_summary="Image provided for analysis." if file_bytes else "",
-                suppliers_db_json="[]",  # Use default suppliers
+                landed_cost_result=landed_cost_result,
+                mode=parsed_query.mode,
+                has_image=bool(file_bytes),
                 research_data=research_data
             )
+            prompt_stats = {
+                "prompt_tokens": prompt.tokens,
+                "prompt_budget": prompt.budget,
+                "landed_cost_detail": prompt.detail,
+                "input_truncated": prompt.input_truncated,
+            }
+            if not prompt.within_budget:
+                logger.warning(f"Hybrid prompt over budget: {prompt_stats}")
+            generation_config = generation_config_for_mode(parsed_query.mode)
             
             model = service._get_model()
             
-            # Call with system prompt
-            full_prompt = f"{HYBRID_SYSTEM_PROMPT}\n\n{prompt}"
-            
             if file_bytes:
                 image_part = {"mime_type": "image/jpeg", "data": file_bytes}
-                response = model.generate_content([full_prompt, image_part])
+                contents = [prompt.text, image_part]
             else:
-                response = model.generate_content(full_prompt)
+                contents = prompt.text
             
-            if response and response.text:
-                data, error = service._parse_json_response(response.text)
+            request_start = time.perf_counter()
+            if on_section is not None:
+                # Stream and hand each completed section to the UI while generating
+                response_text = _stream_insight_sections(
+                    model, contents, on_section, timings, request_start, deadline, llm_calls,
+                    generation_config
+                )
+            else:
+                response = call_with_retries(
+                    "insights",
+                    _bounded_call(model.generate_content, contents, deadline, generation_config=generation_config),
+                    deadline,
+                    fresh_start=_fresh_start(model, contents, deadline, generation_config=generation_config),
+                    sink=llm_calls,
+                )
+                response_text = response.text if response else None
+            timings["insights_s"] = round(time.perf_counter() - request_start, 3)
+            logger.info(
+                f"Hybrid insights: first content {timings.get('first_content_s')}s, "
+                f"first section {timings.get('first_section_s')}s, total {timings['insights_s']}s, "
+                f"~{prompt.tokens} prompt tokens"
+            )
+            
+            if response_text:
+                data, error = service._parse_json_response(response_text)
                 if not error:
                     ai_insights = data
+                    if insight_cache is not None and isinstance(ai_insights, dict):
+                        insight_cache.add(query, category_id, temp_route, ai_insights, parsed_query.mode)
                     
                     # Inject research data into AI insights if provided
                     if research_data and ai_insights:
@@ -714,27 +952,30 @@ def analyze_with_hybrid_system(
                             target_market = extracted_target_market.strip()
                         if extracted_channel and extracted_channel.strip():
                             channel = extracted_channel.strip()
+        except BudgetExhausted as e:
+            budget_exhausted = True
+            logger.warning(f"AI insights skipped, using rule-based result only: {e}")
         except Exception as e:
             logger.error(f"AI insights failed: {e}", exc_info=True)
     
-    # Step 5: Use extracted values or fallbacks (priority: AI > input parser > defaults)
-    final_units = units or parsed.get("volume_units", AppSettings.DEFAULT_VOLUME_UNITS)
-    final_target_market = target_market or parsed.get("target_market", AppSettings.DEFAULT_TARGET_MARKET)
-    final_channel = channel or parsed.get("channel", AppSettings.DEFAULT_CHANNEL)
-    final_route = route or parsed.get("route", AppSettings.DEFAULT_ROUTE)
-    
-    # Step 6: Recalculate landed cost with correct values if they changed
-    if final_units != temp_units or final_route != temp_route:
-        order = OrderParams(
-            category_id=category_id,
-            units=final_units,
-            route=final_route,
-            incoterm=AppSettings.DEFAULT_INCOTERM,
-            retail_price_per_unit=retail_price
-        )
-        landed_cost_result = compute_landed_cost(order)
-    
-    # Step 7: Build final result with extracted values
+    # Step 5: Use extracted values or fallbacks
+    # (priority: AI insights > caller > LLM extraction > input parser > defaults)
+    extracted = {}
+    if extraction is not None:
+        try:
+            extracted = extraction.result(timeout=deadline.remaining()) or {}
+        except FuturesTimeoutError:
+            budget_exhausted = True
+            logger.warning("LLM extraction still running at the deadline, using parsed values")
+    final_units = (units or extracted.get("volume_units") or parsed.get("volume_units")
+                   or AppSettings.DEFAULT_VOLUME_UNITS)
+    final_target_market = (target_market or extracted.get("target_market") or parsed.get("target_market")
+                           or AppSettings.DEFAULT_TARGET_MARKET)
+    final_channel = (channel or extracted.get("channel") or parsed.get("channel")
+                     or AppSettings.DEFAULT_CHANNEL)
+    final_route = route or extracted.get("route") or parsed.get("route") or AppSettings.DEFAULT_ROUTE
+    
+    # Step 6: Build the final result; it prices the final order itself
     try:
         result = build_nexsupply_result(
             user_query=query,
@@ -743,7 +984,8 @@ def analyze_with_hybrid_system(
             target_market=final_target_market,
             channel=final_channel,
             retail_price=retail_price,
-            ai_insights=ai_insights
+            ai_insights=ai_insights,
+            parsed_query=parsed_query
         )
         
         # Step 5: Convert to dashboard format for backward compatibility
@@ -755,7 +997,12 @@ def analyze_with_hybrid_system(
             "data": dashboard_data,
             "full_result": result,
             "calculation_source": "rule_based",
-            "insight_source": "ai" if ai_insights else "default"
+            "insight_source": ("ai_cache" if insight_match else "ai") if ai_insights else "default",
+            "insight_cache": insight_match,
+            "timings": timings,
+            "llm_calls": llm_calls,
+            "budget_exhausted": budget_exhausted,
+            "prompt": prompt_stats
         }
     except Exception as e:
         logger.error(f"Error building result: {e}", exc_info=True)
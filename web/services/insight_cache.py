@@ -0,0 +1,226 @@
+"""
+NexSupply Insight Cache - Reuse AI insights for near-duplicate queries
+"silicone baby teether 5000 units USA" and "5k silicone teethers for US
+Amazon" ask for the same product insights, but an exact prompt cache
+(services/response_cache.py) misses them. This index reuses the insights
+of a previous query when a new one is similar enough and has the same
+category, route and analysis mode.
+
+- Queries are reduced to their product words: lowercase, digits and
+  punctuation dropped, volume/market/channel/mode words removed, a
+  trailing plural "s" stripped
+- Each query becomes a hashed character 3-/4-gram vector (L2-normalized,
+  float32) stored as one row of a fixed-size NumPy matrix; lookup is one
+  matrix-vector product over the rows of the same (category, route, mode);
+  the mode words are not product words, but each mode has its own prompt
+  and output budget, so a "verify" insight never answers a "cost" query
+- A hit needs cosine similarity >= threshold (default 0.75,
+  NEXSUPPLY_INSIGHT_SIMILARITY); when full, the oldest row is replaced
+- Order-specific fields (volume_units, target_market, channel) are removed
+  from stored insights; landed costs are always recomputed by the caller
+
+In-process only: a new process starts with an empty index.
+"""
+
+import os
+import re
+import threading
+import zlib
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from utils.input_parser import CHANNEL_MAP, MARKET_MAP
+from utils.query_understanding import ANALYSIS_MODES, DEFAULT_MODE
+
+
+DEFAULT_THRESHOLD = 0.75
+DEFAULT_CAPACITY = 2048
+DEFAULT_DIMENSIONS = 2048
+NGRAM_SIZES = (3, 4)
+
+THRESHOLD_ENV = "NEXSUPPLY_INSIGHT_SIMILARITY"
+DISABLED_ENV = "NEXSUPPLY_INSIGHT_CACHE_DISABLED"
+
+# Insight fields that describe the order, not the product
+ORDER_FIELDS = ("volume_units", "target_market", "channel")
+
+_FILLER_WORDS = {
+    "a", "an", "the", "for", "to", "in", "with", "of", "and", "or", "from", "about",
+    "i", "we", "my", "our", "want", "need", "is", "what", "per", "order", "qty", "moq",
+    "unit", "units", "pc", "pcs", "piece", "pieces", "set", "sets", "k", "m",
+    "thousand", "million", "china", "import", "sourcing", "source",
+}
+_NON_WORD = re.compile(r"[\d\W_]+")
+
+
+def _stop_words() -> frozenset:
+    words = set(_FILLER_WORDS)
+    phrases = [*MARKET_MAP, *CHANNEL_MAP]
+    phrases += [k for config in ANALYSIS_MODES.values() for k in config["keywords"]]
+    for phrase in phrases:
+        words.update(_NON_WORD.sub(" ", phrase.lower()).split())
+    return frozenset(words)
+
+
+_STOP_WORDS = _stop_words()
+
+
+def normalize_product_text(query: str) -> str:
+    """Product words of a query ("5k silicone teethers for US" → "silicone teether")."""
+    words = []
+    for word in _NON_WORD.sub(" ", query.lower()).split():
+        if word in _STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+def ngram_vector(text: str, dimensions: int = DEFAULT_DIMENSIONS) -> Optional[np.ndarray]:
+    """Hashed, L2-normalized character n-gram counts; None for empty text."""
+    padded = f" {text} "
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for n in NGRAM_SIZES:
+        for i in range(len(padded) - n + 1):
+            # crc32 is stable across processes, unlike hash()
+            vector[zlib.crc32(padded[i:i + n].encode("utf-8")) % dimensions] += 1.0
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+class InsightSimilarityCache:
+    """Thread-safe ring buffer of query vectors with their AI insights."""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        capacity: int = DEFAULT_CAPACITY,
+        dimensions: int = DEFAULT_DIMENSIONS,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if capacity <= 0 or dimensions <= 0:
+            raise ValueError("capacity and dimensions must be positive")
+        self.threshold = threshold
+        self.capacity = capacity
+        self.dimensions = dimensions
+        self._vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self._buckets = np.full(capacity, -1, dtype=np.int64)
+        self._bucket_ids: Dict[Hashable, int] = {}
+        self._entries: list = [None] * capacity   # (normalized query, insights)
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.stores = 0
+
+    def _bucket(self, category_id: str, route: str, mode: str) -> Optional[int]:
+        return self._bucket_ids.get((category_id, route, mode))
+
+    def lookup(
+        self, query: str, category_id: str, route: str, mode: str = DEFAULT_MODE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Insights of the most similar cached query with the same category,
+        route and analysis mode, or None. The returned dict is a copy with
+        "similarity" and "matched_query" added under "_insight_cache".
+        """
+        text = normalize_product_text(query)
+        vector = ngram_vector(text, self.dimensions)
+        with self._lock:
+            if vector is None:
+                self.skipped += 1
+                return None
+            bucket = self._bucket(category_id, route, mode)
+            rows = np.flatnonzero(self._buckets == bucket) if bucket is not None else ()
+            if len(rows) == 0:
+                self.misses += 1
+                return None
+            similarities = self._vectors[rows] @ vector
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            matched_query, insights = self._entries[rows[best]]
+        result = _copy_insights(insights)
+        result["_insight_cache"] = {"similarity": round(similarity, 3), "matched_query": matched_query}
+        return result
+
+    def add(
+        self, query: str, category_id: str, route: str, insights: Dict[str, Any], mode: str = DEFAULT_MODE
+    ) -> bool:
+        """Store insights for a query; False if the query has no product words."""
+        text = normalize_product_text(query)
+        vector = ngram_vector(text, self.dimensions)
+        if vector is None:
+            return False
+        stored = {k: v for k, v in _copy_insights(insights).items() if k not in ORDER_FIELDS}
+        with self._lock:
+            bucket = self._bucket_ids.setdefault((category_id, route, mode), len(self._bucket_ids))
+            row = self._next
+            self._vectors[row] = vector
+            self._buckets[row] = bucket
+            self._entries[row] = (text, stored)
+            self._next = (row + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            self.stores += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.fill(-1)
+            self._entries = [None] * self.capacity
+            self._bucket_ids.clear()
+            self._next = self._size = 0
+            self.hits = self.misses = self.skipped = self.stores = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "stores": self.stores,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": self._size,
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+            }
+
+
+def _copy_insights(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy_insights(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_insights(v) for v in value]
+    return value
+
+
+_insight_cache: Optional[InsightSimilarityCache] = None
+_insight_cache_lock = threading.Lock()
+
+
+def get_insight_cache() -> Optional[InsightSimilarityCache]:
+    """Process-wide index, or None when NEXSUPPLY_INSIGHT_CACHE_DISABLED=1."""
+    global _insight_cache
+    if os.getenv(DISABLED_ENV, "").lower() in ("1", "true", "yes"):
+        return None
+    with _insight_cache_lock:
+        if _insight_cache is None:
+            _insight_cache = InsightSimilarityCache(
+                threshold=float(os.getenv(THRESHOLD_ENV) or DEFAULT_THRESHOLD)
+            )
+        return _insight_cache
+
+
+def get_insight_cache_stats() -> Dict[str, Any]:
+    """stats() of the process-wide index ({} when disabled)."""
+    cache = get_insight_cache()
+    return cache.stats() if cache is not None else {}
@@ -0,0 +1,238 @@
+"""
+NexSupply LLM Gateway - Shared, bounded and coalesced model calls
+Every Gemini call in the process goes through one gateway: an asyncio
+event loop on a background thread that
+
+- caps in-flight upstream calls with an asyncio.Semaphore
+  (max_concurrency, NEXSUPPLY_LLM_MAX_CONCURRENCY)
+- coalesces identical concurrent requests ("singleflight"): a request
+  whose key is already in flight waits for that call instead of making
+  its own; streamed calls are broadcast, late joiners replay the chunks
+  received so far
+- runs the blocking SDK call on a dedicated executor sized to the cap;
+  the call holds its slot until it returns, so callers bound it with a
+  request_options timeout (see services.llm_retry.upstream_timeout)
+
+Streamlit script threads use the blocking generate(); asyncio code
+awaits agenerate(). Keys come from services.response_cache.make_cache_key,
+so "identical" means same model, config, options and normalized prompt.
+Completed calls are not remembered here; that is the response cache's job.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+from services.response_cache import make_cache_key
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+MAX_CONCURRENCY_ENV = "NEXSUPPLY_LLM_MAX_CONCURRENCY"
+
+
+class _Flight:
+    """One upstream call and everyone waiting for it."""
+
+    def __init__(self, stream: bool):
+        self.stream = stream
+        self.result: Future = Future()     # response object (non-stream) or None
+        self.waiters = 1
+        self._chunks: List[Any] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+
+    def push(self, chunk: Any) -> None:
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+        if error is not None:
+            self.result.set_exception(error)
+        else:
+            self.result.set_result(result)
+
+    def chunks(self) -> Iterator[Any]:
+        """Every chunk from the start, blocking for new ones until the call ends."""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self._chunks) and not self._done:
+                    self._cond.wait()
+                if index < len(self._chunks):
+                    chunk = self._chunks[index]
+                    index += 1
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            yield chunk
+
+
+class LLMGateway:
+    """Process-wide concurrency limit and request coalescing for model calls."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-call")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+        self._inflight: Dict[str, _Flight] = {}   # only touched on the gateway loop
+        self.requests = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._loop = loop
+            return self._loop
+
+    async def _join(self, key: str, call: Callable[[], Any], stream: bool) -> _Flight:
+        """Runs on the gateway loop: attach to the in-flight call or start one."""
+        self.requests += 1
+        flight = self._inflight.get(key)
+        if flight is not None and flight.stream == stream:
+            flight.waiters += 1
+            self.coalesced += 1
+            return flight
+        flight = _Flight(stream)
+        self._inflight[key] = flight
+        asyncio.get_running_loop().create_task(self._drive(key, flight, call))
+        return flight
+
+    async def _drive(self, key: str, flight: _Flight, call: Callable[[], Any]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._semaphore:
+                self.upstream_calls += 1
+                self.active += 1
+                self.peak_active = max(self.peak_active, self.active)
+                try:
+                    if flight.stream:
+                        await loop.run_in_executor(self._executor, self._pump, call, flight)
+                        flight.finish()
+                    else:
+                        flight.finish(await loop.run_in_executor(self._executor, call))
+                finally:
+                    self.active -= 1
+        except Exception as e:
+            self.errors += 1
+            flight.finish(error=e)
+        finally:
+            if self._inflight.get(key) is flight:
+                del self._inflight[key]
+
+    @staticmethod
+    def _pump(call: Callable[[], Any], flight: _Flight) -> None:
+        for chunk in call():
+            flight.push(chunk)
+
+    def _submit(self, key: str, call: Callable[[], Any], stream: bool) -> Future:
+        return asyncio.run_coroutine_threadsafe(self._join(key, call, stream), self._ensure_loop())
+
+    def generate(self, key: str, call: Callable[[], Any], stream: bool = False) -> Any:
+        """
+        Blocking call for script threads.
+
+        Args:
+            key: Coalescing key (equal keys in flight share one call)
+            call: Zero-argument function making the upstream call
+            stream: The call returns an iterable of chunks; the return value
+                is then an iterator over them
+        """
+        flight = self._submit(key, call, stream).result()
+        return flight.chunks() if stream else flight.result.result()
+
+    async def agenerate(self, key: str, call: Callable[[], Any]) -> Any:
+        """generate() for asyncio code (non-streaming); works from any event loop."""
+        flight = await asyncio.wrap_future(self._submit(key, call, stream=False))
+        return await asyncio.wrap_future(flight.result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "active": self.active,
+            "peak_active": self.peak_active,
+            "max_concurrency": self.max_concurrency,
+        }
+
+
+class GatewayModel:
+    """GenerativeModel stand-in that sends generate_content through an LLMGateway."""
+
+    def __init__(self, model: Any, gateway: LLMGateway, model_name: str,
+                 generation_config: Optional[Mapping[str, Any]] = None):
+        self._model = model
+        self.gateway = gateway
+        self.model_name = model_name
+        self.generation_config = dict(generation_config or {})
+
+    def _key(self, contents: Any, kwargs: Mapping[str, Any]) -> str:
+        try:
+            return make_cache_key(self.model_name, self.generation_config, contents, kwargs)
+        except ValueError:
+            return uuid.uuid4().hex  # cannot be keyed: never coalesced
+
+    def generate_content(self, contents: Any, **kwargs: Any) -> Any:
+        return self.gateway.generate(
+            self._key(contents, kwargs),
+            lambda: self._model.generate_content(contents, **kwargs),
+            stream=bool(kwargs.get("stream")),
+        )
+
+    def generate_content_uncoalesced(self, contents: Any, **kwargs: Any) -> Any:
+        """generate_content that never joins an in-flight call (for hedged requests)."""
+        return self.gateway.generate(
+            uuid.uuid4().hex,
+            lambda: self._model.generate_content(contents, **kwargs),
+            stream=bool(kwargs.get("stream")),
+        )
+
+    async def generate_content_async(self, contents: Any, **kwargs: Any) -> Any:
+        if kwargs.get("stream"):
+            raise ValueError("Streaming is only available through generate_content")
+        return await self.gateway.agenerate(
+            self._key(contents, kwargs),
+            lambda: self._model.generate_content(contents, **kwargs),
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._model, name)
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """The process-wide gateway (created on first use)."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(int(os.getenv(MAX_CONCURRENCY_ENV) or DEFAULT_MAX_CONCURRENCY))
+        return _gateway
+
+
+def get_llm_gateway_stats() -> Dict[str, Any]:
+    return get_llm_gateway().stats()
@@ -0,0 +1,445 @@
+"""
+NexSupply LLM Retry - Deadline-aware retries, timeouts and hedging
+Wraps single model calls so a slow or flaky upstream cannot hold a
+Streamlit script thread indefinitely:
+
+- every analysis gets a Deadline (NEXSUPPLY_LLM_BUDGET_SECONDS); calls
+  made for it share the remaining time
+- each attempt is bounded by RetryPolicy.attempt_timeout_s and the deadline
+- transient errors (connection, timeout, 429/5xx) are retried with
+  exponential backoff and full jitter, as long as the budget allows
+- optional hedging (NEXSUPPLY_LLM_HEDGE=1): when an attempt has not
+  answered by the P95 latency seen for that call, a second request is
+  sent and whichever answers first wins
+- when the budget runs out BudgetExhausted is raised, so callers can fall
+  back to the rule-based result
+
+Timed-out attempts are abandoned, not cancelled: the blocking SDK call
+finishes in the background, holding its LLM gateway slot. Callers pass
+upstream_timeout() as the request's request_options timeout, so an
+abandoned call gives the slot back by the time the attempt would have
+timed out. Each call appends a CallRecord (attempts, outcomes,
+latencies) to an optional sink.
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    _GOOGLE_TRANSIENT: Tuple[type, ...] = (
+        google_exceptions.TooManyRequests,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.InternalServerError,
+        google_exceptions.BadGateway,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.GatewayTimeout,
+        google_exceptions.DeadlineExceeded,
+    )
+except ImportError:
+    _GOOGLE_TRANSIENT = ()
+
+
+DEFAULT_BUDGET_SECONDS = 45.0
+MIN_UPSTREAM_TIMEOUT_S = 1.0   # the SDK rejects a zero timeout
+BUDGET_ENV = "NEXSUPPLY_LLM_BUDGET_SECONDS"
+HEDGE_ENV = "NEXSUPPLY_LLM_HEDGE"
+
+TRANSIENT_ERRORS: Tuple[type, ...] = (ConnectionError, TimeoutError) + _GOOGLE_TRANSIENT
+
+
+class BudgetExhausted(TimeoutError):
+    """The analysis time budget ran out before the model answered."""
+
+
+class AttemptTimeout(TimeoutError):
+    """A single attempt did not answer within its timeout (retryable)."""
+
+
+class Deadline:
+    """Absolute point in time shared by all model calls of one analysis."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Time budget must be positive")
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to try one model call."""
+
+    max_attempts: int = 3
+    attempt_timeout_s: float = 30.0
+    base_delay_s: float = 0.5
+    max_delay_s: float = 4.0
+    hedge: bool = False
+    hedge_min_samples: int = 20     # latencies needed before P95 is trusted
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if self.attempt_timeout_s <= 0:
+            raise ValueError("attempt_timeout_s must be positive")
+        if self.base_delay_s < 0 or self.max_delay_s < self.base_delay_s:
+            raise ValueError("Need 0 <= base_delay_s <= max_delay_s")
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter delay before retry number `retry` (0-based)."""
+        return random.uniform(0, min(self.max_delay_s, self.base_delay_s * (2 ** retry)))
+
+
+class LatencyTracker:
+    """Recent successful latencies per call label, for hedging and stats."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, latency_s: float) -> None:
+        with self._lock:
+            self._samples.setdefault(label, deque(maxlen=self.window)).append(latency_s)
+
+    def count(self, label: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(label, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def percentile(self, label: str, q: float = 0.95, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(label, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            labels = set(self._samples) | set(self._counts)
+            counts = {label: dict(self._counts.get(label, {})) for label in labels}
+        return {
+            label: dict(
+                counts[label],
+                p50_s=self.percentile(label, 0.5),
+                p95_s=self.percentile(label, 0.95),
+            )
+            for label in sorted(labels)
+        }
+
+
+@dataclass
+class CallRecord:
+    """Attempts and latency of one logical model call."""
+
+    label: str
+    attempts: List[Dict[str, Any]] = field(default_factory=list)
+    outcome: str = "pending"
+    latency_s: Optional[float] = None
+
+    def add_attempt(self, hedge: bool, latency_s: float, outcome: str) -> None:
+        self.attempts.append({
+            "attempt": len(self.attempts) + 1,
+            "hedge": hedge,
+            "latency_s": round(latency_s, 3),
+            "outcome": outcome,
+        })
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "outcome": self.outcome,
+            "latency_s": self.latency_s,
+            "attempts": list(self.attempts),
+        }
+
+
+def _spawn(call: Callable[[], Any]) -> Future:
+    """Run call on a daemon thread so an abandoned attempt never blocks exit."""
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run():
+        try:
+            future.set_result(call())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm-attempt", daemon=True).start()
+    return future
+
+
+def _outcome(error: Optional[BaseException]) -> str:
+    return "ok" if error is None else f"error: {type(error).__name__}"
+
+
+def _run_attempt(
+    record: CallRecord,
+    start: Callable[[], Any],
+    hedge_start: Optional[Callable[[], Any]],
+    timeout: float,
+    hedge_after: Optional[float],
+) -> Tuple[Any, float]:
+    """One attempt, possibly hedged. Returns (value, latency of the winner)."""
+    began = time.monotonic()
+    pending: Dict[Future, bool] = {_spawn(start): False}
+    last_error: Optional[BaseException] = None
+
+    if hedge_start is not None and hedge_after is not None and hedge_after < timeout:
+        done, _ = wait(pending, timeout=hedge_after)
+        if not done:
+            pending[_spawn(hedge_start)] = True
+
+    while pending:
+        done, _ = wait(pending, timeout=max(0.0, began + timeout - time.monotonic()),
+                       return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            hedge = pending.pop(future)
+            error = future.exception()
+            latency = time.monotonic() - began
+            record.add_attempt(hedge, latency, _outcome(error))
+            if error is None:
+                for loser_hedge in pending.values():
+                    record.add_attempt(loser_hedge, latency, "abandoned")
+                return future.result(), latency
+            last_error = error
+        if last_error is not None and not isinstance(last_error, TRANSIENT_ERRORS):
+            for loser_hedge in pending.values():
+                record.add_attempt(loser_hedge, time.monotonic() - began, "abandoned")
+            raise last_error
+
+    for hedge in pending.values():
+        record.add_attempt(hedge, time.monotonic() - began, "timeout")
+    if pending or last_error is None:
+        raise AttemptTimeout(f"No answer within {timeout:.1f}s")
+    raise last_error
+
+
+def _finish(record: CallRecord, started: float, outcome: str,
+            tracker: "LatencyTracker", sink: Optional[List[Dict[str, Any]]]) -> None:
+    record.outcome = outcome
+    record.latency_s = round(time.monotonic() - started, 3)
+    tracker.count(record.label, outcome)
+    if sink is not None:
+        sink.append(record.as_dict())
+
+
+def _sleep_before_retry(policy: RetryPolicy, retry: int, deadline: Deadline,
+                        error: BaseException) -> None:
+    delay = policy.backoff(retry)
+    if delay >= deadline.remaining():
+        raise BudgetExhausted("Time budget exhausted while backing off") from error
+    time.sleep(delay)
+
+
+def call_with_retries(
+    label: str,
+    start: Callable[[], Any],
+    deadline: Deadline,
+    policy: Optional[RetryPolicy] = None,
+    fresh_start: Optional[Callable[[], Any]] = None,
+    tracker: Optional[LatencyTracker] = None,
+    sink: Optional[List[Dict[str, Any]]] = None,
+) -> Any:
+    """
+    Make one model call within the deadline.
+
+    Args:
+        label: Call name for latency tracking and records (e.g. "insights")
+        start: Zero-argument function making the call
+        deadline: Budget shared with the other calls of the analysis
+        policy: Attempts, timeouts, backoff and hedging (default_retry_policy())
+        fresh_start: Like start, but never joins an in-flight call (see
+            GatewayModel.generate_content_uncoalesced). Used for retries,
+            so a retry after a timeout reaches the upstream instead of
+            waiting on the hung call again, and for hedged requests.
+            Without it retries use start and there is no hedging.
+        tracker: Latency history (the process-wide one by default)
+        sink: List receiving this call's CallRecord.as_dict()
+
+    Raises:
+        BudgetExhausted: The deadline passed first
+        Exception: A non-transient error, or the last transient one once
+            attempts are used up
+    """
+    policy = policy or default_retry_policy()
+    tracker = tracker or get_latency_tracker()
+    record = CallRecord(label)
+    started = time.monotonic()
+    hedge_after = None
+    if policy.hedge and fresh_start is not None:
+        hedge_after = tracker.percentile(label, 0.95, policy.hedge_min_samples)
+
+    for attempt in range(policy.max_attempts):
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            _finish(record, started, "budget_exhausted", tracker, sink)
+            raise BudgetExhausted(f"No time left for {label}")
+        timeout = min(policy.attempt_timeout_s, remaining)
+        try:
+            call = start if attempt == 0 else (fresh_start or start)
+            value, latency = _run_attempt(record, call, fresh_start, timeout, hedge_after)
+        except TRANSIENT_ERRORS as e:
+            if attempt + 1 == policy.max_attempts:
+                _finish(record, started, "budget_exhausted" if deadline.expired else "failed", tracker, sink)
+                if deadline.expired:
+                    raise BudgetExhausted(f"Time budget exhausted for {label}") from e
+                raise
+            try:
+                _sleep_before_retry(policy, attempt, deadline, e)
+            except BudgetExhausted:
+                _finish(record, started, "budget_exhausted", tracker, sink)
+                raise
+            continue
+        except Exception:
+            _finish(record, started, "failed", tracker, sink)
+            raise
+        tracker.record(label, latency)
+        _finish(record, started, "ok", tracker, sink)
+        return value
+    raise AssertionError("unreachable")
+
+
+_DONE = object()
+
+
+def _pump(start: Callable[[], Any], chunks: "queue.Queue", stop: threading.Event) -> None:
+    """Move streamed chunks into a bounded queue until the reader goes away."""
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for chunk in start():
+            if not put(chunk):
+                return
+        put(_DONE)
+    except BaseException as e:
+        put(e)
+
+
+def stream_with_retries(
+    label: str,
+    start: Callable[[], Any],
+    deadline: Deadline,
+    policy: Optional[RetryPolicy] = None,
+    fresh_start: Optional[Callable[[], Any]] = None,
+    tracker: Optional[LatencyTracker] = None,
+    sink: Optional[List[Dict[str, Any]]] = None,
+) -> Iterator[Any]:
+    """
+    Streamed counterpart of call_with_retries (no hedging).
+
+    The first chunk must arrive within the attempt timeout and every later
+    one before the deadline. Transient failures are retried only while
+    nothing has been yielded yet; after that they propagate. Retries use
+    fresh_start when given, so they do not replay a stalled stream.
+    """
+    policy = policy or default_retry_policy()
+    tracker = tracker or get_latency_tracker()
+    record = CallRecord(label)
+    started = time.monotonic()
+
+    for attempt in range(policy.max_attempts):
+        if deadline.expired:
+            _finish(record, started, "budget_exhausted", tracker, sink)
+            raise BudgetExhausted(f"No time left for {label}")
+        began = time.monotonic()
+        chunks: "queue.Queue" = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        call = start if attempt == 0 else (fresh_start or start)
+        threading.Thread(target=_pump, args=(call, chunks, stop), name="llm-stream", daemon=True).start()
+        yielded = False
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                wait_s = deadline.remaining() if yielded else min(policy.attempt_timeout_s, deadline.remaining())
+                try:
+                    item = chunks.get(timeout=wait_s)
+                except queue.Empty:
+                    error = AttemptTimeout(f"No chunk within {wait_s:.1f}s")
+                    record.add_attempt(False, time.monotonic() - began, "timeout")
+                    break
+                if item is _DONE:
+                    latency = time.monotonic() - began
+                    record.add_attempt(False, latency, "ok")
+                    tracker.record(label, latency)
+                    _finish(record, started, "ok", tracker, sink)
+                    return
+                if isinstance(item, BaseException):
+                    error = item
+                    record.add_attempt(False, time.monotonic() - began, _outcome(error))
+                    break
+                yielded = True
+                yield item
+        finally:
+            stop.set()
+
+        retryable = isinstance(error, TRANSIENT_ERRORS) and not yielded
+        if not retryable or attempt + 1 == policy.max_attempts:
+            if deadline.expired:
+                _finish(record, started, "budget_exhausted", tracker, sink)
+                raise BudgetExhausted(f"Time budget exhausted for {label}") from error
+            _finish(record, started, "failed", tracker, sink)
+            raise error
+        try:
+            _sleep_before_retry(policy, attempt, deadline, error)
+        except BudgetExhausted:
+            _finish(record, started, "budget_exhausted", tracker, sink)
+            raise
+
+
+def upstream_timeout(deadline: Deadline, policy: Optional[RetryPolicy] = None, stream: bool = False) -> float:
+    """
+    Timeout for the upstream request of one attempt: the attempt timeout,
+    or the rest of the budget for a stream, never past the deadline.
+    Evaluate it when the attempt starts (inside the start callable).
+    """
+    remaining = deadline.remaining()
+    if not stream:
+        remaining = min((policy or default_retry_policy()).attempt_timeout_s, remaining)
+    return max(MIN_UPSTREAM_TIMEOUT_S, remaining)
+
+
+def analysis_deadline() -> Deadline:
+    """A fresh Deadline with the configured per-analysis budget."""
+    return Deadline(float(os.getenv(BUDGET_ENV) or DEFAULT_BUDGET_SECONDS))
+
+
+def default_retry_policy() -> RetryPolicy:
+    return RetryPolicy(hedge=os.getenv(HEDGE_ENV, "").lower() in ("1", "true", "yes"))
+
+
+_tracker = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """The process-wide latency history."""
+    return _tracker
+
+
+def get_llm_call_stats() -> Dict[str, Dict[str, Any]]:
+    """Outcome counts and P50/P95 latency per call label."""
+    return _tracker.stats()
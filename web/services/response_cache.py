@@ -0,0 +1,366 @@
+"""
+NexSupply Response Cache - Persistent cache for Gemini responses
+Identical requests (quick-start templates, popular products) are answered
+from a local SQLite file instead of a 10-20 s model call. The file is
+shared by every session and process on the host.
+
+- Key: SHA-256 over model name, generation config, call options (except
+  request_options) and the normalized prompt (Unicode NFC, whitespace runs collapsed); image and
+  other binary parts are keyed by the SHA-256 of their bytes
+- Entries expire after ttl_seconds; past max_bytes the least recently
+  used entries are evicted
+- Hits, misses, stores and evictions are counted in the same database,
+  so get_response_cache_stats() reports the host-wide hit rate
+- Only complete replies are stored (finish_reason STOP, and the caller's
+  accept check, e.g. valid JSON); truncated or malformed output is not
+  replayed
+- Cache errors are logged and treated as misses; they never fail a call
+
+The prompts embed the current date, so an entry is naturally reused for
+at most a day even with a longer TTL.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Eviction frees down to this share of max_bytes, so it does not run on every store
+EVICTION_TARGET = 0.9
+BUSY_TIMEOUT_SECONDS = 5.0
+
+# Environment overrides
+CACHE_PATH_ENV = "NEXSUPPLY_LLM_CACHE_PATH"
+CACHE_TTL_ENV = "NEXSUPPLY_LLM_CACHE_TTL"
+CACHE_DISABLED_ENV = "NEXSUPPLY_LLM_CACHE_DISABLED"
+
+# Call options that do not change the answer (per-attempt timeouts)
+TRANSPORT_OPTIONS = ("request_options",)
+
+_WHITESPACE = re.compile(r"\s+")
+_COUNTERS = ("hits", "misses", "stores", "evictions", "expired")
+
+
+def normalize_prompt(text: str) -> str:
+    """NFC-normalize, trim and collapse whitespace runs to one space."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def _key_part(part: Any) -> Any:
+    """JSON-able form of one prompt part; binary data becomes its hash."""
+    if isinstance(part, str):
+        return normalize_prompt(part)
+    if isinstance(part, (bytes, bytearray, memoryview)):
+        return {"sha256": hashlib.sha256(bytes(part)).hexdigest()}
+    if isinstance(part, Mapping):
+        return {str(k): _key_part(v) for k, v in sorted(part.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(part, (list, tuple)):
+        return [_key_part(p) for p in part]
+    if part is None or isinstance(part, (bool, int, float)):
+        return part
+    raise ValueError(f"Cannot build a cache key for {type(part).__name__}")
+
+
+def make_cache_key(
+    model_name: str,
+    generation_config: Optional[Mapping[str, Any]],
+    contents: Any,
+    options: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """
+    Cache key for one generate_content call.
+
+    Raises:
+        ValueError: A prompt part that cannot be keyed (e.g. an SDK object).
+    """
+    payload = {
+        "model": model_name,
+        "config": _key_part(dict(generation_config or {})),
+        "options": _key_part({k: v for k, v in (options or {}).items() if k not in TRANSPORT_OPTIONS}),
+        "contents": _key_part(contents),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed TTL + LRU cache of response texts, safe across processes."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.executemany("INSERT OR IGNORE INTO cache_stats VALUES (?, 0)", [(c,) for c in _COUNTERS])
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across threads and forks
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute("UPDATE cache_stats SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached text for `key`, or None (missing or expired)."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT text, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count(conn, "expired")
+                row = None
+            if row is None:
+                self._count(conn, "misses")
+                return None
+            conn.execute(
+                "UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self._count(conn, "hits")
+            return row[0]
+
+    def put(self, key: str, text: str, model: str = "") -> None:
+        """Store a response text, evicting expired then least recently used entries."""
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, text, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, text, size, now, now),
+            )
+            self._count(conn, "stores")
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total, now)
+
+    def _evict(self, conn: sqlite3.Connection, total: int, now: float) -> None:
+        expired = conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        if expired:
+            self._count(conn, "expired", expired)
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = self.max_bytes * EVICTION_TARGET
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total <= target:
+                break
+            victims.append((key,))
+            total -= size
+        if victims:
+            conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            self._count(conn, "evictions", len(victims))
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("UPDATE cache_stats SET value = 0")
+
+    def stats(self) -> Dict[str, Any]:
+        """Host-wide counters, hit rate, entry count and stored bytes."""
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM cache_stats"))
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        return {
+            **{name: counters.get(name, 0) for name in _COUNTERS},
+            "hit_rate": counters.get("hits", 0) / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def _response_text(response: Any) -> Optional[str]:
+    try:
+        return response.text if response else None
+    except ValueError:
+        # Blocked or empty candidates: .text raises, nothing to cache
+        return None
+
+
+def _finish_reason(response: Any) -> Optional[str]:
+    """Name of the first candidate's finish reason ("STOP", "MAX_TOKENS", ...), if any."""
+    try:
+        reason = response.candidates[0].finish_reason
+    except (AttributeError, IndexError, TypeError):
+        return None
+    return getattr(reason, "name", str(reason))
+
+
+class CachedResponse:
+    """Stand-in for a generate_content response served from the cache."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.from_cache = True
+
+
+class CachedModel:
+    """
+    Wraps a GenerativeModel so generate_content goes through a ResponseCache.
+
+    Prompts that cannot be keyed pass straight through. A response is
+    stored only if the model finished normally (finish_reason STOP, so no
+    MAX_TOKENS-truncated or blocked output) and `accept(text)` holds, e.g.
+    the text parses as the expected JSON; anything else is retried on the
+    next identical call. Streaming calls share entries with non-streaming
+    ones: a hit is replayed as a single chunk, a miss is stored once the
+    stream has been consumed. generate_content_uncoalesced (retries and
+    hedged requests through the LLM gateway) uses the same entries.
+    """
+
+    def __init__(self, model: Any, cache: ResponseCache, model_name: str,
+                 generation_config: Optional[Mapping[str, Any]] = None,
+                 accept: Optional[Callable[[str], bool]] = None):
+        self._model = model
+        self.cache = cache
+        self.model_name = model_name
+        self.generation_config = dict(generation_config or {})
+        self.accept = accept
+
+    def generate_content(self, contents: Any, **kwargs: Any) -> Any:
+        return self._generate(self._model.generate_content, contents, kwargs)
+
+    def generate_content_uncoalesced(self, contents: Any, **kwargs: Any) -> Any:
+        return self._generate(self._model.generate_content_uncoalesced, contents, kwargs)
+
+    def _generate(self, call: Callable[..., Any], contents: Any, kwargs: Dict[str, Any]) -> Any:
+        stream = bool(kwargs.get("stream"))
+        options = {k: v for k, v in kwargs.items() if k != "stream"}
+        try:
+            key = make_cache_key(self.model_name, self.generation_config, contents, options)
+            text = self.cache.get(key)
+        except (ValueError, sqlite3.Error) as e:
+            logger.warning(f"Response cache lookup skipped: {e}")
+            return call(contents, **kwargs)
+        if text is not None:
+            return iter([CachedResponse(text)]) if stream else CachedResponse(text)
+
+        response = call(contents, **kwargs)
+        if stream:
+            return self._store_stream(key, response)
+        self._store(key, _response_text(response), _finish_reason(response))
+        return response
+
+    async def generate_content_async(self, contents: Any, **kwargs: Any) -> Any:
+        try:
+            key = make_cache_key(self.model_name, self.generation_config, contents, kwargs)
+            text = self.cache.get(key)
+        except (ValueError, sqlite3.Error) as e:
+            logger.warning(f"Response cache lookup skipped: {e}")
+            return await self._model.generate_content_async(contents, **kwargs)
+        if text is not None:
+            return CachedResponse(text)
+        response = await self._model.generate_content_async(contents, **kwargs)
+        self._store(key, _response_text(response), _finish_reason(response))
+        return response
+
+    def _store_stream(self, key: str, chunks: Iterable[Any]) -> Iterator[Any]:
+        parts = []
+        finish_reason = None
+        for chunk in chunks:
+            text = _response_text(chunk)
+            if text:
+                parts.append(text)
+            finish_reason = _finish_reason(chunk) or finish_reason
+            yield chunk
+        # The finish reason arrives on the last chunk
+        self._store(key, "".join(parts), finish_reason)
+
+    def _store(self, key: str, text: Optional[str], finish_reason: Optional[str]) -> None:
+        if not text or finish_reason != "STOP":
+            return
+        if self.accept is not None and not self.accept(text):
+            logger.info("Response cache store skipped: reply rejected")
+            return
+        try:
+            self.cache.put(key, text, self.model_name)
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache store failed: {e}")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._model, name)
+
+
+def _default_cache_path() -> str:
+    """Same placement rule as the analytics SQLite file (services/data_logger.py)."""
+    if os.path.exists("/tmp"):
+        return "/tmp/nexsupply_llm_cache.db"
+    return os.path.join(os.path.dirname(os.path.dirname(__file__)), "nexsupply_llm_cache.db")
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Process-wide cache over the host-wide file, or None when disabled
+    (NEXSUPPLY_LLM_CACHE_DISABLED=1) or the file cannot be opened.
+    """
+    global _response_cache
+    if os.getenv(CACHE_DISABLED_ENV, "").lower() in ("1", "true", "yes"):
+        return None
+    if _response_cache is None:
+        try:
+            _response_cache = ResponseCache(
+                os.getenv(CACHE_PATH_ENV) or _default_cache_path(),
+                ttl_seconds=float(os.getenv(CACHE_TTL_ENV) or DEFAULT_TTL_SECONDS),
+            )
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+    return _response_cache
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """stats() of the shared cache ({} when disabled)."""
+    cache = get_response_cache()
+    return cache.stats() if cache is not None else {}
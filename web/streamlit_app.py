@@ -361,6 +361,7 @@ def apply_global_css():
 # =============================================================================
 
 from pages.home import render_home_page
+from pages.bulk_analysis import render_bulk_analysis_page
 from pages.results_dashboard import render_results_page
 from utils.project_manager import initialize_supabase
 
@@ -397,6 +398,8 @@ def main():
     
     if is_results_page:
         render_results_page()
+    elif st.session_state.page == "bulk":
+        render_bulk_analysis_page()
     else:
         render_home_page()
 
@@ -0,0 +1,111 @@
+"""
+Unit tests for bulk catalog analysis.
+Tests file parsing, chunked pricing, error rows, bounded insights and throughput.
+"""
+
+import threading
+import time
+
+import pytest
+from utils.catalog_analysis import (
+    analyze_catalog_file,
+    catalog_results_to_csv,
+    generate_catalog_insights,
+    read_catalog,
+)
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.cost_tables import classify_category
+
+
+CATALOG = (
+    "Product Name,Qty,Market,Retail Price,SKU\n"
+    "Silicone Baby Teether,5000,USA,12.99,B-1\n"
+    "\n"
+    "LED Desk Lamp,\"2,000\",EU,,L-1\n"
+    "Baseball cap,-3,USA,,C-1\n"
+    ",100,USA,,E-1\n"
+    "Mystery item,,,,\n"
+).encode("utf-8")
+
+
+def _rows(data, **options):
+    return [row for chunk in analyze_catalog_file(data, "catalog.csv", **options) for row in chunk]
+
+
+def test_read_catalog_aliases_and_errors():
+    """Test header aliases, number parsing and per-row errors."""
+    rows = list(read_catalog(CATALOG, "catalog.csv"))
+    assert [r.row for r in rows] == [1, 2, 3, 4, 5]
+    assert rows[0].units == 5000 and rows[0].retail_price == 12.99 and rows[0].sku == "B-1"
+    assert rows[1].units == 2000 and rows[1].target_market == "EU"
+    assert "positive" in rows[2].error
+    assert rows[3].error == "Missing product name"
+    
+    with pytest.raises(ValueError):
+        list(read_catalog(b"name,qty\nx,1\n", "catalog.pdf"))
+    with pytest.raises(ValueError):
+        list(read_catalog(b"foo,bar\n1,2\n", "catalog.csv"))
+
+
+def test_priced_rows_match_single_calculator():
+    """Test that catalog rows equal the single-product calculator."""
+    results = _rows(CATALOG, default_units=1500)
+    teether, lamp, cap, empty, mystery = results
+    
+    expected = compute_landed_cost(OrderParams(
+        category_id=classify_category("Silicone Baby Teether"), units=5000,
+        route="cn_to_us_west_coast", retail_price_per_unit=12.99, target_market="United States",
+    ))
+    assert teether["landed_cost_per_unit_usd"] == expected["landed_cost_per_unit_usd"]
+    assert teether["gross_margin_percent"] == expected["margin_estimate"]["gross_margin_percent"]
+    assert lamp["route"] == "cn_to_eu" and lamp["target_market"] == "European Union"
+    assert mystery["units"] == 1500 and mystery["category_id"] == "generic_consumer_product"
+    assert cap["landed_cost_per_unit_usd"] is None and cap["error"]
+    assert empty["error"] and teether["error"] is None
+    
+    csv_text = catalog_results_to_csv(results)
+    assert csv_text.splitlines()[0].startswith("row,sku,product,category_id")
+    assert len(csv_text.splitlines()) == 6
+
+
+def test_results_stream_in_chunks():
+    """Test that results arrive chunk by chunk on one cost table version."""
+    body = "".join(f"Yoga mat {i},{1000 + i},USA\n" for i in range(25))
+    chunks = list(analyze_catalog_file(f"product,units,market\n{body}".encode(), "c.csv", chunk_size=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert len({r["cost_table_version"] for c in chunks for r in c}) == 1
+
+
+def test_insights_pool_is_bounded():
+    """Test the worker bound, the row cap and per-row failure handling."""
+    results = _rows(CATALOG) * 4
+    for i, row in enumerate(results):
+        row["row"] = i
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    
+    def fake_insight(row):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        if row["product"] == "LED Desk Lamp":
+            raise RuntimeError("model unavailable")
+        return {"summary": row["product"]}
+    
+    out = list(generate_catalog_insights(results, fake_insight, max_workers=2, max_rows=9))
+    assert len(out) == 9 and peak[0] <= 2
+    assert any(error == "model unavailable" for _, _, error in out)
+    assert all(insights["summary"] for _, insights, error in out if error is None)
+
+
+def test_ten_thousand_rows_priced_in_seconds():
+    """Test bulk throughput without AI insights."""
+    names = ["Silicone Baby Teether", "LED Desk Lamp", "Baseball cap", "Yoga mat", "Dog toy rope"]
+    body = "".join(f"{names[i % 5]} {i % 300},{500 + i},{'USA' if i % 2 else 'EU'}\n" for i in range(10_000))
+    start = time.perf_counter()
+    results = _rows(f"product,units,market\n{body}".encode())
+    assert len(results) == 10_000 and all(r["error"] is None for r in results)
+    assert time.perf_counter() - start < 5.0
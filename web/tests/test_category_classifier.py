@@ -0,0 +1,85 @@
+"""
+Unit tests for the top-k BM25 category classifier.
+Tests ranking, confidence flags, batch classification and result metadata.
+"""
+
+import pytest
+from utils.category_classifier import (
+    FALLBACK_CATEGORY,
+    build_category_classifier,
+    classify_category_top_k,
+    get_category_classifier,
+)
+from utils.result_builder import build_nexsupply_result
+
+
+def test_distinctive_terms_outrank_shared_ones():
+    """Test that a term shared by many categories weighs less than a unique one."""
+    classifier = build_category_classifier({
+        "mugs": ["mug", "cup"],
+        "bottles": ["bottle", "cup"],
+        "lids": ["lid", "cup"],
+    })
+    result = classifier.classify("travel mug with cup lid", k=2)
+    assert [c["category_id"] for c in result["candidates"]] == ["mugs", "lids"]
+    assert result["ambiguous"] and not result["confident"]
+    assert result["candidates"][0]["confidence"] >= result["candidates"][1]["confidence"]
+    assert set(result["matched_terms"]) == {"mug", "cup", "lid"}
+
+
+def test_confidence_and_fallback():
+    """Test confident matches, weak matches and no match."""
+    classifier = get_category_classifier()
+    strong = classifier.classify("Silicone Baby Teether")
+    assert strong["category_id"] == "baby_infant_products"
+    assert strong["confident"] and 0 < strong["confidence"] < 1
+    
+    none = classifier.classify("qwertyuiop")
+    assert none["category_id"] == FALLBACK_CATEGORY
+    assert none["confidence"] == 0.0 and none["candidates"] == []
+    with pytest.raises(ValueError):
+        classifier.classify("cap", k=0)
+
+
+def test_label_words_are_indexed():
+    """Test that category label words count as terms."""
+    classifier = build_category_classifier({"hats": ["beanie"]}, {"hats": "Hats and Caps"})
+    assert classifier.classify("bucket hats")["category_id"] == "hats"
+    assert classifier.classify("bucket hats")["candidates"][0]["label"] == "Hats and Caps"
+
+
+def test_label_words_only_match_whole_words():
+    """Test that label words inside longer words add nothing, unlike keywords."""
+    classifier = build_category_classifier(
+        {"hats": ["beanie", "cap"], "cases": ["sleeve"]},
+        {"hats": "Hat / Cap", "cases": "Phone case"},
+    )
+    assert classifier.classify("showcase")["category_id"] == FALLBACK_CATEGORY
+    assert classifier.classify("whatever")["category_id"] == FALLBACK_CATEGORY
+    assert classifier.classify("phone case")["category_id"] == "cases"
+    # "cap" is also a keyword: its keyword listing still matches as a substring
+    partial = classifier.classify("capacity")
+    whole = classifier.classify("cap")
+    assert partial["matched_terms"] == whole["matched_terms"] == ["cap"]
+    assert partial["candidates"][0]["score"] < whole["candidates"][0]["score"]
+    
+    bundled = get_category_classifier()
+    assert bundled.classify("handle")["category_id"] == FALLBACK_CATEGORY
+    assert bundled.classify("showcase")["category_id"] == FALLBACK_CATEGORY
+
+
+def test_batch_matches_single_queries():
+    """Test batch classification, including repeated queries."""
+    queries = ["LED Desk Lamp", "phone case", "LED Desk Lamp", "dog toy", ""]
+    batch = get_category_classifier().classify_batch(queries, k=2)
+    assert batch == [classify_category_top_k(q, k=2) for q in queries]
+    batch[0]["candidates"].clear()
+    assert batch[2]["candidates"]
+
+
+def test_result_meta_has_classification():
+    """Test that results carry the ranked category candidates."""
+    meta = build_nexsupply_result("baseball cap")["meta"]
+    classification = meta["category_classification"]
+    assert classification["candidates"][0]["category_id"] == "apparel_hat_cap"
+    assert classification["confident"]
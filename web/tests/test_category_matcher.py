@@ -0,0 +1,65 @@
+"""
+Unit tests for the keyword automaton behind classify_category.
+Tests overlapping matches, scoring rules, CJK/Hangul and parity with the substring scan.
+"""
+
+import pytest
+from utils.category_matcher import build_keyword_automaton
+from utils.cost_tables import CATEGORY_KEYWORDS, classify_category
+
+
+def scan_classify(query):
+    """Reference: one substring search per keyword."""
+    query_lower = query.lower()
+    scores = {}
+    for cat_id, keywords in CATEGORY_KEYWORDS.items():
+        score = sum(1 for kw in keywords if kw.lower() in query_lower)
+        if score > 0:
+            scores[cat_id] = score
+    return max(scores, key=scores.get) if scores else "generic_consumer_product"
+
+
+def test_overlapping_and_nested_keywords():
+    """Test that keywords inside or overlapping other keywords are all found."""
+    automaton = build_keyword_automaton({
+        "a": ["he", "she", "hers"],
+        "b": ["his", "usher"],
+    })
+    assert automaton.scores("USHERS") == [3, 1]
+    assert automaton.scores("his his his") == [0, 1]  # repeats count once
+    assert automaton.best_match("nothing here") == "a"
+    assert automaton.best_match("xyz") is None
+
+
+def test_ties_and_duplicate_keywords():
+    """Test first-listed tie break and keywords shared between categories."""
+    automaton = build_keyword_automaton({"first": ["cap"], "second": ["cap"], "third": ["hat", "hat"]})
+    assert automaton.best_match("a cap") == "first"
+    assert automaton.scores("hat") == [0, 0, 2]
+    with pytest.raises(ValueError):
+        build_keyword_automaton({"bad": [None]})
+
+
+def test_whole_word_matches():
+    """Test that matched_words separates whole-word hits from ones inside a word."""
+    automaton = build_keyword_automaton({"a": ["hat", "cap", "what"], "b": ["cap_"]})
+    assert automaton.matched_words("what capacity") == ({0, 1, 2}, {2})
+    assert automaton.matched_words("a hat, cap_x") == ({0, 1, 3}, {0})
+    assert automaton.matched_words("") == (set(), set())
+
+
+def test_cjk_and_hangul():
+    """Test non-Latin keywords and mixed-script queries."""
+    automaton = build_keyword_automaton({"baby": ["치발기", "牙胶"], "pet": ["宠物", "강아지"]})
+    assert automaton.best_match("유아용 실리콘 치발기") == "baby"
+    assert automaton.best_match("宠物玩具 강아지") == "pet"
+    assert automaton.best_match("婴儿牙胶") == "baby"
+
+
+def test_classify_category_matches_substring_scan():
+    """Test parity with the previous implementation over real keyword mixes."""
+    keywords = [kw for kws in CATEGORY_KEYWORDS.values() for kw in kws]
+    queries = [" ".join(keywords[i:i + 3]) for i in range(0, len(keywords), 3)]
+    queries += ["Silicone Baby Teether", "LED Desk Lamp", "Ceramic Coffee Mug", "유아용 치발기", "宠物玩具", ""]
+    for query in queries:
+        assert classify_category(query) == scan_classify(query), query
@@ -0,0 +1,133 @@
+"""
+Unit tests for the compliance-cost index.
+Tests certification matching, market profiles, caching and calculator integration.
+"""
+
+import pytest
+from utils.compliance_index import (
+    build_compliance_index,
+    get_compliance_index,
+    match_certifications,
+    normalize_market,
+)
+from utils.cost_calculator import OrderParams, compute_landed_cost, compute_landed_cost_batch
+from utils.cost_tables import get_category_config
+
+
+COSTS = {
+    "lastUpdated": "2025-01",
+    "certifications": {
+        "FCC": {"name": "FCC", "cost_range": {"low": 800, "high": 2500, "average": 1500}, "timeline_weeks": 4},
+        "CPC": {"name": "CPC", "cost_range": {"low": 300, "high": 1200, "average": 600}, "timeline_weeks": 3},
+        "CPSC": {"name": "CPSC", "cost_range": {"low": 200, "high": 800, "average": 500}, "timeline_weeks": 2},
+    },
+}
+
+
+def test_match_certifications():
+    """Test regulation text → certification codes, with CPSC covered by CPC."""
+    assert match_certifications(["FCC Part 15 (Bluetooth)"]) == ["FCC"]
+    assert match_certifications(["CPSC 16 CFR 1303"]) == ["CPSC"]
+    assert match_certifications(["CPSIA lead limits", "CPSC small parts"]) == ["CPC"]
+    assert match_certifications(["Prop 65 warning"]) == []
+
+
+def test_build_profiles_per_market():
+    """Test that costs apply to the costed market only and rules map to categories."""
+    rules = {"categories": [{
+        "id": "wireless_phone_charger",
+        "targetMarkets": ["USA", "EU"],
+        "requiredRegulations": [{"name": "FCC Part 15", "details": "Intentional radiator"}, "CPSC general"],
+        "highRiskFlags": ["Battery overheating"],
+    }]}
+    index = build_compliance_index(COSTS, rules)
+    
+    us = index.lookup("electronics_small_accessory", "us")
+    assert [c["code"] for c in us["certifications"]] == ["FCC", "CPSC"]
+    assert us["cert_cost_usd"] == {"low": 1000.0, "average": 2000.0, "high": 3300.0}
+    assert us["timeline_weeks"] == 4
+    assert index.lookup("wireless_phone_charger", "United States") == us | {"key": "wireless_phone_charger"}
+    assert index.certification_cost("electronics_small_accessory", "European Union") is None
+    assert index.lookup("electronics_small_accessory", "Japan") is None
+    assert normalize_market(" UK ") == "United Kingdom"
+    
+    with pytest.raises(ValueError):
+        build_compliance_index(COSTS, {"categories": [{"id": "x"}]})
+
+
+def test_unpriced_profile_keeps_category_default():
+    """Test that a US profile without priced certifications does not zero the certification cost."""
+    rules = {"categories": [{"id": "auto_category_2", "targetMarkets": ["USA"],
+                             "requiredRegulations": ["Prop 65 warning"]}]}
+    index = build_compliance_index(COSTS, rules)
+    assert index.lookup("automotive_accessory", "USA")["cert_cost_usd"] is None
+    assert index.certification_cost("automotive_accessory", "USA") is None
+
+    category = "automotive_accessory"
+    base = compute_landed_cost(OrderParams(category_id=category, units=5000))
+    us = compute_landed_cost(OrderParams(category_id=category, units=5000, target_market="USA"))
+    assert us["cost_breakdown_detailed"]["certification"] == get_category_config(category)["cert_cost_per_sku_usd"] > 0
+    assert us["assumptions"]["certification_cost_source"] == "category_default"
+    assert us["landed_cost_per_unit_usd"] == base["landed_cost_per_unit_usd"]
+
+
+def test_bundled_index_is_shared():
+    """Test the shipped files and that an unchanged index is reused."""
+    index = get_compliance_index()
+    assert get_compliance_index() is index
+    profile = index.lookup("baby_infant_products", "USA")
+    assert "CPC" in [c["code"] for c in profile["certifications"]]
+    assert index.certification_cost("baby_infant_products", "USA") == profile["cert_cost_usd"]["average"]
+
+
+def test_failed_reload_keeps_previous_index(monkeypatch):
+    """Test that a missing or malformed file after startup keeps the last good index."""
+    import utils.compliance_index as compliance_index
+    
+    index = get_compliance_index()
+    
+    def broken(costs_path, rules_path):
+        raise ValueError("Expecting value: line 1 column 1")
+    
+    monkeypatch.setattr(compliance_index, "_load", broken)
+    monkeypatch.setitem(compliance_index._state, "stat", None)
+    monkeypatch.setitem(compliance_index._state, "next_check", 0.0)
+    failed = compliance_index._state["failed_reloads"]
+    assert get_compliance_index() is index
+    assert compliance_index._state["failed_reloads"] == failed + 1
+    assert compute_landed_cost(OrderParams(category_id="baby_infant_products", units=1000, target_market="USA"))
+    
+    monkeypatch.setattr(compliance_index, "_stat", lambda paths: (None, None))
+    monkeypatch.setitem(compliance_index._state, "next_check", 0.0)
+    assert get_compliance_index() is index
+
+
+def test_compute_landed_cost_uses_target_market():
+    """Test the certification cost override and the compliance block."""
+    category = "electronics_small_accessory"
+    base = compute_landed_cost(OrderParams(category_id=category, units=2000))
+    assert base["cost_breakdown_detailed"]["certification"] == get_category_config(category)["cert_cost_per_sku_usd"]
+    assert base["assumptions"]["certification_cost_source"] == "category_default"
+    assert "compliance" not in base
+    
+    us = compute_landed_cost(OrderParams(category_id=category, units=2000, target_market="USA"))
+    expected = get_compliance_index().certification_cost(category, "USA")
+    assert us["cost_breakdown_detailed"]["certification"] == round(expected, 2)
+    assert us["assumptions"]["target_market"] == "United States"
+    assert us["compliance"]["market"] == "United States"
+    
+    us["compliance"]["certifications"].clear()
+    assert get_compliance_index().lookup(category, "USA")["certifications"]
+    
+    other = compute_landed_cost(OrderParams(category_id="generic_consumer_product", units=2000, target_market="USA"))
+    assert other["assumptions"]["certification_cost_source"] == "category_default"
+
+
+def test_batch_target_markets_match_scalar():
+    """Test that batch pricing with target markets matches the scalar path."""
+    categories = ["electronics_small_accessory", "baby_infant_products", "generic_consumer_product"]
+    markets = ["USA", "EU", None]
+    records = compute_landed_cost_batch(categories, 1500, target_markets=markets).to_records()
+    
+    for category, market, record in zip(categories, markets, records):
+        assert record == compute_landed_cost(OrderParams(category_id=category, units=1500, target_market=market))
@@ -0,0 +1,83 @@
+"""
+Unit tests for the landed cost cache.
+Tests LRU behaviour, counters, copy-on-read and version invalidation.
+"""
+
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.cost_cache import LandedCostCache, compute_landed_cost_cached, order_cache_key
+
+
+def test_cached_result_matches_uncached():
+    """Test that the cached wrapper returns the scalar result."""
+    order = OrderParams(category_id="apparel_hat_cap", units=5000)
+    assert compute_landed_cost_cached(order) == compute_landed_cost(order)
+    assert compute_landed_cost_cached(order) == compute_landed_cost(order)
+
+
+def test_callers_cannot_corrupt_entries():
+    """Test that mutating a returned result does not affect the cache."""
+    cache = LandedCostCache(max_entries=4)
+    compute = lambda: {"components_usd": {"product": 1.0}}
+    
+    first = cache.get_or_compute("k", "v1", compute)
+    first["components_usd"]["product"] = -1.0
+    second = cache.get_or_compute("k", "v1", compute)
+    
+    assert second["components_usd"]["product"] == 1.0
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_eviction_and_counters():
+    """Test that the least recently used entry is evicted first."""
+    cache = LandedCostCache(max_entries=2)
+    calls = []
+    
+    def compute(key):
+        calls.append(key)
+        return {"key": key}
+    
+    for key in ["a", "b", "a", "c", "a", "b"]:
+        cache.get_or_compute(key, "v1", lambda: compute(key))
+    
+    stats = cache.stats()
+    assert calls == ["a", "b", "c", "b"]
+    assert stats["hits"] == 2
+    assert stats["misses"] == 4
+    assert stats["evictions"] == 2
+    assert stats["entries"] == 2
+
+
+def test_version_change_invalidates():
+    """Test that a new table version drops existing entries."""
+    cache = LandedCostCache()
+    cache.get_or_compute("k", "v1", lambda: {"value": 1})
+    result = cache.get_or_compute("k", "v2", lambda: {"value": 2})
+    
+    assert result == {"value": 2}
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_order_key_normalization():
+    """Test that equivalent 'not provided' values share a key."""
+    a = OrderParams(category_id="apparel_hat_cap", units=5000, retail_price_per_unit=0)
+    b = OrderParams(category_id="apparel_hat_cap", units=5000, custom_unit_weight_kg=0)
+    assert order_cache_key(a) == order_cache_key(b)
+
+
+def test_index_version_change_invalidates(monkeypatch):
+    """Test that a compliance index rebuild reprices cached orders."""
+    import dataclasses
+    import utils.cost_cache as cost_cache
+    from utils.compliance_index import get_compliance_index
+    
+    order = OrderParams(category_id="baby_infant_products", units=5000, target_market="USA")
+    before = cost_cache.pricing_version()
+    compute_landed_cost_cached(order)
+    misses = cost_cache.get_cost_cache_stats()["misses"]
+    
+    rebuilt = dataclasses.replace(get_compliance_index(), version="2099-01")
+    monkeypatch.setattr(cost_cache, "get_compliance_index", lambda: rebuilt)
+    assert cost_cache.pricing_version() != before
+    compute_landed_cost_cached(order)
+    assert cost_cache.get_cost_cache_stats()["misses"] == misses + 1
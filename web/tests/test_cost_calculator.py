@@ -82,3 +82,168 @@ def test_order_params_defaults():
 
 
 
+def test_batch_matches_scalar_per_row():
+    """Test that batch records are identical to scalar results."""
+    import math
+    from utils.cost_calculator import compute_landed_cost_batch
+    
+    category_ids = ["candy_marshmallow_stick", "apparel_hat_cap", "toys_games", "lighting_led_fixture"]
+    units = [1000, 5000, 12345, 50000]
+    routes = ["cn_to_us_west_coast", "cn_to_eu", "cn_to_us_east_coast", "cn_to_uk"]
+    weights = [None, 0.25, None, 1.2]
+    retail = [2.5, None, 9.99, 30.0]
+    
+    batch = compute_landed_cost_batch(
+        category_ids,
+        units,
+        routes=routes,
+        unit_weights_kg=[w if w else math.nan for w in weights],
+        retail_prices=[p if p else math.nan for p in retail],
+    )
+    records = batch.to_records()
+    
+    assert len(batch) == 4
+    for i, record in enumerate(records):
+        expected = compute_landed_cost(OrderParams(
+            category_id=category_ids[i],
+            units=units[i],
+            route=routes[i],
+            retail_price_per_unit=retail[i],
+            custom_unit_weight_kg=weights[i],
+        ))
+        assert record == expected
+
+
+def test_batch_columns_and_broadcasting():
+    """Test columnar output with scalar route and volume."""
+    from utils.cost_calculator import compute_landed_cost_batch
+    
+    batch = compute_landed_cost_batch(["apparel_hat_cap"] * 3, 5000, routes="cn_to_eu")
+    scalar = compute_landed_cost(OrderParams(category_id="apparel_hat_cap", units=5000, route="cn_to_eu"))
+    
+    assert batch.routes == ["cn_to_eu"] * 3
+    assert batch["total_landed_cost_usd"].shape == (3,)
+    assert round(float(batch["total_landed_cost_usd"][0]), 2) == scalar["total_landed_cost_usd"]
+    
+    frame = batch.to_dataframe()
+    assert len(frame) == 3
+    assert "landed_cost_per_unit_usd" in frame.columns
+
+
+def test_batch_rejects_mismatched_columns():
+    """Test that column length mismatches are rejected."""
+    from utils.cost_calculator import compute_landed_cost_batch
+    
+    with pytest.raises(ValueError):
+        compute_landed_cost_batch(["apparel_hat_cap"] * 3, [1000, 2000])
+
+
+def test_volume_curve_matches_scalar():
+    """Test that each curve point equals the scalar per-unit cost."""
+    from utils.cost_calculator import compute_volume_curve, compute_landed_cost_batch, FIXED_COST_KEYS
+    
+    grid = [1000, 5000, 10000, 50000]
+    curve = compute_volume_curve("apparel_hat_cap", "cn_to_eu", grid, fixed_share_threshold=0.05)
+    
+    assert curve["units"] == grid
+    for units, per_unit in zip(grid, curve["landed_cost_per_unit_usd"]):
+        scalar = compute_landed_cost(OrderParams(category_id="apparel_hat_cap", units=units, route="cn_to_eu"))
+        assert per_unit == scalar["landed_cost_per_unit_usd"]
+    
+    # Per-unit cost falls and fixed-cost share crosses the threshold at the solved volume
+    assert curve["landed_cost_per_unit_usd"] == sorted(curve["landed_cost_per_unit_usd"], reverse=True)
+    threshold = curve["units_for_fixed_share_threshold"]
+    batch = compute_landed_cost_batch(["apparel_hat_cap"] * 2, [threshold - 1, threshold], routes="cn_to_eu")
+    share = sum(batch[k] for k in FIXED_COST_KEYS) / batch["total_landed_cost_usd"]
+    assert share[0] >= 0.05 > share[1]
+
+
+def test_scenarios_are_exact_reprices():
+    """Test that scenario rows equal a scalar re-price with edited coefficients."""
+    from utils.cost_calculator import CostScenario, compute_scenarios
+    from utils.cost_tables import get_category_config
+    
+    order = OrderParams(category_id="apparel_hat_cap", units=5000, retail_price_per_unit=4.0)
+    result = compute_scenarios(order, [
+        CostScenario("Duty -5", shifts={"duty_rate_percent": -5}),
+        CostScenario("FOB +10%", multipliers={"base_fob_cost_per_kg": 1.1}),
+    ])
+    
+    base = compute_landed_cost(order)
+    assert result["base"]["landed_cost_per_unit_usd"] == base["landed_cost_per_unit_usd"]
+    assert result["base"]["retail_price_basis"] == "provided"
+    
+    duty = get_category_config("apparel_hat_cap")["duty_rate_percent"]
+    duty_row = result["scenarios"][0]
+    expected_delta = -5 / 100.0 * (
+        base["cost_breakdown_detailed"]["product_fob"] + base["cost_breakdown_detailed"]["sea_freight"]
+    ) / order.units
+    assert duty > 5
+    assert duty_row["cost_delta_per_unit_usd"] == pytest.approx(expected_delta, abs=1e-4)
+    assert duty_row["margin_delta_points"] > 0
+    assert result["scenarios"][1]["margin_delta_points"] < 0
+
+
+def test_scenario_rejects_unknown_coefficient():
+    """Test that misspelled coefficients are rejected."""
+    from utils.cost_calculator import CostScenario
+    
+    with pytest.raises(ValueError):
+        CostScenario("bad", multipliers={"freight": 1.2})
+
+
+def test_sensitivity_keeps_display_fields():
+    """Test that compute_sensitivity still returns the dashboard fields."""
+    from utils.cost_calculator import compute_sensitivity
+    
+    order = OrderParams(category_id="apparel_hat_cap", units=5000)
+    sensitivity = compute_sensitivity(order, compute_landed_cost(order))
+    
+    assert len(sensitivity["scenarios"]) == 3
+    for scenario in sensitivity["scenarios"]:
+        assert {"name", "trigger", "margin_impact", "new_margin", "recommendation"} <= set(scenario)
+
+
+def test_override_paths_agree():
+    """Test that curve, scenarios and simulation price tariff/compliance overrides like the scalar."""
+    from utils.cost_calculator import compute_scenarios, compute_sensitivity, compute_volume_curve
+    from utils.cost_simulation import simulate_landed_cost
+    
+    order = OrderParams(
+        category_id="baby_infant_products", units=5000, hs_code="3926.90",
+        channel="Amazon FBA", target_market="USA", retail_price_per_unit=12.0,
+    )
+    lc = compute_landed_cost(order)
+    default = compute_landed_cost(OrderParams(category_id="baby_infant_products", units=5000))
+    assert lc["landed_cost_per_unit_usd"] != default["landed_cost_per_unit_usd"]
+    
+    curve = compute_volume_curve(order.category_id, order.route, [1000, 5000],
+                                 hs_code=order.hs_code, target_market=order.target_market)
+    assert curve["landed_cost_per_unit_usd"][1] == lc["landed_cost_per_unit_usd"]
+    assert simulate_landed_cost(order, seed=1)["deterministic_per_unit_usd"] == lc["landed_cost_per_unit_usd"]
+    
+    base = compute_scenarios(order)["base"]
+    assert base["landed_cost_per_unit_usd"] == lc["landed_cost_per_unit_usd"]
+    assert base["channel_fees_per_unit_usd"] == lc["margin_estimate"]["channel_fees_per_unit_usd"]
+    assert base["net_margin_percent"] == pytest.approx(lc["margin_estimate"]["net_margin_percent"], abs=0.05)
+    assert compute_sensitivity(order)["base_margin"] == f"{lc['margin_estimate']['net_margin_percent']:.1f}%"
+
+
+def test_unknown_ids_are_reported_in_assumptions():
+    """Test that generic/default-lane fallbacks are surfaced, in scalar and batch results."""
+    from utils.cost_calculator import compute_landed_cost_batch
+    
+    known = compute_landed_cost(OrderParams(category_id="apparel_hat_cap", units=1000))
+    assert known["assumptions"]["fallbacks"] == []
+    
+    order = OrderParams(category_id="toys_games", units=1000, route="cn_to_uk")
+    result = compute_landed_cost(order)
+    assert result["assumptions"]["fallbacks"] == [
+        {"field": "category_id", "requested": "toys_games", "used": "generic_consumer_product"},
+        {"field": "route", "requested": "cn_to_uk", "used": "cn_to_us_west_coast"},
+    ]
+    generic = compute_landed_cost(OrderParams(category_id="generic_consumer_product", units=1000))
+    assert result["total_landed_cost_usd"] == generic["total_landed_cost_usd"]
+    
+    batch = compute_landed_cost_batch(["toys_games"], 1000, routes=["cn_to_uk"])
+    assert batch.to_records()[0] == result
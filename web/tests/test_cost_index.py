@@ -0,0 +1,72 @@
+"""
+Unit tests for compiled cost tables.
+Tests index mapping, immutability and build-time validation.
+"""
+
+import copy
+import pytest
+from utils.cost_tables import get_category_config
+from utils.cost_index import compile_cost_tables, get_compiled_cost_tables
+from utils.cost_store import DEFAULT_COST_TABLES_PATH, read_cost_table_snapshot
+
+
+_, _, BUNDLED_TABLES, _ = read_cost_table_snapshot(DEFAULT_COST_TABLES_PATH)
+
+
+def test_compiled_tables_match_source():
+    """Test that compiled coefficients match the nested dict values."""
+    tables = get_compiled_cost_tables()
+    
+    assert tables.category_ids == tuple(BUNDLED_TABLES.keys())
+    for i, category_id in enumerate(tables.category_ids):
+        cfg = BUNDLED_TABLES[category_id]
+        view = tables.view(i)
+        assert view.base_fob_cost_per_kg == cfg["base_fob_cost_per_kg"]
+        assert view["duty_rate_percent"] == cfg["duty_rate_percent"]
+        assert view.docs_and_broker_per_shipment_usd == cfg["handling_profile"]["docs_and_broker_per_shipment_usd"]
+        for j, route in enumerate(tables.route_ids):
+            sea, origin, destination = view.freight_rates(j)
+            assert sea == cfg["freight_profile"][route]["sea_freight_per_cbm_usd"]
+            assert tables.freight["destination_charges_per_cbm_usd"][i, j] == destination
+
+
+def test_unknown_names_fall_back():
+    """Test that unknown categories and routes map to the fallback indices."""
+    tables = get_compiled_cost_tables()
+    
+    generic = tables.category_id_of("toys_games")
+    assert tables.category_ids[generic] == "generic_consumer_product"
+    assert tables.configs[generic]["label"] == get_category_config("toys_games")["label"]
+    assert tables.route_ids[tables.route_id_of("cn_to_uk")] == "cn_to_us_west_coast"
+    
+    assert tables.fallbacks("apparel_hat_cap", "cn_to_eu") == []
+    assert tables.fallbacks("toys_games", "cn_to_uk") == [
+        {"field": "category_id", "requested": "toys_games", "used": "generic_consumer_product"},
+        {"field": "route", "requested": "cn_to_uk", "used": "cn_to_us_west_coast"},
+    ]
+
+
+def test_compiled_tables_are_read_only():
+    """Test that compiled arrays and views cannot be modified."""
+    tables = get_compiled_cost_tables()
+    
+    with pytest.raises(ValueError):
+        tables.coefficients["duty_rate_percent"][0] = 99.0
+    with pytest.raises(AttributeError):
+        tables.view(0).duty_rate_percent = 99.0
+
+
+def test_invalid_tables_rejected_at_build():
+    """Test that missing routes and bad values fail when compiling."""
+    broken = copy.deepcopy(BUNDLED_TABLES)
+    del broken["apparel_hat_cap"]["freight_profile"]["cn_to_eu"]
+    with pytest.raises(ValueError, match="cn_to_eu"):
+        compile_cost_tables(broken)
+    
+    broken = copy.deepcopy(BUNDLED_TABLES)
+    broken["apparel_hat_cap"]["default_units_per_carton"] = 0
+    with pytest.raises(ValueError, match="default_units_per_carton"):
+        compile_cost_tables(broken)
+    
+    with pytest.raises(ValueError):
+        compile_cost_tables(BUNDLED_TABLES, routes=["cn_to_eu"])
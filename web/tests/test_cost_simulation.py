@@ -0,0 +1,45 @@
+"""
+Unit tests for the Monte Carlo cost simulation.
+Tests reproducibility, band ordering and driver contributions.
+"""
+
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.cost_simulation import simulate_landed_cost
+from utils.result_builder import build_nexsupply_result
+
+
+def test_simulation_is_reproducible_with_seed():
+    """Test that the same seed gives identical results."""
+    order = OrderParams(category_id="electronics_small_accessory", units=5000)
+    assert simulate_landed_cost(order, seed=42) == simulate_landed_cost(order, seed=42)
+    assert simulate_landed_cost(order, seed=42) != simulate_landed_cost(order, seed=43)
+
+
+def test_simulation_bands_and_drivers():
+    """Test percentile ordering, deterministic anchor and contributions."""
+    order = OrderParams(category_id="apparel_hat_cap", units=5000, route="cn_to_eu")
+    result = simulate_landed_cost(order, samples=10_000, seed=1)
+    
+    bands = result["per_unit_usd"]
+    assert bands["p10"] <= bands["p50"] <= bands["p90"]
+    assert result["deterministic_per_unit_usd"] == compute_landed_cost(order)["landed_cost_per_unit_usd"]
+    assert {d["driver"] for d in result["drivers"]} == {
+        "freight_multiplier", "fob_multiplier", "weight_multiplier", "duty_shift_points"
+    }
+    assert sum(d["contribution_percent"] for d in result["drivers"]) == pytest.approx(100.0, abs=0.5)
+
+
+def test_simulation_rejects_bad_sample_count():
+    """Test that out-of-range sample counts are rejected."""
+    with pytest.raises(ValueError):
+        simulate_landed_cost(OrderParams(category_id="apparel_hat_cap", units=5000), samples=10)
+
+
+def test_result_builder_optional_uncertainty():
+    """Test that the uncertainty section is only added on request."""
+    assert "uncertainty" not in build_nexsupply_result("baseball cap")["landed_cost"]
+    
+    result = build_nexsupply_result("baseball cap", include_uncertainty=True, uncertainty_seed=7)
+    assert result["landed_cost"]["uncertainty"]["seed"] == 7
+    assert result["meta"]["cost_accuracy"] == result["landed_cost"]["uncertainty"]["accuracy_label"]
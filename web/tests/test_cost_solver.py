@@ -0,0 +1,75 @@
+"""
+Unit tests for the reverse cost solver.
+Tests closed-form answers against the forward calculator.
+"""
+
+import numpy as np
+import pytest
+from utils.cost_calculator import OrderParams, _landed_cost_components, compute_landed_cost_batch
+from utils.cost_index import get_compiled_cost_tables
+from utils.cost_solver import solve_for_order, solve_max_fob, solve_min_volume
+
+
+CATALOG = ["electronics_small_accessory", "apparel_hat_cap", "generic_consumer_product"]
+
+
+def test_max_fob_hits_target_exactly():
+    """Test that pricing at the solved FOB lands exactly on the target."""
+    retail = np.array([20.0, 15.0, 10.0])
+    result = solve_max_fob(CATALOG, 5000, retail_prices=retail, target_margin_percent=40)
+    assert result["feasible"].all()
+    
+    # Re-price with the solved FOB by scaling the product + duty share
+    tables = get_compiled_cost_tables()
+    for i, category_id in enumerate(CATALOG):
+        idx = tables.category_index[category_id]
+        coeffs = tables.view(idx).to_dict()
+        coeffs["base_fob_cost_per_kg"] = result["max_fob_per_kg_usd"][i]
+        raw = _landed_cost_components(
+            coeffs, 5000, coeffs["default_unit_weight_kg"],
+            *tables.view(idx).freight_rates(tables.route_id_of(None)),
+        )
+        assert raw["landed_cost_per_unit_usd"] == pytest.approx(retail[i] * 0.6)
+
+
+def test_max_fob_infeasible_target():
+    """Test that a target below the non-FOB costs is reported infeasible."""
+    result = solve_max_fob(["generic_consumer_product"], 100, target_landed_cost_per_unit=0.01)
+    assert not result["feasible"][0]
+    assert np.isnan(result["max_fob_per_kg_usd"][0])
+
+
+def test_min_volume_closed_form_matches_search():
+    """Test closed form against bisection and the boundary condition."""
+    target = np.array([3.0, 4.0, 2.5])
+    closed = solve_min_volume(CATALOG, target_landed_cost_per_unit=target)
+    search = solve_min_volume(CATALOG, target_landed_cost_per_unit=target, method="search")
+    np.testing.assert_array_equal(closed["min_units"], search["min_units"])
+    
+    for units, ok in ((closed["min_units"], True), (closed["min_units"] - 1, False)):
+        feasible_rows = closed["feasible"] & (units > 0)
+        cost = compute_landed_cost_batch(
+            [c for c, f in zip(CATALOG, feasible_rows) if f], units[feasible_rows]
+        )["landed_cost_per_unit_usd"]
+        assert np.all((cost <= target[feasible_rows]) == ok)
+
+
+def test_min_volume_unreachable_below_variable_cost():
+    """Test that targets under the variable cost floor are infeasible."""
+    result = solve_min_volume(["apparel_hat_cap"], target_landed_cost_per_unit=0.01)
+    assert result["min_units"][0] == -1
+    assert not result["feasible"][0]
+
+
+def test_solve_for_order_and_validation():
+    """Test the single-order wrapper and argument checks."""
+    order = OrderParams(category_id="apparel_hat_cap", units=3000, retail_price_per_unit=18.0)
+    result = solve_for_order(order, target_margin_percent=50)
+    assert result["target_landed_cost_per_unit_usd"] == 9.0
+    assert result["max_fob"]["feasible"]
+    assert result["min_volume"]["min_units"] is not None
+    
+    with pytest.raises(ValueError):
+        solve_max_fob(CATALOG, 1000, target_margin_percent=40)
+    with pytest.raises(ValueError):
+        solve_max_fob(CATALOG, 1000, target_margin_percent=40, target_landed_cost_per_unit=3)
@@ -0,0 +1,155 @@
+"""
+Unit tests for the versioned cost table store.
+Tests snapshot checksums, hot reload, rejection of bad files and version tagging.
+"""
+
+import copy
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.cost_index import table_checksum
+from utils.cost_store import (
+    DEFAULT_COST_TABLES_PATH,
+    CostTableStore,
+    read_cost_table_snapshot,
+    set_cost_table_store,
+    write_cost_table_snapshot,
+)
+
+
+_, _, BUNDLED_TABLES, _ = read_cost_table_snapshot(DEFAULT_COST_TABLES_PATH)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "cost_tables.json")
+    write_cost_table_snapshot(path, BUNDLED_TABLES, "test-1")
+    return path
+
+
+@pytest.fixture
+def store(snapshot_path):
+    store = CostTableStore(snapshot_path, check_interval=0)
+    set_cost_table_store(store)
+    yield store
+    set_cost_table_store(None)
+
+
+def _rewrite(path, tables, version):
+    write_cost_table_snapshot(path, tables, version)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_bundled_snapshot_matches_cost_tables():
+    """Test that data/cost_tables.json is an up-to-date export of BUNDLED_TABLES."""
+    _, checksum, categories, _ = read_cost_table_snapshot(DEFAULT_COST_TABLES_PATH)
+    assert checksum == table_checksum(BUNDLED_TABLES)
+    assert categories == BUNDLED_TABLES
+
+
+def test_snapshot_roundtrip_compressed(tmp_path):
+    """Test that gzip snapshots read back identically."""
+    path = str(tmp_path / "cost_tables.json.gz")
+    checksum = write_cost_table_snapshot(path, BUNDLED_TABLES, "gz")
+    version, read_checksum, categories, routes = read_cost_table_snapshot(path)
+    assert (version, read_checksum) == ("gz", checksum)
+    assert categories == BUNDLED_TABLES
+    assert "cn_to_us_west_coast" in routes
+
+
+def test_results_record_table_version(store):
+    """Test that results carry the version that priced them."""
+    order = OrderParams(category_id="apparel_hat_cap", units=3000)
+    result = compute_landed_cost(order)
+    assert result["cost_table_version"] == store.current().version
+    assert result["cost_table_version"].startswith("test-1+")
+
+
+def test_hot_reload_keeps_old_snapshot(store, snapshot_path):
+    """Test atomic swap: new calls see new rates, old snapshots are untouched."""
+    order = OrderParams(category_id="apparel_hat_cap", units=3000)
+    old_tables = store.current()
+    old_cost = compute_landed_cost(order)["total_landed_cost_usd"]
+    
+    changed = copy.deepcopy(BUNDLED_TABLES)
+    changed["apparel_hat_cap"]["base_fob_cost_per_kg"] *= 2
+    _rewrite(snapshot_path, changed, "test-2")
+    
+    result = compute_landed_cost(order)
+    assert result["cost_table_version"].startswith("test-2+")
+    assert result["total_landed_cost_usd"] > old_cost
+    assert old_tables.view(old_tables.category_index["apparel_hat_cap"]).base_fob_cost_per_kg == \
+        BUNDLED_TABLES["apparel_hat_cap"]["base_fob_cost_per_kg"]
+    assert store.stats()["reloads"] == 1
+
+
+def test_configs_and_labels_follow_the_snapshot(store, snapshot_path):
+    """Test that category configs, classifier labels and parsed queries follow the store, not the literal."""
+    from utils.category_classifier import get_category_classifier
+    from utils.cost_tables import get_category_config
+    from utils.query_understanding import parse_query
+    
+    assert parse_query("snapback cap").classification["candidates"][0]["label"] == "Hat / Cap / Headwear"
+    changed = copy.deepcopy(BUNDLED_TABLES)
+    changed["apparel_hat_cap"]["label"] = "Snapback Hat"
+    _rewrite(snapshot_path, changed, "test-3")
+    
+    assert get_category_config("apparel_hat_cap")["label"] == "Snapback Hat"
+    classifier = get_category_classifier()
+    assert classifier.labels[classifier.categories.index("apparel_hat_cap")] == "Snapback Hat"
+    assert parse_query("snapback cap").classification["candidates"][0]["label"] == "Snapback Hat"
+    
+    
+    with pytest.warns(DeprecationWarning):
+        from utils import COST_TABLES
+    assert COST_TABLES["apparel_hat_cap"]["label"] == "Snapback Hat"
+
+
+def test_hand_edited_snapshot_is_restamped(store, snapshot_path):
+    """Test that an edited snapshot is rejected until the export script restamps it."""
+    store.current()
+    with open(snapshot_path, encoding="utf-8") as f:
+        payload = json.load(f)
+    payload["categories"]["apparel_hat_cap"]["label"] = "Bucket Hat"
+    with open(snapshot_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    
+    assert store.reload() is False
+    assert "checksum mismatch" in store.stats()["last_error"]
+    
+    web_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "scripts/export_cost_tables.py", "test-5", snapshot_path],
+                   cwd=web_dir, check=True, capture_output=True)
+    assert store.reload() is True
+    assert store.current().version.startswith("test-5+")
+    assert store.current().configs[store.current().category_index["apparel_hat_cap"]]["label"] == "Bucket Hat"
+
+
+def test_bad_reload_is_rejected(store, snapshot_path):
+    """Test that a tampered file keeps the previous version serving."""
+    version = store.current().version
+    with open(snapshot_path, encoding="utf-8") as f:
+        payload = json.load(f)
+    payload["categories"]["apparel_hat_cap"]["duty_rate_percent"] = 99
+    with open(snapshot_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    
+    assert store.reload() is False
+    assert store.current().version == version
+    assert store.stats()["failed_reloads"] == 1
+    assert "checksum mismatch" in store.stats()["last_error"]
+
+
+def test_invalid_tables_are_not_written(tmp_path):
+    """Test that writing validates the tables first."""
+    broken = copy.deepcopy(BUNDLED_TABLES)
+    del broken["apparel_hat_cap"]["duty_rate_percent"]
+    with pytest.raises(ValueError):
+        write_cost_table_snapshot(str(tmp_path / "x.json"), broken, "bad")
+    with pytest.raises(OSError):
+        CostTableStore(str(tmp_path / "missing.json")).current()
@@ -0,0 +1,67 @@
+"""
+Unit tests for the Amazon FBA fee engine.
+Tests tier breakpoints, referral groups and channel-aware margins.
+"""
+
+import numpy as np
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost, compute_landed_cost_batch
+from utils.fba_fees import LBS_PER_KG, compute_fba_fees, fba_fees_for, get_fee_schedule
+
+
+def test_tier_breakpoints():
+    """Test that breakpoint weights fall into the lower tier."""
+    weights_lbs = np.array([0.1, 0.75, 0.76, 20.0, 45.0, 70.0, 100.0])
+    fees = compute_fba_fees(["generic_consumer_product"] * 7, weights_lbs / LBS_PER_KG)
+    assert fees["fulfillment_fee_per_unit_usd"].tolist() == pytest.approx(
+        [3.50, 3.50, 4.75, 4.75, 9.50, 9.50, 15.00]
+    )
+    names = get_fee_schedule().tier_names
+    assert [names[t] for t in fees["fulfillment_tier"][:3]] == [
+        "small_standard", "small_standard", "large_standard"
+    ]
+
+
+def test_referral_rates_by_category():
+    """Test referral groups and zero referral without a retail price."""
+    fees = compute_fba_fees(
+        ["apparel_hat_cap", "electronics_small_accessory", "generic_consumer_product"],
+        0.1,
+        [20.0, 20.0, np.nan],
+    )
+    assert fees["referral_fee_per_unit_usd"].tolist() == pytest.approx([3.4, 3.0, 0.0])
+
+
+def test_batch_matches_scalar():
+    """Test that array and single-SKU fees are identical."""
+    categories = ["apparel_hat_cap", "furniture_small_storage", "pet_toy_accessory"]
+    weights = [0.08, 12.0, 0.5]
+    retail = [15.0, 80.0, 9.99]
+    fees = compute_fba_fees(categories, weights, retail)
+    for i, category in enumerate(categories):
+        single = fba_fees_for(category, weights[i], retail[i])
+        assert single["total_fees_per_unit_usd"] == fees["total_fees_per_unit_usd"][i]
+
+
+def test_fba_channel_feeds_margin_estimate():
+    """Test net margin in compute_landed_cost and batch parity."""
+    order = OrderParams(category_id="apparel_hat_cap", units=3000,
+                        retail_price_per_unit=19.99, channel="Amazon FBA")
+    result = compute_landed_cost(order)
+    margin = result["margin_estimate"]
+    fees = result["channel_fees"]
+    
+    assert margin["channel"] == "Amazon FBA"
+    assert margin["net_margin_per_unit_usd"] == pytest.approx(
+        margin["gross_margin_per_unit_usd"] - fees["total_fees_per_unit_usd"], abs=1e-3
+    )
+    assert "channel_fees" not in compute_landed_cost(
+        OrderParams(category_id="apparel_hat_cap", units=3000, retail_price_per_unit=19.99)
+    )
+    
+    batch = compute_landed_cost_batch(
+        ["apparel_hat_cap", "apparel_hat_cap"], 3000,
+        retail_prices=19.99, channels=["Amazon FBA", "Wholesale"],
+    )
+    assert batch.to_records()[0] == result
+    assert np.isnan(batch["net_margin_percent"][1])
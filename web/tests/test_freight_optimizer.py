@@ -0,0 +1,98 @@
+"""
+Unit tests for the route × mode freight optimizer.
+Tests minimum charges, container rounding, option selection and crossovers.
+"""
+
+import pytest
+from utils.freight_optimizer import (
+    freight_cost_matrix,
+    load_freight_options,
+    optimize_freight,
+)
+
+
+def _column(table, route, mode):
+    return next(j for j, (r, m) in enumerate(zip(table.routes, table.modes)) if r == route and m == mode)
+
+
+def test_minimum_charge_and_chargeable_weight():
+    """Test that air/LCL minimums apply and air uses volumetric weight."""
+    table = load_freight_options()
+    air = _column(table, "china_to_us_west_coast", "air")
+    lcl = _column(table, "china_to_us_west_coast", "sea_lcl")
+    
+    costs = freight_cost_matrix(table, [0.1, 2.0], [5.0, 50.0])
+    assert costs["cost_usd"][0, air] == pytest.approx(max(0.1 * 1_000_000 / 6000 * 5.5, 50))
+    assert costs["cost_usd"][0, lcl] == 300
+    assert costs["min_charge_applied"][0, lcl]
+    assert costs["cost_usd"][1, lcl] == pytest.approx(360)
+
+
+def test_fcl_container_rounding():
+    """Test the cheapest 20ft/40ft mix for the FCL remainder."""
+    table = load_freight_options()
+    fcl = _column(table, "china_to_us_west_coast", "sea_fcl")
+    
+    costs = freight_cost_matrix(table, [10.0, 40.0, 70.0, 116.0], [100.0] * 4)
+    assert costs["cost_usd"][:, fcl].tolist() == [3200, 4800, 4800 + 3200, 2 * 4800]
+    assert costs["containers_40ft"][2, fcl] == 1
+    assert costs["containers_20ft"][2, fcl] == 1
+    # Payload limit forces a second 40ft even though volume fits in one
+    heavy = freight_cost_matrix(table, [20.0], [30_000.0])
+    assert heavy["containers_40ft"][0, fcl] + heavy["containers_20ft"][0, fcl] == 2
+
+
+def test_optimize_freight_cheapest_and_fastest():
+    """Test that cheapest/fastest are picked across all routes and modes."""
+    result = optimize_freight("electronics_small_accessory", 5000)
+    options = result["options"]
+    
+    assert len(options) == len(load_freight_options())
+    assert result["cheapest"]["cost_usd"] == min(o["cost_usd"] for o in options)
+    assert result["fastest"]["transit_days"] == min(o["transit_days"] for o in options)
+    assert result["fastest"]["mode"] == "air"
+
+
+def test_optimize_freight_route_filter_and_crossover():
+    """Test calculator route IDs and the LCL → FCL crossover."""
+    result = optimize_freight("generic_consumer_product", 1000, routes=["cn_to_us_west_coast"])
+    assert {o["route"] for o in result["options"]} == {"china_to_us_west_coast"}
+    
+    crossover = {c["route"]: c for c in result["lcl_fcl_crossover"]}
+    china = crossover["china_to_us_west_coast"]
+    # 20ft at $3,200 beats $180/CBM LCL from ~17.8 CBM
+    assert china["cbm"] == pytest.approx(17.8, abs=0.1)
+    assert china["fcl_cost_usd"] <= china["lcl_cost_usd"]
+    assert "vietnam_to_us_west_coast" not in crossover
+
+
+def test_optimize_freight_rejects_bad_input():
+    """Test validation of units and routes."""
+    with pytest.raises(ValueError):
+        optimize_freight("generic_consumer_product", 0)
+    with pytest.raises(ValueError):
+        optimize_freight("generic_consumer_product", 100, routes=["mars_to_moon"])
+
+
+def test_crossovers_report_every_switch(tmp_path):
+    """Test that LCL winning back past a container's capacity is reported."""
+    import json
+    from utils.freight_optimizer import find_lcl_fcl_crossovers
+    
+    path = tmp_path / "freight.json"
+    path.write_text(json.dumps({"routes": {"cheap_lcl": {
+        "sea_lcl": {"per_cbm": 100, "transit_days": 18},
+        "sea_fcl": {"per_container_20ft": 3200, "per_container_40ft": 4800, "transit_days": 20},
+    }}}))
+    (crossover,) = find_lcl_fcl_crossovers(load_freight_options(str(path)), kg_per_cbm=100, units_per_cbm=50)
+    
+    # FCL ties at 48 CBM (one 40ft), loses past each 40ft's 58 CBM and
+    # catches up again at the next container price
+    assert [(s["cheaper"], s["cbm"]) for s in crossover["switches"]] == [
+        ("sea_fcl", 48.0), ("sea_lcl", 58.1), ("sea_fcl", 80.0), ("sea_lcl", 86.1),
+        ("sea_fcl", 96.0), ("sea_lcl", 116.1), ("sea_fcl", 128.0),
+    ]
+    assert crossover["cbm"] == 48.0 and crossover["units"] == 2400
+    for switch in crossover["switches"]:
+        fcl_cheaper = switch["fcl_cost_usd"] <= switch["lcl_cost_usd"]
+        assert fcl_cheaper == (switch["cheaper"] == "sea_fcl")
@@ -0,0 +1,181 @@
+"""
+Unit tests for GeminiService orchestration with a stub model.
+Tests that extraction overlaps the insight call and how their values are reconciled.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+import services.data_logger as data_logger
+import services.gemini_service as gemini_service
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Extraction blocks until the insight call has started (deadlocks if sequential)."""
+
+    def __init__(self, extraction, insights):
+        self.extraction = extraction
+        self.insights = insights
+        self.insight_started = threading.Event()
+        self.overlapped = False
+        self.insight_kwargs = None
+
+    def generate_content(self, contents, **kwargs):
+        prompt = contents[0] if isinstance(contents, list) else contents
+        if "AI parser" in prompt:
+            self.overlapped = self.insight_started.wait(timeout=5)
+            return StubResponse(json.dumps(self.extraction))
+        self.insight_kwargs = kwargs
+        self.insight_started.set()
+        return StubResponse(json.dumps(self.insights))
+
+
+@pytest.fixture
+def stub_model(monkeypatch):
+    def install(extraction, insights):
+        model = StubModel(extraction, insights)
+
+        class StubService(gemini_service.GeminiService):
+            is_configured = True
+
+            def __init__(self):
+                super().__init__()
+                self._model = model
+
+        monkeypatch.setattr(gemini_service, "get_gemini_service", StubService)
+        monkeypatch.setattr(data_logger, "log_analysis", lambda **kwargs: None)
+        monkeypatch.setenv("NEXSUPPLY_INSIGHT_CACHE_DISABLED", "1")
+        return model, StubService()
+
+    return install
+
+
+def test_extraction_overlaps_insight_call(stub_model):
+    """Test that both model calls are in flight together and extraction values are used."""
+    model, service = stub_model(
+        {"volume": 3000, "channel": "Amazon FBA", "target_market": "USA"},
+        {"product_name": "Yoga mat"},
+    )
+    result = service.analyze_product({"query": "yoga mat for europe"})
+
+    assert result["success"]
+    assert model.overlapped
+    assert model.insight_kwargs["generation_config"]["max_output_tokens"] <= 8192
+    assumptions = result["data"]["assumptions"]
+    assert assumptions["volume_units"] == 3000
+    assert assumptions["channel"] == "Amazon FBA"
+    assert assumptions["route"] == "cn_to_us_west_coast"
+
+
+def test_insight_values_take_priority_over_extraction(stub_model):
+    """Test AI insights > LLM extraction > rule-based parse."""
+    _, service = stub_model(
+        {"volume": 3000, "channel": "Amazon FBA", "target_market": "USA"},
+        {"product_name": "Yoga mat", "channel": "Retail"},
+    )
+    result = service.analyze_product({"query": "500 yoga mats"})
+
+    assumptions = result["data"]["assumptions"]
+    assert assumptions["channel"] == "Retail"
+    assert assumptions["volume_units"] == 3000
+
+
+def test_failed_extraction_falls_back_to_parsed_query(stub_model):
+    """Test that an unusable extraction response leaves the rule-based values."""
+    model, service = stub_model({}, {"product_name": "Yoga mat"})
+    model.extraction = "not json"
+    result = service.analyze_product({"query": "500 yoga mats to the UK"})
+
+    assumptions = result["data"]["assumptions"]
+    assert assumptions["volume_units"] == 500
+    assert assumptions["route"] == "cn_to_uk"
+
+
+def test_streamed_sections_reach_callback_before_completion(stub_model):
+    """Test that sections are delivered while the response is still streaming."""
+    insights = {
+        "product_name": "Yoga mat",
+        "hidden_cost_alerts": ["Storage fees"],
+        "risk_overview": {"overall_level": "Low"},
+    }
+    model, service = stub_model({}, insights)
+    text = json.dumps(insights)
+    produced = []
+
+    def stream(contents, stream=False, **kwargs):
+        prompt = contents[0] if isinstance(contents, list) else contents
+        if "AI parser" in prompt:
+            return StubResponse("{}")
+        assert stream
+
+        def chunks():
+            for i in range(0, len(text), 10):
+                produced.append(i)
+                yield StubResponse(text[i:i + 10])
+        return chunks()
+
+    model.generate_content = stream
+    seen = []
+    result = service.analyze_product(
+        {"query": "yoga mat"},
+        on_section=lambda name, values: seen.append((name, len(produced), values)),
+    )
+
+    assert result["success"]
+    assert [name for name, _, _ in seen] == ["product", "hidden_costs", "risk_overview"]
+    assert seen[0][1] < len(produced)
+    assert seen[0][2] == {"product_name": "Yoga mat"}
+    assert result["timings"]["first_content_s"] <= result["timings"]["first_section_s"]
+    assert result["timings"]["total_s"] >= result["timings"]["insights_s"]
+
+
+def test_exhausted_budget_returns_rule_based_result(stub_model, monkeypatch):
+    """Test that hung model calls end in a clean rule-based result at the deadline."""
+    model, service = stub_model({}, {"product_name": "Yoga mat"})
+    release = threading.Event()
+
+    def hang(contents, **kwargs):
+        release.wait(5)
+        return StubResponse("{}")
+
+    model.generate_content = hang
+    monkeypatch.setenv("NEXSUPPLY_LLM_BUDGET_SECONDS", "0.3")
+    started = time.perf_counter()
+    result = service.analyze_product({"query": "500 yoga mats"})
+    release.set()
+
+    assert time.perf_counter() - started < 2
+    assert result["success"] and result["budget_exhausted"]
+    assert result["data"]["assumptions"]["volume_units"] == 500
+    assert {call["label"]: call["outcome"] for call in result["llm_calls"]} == {
+        "extraction": "budget_exhausted",
+        "insights": "budget_exhausted",
+    }
+
+
+def test_late_extraction_does_not_hold_up_the_result(stub_model, monkeypatch):
+    """Test that an extraction still running at the deadline is not waited for."""
+    model, service = stub_model({}, {"product_name": "Yoga mat"})
+    release = threading.Event()
+
+    def stuck(*args):
+        release.wait(5)
+        return {}
+
+    monkeypatch.setattr(service, "extract_order_parameters", stuck)
+    monkeypatch.setenv("NEXSUPPLY_LLM_BUDGET_SECONDS", "0.5")
+    started = time.perf_counter()
+    result = service.analyze_product({"query": "500 yoga mats"})
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    assert elapsed < 2
+    assert result["success"] and result["budget_exhausted"]
+    assert result["data"]["assumptions"]["volume_units"] == 500
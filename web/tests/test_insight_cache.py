@@ -0,0 +1,92 @@
+"""
+Unit tests for the near-duplicate AI insight cache.
+Tests normalization, similarity hits and misses, bucketing, eviction and hybrid reuse.
+"""
+
+import json
+
+import pytest
+import services.data_logger as data_logger
+import services.gemini_service as gemini_service
+import services.insight_cache as insight_cache
+from services.insight_cache import InsightSimilarityCache, normalize_product_text
+
+
+INSIGHTS = {"product_name": "Silicone teether", "volume_units": 5000, "channel": "Amazon FBA"}
+
+
+def test_normalize_product_text():
+    """Test that volume, market, channel and filler words are dropped."""
+    assert normalize_product_text("5k silicone teethers for US Amazon") == "silicone teether"
+    assert normalize_product_text("Silicone baby teether 5000 units USA") == "silicone baby teether"
+    assert normalize_product_text("5000 units for the US") == ""
+
+
+def test_near_duplicate_hit_and_bucket_miss():
+    """Test reuse for reworded queries only within the same category, route and mode."""
+    cache = InsightSimilarityCache(threshold=0.75)
+    assert cache.add("silicone baby teether 5000 units USA", "baby", "cn_to_us", INSIGHTS)
+
+    hit = cache.lookup("5k silicone teethers for US Amazon", "baby", "cn_to_us")
+    assert hit["product_name"] == "Silicone teether"
+    assert "volume_units" not in hit and "channel" not in hit
+    assert hit["_insight_cache"]["similarity"] >= 0.75
+
+    assert cache.lookup("silicone baby spoon 5000 units", "baby", "cn_to_us") is None
+    assert cache.lookup("5k silicone teethers", "baby", "cn_to_eu") is None
+    assert cache.lookup("5k silicone teethers", "toys", "cn_to_us") is None
+    assert cache.lookup("5000 units", "baby", "cn_to_us") is None
+    assert cache.lookup("5k silicone teethers", "baby", "cn_to_us", "verify") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["skipped"]) == (1, 4, 1)
+    assert stats["hit_rate"] == pytest.approx(0.2)
+
+    hit["product_name"] = "changed"
+    assert cache.lookup("silicone teether", "baby", "cn_to_us")["product_name"] == "Silicone teether"
+
+
+def test_capacity_replaces_oldest_and_validation():
+    """Test ring-buffer replacement and constructor validation."""
+    cache = InsightSimilarityCache(capacity=2)
+    cache.add("yoga mat", "fitness", "r", {"product_name": "mat"})
+    cache.add("dumbbell", "fitness", "r", {"product_name": "dumbbell"})
+    cache.add("resistance band", "fitness", "r", {"product_name": "band"})
+    assert cache.lookup("yoga mat", "fitness", "r") is None
+    assert cache.lookup("resistance bands", "fitness", "r")["product_name"] == "band"
+    assert cache.stats()["entries"] == 2
+
+    with pytest.raises(ValueError):
+        InsightSimilarityCache(threshold=0)
+
+
+def test_hybrid_reuses_insights_and_recomputes_costs(monkeypatch):
+    """Test that a reworded query skips the model but still prices its own order."""
+    calls = []
+
+    class StubModel:
+        def generate_content(self, contents, **kwargs):
+            calls.append(contents)
+            return type("R", (), {"text": json.dumps({"product_name": "Yoga mat", "volume_units": 3000})})()
+
+    class StubService(gemini_service.GeminiService):
+        is_configured = True
+
+        def __init__(self):
+            super().__init__()
+            self._model = StubModel()
+
+    monkeypatch.setattr(gemini_service, "get_gemini_service", StubService)
+    monkeypatch.setattr(data_logger, "log_analysis", lambda **kwargs: None)
+    monkeypatch.setattr(insight_cache, "_insight_cache", InsightSimilarityCache())
+    monkeypatch.delenv("NEXSUPPLY_INSIGHT_CACHE_DISABLED", raising=False)
+
+    first = gemini_service.analyze_with_hybrid_system("yoga mats 500 units")
+    second = gemini_service.analyze_with_hybrid_system("Yoga mat, 8000 pcs")
+
+    assert len(calls) == 1
+    assert first["insight_source"] == "ai" and second["insight_source"] == "ai_cache"
+    assert second["insight_cache"]["similarity"] == 1.0
+    assert first["data"]["assumptions"]["volume_units"] == 3000
+    assert second["data"]["assumptions"]["volume_units"] == 8000
+    assert second["data"]["product_info"]["name"] == "Yoga mat"
@@ -0,0 +1,72 @@
+"""
+Unit tests for incremental JSON parsing of streamed responses.
+Tests member boundaries across arbitrary chunking, string edge cases and sections.
+"""
+
+import json
+
+from utils.json_stream import IncrementalJSONObjectParser, SectionCollector, stream_sections
+
+
+DOCUMENT = {
+    "product_name": "Silicone \"baby\" teether, {BPA-free}",
+    "demand_level": "High",
+    "demand_notes": "Search volume up; see [1], \\ note",
+    "margin_range_percent": [35, 50],
+    "competition_level": "Medium",
+    "competition_notes": "",
+    "hidden_cost_alerts": ["FDA testing", "Amazon storage fees"],
+    "suppliers": [],
+    "risk_overview": {"overall_level": "Medium", "axes": {"quality": "Low"}, "comments": ["a, b", "{c}"]},
+    "reliability_score": 0.72,
+    "empty": None,
+}
+
+
+def _feed_all(parser, chunks):
+    members = []
+    for chunk in chunks:
+        members.extend(parser.feed(chunk))
+    return members
+
+
+def test_members_match_json_loads_for_any_chunking():
+    """Test that every chunk size yields the same members as json.loads."""
+    text = "```json\n" + json.dumps(DOCUMENT, indent=2, ensure_ascii=False) + "\n```"
+    for size in (1, 2, 7, 64, len(text)):
+        parser = IncrementalJSONObjectParser()
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        members = _feed_all(parser, chunks)
+        assert dict(members) == DOCUMENT, size
+        assert [k for k, _ in members] == list(DOCUMENT)
+        assert parser.done
+
+
+def test_members_arrive_before_the_object_closes():
+    """Test that a member is reported as soon as the following comma arrives."""
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"product_name": "Mat", "risk_overview": {"overall_level"') == [("product_name", "Mat")]
+    assert parser.feed(': "Low"}') == []
+    assert parser.feed("}  trailing text {") == [("risk_overview", {"overall_level": "Low"})]
+    assert parser.feed('"more": 1}') == []
+
+
+def test_broken_member_is_skipped():
+    """Test that an unparseable member does not stop later members."""
+    parser = IncrementalJSONObjectParser()
+    members = _feed_all(parser, ['{"a": tru, "b": 2}'])
+    assert members == [("b", 2)]
+
+
+def test_sections_complete_in_stream_order():
+    """Test section grouping, completion order and flushing partial sections."""
+    collector = SectionCollector({"first": ("a", "b"), "second": ("c",), "third": ("d", "e")})
+    assert collector.add("a", 1) == []
+    assert collector.add("c", 3) == [("second", {"c": 3})]
+    assert collector.add("b", 2) == [("first", {"a": 1, "b": 2})]
+    assert collector.add("d", 4) == []
+    assert collector.flush() == [("third", {"d": 4})]
+
+    text = json.dumps(DOCUMENT)
+    names = [name for name, _ in stream_sections([text[i:i + 5] for i in range(0, len(text), 5)])]
+    assert names == ["product", "market_snapshot", "hidden_costs", "suppliers", "risk_overview"]
@@ -0,0 +1,69 @@
+"""
+Unit tests for the lead time simulation.
+Tests quote parsing, percentiles, on-time probability and batch consistency.
+"""
+
+import numpy as np
+import pytest
+from utils.lead_time import estimate_lead_time, parse_day_range, simulate_lead_times
+from utils.result_builder import build_nexsupply_result, convert_to_dashboard_format
+
+
+def test_parse_day_range():
+    """Test supplier quote formats."""
+    assert parse_day_range("25-35") == (25.0, 35.0)
+    assert parse_day_range("25–35 days") == (25.0, 35.0)
+    assert parse_day_range("30 to 20") == (20.0, 30.0)
+    assert parse_day_range(30) == (30.0, 30.0)
+    assert parse_day_range(np.int64(30)) == (30.0, 30.0)
+    assert parse_day_range("TBD") is None
+    assert parse_day_range(None) is None
+
+
+def test_percentiles_within_stage_bounds():
+    """Test percentile ordering and that totals stay inside the stage sums."""
+    sim = simulate_lead_times([None, "25-35"], samples=5_000, seed=3)
+    assert np.all(sim["p10_days"] <= sim["p50_days"])
+    assert np.all(sim["p50_days"] <= sim["p90_days"])
+    # Benchmark stages: min 39, max 70 days in total
+    assert 39 <= sim["p10_days"][0] and sim["p90_days"][0] <= 70
+    assert sim["p50_days"][1] > sim["p50_days"][0]
+    assert np.all(np.isnan(sim["on_time_probability"]))
+
+
+def test_on_time_probability_is_monotonic():
+    """Test that later requested dates are never less likely to be met."""
+    days = [40, 50, 55, 60, 90]
+    sim = simulate_lead_times([None] * len(days), requested_days=days, seed=1)
+    probability = sim["on_time_probability"]
+    assert probability[0] == 0.0 and probability[-1] == 1.0
+    assert np.all(np.diff(probability) >= 0)
+
+
+def test_batch_matches_single_order():
+    """Test that a batch row equals the same order simulated alone."""
+    quotes = ["25-35", None, "40-50", "25-35"]
+    batch = simulate_lead_times(quotes, requested_days=65, seed=9)
+    for i, quote in enumerate(quotes):
+        single = simulate_lead_times([quote], requested_days=65, seed=9)
+        assert batch["p90_days"][i] == single["p90_days"][0]
+        assert batch["on_time_probability"][i] == single["on_time_probability"][0]
+    for scalar in (np.int64(65), np.float32(65), np.array(65)):
+        numpy_scalar = simulate_lead_times(quotes, requested_days=scalar, seed=9)
+        assert np.array_equal(numpy_scalar["on_time_probability"], batch["on_time_probability"])
+    with pytest.raises(ValueError):
+        simulate_lead_times(quotes, requested_days=[60, 70])
+    with pytest.raises(ValueError):
+        simulate_lead_times(quotes, samples=10)
+
+
+def test_dashboard_lead_time_from_simulation():
+    """Test that the dashboard fields add up to the simulated P90."""
+    estimate = estimate_lead_time("25-35")
+    parts = ("production_days", "shipping_days", "customs_days", "buffer_days")
+    assert sum(estimate[k] for k in parts) == estimate["total_days"]
+    assert estimate["total_days"] >= estimate["p90_days"]
+    
+    dashboard = convert_to_dashboard_format(build_nexsupply_result("baseball cap"))
+    assert dashboard["lead_time"]["method"] == "monte_carlo"
+    assert dashboard["lead_time"]["p50_days"] <= dashboard["lead_time"]["p90_days"]
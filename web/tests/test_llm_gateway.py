@@ -0,0 +1,115 @@
+"""
+Unit tests for the LLM gateway.
+Tests request coalescing, the concurrency cap, streamed broadcast, errors and async use.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from services.llm_gateway import GatewayModel, LLMGateway
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class SlowModel:
+    """Counts calls and in-flight calls; each call sleeps briefly."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, contents, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if contents == "fail":
+                raise ConnectionError("upstream down")
+            if kwargs.get("stream"):
+                return iter([StubResponse(f"{contents}-{i}") for i in range(3)])
+            return StubResponse(f"answer to {contents}")
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_identical_concurrent_requests_share_one_call():
+    """Test that 20 threads asking the same prompt cause one upstream call."""
+    model = SlowModel(delay=0.2)
+    gateway = LLMGateway(max_concurrency=4)
+    wrapped = GatewayModel(model, gateway, "m", {"temperature": 0.7})
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        texts = list(pool.map(lambda _: wrapped.generate_content("Quick start: yoga mat").text, range(20)))
+
+    assert texts == ["answer to Quick start: yoga mat"] * 20
+    assert model.calls == 1
+    stats = gateway.stats()
+    assert stats["requests"] == 20 and stats["coalesced"] == 19 and stats["upstream_calls"] == 1
+
+    # Completed calls are not remembered
+    wrapped.generate_content("Quick start: yoga mat")
+    assert model.calls == 2
+
+    # Hedged requests never join an in-flight call
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda _: wrapped.generate_content_uncoalesced("Quick start: yoga mat"), range(2)))
+    assert model.calls == 4
+
+
+def test_concurrency_cap():
+    """Test that distinct prompts never exceed max_concurrency in flight."""
+    model = SlowModel(delay=0.05)
+    wrapped = GatewayModel(model, LLMGateway(max_concurrency=2), "m")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: wrapped.generate_content(f"prompt {i}"), range(8)))
+
+    assert model.calls == 8
+    assert model.peak == 2
+    with pytest.raises(ValueError):
+        LLMGateway(max_concurrency=0)
+
+
+def test_streams_are_broadcast_and_errors_reach_every_waiter():
+    """Test chunk replay for coalesced streams and shared exceptions."""
+    model = SlowModel(delay=0.1)
+    wrapped = GatewayModel(model, LLMGateway(), "m")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        streams = list(pool.map(
+            lambda _: [c.text for c in wrapped.generate_content("teether", stream=True)], range(3)
+        ))
+    assert streams == [["teether-0", "teether-1", "teether-2"]] * 3
+    assert model.calls == 1
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(wrapped.generate_content, "fail") for _ in range(3)]
+        for future in futures:
+            with pytest.raises(ConnectionError):
+                future.result()
+    assert model.calls == 2
+
+
+def test_async_callers_coalesce():
+    """Test generate_content_async from an event loop."""
+    model = SlowModel(delay=0.1)
+    wrapped = GatewayModel(model, LLMGateway(), "m")
+
+    async def main():
+        return await asyncio.gather(*(wrapped.generate_content_async("bottle") for _ in range(5)))
+
+    responses = asyncio.run(main())
+    assert {r.text for r in responses} == {"answer to bottle"}
+    assert model.calls == 1
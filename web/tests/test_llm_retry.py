@@ -0,0 +1,199 @@
+"""
+Unit tests for deadline-aware model calls.
+Tests retries with backoff, the time budget, hedging and streamed calls.
+"""
+
+import threading
+import time
+
+import pytest
+from services.llm_gateway import GatewayModel, LLMGateway
+from services.llm_retry import (
+    BudgetExhausted,
+    Deadline,
+    LatencyTracker,
+    RetryPolicy,
+    call_with_retries,
+    stream_with_retries,
+    upstream_timeout,
+)
+
+
+FAST = RetryPolicy(base_delay_s=0.01, max_delay_s=0.02, attempt_timeout_s=1.0)
+
+
+class Flaky:
+    """Fails with the given errors first, then answers."""
+
+    def __init__(self, *errors, delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return "answer"
+
+
+def test_transient_errors_are_retried():
+    """Test backoff retries and the per-call record."""
+    call = Flaky(ConnectionError("reset"), TimeoutError("slow"))
+    calls = []
+    assert call_with_retries("x", call, Deadline(5), FAST, tracker=LatencyTracker(), sink=calls) == "answer"
+
+    assert call.calls == 3
+    (record,) = calls
+    assert record["outcome"] == "ok"
+    assert [a["outcome"] for a in record["attempts"]] == [
+        "error: ConnectionError", "error: TimeoutError", "ok"
+    ]
+
+    with pytest.raises(ConnectionError):
+        call_with_retries("x", Flaky(*[ConnectionError()] * 3), Deadline(5), FAST, tracker=LatencyTracker())
+
+
+def test_permanent_errors_are_not_retried():
+    """Test that a non-transient error surfaces after one attempt."""
+    call = Flaky(ValueError("bad request"))
+    calls = []
+    with pytest.raises(ValueError):
+        call_with_retries("x", call, Deadline(5), FAST, tracker=LatencyTracker(), sink=calls)
+    assert call.calls == 1
+    assert calls[0]["outcome"] == "failed"
+
+
+def test_budget_exhaustion_returns_promptly():
+    """Test that a hung call gives up at the deadline, not when the call returns."""
+    calls = []
+    started = time.monotonic()
+    with pytest.raises(BudgetExhausted):
+        call_with_retries("x", Flaky(delay=2.0), Deadline(0.2), FAST, tracker=LatencyTracker(), sink=calls)
+    assert time.monotonic() - started < 1.0
+    assert calls[0]["outcome"] == "budget_exhausted"
+    assert calls[0]["attempts"][0]["outcome"] == "timeout"
+
+    with pytest.raises(ValueError):
+        Deadline(0)
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_timeout_retry_reaches_the_upstream_again():
+    """Test that a retry after a timeout does not join the hung in-flight call."""
+    class Model:
+        def __init__(self):
+            self.calls = 0
+
+        def generate_content(self, contents, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                time.sleep(1.0)
+            if kwargs.get("stream"):
+                return iter(["a", "b"])
+            return "answer"
+
+    model = Model()
+    gateway = LLMGateway()
+    wrapped = GatewayModel(model, gateway, "m")
+    policy = RetryPolicy(max_attempts=3, attempt_timeout_s=0.3, base_delay_s=0.01, max_delay_s=0.02)
+    value = call_with_retries(
+        "x", lambda: wrapped.generate_content("p"), Deadline(5), policy,
+        fresh_start=lambda: wrapped.generate_content_uncoalesced("p"), tracker=LatencyTracker(),
+    )
+    assert value == "answer"
+    assert gateway.stats()["upstream_calls"] == 2 and gateway.stats()["coalesced"] == 0
+
+    model.calls = 0
+    chunks = stream_with_retries(
+        "s", lambda: wrapped.generate_content("q", stream=True), Deadline(5), policy,
+        fresh_start=lambda: wrapped.generate_content_uncoalesced("q", stream=True), tracker=LatencyTracker(),
+    )
+    assert list(chunks) == ["a", "b"]
+    assert gateway.stats()["upstream_calls"] == 4
+
+
+def test_abandoned_attempt_frees_its_gateway_slot():
+    """Test that a hung upstream call times out with its attempt instead of holding the slot."""
+    class Model:
+        def generate_content(self, contents, request_options=None, **kwargs):
+            if contents == "hang":
+                # What the SDK does with request_options={"timeout": ...}
+                time.sleep(request_options["timeout"])
+                raise TimeoutError("upstream timeout")
+            return "answer"
+
+    gateway = LLMGateway(max_concurrency=1)
+    wrapped = GatewayModel(Model(), gateway, "m")
+    deadline = Deadline(5)
+    policy = RetryPolicy(max_attempts=1, attempt_timeout_s=1.0)
+    assert upstream_timeout(deadline, policy) == 1.0
+    assert 4.0 < upstream_timeout(deadline, policy, stream=True) <= 5.0
+
+    with pytest.raises(TimeoutError):
+        call_with_retries(
+            "x", lambda: wrapped.generate_content("hang", request_options={"timeout": upstream_timeout(deadline, policy)}),
+            deadline, policy, tracker=LatencyTracker(),
+        )
+    started = time.monotonic()
+    assert wrapped.generate_content("ok", request_options={"timeout": upstream_timeout(deadline, policy)}) == "answer"
+    assert time.monotonic() - started < 1.0
+    assert gateway.stats()["active"] == 0
+
+
+def test_hedged_request_wins_when_first_is_slow():
+    """Test that a second request goes out after the P95 latency and the faster one wins."""
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record("x", 0.05)
+    policy = RetryPolicy(hedge=True, attempt_timeout_s=2.0)
+    calls = []
+    started = time.monotonic()
+    value = call_with_retries(
+        "x", Flaky(delay=1.5), Deadline(5), policy,
+        fresh_start=lambda: "hedged", tracker=tracker, sink=calls,
+    )
+
+    assert value == "hedged"
+    assert time.monotonic() - started < 1.0
+    outcomes = {(a["hedge"], a["outcome"]) for a in calls[0]["attempts"]}
+    assert outcomes == {(True, "ok"), (False, "abandoned")}
+
+
+def test_streams_retry_before_first_chunk_only():
+    """Test stream retries, mid-stream failures and stalls."""
+    attempts = []
+
+    def start():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("reset")
+        return iter(["a", "b"])
+
+    calls = []
+    chunks = stream_with_retries("s", start, Deadline(5), FAST, tracker=LatencyTracker(), sink=calls)
+    assert list(chunks) == ["a", "b"]
+    assert calls[0]["outcome"] == "ok" and len(calls[0]["attempts"]) == 2
+
+    def broken():
+        yield "a"
+        raise ConnectionError("dropped")
+
+    received = []
+    with pytest.raises(ConnectionError):
+        for chunk in stream_with_retries("s", broken, Deadline(5), FAST, tracker=LatencyTracker()):
+            received.append(chunk)
+    assert received == ["a"]
+
+    release = threading.Event()
+
+    def stalled():
+        yield "a"
+        release.wait(5)
+        yield "b"
+
+    with pytest.raises(BudgetExhausted):
+        list(stream_with_retries("s", stalled, Deadline(0.3), FAST, tracker=LatencyTracker()))
+    release.set()
@@ -0,0 +1,67 @@
+"""
+Unit tests for multi-SKU PO consolidation.
+Tests shared-cost accounting, allocation methods and single-line parity.
+"""
+
+import time
+
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.po_consolidation import POLine, compute_consolidated_po
+
+
+LINES = [
+    POLine("electronics_small_accessory", 3000, sku="CABLE-01", retail_price_per_unit=12.0),
+    POLine("apparel_hat_cap", 2000, sku="CAP-02"),
+    {"category_id": "generic_consumer_product", "units": 500, "sku": "MISC-03"},
+]
+
+
+def test_single_line_matches_compute_landed_cost():
+    """Test that a one-line PO costs the same as a standalone order."""
+    result = compute_consolidated_po([POLine("apparel_hat_cap", 4000)])
+    expected = compute_landed_cost(OrderParams(category_id="apparel_hat_cap", units=4000))
+    
+    assert result["po"]["total_landed_cost_usd"] == expected["total_landed_cost_usd"]
+    assert result["po"]["consolidation_savings_usd"] == 0
+    assert result["lines"][0]["allocation_share_percent"] == 100.0
+
+
+@pytest.mark.parametrize("allocation", ["cbm", "value", "units"])
+def test_shared_costs_charged_once_and_fully_allocated(allocation):
+    """Test that shared costs are paid once and allocations sum to them."""
+    result = compute_consolidated_po(LINES, allocation=allocation)
+    po, lines = result["po"], result["lines"]
+    
+    shared = sum(po["shared_costs_usd"].values())
+    assert sum(l["allocated_shared_cost_usd"] for l in lines) == pytest.approx(shared, abs=0.05)
+    assert sum(l["landed_cost_usd"] for l in lines) == pytest.approx(po["total_landed_cost_usd"], abs=0.05)
+    assert sum(po["components_usd"].values()) == pytest.approx(po["total_landed_cost_usd"], abs=0.05)
+    assert po["consolidation_savings_usd"] > 0
+    assert all(l["savings_per_unit_usd"] >= -1e-4 for l in lines)
+
+
+def test_allocation_by_units_and_margin():
+    """Test unit-based shares and margin only where retail is given."""
+    lines = compute_consolidated_po(LINES, allocation="units")["lines"]
+    assert [l["allocation_share_percent"] for l in lines] == [54.55, 36.36, 9.09]
+    assert lines[0]["gross_margin_percent"] is not None
+    assert lines[1]["gross_margin_percent"] is None
+    assert [l["sku"] for l in lines] == ["CABLE-01", "CAP-02", "MISC-03"]
+
+
+def test_rejects_invalid_input():
+    """Test validation of allocation method and empty POs."""
+    with pytest.raises(ValueError):
+        compute_consolidated_po(LINES, allocation="weight")
+    with pytest.raises(ValueError):
+        compute_consolidated_po([])
+
+
+def test_thousand_line_po_is_fast():
+    """Test that a 1,000-line PO is priced well under a second."""
+    lines = [POLine("electronics_small_accessory", 100 + i) for i in range(1000)]
+    start = time.perf_counter()
+    result = compute_consolidated_po(lines)
+    assert time.perf_counter() - start < 0.5
+    assert result["po"]["line_count"] == 1000
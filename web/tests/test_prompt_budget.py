@@ -0,0 +1,86 @@
+"""
+Unit tests for hybrid prompt compaction and token budgets.
+Tests the compact landed cost, token estimates and fitting prompts to a budget.
+"""
+
+import json
+
+from utils.cost_cache import compute_landed_cost_cached
+from utils.cost_calculator import OrderParams
+from utils.prompt_budget import (
+    MIN_USER_INPUT_CHARS,
+    build_budgeted_hybrid_prompt,
+    compact_json,
+    compact_landed_cost,
+    estimate_tokens,
+    generation_config_for_mode,
+    prompt_token_budget,
+)
+
+
+def _landed_cost():
+    return compute_landed_cost_cached(OrderParams(
+        category_id="sports_fitness_equipment",
+        units=5000,
+        route="cn_to_us_west_coast",
+        incoterm="DDP",
+        channel="Amazon FBA",
+        target_market="USA",
+    ))
+
+
+def test_compact_landed_cost_keeps_the_numbers_the_model_needs():
+    """Test field selection per detail level and the size drop against indented JSON."""
+    result = _landed_cost()
+    full = compact_landed_cost(result)
+    assert full["landed_cost_per_unit_usd"] == result["landed_cost_per_unit_usd"]
+    assert full["components_share_percent"] == result["components_share_percent"]
+    assert full["compliance"]["certifications"] == ["CPSC"]
+    assert all(":" not in flag for flag in full["compliance"]["risk_flags"])
+    assert "cost_breakdown_detailed" not in full
+
+    assert "risk_flags" not in compact_landed_cost(result, detail=1)["compliance"]
+    assert set(compact_landed_cost(result, detail=0)) == {
+        "units", "total_landed_cost_usd", "landed_cost_per_unit_usd", "components_share_percent"
+    }
+    assert json.loads(compact_json(full)) == full
+    assert estimate_tokens(compact_json(full)) * 3 < estimate_tokens(json.dumps(result, indent=2))
+
+
+def test_estimate_tokens():
+    """Test the Latin and Hangul estimates."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("요가매트") == 4
+
+
+def test_prompt_fits_mode_budget():
+    """Test detail reduction, then user input truncation, to stay within the budget."""
+    result = _landed_cost()
+    prompt = build_budgeted_hybrid_prompt("yoga mat, 5000 units", "sports_fitness_equipment", "Fitness", result)
+    assert prompt.detail == 2 and prompt.within_budget and not prompt.input_truncated
+    assert prompt.budget == prompt_token_budget("general")
+    assert '"landed_cost_per_unit_usd":5.0185' in prompt.text
+
+    tight = build_budgeted_hybrid_prompt("yoga mat", "sports_fitness_equipment", "Fitness", result,
+                                         budget=prompt.tokens - 10)
+    assert tight.detail < 2 and tight.within_budget
+
+    long_input = "yoga mat " * 2000
+    cut = build_budgeted_hybrid_prompt(long_input, "sports_fitness_equipment", "Fitness", result, mode="verify")
+    assert cut.input_truncated and cut.within_budget and cut.detail == 0
+
+    floor = build_budgeted_hybrid_prompt(long_input, "sports_fitness_equipment", "Fitness", result, budget=100)
+    assert not floor.within_budget
+    assert "yoga mat " * (MIN_USER_INPUT_CHARS // 9) in floor.text
+
+    image = build_budgeted_hybrid_prompt("yoga mat", "sports_fitness_equipment", "Fitness", result, has_image=True)
+    assert image.tokens > prompt.tokens
+
+
+def test_output_limits_per_mode():
+    """Test that every mode gets a max_output_tokens below the model-wide default."""
+    from services.gemini_service import GeminiService
+    for mode in ("general", "cost", "market", "verify", "leadtime", "unknown"):
+        limit = generation_config_for_mode(mode)["max_output_tokens"]
+        assert 0 < limit < GeminiService.GENERATION_CONFIG["max_output_tokens"]
@@ -0,0 +1,90 @@
+"""
+Unit tests for single-pass query understanding.
+Tests parity with the per-field parsers, immutability and precedence rules.
+"""
+
+import dataclasses
+import random
+
+import pytest
+from utils.category_classifier import classify_category_top_k, get_category_classifier
+from utils.cost_tables import CATEGORY_KEYWORDS, classify_category
+from utils.input_parser import CHANNEL_MAP, MARKET_MAP, parse_input_parameters
+from utils.query_understanding import (
+    ANALYSIS_MODES,
+    build_query_lexicon,
+    parse_query,
+    parse_query_with,
+)
+
+
+def _detect_mode(query):
+    """The original keyword loop of detect_analysis_mode."""
+    query_lower = query.lower()
+    for mode, config in ANALYSIS_MODES.items():
+        for keyword in config["keywords"]:
+            if keyword.lower() in query_lower:
+                return mode
+    return "general"
+
+
+def test_matches_per_field_parsers():
+    """Test that one parse gives what the separate functions give."""
+    words = [k for keywords in CATEGORY_KEYWORDS.values() for k in keywords]
+    words += [k for config in ANALYSIS_MODES.values() for k in config["keywords"]]
+    words += [*MARKET_MAP, *CHANNEL_MAP, "5000", "2 million", "200만개", "widget"]
+    rng = random.Random(7)
+    queries = [" ".join(rng.choice(words) for _ in range(rng.randint(0, 8))) for _ in range(500)]
+    queries += ["Silicone baby teether 5000 units for US Amazon FBA", "미국 편의점 200만개 비용", ""]
+    queries += ["showcase handle", "what capacity", "hand tool phone case"]  # label words in words
+
+    for query in queries:
+        parsed = parse_query(query)
+        assert parsed.mode == _detect_mode(query), query
+        assert parsed.category_id == classify_category(query), query
+        assert parsed.classification_dict() == classify_category_top_k(query), query
+        assert parsed.input_parameters() == parse_input_parameters(query), query
+
+
+def test_parsed_query_fields_and_sharing():
+    """Test the parsed fields, memoization and read-only state."""
+    parsed = parse_query("How much does it cost to ship 5,000 yoga mats to the UK via Amazon FBA?")
+    assert parsed.mode == "cost"
+    assert parsed.category_id == "sports_fitness_equipment"
+    assert parsed.category_candidates[0] == "sports_fitness_equipment"
+    assert (parsed.volume_units, parsed.target_market, parsed.channel, parsed.route) == (
+        5000, "UK", "Amazon FBA", "cn_to_uk"
+    )
+    assert parse_query(parsed.raw) is parsed
+    assert parse_query("yoga mat, 8000 pcs").volume_units == 8000
+    assert parse_query("yoga mat, 12,500 pcs").volume_units == 12500
+    assert parse_query(["yoga", "mat"]) is parse_query("yoga mat")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        parsed.mode = "verify"
+    with pytest.raises(TypeError):
+        parsed.classification["category_id"] = "x"
+    copy = parsed.classification_dict()
+    copy["candidates"].clear()
+    assert parsed.category_candidates
+
+
+def test_precedence_with_custom_lexicon():
+    """Test first-listed precedence for modes and map keys, count order for categories."""
+    lexicon = build_query_lexicon(
+        {"b_mode": {"keywords": ["beta"]}, "a_mode": {"keywords": ["alpha"]}},
+        {"mugs": ["mug"], "cups": ["cup", "tea"]},
+        get_category_classifier(),
+        {"zz": "Later", "aa": "Earlier"},
+        {"web": "Online"},
+    )
+    parsed = parse_query_with(lexicon, "alpha beta tea cup mug aa zz")
+    assert parsed.mode == "b_mode"
+    assert parsed.category_id == "cups"
+    assert parsed.target_market == "Later"
+    assert parsed.channel is None and parsed.route is None
+
+    empty = parse_query_with(lexicon, "")
+    assert empty.mode == "general"
+    assert empty.category_id == "generic_consumer_product"
+    assert empty.input_parameters() == {}
@@ -0,0 +1,131 @@
+"""
+Unit tests for the persistent Gemini response cache.
+Tests key normalization, TTL, LRU eviction, shared stats and the model wrapper.
+"""
+
+import pytest
+from services.response_cache import (
+    CachedModel,
+    ResponseCache,
+    make_cache_key,
+    normalize_prompt,
+)
+
+
+class StubCandidate:
+    def __init__(self, finish_reason):
+        self.finish_reason = finish_reason
+
+
+class StubResponse:
+    def __init__(self, text, finish_reason="STOP"):
+        self.text = text
+        self.candidates = [StubCandidate(finish_reason)]
+
+
+class StubModel:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, contents, **kwargs):
+        self.calls += 1
+        return StubResponse(f"answer {self.calls}")
+
+    generate_content_uncoalesced = generate_content
+
+
+def test_cache_key_normalization():
+    """Test whitespace normalization, config sensitivity and image hashing."""
+    config = {"temperature": 0.7}
+    key = make_cache_key("m", config, "Yoga  mat\n cost ")
+    assert key == make_cache_key("m", config, "Yoga mat cost")
+    assert key != make_cache_key("m", {"temperature": 0.2}, "Yoga mat cost")
+    assert key != make_cache_key("other", config, "Yoga mat cost")
+    assert normalize_prompt(" a\t b ") == "a b"
+    assert make_cache_key("m", config, "p", {"request_options": {"timeout": 3}}) == make_cache_key("m", config, "p")
+
+    image = {"mime_type": "image/jpeg", "data": b"\xff\xd8pixels"}
+    same = {"data": bytearray(b"\xff\xd8pixels"), "mime_type": "image/jpeg"}
+    other = {"mime_type": "image/jpeg", "data": b"\xff\xd8other"}
+    assert make_cache_key("m", config, ["p", image]) == make_cache_key("m", config, ["p", same])
+    assert make_cache_key("m", config, ["p", image]) != make_cache_key("m", config, ["p", other])
+    with pytest.raises(ValueError):
+        make_cache_key("m", config, object())
+
+
+def test_ttl_and_shared_stats(tmp_path, monkeypatch):
+    """Test expiry and that a second instance on the same file sees entries and counters."""
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path, ttl_seconds=60)
+    cache.put("k", "text")
+    assert ResponseCache(path).get("k") == "text"
+    assert cache.get("missing") is None
+
+    import services.response_cache as module
+    now = module.time.time()
+    monkeypatch.setattr(module.time, "time", lambda: now + 120)
+    assert cache.get("k") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expired"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert stats["entries"] == 0
+
+    with pytest.raises(ValueError):
+        ResponseCache(path, ttl_seconds=0)
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used entries go first when over max_bytes."""
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.put(name, name * 80)
+    cache.get("a")
+    cache.put("d", "d" * 80)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" * 80
+    assert cache.get("d") == "d" * 80
+    assert cache.stats()["evictions"] >= 1
+    assert cache.stats()["bytes"] <= 250
+
+
+def test_cached_model_wrapper(tmp_path):
+    """Test that repeated prompts skip the model, also when streamed."""
+    model = StubModel()
+    cached = CachedModel(model, ResponseCache(str(tmp_path / "cache.db")), "m", {"temperature": 0.7})
+
+    first = cached.generate_content("Yoga mat cost")
+    second = cached.generate_content("Yoga   mat cost")
+    assert first.text == second.text == "answer 1"
+    assert second.from_cache and model.calls == 1
+
+    replay = list(cached.generate_content("Yoga mat cost", stream=True))
+    assert [c.text for c in replay] == ["answer 1"] and model.calls == 1
+
+    model.generate_content = lambda contents, **kwargs: iter(
+        [StubResponse("a", "FINISH_REASON_UNSPECIFIED"), StubResponse("b")]
+    )
+    assert [c.text for c in cached.generate_content("Teether", stream=True)] == ["a", "b"]
+    assert cached.generate_content("Teether").text == "ab"
+    assert cached.generate_content_uncoalesced("Teether").from_cache
+
+
+def test_only_complete_replies_are_stored(tmp_path):
+    """Test that truncated and rejected replies are not replayed, and retries use the cache."""
+    model = StubModel()
+    cached = CachedModel(model, ResponseCache(str(tmp_path / "cache.db")), "m",
+                         accept=lambda text: text.startswith("{"))
+
+    model.generate_content = lambda contents, **kwargs: StubResponse('{"a": 1', "MAX_TOKENS")
+    cached.generate_content("Yoga mat")
+    model.generate_content = lambda contents, **kwargs: StubResponse("not json")
+    cached.generate_content("Yoga mat")
+    model.generate_content = lambda contents, **kwargs: iter([StubResponse('{"a"', "MAX_TOKENS")])
+    list(cached.generate_content("Yoga mat", stream=True))
+    assert cached.cache.stats()["stores"] == 0
+
+    model.generate_content_uncoalesced = lambda contents, **kwargs: StubResponse('{"a": 1}')
+    cached.generate_content_uncoalesced("Yoga mat")
+    assert cached.generate_content("Yoga mat").text == '{"a": 1}'
+    assert cached.cache.stats()["stores"] == 1
@@ -0,0 +1,117 @@
+"""
+Unit tests for the HS-code tariff index.
+Tests prefix resolution, origins, batch lookups and calculator integration.
+"""
+
+import numpy as np
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost, compute_landed_cost_batch
+from utils.cost_tables import get_category_config
+from utils.tariff_index import (
+    build_tariff_index,
+    destination_for,
+    get_tariff_index,
+    normalize_hs_code,
+    origin_for,
+)
+
+
+def test_most_specific_prefix_wins():
+    """Test longest-prefix resolution over listed codes."""
+    index = build_tariff_index({"rates": {
+        "39": {"china": 5.0},
+        "3926": {"china": 6.0},
+        "3926.90": {"china": 6.5, "vietnam": 4.0},
+    }})
+    assert index.rate("3926.90.9990", "china") == 6.5
+    assert index.rate("3926.10", "china") == 6.0
+    assert index.rate("3901", "china") == 5.0
+    assert index.rate("3926.10", "vietnam") is None
+    assert index.rate("8518.30", "china") is None
+    assert index.rate("not-a-code", "china") is None
+
+
+def test_bundled_rates_and_origins():
+    """Test the shipped tariff file and origin aliases."""
+    index = get_tariff_index()
+    assert index.rate("6307.90.98", "cn_to_us_west_coast") == 16.0
+    assert index.lookup("8518.30", "vn")["matched_hs_code"] == "8518.30"
+    assert origin_for("cn_to_eu") == "china"
+    assert origin_for("KR") == "south_korea"
+    assert normalize_hs_code("8518.30.20") == "85183020"
+
+
+def test_batch_lookup_matches_scalar():
+    """Test that batch rates equal scalar lookups, NaN where unlisted."""
+    index = get_tariff_index()
+    codes = ["3926.90", "6307.90.1000", None, "0000", "3926.90"]
+    origins = ["china", "vietnam", "china", "china", "south_korea"]
+    rates = index.rates_for(codes, origins)
+    
+    for code, origin, rate in zip(codes, origins, rates):
+        expected = index.rate(code, origin)
+        assert (np.isnan(rate) and expected is None) or rate == expected
+    with pytest.raises(ValueError):
+        index.rates_for(codes, origins[:2])
+
+
+def test_compute_landed_cost_uses_hs_code():
+    """Test HS-code duty override and category fallback."""
+    category = "apparel_hat_cap"
+    base = compute_landed_cost(OrderParams(category_id=category, units=3000))
+    assert base["assumptions"]["duty_rate_source"] == "category_default"
+    assert base["assumptions"]["hs_code"] == get_category_config(category)["hs_code_hint"]
+    
+    tariffed = compute_landed_cost(OrderParams(category_id=category, units=3000, hs_code="3926.90"))
+    assert tariffed["assumptions"]["duty_rate_percent"] == 6.5
+    assert tariffed["assumptions"]["hs_code"] == "3926.90"
+    
+    unknown = compute_landed_cost(OrderParams(category_id=category, units=3000, hs_code="0101.21"))
+    assert unknown["total_landed_cost_usd"] == base["total_landed_cost_usd"]
+
+
+def test_category_hs_code_hint_is_looked_up():
+    """Test that without an HS code the category's hint is priced from the tariff index."""
+    category = "phone_case_protector"
+    assert get_category_config(category)["hs_code_hint"] == "3926.90"
+    hinted = compute_landed_cost(OrderParams(category_id=category, units=2000))
+    assert hinted["assumptions"]["duty_rate_percent"] == 6.5
+    assert hinted["assumptions"]["hs_code_source"] == "category_hint"
+    assert hinted["assumptions"]["duty_rate_source"].startswith("tariff_rates")
+    assert compute_landed_cost_batch([category], 2000).to_records()[0] == hinted
+    
+    explicit = compute_landed_cost(OrderParams(category_id=category, units=2000, hs_code="3926.90"))
+    assert explicit["assumptions"]["hs_code_source"] == "order"
+    assert explicit["total_landed_cost_usd"] == hinted["total_landed_cost_usd"]
+    
+    eu = compute_landed_cost(OrderParams(category_id=category, units=2000, route="cn_to_eu"))
+    assert eu["assumptions"]["duty_rate_percent"] == get_category_config(category)["duty_rate_percent"]
+
+
+def test_batch_hs_codes_match_scalar():
+    """Test that batch pricing with HS codes matches the scalar path."""
+    categories = ["apparel_hat_cap", "electronics_small_accessory", "generic_consumer_product"]
+    codes = ["6307.90", None, "8518.30"]
+    batch = compute_landed_cost_batch(categories, 2000, hs_codes=codes)
+    records = batch.to_records()
+    
+    for category, code, record in zip(categories, codes, records):
+        assert record == compute_landed_cost(OrderParams(category_id=category, units=2000, hs_code=code))
+
+
+def test_rates_only_apply_to_the_import_market():
+    """Test that US duties are not applied to routes into another market."""
+    index = get_tariff_index()
+    assert index.destination == "us"
+    assert destination_for("cn_to_us_east_coast") == "us"
+    assert destination_for("cn_to_eu") == "eu" and destination_for("china") is None
+    assert index.rate("3926.90", "cn_to_eu") is None
+    assert index.rate("3926.90", "china") == 6.5
+    assert np.isnan(index.rates_for(["3926.90"] * 2, ["cn_to_eu", "cn_to_us_west_coast"])[0])
+    
+    category = "apparel_hat_cap"
+    eu = compute_landed_cost(OrderParams(category_id=category, units=3000, route="cn_to_eu", hs_code="3926.90"))
+    assert eu["assumptions"]["duty_rate_source"] == "category_default"
+    assert eu["assumptions"]["duty_rate_percent"] == get_category_config(category)["duty_rate_percent"]
+    batch = compute_landed_cost_batch([category], 3000, routes="cn_to_eu", hs_codes=["3926.90"])
+    assert batch.to_records()[0] == eu
@@ -3,7 +3,6 @@
 from utils.config import Config, AppSettings
 from utils.i18n import t, get_current_language, render_language_selector_minimal
 from utils.cost_tables import (
-    COST_TABLES,
     CATEGORY_KEYWORDS,
     MARKET_DATA,
     classify_category,
@@ -14,8 +13,53 @@ from utils.cost_tables import (
     get_lead_time_estimate,
     get_hidden_cost_estimate,
 )
-from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.category_matcher import KeywordAutomaton, build_keyword_automaton
+from utils.category_classifier import CategoryClassifier, classify_category_top_k, get_category_classifier
+from utils.query_understanding import ParsedQuery, get_query_lexicon, parse_query
+from utils.cost_index import (
+    CompiledCostTables,
+    compile_cost_tables,
+    get_compiled_cost_tables,
+)
+from utils.cost_calculator import (
+    OrderParams,
+    OrderOverrides,
+    resolve_order_overrides,
+    compute_landed_cost,
+    LandedCostBatch,
+    compute_landed_cost_batch,
+    compute_volume_curve,
+    CostScenario,
+    compute_scenarios,
+)
+from utils.cost_cache import (
+    LandedCostCache,
+    compute_landed_cost_cached,
+    get_cost_cache_stats,
+    invalidate_cost_cache,
+)
+from utils.cost_store import (
+    CostTableStore,
+    get_cost_table_store,
+    write_cost_table_snapshot,
+)
+from utils.cost_simulation import simulate_landed_cost
+from utils.lead_time import estimate_lead_time, parse_day_range, simulate_lead_times
+from utils.freight_optimizer import optimize_freight, load_freight_options
+from utils.po_consolidation import POLine, compute_consolidated_po
+from utils.catalog_analysis import (
+    CatalogRow,
+    analyze_catalog_file,
+    generate_catalog_insights,
+    price_catalog,
+    read_catalog,
+)
+from utils.tariff_index import TariffIndex, get_tariff_index, normalize_hs_code
+from utils.fba_fees import FBAFeeSchedule, compute_fba_fees, fba_fees_for, get_fee_schedule
+from utils.compliance_index import ComplianceIndex, build_compliance_index, get_compliance_index
+from utils.cost_solver import solve_max_fob, solve_min_volume, solve_for_order
 from utils.result_builder import build_nexsupply_result, convert_to_dashboard_format
+from utils.json_stream import IncrementalJSONObjectParser, SectionCollector
 from utils.prompts import (
     SYSTEM_INSTRUCTION,
     build_analysis_prompt,
@@ -23,6 +67,13 @@ from utils.prompts import (
     build_hybrid_prompt,
     HYBRID_SYSTEM_PROMPT,
 )
+from utils.prompt_budget import (
+    HybridPrompt,
+    build_budgeted_hybrid_prompt,
+    compact_landed_cost,
+    estimate_tokens,
+    generation_config_for_mode,
+)
 from utils.validation import (
     validate_query,
     validate_context,
@@ -52,7 +103,7 @@ __all__ = [
     "get_current_language",
     "render_language_selector_minimal",
     # Cost Tables
-    "COST_TABLES",
+    "COST_TABLES",  # deprecated: read-only view of the store snapshot
     "CATEGORY_KEYWORDS",
     "MARKET_DATA",
     "classify_category",
@@ -62,18 +113,93 @@ __all__ = [
     "get_confidence_level",
     "get_lead_time_estimate",
     "get_hidden_cost_estimate",
+    # Category Matcher
+    "KeywordAutomaton",
+    "build_keyword_automaton",
+    # Category Classifier
+    "CategoryClassifier",
+    "classify_category_top_k",
+    "get_category_classifier",
+    # Query Understanding
+    "ParsedQuery",
+    "get_query_lexicon",
+    "parse_query",
+    # Compiled Cost Tables
+    "CompiledCostTables",
+    "compile_cost_tables",
+    "get_compiled_cost_tables",
     # Cost Calculator
     "OrderParams",
+    "OrderOverrides",
+    "resolve_order_overrides",
     "compute_landed_cost",
+    "LandedCostBatch",
+    "compute_landed_cost_batch",
+    "compute_volume_curve",
+    "CostScenario",
+    "compute_scenarios",
+    # Landed Cost Cache
+    "LandedCostCache",
+    "compute_landed_cost_cached",
+    "get_cost_cache_stats",
+    "invalidate_cost_cache",
+    # Cost Table Store
+    "CostTableStore",
+    "get_cost_table_store",
+    "write_cost_table_snapshot",
+    # Cost Simulation
+    "simulate_landed_cost",
+    # Lead Time Simulation
+    "estimate_lead_time",
+    "parse_day_range",
+    "simulate_lead_times",
+    # Freight Optimizer
+    "optimize_freight",
+    "load_freight_options",
+    # PO Consolidation
+    "POLine",
+    "compute_consolidated_po",
+    # Catalog Analysis
+    "CatalogRow",
+    "analyze_catalog_file",
+    "generate_catalog_insights",
+    "price_catalog",
+    "read_catalog",
+    # Tariff Index
+    "TariffIndex",
+    "get_tariff_index",
+    "normalize_hs_code",
+    # FBA Fees
+    "FBAFeeSchedule",
+    "compute_fba_fees",
+    "fba_fees_for",
+    "get_fee_schedule",
+    # Compliance Index
+    "ComplianceIndex",
+    "build_compliance_index",
+    "get_compliance_index",
+    # Cost Solver
+    "solve_max_fob",
+    "solve_min_volume",
+    "solve_for_order",
     # Result Builder
     "build_nexsupply_result",
     "convert_to_dashboard_format",
+    # JSON Stream
+    "IncrementalJSONObjectParser",
+    "SectionCollector",
     # Prompts
     "SYSTEM_INSTRUCTION",
     "build_analysis_prompt",
     "build_image_analysis_prompt",
     "build_hybrid_prompt",
     "HYBRID_SYSTEM_PROMPT",
+    # Prompt Budget
+    "HybridPrompt",
+    "build_budgeted_hybrid_prompt",
+    "compact_landed_cost",
+    "estimate_tokens",
+    "generation_config_for_mode",
     # Validation
     "validate_query",
     "validate_context",
@@ -92,3 +218,11 @@ __all__ = [
     "build_email_context",
     "build_db_context",
 ]
+
+
+def __getattr__(name):
+    # Deprecated COST_TABLES resolves on access so it follows table reloads
+    if name == "COST_TABLES":
+        from utils import cost_tables
+        return cost_tables.__getattr__(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,361 @@
+"""
+NexSupply Catalog Analysis - Classify and price an uploaded SKU list
+Bulk counterpart of the single-query flow: a CSV/XLSX of product names,
+volumes and target markets is read row by row, classified and priced in
+vectorized chunks, and results are yielded as each chunk completes.
+
+Pipeline:
+- read_catalog(): streams rows from CSV (csv module) or XLSX (openpyxl,
+  read-only); headers are matched by alias ("qty", "volume" → units)
+- price_catalog(): one query parse (utils.query_understanding) per
+  distinct product name, then one compute_landed_cost_batch call per
+  chunk on a single cost table snapshot; bad rows are reported, not raised
+- generate_catalog_insights(): optional LLM insights in a bounded thread
+  pool with a bounded number of requests in flight, yielded as completed
+
+Without insights a 10k-row file is priced in well under a second of
+compute; see tests/test_catalog_analysis.py.
+"""
+
+import csv
+import io
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.compliance_index import normalize_market
+from utils.cost_calculator import compute_landed_cost_batch
+from utils.cost_index import get_compiled_cost_tables
+from utils.query_understanding import get_query_lexicon, parse_query_with
+
+
+DEFAULT_CHUNK_SIZE = 2_000
+DEFAULT_INSIGHT_WORKERS = 4
+MAX_INSIGHT_ROWS = 50
+
+# Accepted header names per field (compared lowercased, spaces → "_")
+COLUMN_ALIASES = {
+    "product": ("product", "product_name", "name", "title", "item", "description", "query"),
+    "units": ("units", "volume", "volume_units", "quantity", "qty", "order_qty", "moq"),
+    "target_market": ("target_market", "market", "destination", "country"),
+    "retail_price": ("retail_price", "retail_price_usd", "price", "retail"),
+    "sku": ("sku", "id", "item_id", "asin"),
+    "route": ("route",),
+    "channel": ("channel", "sales_channel"),
+    "hs_code": ("hs_code", "hts_code", "hs"),
+    "unit_weight_kg": ("unit_weight_kg", "weight_kg", "weight"),
+}
+
+# Normalized target market → default route
+MARKET_ROUTES = {
+    "United States": "cn_to_us_west_coast",
+    "European Union": "cn_to_eu",
+}
+
+RESULT_COLUMNS = (
+    "row", "sku", "product", "category_id", "category_label", "category_confidence",
+    "units", "target_market", "route", "channel",
+    "landed_cost_per_unit_usd", "total_landed_cost_usd",
+    "product_per_unit_usd", "shipping_per_unit_usd", "duty_and_tax_per_unit_usd",
+    "gross_margin_percent", "net_margin_percent", "cost_table_version", "error",
+)
+
+
+@dataclass
+class CatalogRow:
+    """One parsed catalog line (row is the 1-based data row number)."""
+    row: int
+    product: str
+    units: Optional[int] = None
+    target_market: Optional[str] = None
+    retail_price: Optional[float] = None
+    sku: Optional[str] = None
+    route: Optional[str] = None
+    channel: Optional[str] = None
+    hs_code: Optional[str] = None
+    unit_weight_kg: Optional[float] = None
+    error: Optional[str] = None
+
+
+def _header_map(header: Sequence[Any]) -> Dict[str, int]:
+    normalized = [str(h or "").strip().lower().replace(" ", "_") for h in header]
+    mapping = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                mapping[field] = normalized.index(alias)
+                break
+    if "product" not in mapping:
+        raise ValueError(
+            f"Catalog needs a product column (one of {', '.join(COLUMN_ALIASES['product'])})"
+        )
+    return mapping
+
+
+def _number(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(",", "").replace("$", "")
+    return float(text) if text else None
+
+
+def _parse_row(number: int, values: Sequence[Any], columns: Dict[str, int]) -> CatalogRow:
+    def cell(field: str) -> Any:
+        index = columns.get(field)
+        if index is None or index >= len(values):
+            return None
+        value = values[index]
+        return value.strip() if isinstance(value, str) else value
+
+    def text(field: str) -> Optional[str]:
+        value = cell(field)
+        return str(value) if value not in (None, "") else None
+
+    row = CatalogRow(row=number, product=text("product") or "")
+    row.target_market, row.sku = text("target_market"), text("sku")
+    row.route, row.channel, row.hs_code = text("route"), text("channel"), text("hs_code")
+    try:
+        units = _number(cell("units"))
+        if units is not None:
+            if units <= 0 or units != int(units):
+                raise ValueError(f"units must be a positive whole number, got {cell('units')!r}")
+            row.units = int(units)
+        row.retail_price = _number(cell("retail_price"))
+        row.unit_weight_kg = _number(cell("unit_weight_kg"))
+    except ValueError as e:
+        row.error = str(e) if "units" in str(e) else f"Not a number: {e}"
+    if not row.product and row.error is None:
+        row.error = "Missing product name"
+    return row
+
+
+def _iter_csv(data: bytes) -> Iterator[List[str]]:
+    text = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline="")
+    yield from csv.reader(text)
+
+
+def _iter_xlsx(data: bytes) -> Iterator[Sequence[Any]]:
+    try:
+        import openpyxl
+    except ImportError as e:
+        raise ValueError("Reading .xlsx catalogs needs openpyxl (pip install openpyxl)") from e
+    workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_catalog(data: bytes, filename: str) -> Iterator[CatalogRow]:
+    """
+    Stream catalog rows from CSV or XLSX bytes; blank lines are skipped.
+
+    Raises:
+        ValueError: Unsupported file type or no product column.
+    """
+    extension = os.path.splitext(filename.lower())[1]
+    if extension in (".csv", ".txt"):
+        lines = _iter_csv(data)
+    elif extension in (".xlsx", ".xlsm"):
+        lines = _iter_xlsx(data)
+    else:
+        raise ValueError(f"Unsupported catalog file type {extension or filename!r} (use .csv or .xlsx)")
+
+    columns = None
+    number = 0
+    for values in lines:
+        if not any(v not in (None, "") for v in values):
+            continue
+        if columns is None:
+            columns = _header_map(values)
+            continue
+        number += 1
+        yield _parse_row(number, values, columns)
+    if columns is None:
+        raise ValueError("Catalog file is empty")
+
+
+def _chunks(rows: Iterable[CatalogRow], size: int) -> Iterator[List[CatalogRow]]:
+    chunk: List[CatalogRow] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def price_catalog(
+    rows: Iterable[CatalogRow],
+    default_units: Optional[int] = None,
+    default_target_market: Optional[str] = None,
+    default_route: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Classify and price catalog rows, yielding one list of results per chunk.
+
+    Every chunk is priced on the same cost table snapshot. A row's route is
+    its own route column, else the default for its target market, else
+    default_route / AppSettings. Rows with parse errors come back with
+    "error" set and no costs.
+    """
+    from utils.config import AppSettings
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    default_units = default_units or AppSettings.DEFAULT_VOLUME_UNITS
+    default_target_market = default_target_market or AppSettings.DEFAULT_TARGET_MARKET
+    default_route = default_route or AppSettings.DEFAULT_ROUTE
+
+    tables = get_compiled_cost_tables()
+    lexicon = get_query_lexicon()
+    labels = {c: cfg["label"] for c, cfg in zip(tables.category_ids, tables.configs)}
+    category_memo: Dict[str, Tuple[str, float]] = {}
+
+    for chunk in _chunks(rows, chunk_size):
+        results = []
+        valid = []
+        for row in chunk:
+            result = dict.fromkeys(RESULT_COLUMNS)
+            result.update(row=row.row, sku=row.sku, product=row.product, error=row.error)
+            results.append(result)
+            if row.error is not None:
+                continue
+            known = category_memo.get(row.product)
+            if known is None:
+                parsed = parse_query_with(lexicon, row.product)
+                confidence = next(
+                    (c["confidence"] for c in parsed.classification["candidates"]
+                     if c["category_id"] == parsed.category_id),
+                    0.0,
+                )
+                known = category_memo[row.product] = (parsed.category_id, confidence)
+            market = normalize_market(row.target_market or default_target_market)
+            result.update(
+                category_id=known[0],
+                category_label=labels.get(known[0]),
+                category_confidence=known[1],
+                units=row.units or default_units,
+                target_market=market,
+                route=row.route or MARKET_ROUTES.get(market, default_route),
+                channel=row.channel,
+            )
+            valid.append((result, row))
+
+        if valid:
+            batch = compute_landed_cost_batch(
+                [r["category_id"] for r, _ in valid],
+                [r["units"] for r, _ in valid],
+                routes=[r["route"] for r, _ in valid],
+                unit_weights_kg=[row.unit_weight_kg or np.nan for _, row in valid],
+                retail_prices=[row.retail_price if row.retail_price is not None else np.nan for _, row in valid],
+                tables=tables,
+                hs_codes=[row.hs_code for _, row in valid],
+                channels=[r["channel"] for r, _ in valid],
+                target_markets=[r["target_market"] for r, _ in valid],
+            )
+            units = batch.units.astype(float)
+            columns = {
+                "landed_cost_per_unit_usd": batch["landed_cost_per_unit_usd"].round(4),
+                "total_landed_cost_usd": batch["total_landed_cost_usd"].round(2),
+                "product_per_unit_usd": (batch["product"] / units).round(4),
+                "shipping_per_unit_usd": (batch["shipping"] / units).round(4),
+                "duty_and_tax_per_unit_usd": (batch["duty_and_tax"] / units).round(4),
+                "gross_margin_percent": batch["gross_margin_percent"].round(1),
+                "net_margin_percent": batch["net_margin_percent"].round(1),
+            }
+            lists = {name: values.tolist() for name, values in columns.items()}
+            for i, (result, _) in enumerate(valid):
+                for name, values in lists.items():
+                    value = values[i]
+                    result[name] = None if value != value else value  # NaN → None
+                result["cost_table_version"] = batch.table_version
+        yield results
+
+
+def analyze_catalog_file(data: bytes, filename: str, **options: Any) -> Iterator[List[Dict[str, Any]]]:
+    """read_catalog() + price_catalog(); options are passed to price_catalog."""
+    return price_catalog(read_catalog(data, filename), **options)
+
+
+def default_insight_fn(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the single-product hybrid analysis for a priced row and keep a summary."""
+    from services.gemini_service import analyze_with_hybrid_system
+
+    analysis = analyze_with_hybrid_system(
+        result["product"],
+        units=result["units"],
+        route=result["route"],
+        target_market=result["target_market"],
+        channel=result["channel"],
+    )
+    if not analysis.get("success"):
+        raise RuntimeError(analysis.get("error") or "analysis failed")
+    full = analysis["full_result"]
+    return {
+        "insight_source": analysis.get("insight_source"),
+        "product_name": full["meta"]["product_name"],
+        "demand_level": full["market_snapshot"]["demand"]["level"],
+        "competition_level": full["market_snapshot"]["competition"]["level"],
+        "risk_level": full["risk_overview"]["overall_level"],
+        "risk_comments": full["risk_overview"].get("comments", [])[:2],
+    }
+
+
+def generate_catalog_insights(
+    results: Sequence[Dict[str, Any]],
+    insight_fn: Callable[[Dict[str, Any]], Dict[str, Any]] = default_insight_fn,
+    max_workers: int = DEFAULT_INSIGHT_WORKERS,
+    max_rows: Optional[int] = MAX_INSIGHT_ROWS,
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    LLM insights for priced rows in a bounded pool, yielded as they finish.
+
+    At most `max_workers` requests run and at most 2 × max_workers are
+    queued at any time, so a large catalog never floods the API. Rows with
+    errors are skipped; only the first `max_rows` priced rows are sent.
+
+    Yields:
+        (row number, insights or None, error message or None)
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be positive")
+    pending_rows = iter([r for r in results if r.get("error") is None][:max_rows])
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="catalog-insights") as pool:
+        in_flight = {}
+
+        def submit_next() -> bool:
+            row = next(pending_rows, None)
+            if row is None:
+                return False
+            in_flight[pool.submit(insight_fn, row)] = row["row"]
+            return True
+
+        while len(in_flight) < 2 * max_workers and submit_next():
+            pass
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                number = in_flight.pop(future)
+                try:
+                    yield number, future.result(), None
+                except Exception as e:  # one failed row must not stop the catalog
+                    yield number, None, str(e) or type(e).__name__
+                submit_next()
+
+
+def catalog_results_to_csv(results: Iterable[Dict[str, Any]]) -> str:
+    """Serialize result rows (RESULT_COLUMNS order) to CSV text."""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(results)
+    return out.getvalue()
@@ -0,0 +1,255 @@
+"""
+NexSupply Category Classifier - Top-k categories with confidence
+Ranks categories by BM25 weight instead of a raw keyword count, so a
+distinctive keyword outweighs one shared by many categories and weak or
+tied matches are visible to the caller.
+
+Index:
+- Each category is a document: its CATEGORY_KEYWORDS entries plus the
+  words of its label (the cost table snapshot's "label")
+- Terms are matched in the query as substrings with the keyword
+  automaton (utils.category_matcher), so CJK and Hangul work unchanged.
+  Label words only count as whole words: "hat" inside "what" scores
+  only the categories that list "hat" as a keyword
+- The inverted index maps every term to precomputed (category, BM25
+  weight) postings; scoring a query only touches the postings of the
+  terms it contains
+
+Confidence is a category's share of the total score with a fixed
+no-match prior (NULL_SCORE): one weak term gives a low value, several
+distinctive terms for one category approach 1. There is no labeled
+query set to fit it against, so treat it as a ranking signal with
+thresholds (CONFIDENT_THRESHOLD, AMBIGUITY_RATIO), not a probability.
+"""
+
+import heapq
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Container, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from utils.category_matcher import KeywordAutomaton, build_keyword_automaton
+from utils.cost_index import get_compiled_cost_tables
+from utils.cost_tables import CATEGORY_KEYWORDS
+
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Score mass assigned to "none of the categories"
+NULL_SCORE = 2.0
+
+# Top category is confident at or above this confidence ...
+CONFIDENT_THRESHOLD = 0.6
+# ... unless the runner-up scores at least this fraction of it
+AMBIGUITY_RATIO = 0.8
+
+DEFAULT_TOP_K = 3
+FALLBACK_CATEGORY = "generic_consumer_product"
+
+_LABEL_STOPWORDS = {"and", "the", "for", "with", "other", "general", "basic"}
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _label_terms(label: str) -> List[str]:
+    return [
+        word for word in _WORD_PATTERN.findall(label.lower())
+        if len(word) >= 3 and word not in _LABEL_STOPWORDS
+    ]
+
+
+@dataclass(frozen=True)
+class CategoryClassifier:
+    """Immutable BM25 inverted index over category keyword documents."""
+    automaton: KeywordAutomaton
+    postings: Tuple[Tuple[Tuple[int, float], ...], ...]  # term id -> (category index, weight)
+    # Same, counting keyword listings only: for terms found only inside a word
+    keyword_postings: Tuple[Tuple[Tuple[int, float], ...], ...]
+    terms: Tuple[str, ...]
+    categories: Tuple[str, ...]
+    labels: Tuple[str, ...]
+
+    def scores(self, query: str) -> Tuple[Dict[int, float], List[int]]:
+        """BM25 score per matched category index, plus the matched term ids."""
+        return self._score_terms(*self.automaton.matched_words(query.lower()))
+
+    def _score_terms(
+        self, term_ids: Iterable[int], whole_word_ids: Optional[Container[int]] = None
+    ) -> Tuple[Dict[int, float], List[int]]:
+        scores: Dict[int, float] = {}
+        matched = []
+        for term in sorted(term_ids):
+            whole = whole_word_ids is None or term in whole_word_ids
+            postings = self.postings[term] if whole else self.keyword_postings[term]
+            if not postings:
+                continue
+            matched.append(term)
+            for category, weight in postings:
+                scores[category] = scores.get(category, 0.0) + weight
+        return scores, matched
+
+    def classify(self, query: str, k: int = DEFAULT_TOP_K) -> Dict[str, Any]:
+        """
+        Top-k categories for one query.
+
+        Returns:
+            Dict with category_id (FALLBACK_CATEGORY when nothing matched),
+            confidence, confident, ambiguous, candidates (category_id,
+            label, score, confidence; best first) and matched_terms.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        return self._rank(*self.scores(query), k)
+
+    def classify_terms(
+        self,
+        term_ids: Iterable[int],
+        k: int = DEFAULT_TOP_K,
+        whole_word_ids: Optional[Container[int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        classify() for term ids (indices into `terms`) matched by the
+        caller's own scan; `whole_word_ids` are the ones found as whole
+        words (KeywordAutomaton.matched_words), None = all of them.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        return self._rank(*self._score_terms(term_ids, whole_word_ids), k)
+
+    def _rank(self, scores: Dict[int, float], matched: List[int], k: int) -> Dict[str, Any]:
+        total = sum(scores.values()) + NULL_SCORE
+        # Highest score first, then category order (same tie rule as classify_category)
+        top = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        candidates = [
+            {
+                "category_id": self.categories[category],
+                "label": self.labels[category],
+                "score": round(score, 4),
+                "confidence": round(score / total, 3),
+            }
+            for category, score in top
+        ]
+        if not candidates:
+            return {
+                "category_id": FALLBACK_CATEGORY,
+                "confidence": 0.0,
+                "confident": False,
+                "ambiguous": False,
+                "candidates": [],
+                "matched_terms": [],
+            }
+
+        best_score = top[0][1]
+        ambiguous = len(top) > 1 and top[1][1] >= AMBIGUITY_RATIO * best_score
+        confidence = best_score / total
+        return {
+            "category_id": candidates[0]["category_id"],
+            "confidence": round(confidence, 3),
+            "confident": not ambiguous and confidence >= CONFIDENT_THRESHOLD,
+            "ambiguous": ambiguous,
+            "candidates": candidates,
+            "matched_terms": [self.terms[term] for term in matched],
+        }
+
+    def classify_batch(self, queries: Sequence[str], k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+        """classify() for many queries; repeated queries are scored once."""
+        memo: Dict[str, Dict[str, Any]] = {}
+        results = []
+        for query in queries:
+            result = memo.get(query)
+            if result is None:
+                result = memo[query] = self.classify(query, k)
+                results.append(result)
+            else:
+                results.append(dict(result, candidates=[dict(c) for c in result["candidates"]],
+                                    matched_terms=list(result["matched_terms"])))
+        return results
+
+
+def build_category_classifier(
+    keywords: Mapping[str, Sequence[str]],
+    labels: Optional[Mapping[str, str]] = None,
+) -> CategoryClassifier:
+    """
+    Build the BM25 index for a category → keywords mapping.
+
+    Args:
+        keywords: Category ID → keyword list (e.g. CATEGORY_KEYWORDS)
+        labels: Category ID → display label; label words are indexed too
+
+    Raises:
+        ValueError: No categories, or a keyword that is not a string.
+    """
+    if not keywords:
+        raise ValueError("Classifier needs at least one category")
+    labels = labels or {}
+    categories = tuple(keywords)
+    documents = {
+        category: [*keywords[category], *_label_terms(labels.get(category, ""))]
+        for category in categories
+    }
+    keyword_counts: List[Dict[str, int]] = []  # category index -> keyword -> listings
+    for category in categories:
+        counts: Dict[str, int] = {}
+        for keyword in keywords[category]:
+            counts[keyword.lower()] = counts.get(keyword.lower(), 0) + 1
+        keyword_counts.append(counts)
+
+    automaton = build_keyword_automaton(documents)
+    n_docs = len(categories)
+    doc_lengths = [len(documents[c]) for c in categories]
+    avg_length = sum(doc_lengths) / n_docs or 1.0
+
+    def bm25(idf: float, count: int, category: int) -> float:
+        return (
+            idf * count * (BM25_K1 + 1.0)
+            / (count + BM25_K1 * (1.0 - BM25_B + BM25_B * doc_lengths[category] / avg_length))
+        )
+
+    term_text = {}
+    for category in categories:
+        for term in documents[category]:
+            term_text.setdefault(term.lower(), None)
+    terms = tuple(term_text)  # same first-seen order as the automaton's pattern ids
+
+    postings = []
+    keyword_postings = []
+    for term, term_categories in zip(terms, automaton.pattern_categories):
+        tf: Dict[int, int] = {}
+        for category in term_categories:
+            tf[category] = tf.get(category, 0) + 1
+        idf = math.log((n_docs - len(tf) + 0.5) / (len(tf) + 0.5) + 1.0)
+        postings.append(tuple((category, bm25(idf, count, category)) for category, count in tf.items()))
+        keyword_postings.append(tuple(
+            (category, bm25(idf, keyword_counts[category][term], category))
+            for category in tf
+            if keyword_counts[category].get(term)
+        ))
+    return CategoryClassifier(
+        automaton=automaton,
+        postings=tuple(postings),
+        keyword_postings=tuple(keyword_postings),
+        terms=terms,
+        categories=categories,
+        labels=tuple(labels.get(c, c) for c in categories),
+    )
+
+
+_classifier: Optional[Tuple[str, CategoryClassifier]] = None  # (cost table version, classifier)
+
+
+def get_category_classifier() -> CategoryClassifier:
+    """Classifier over CATEGORY_KEYWORDS and the cost table labels (rebuilt when the tables change)."""
+    global _classifier
+    tables = get_compiled_cost_tables()
+    cached = _classifier
+    if cached is None or cached[0] != tables.version:
+        labels = {category: cfg.get("label", category) for category, cfg in zip(tables.category_ids, tables.configs)}
+        cached = _classifier = (tables.version, build_category_classifier(CATEGORY_KEYWORDS, labels))
+    return cached[1]
+
+
+def classify_category_top_k(query: str, k: int = DEFAULT_TOP_K) -> Dict[str, Any]:
+    """Top-k categories with confidence for a product query."""
+    return get_category_classifier().classify(query, k)
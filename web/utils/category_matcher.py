@@ -0,0 +1,161 @@
+"""
+NexSupply Category Matcher - Aho-Corasick keyword automaton
+Scores every category against a query in one left-to-right scan instead
+of one substring search per keyword.
+
+- Keywords are lowercased with str.lower(), like the query, and matched
+  as plain substrings (works the same for Latin, CJK and Hangul text)
+- A category's score is the number of its keywords found in the query;
+  a keyword counts once however often it occurs
+- Ties go to the category listed first, no match gives None
+- matched_words() also reports which patterns occur as whole words
+  (not preceded or followed by a letter, digit or underscore)
+
+The automaton is immutable after build_keyword_automaton(), so one
+instance can be shared across threads.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+@dataclass(frozen=True)
+class KeywordAutomaton:
+    """Trie with failure links; state 0 is the root."""
+    goto: Tuple[Dict[str, int], ...]
+    fail: Tuple[int, ...]
+    outputs: Tuple[Tuple[int, ...], ...]       # pattern ids ending at each state (incl. via fail links)
+    pattern_categories: Tuple[Tuple[int, ...], ...]  # pattern id -> category indices (one per listing)
+    categories: Tuple[str, ...]
+    always: Tuple[int, ...] = ()                # empty keywords match every query
+    lengths: Tuple[int, ...] = ()               # pattern id -> length in characters
+
+    def matched_patterns(self, text: str) -> set:
+        """Ids of all patterns occurring in `text` (already lowercased)."""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        found = set(self.always)
+        state = 0
+        for ch in text:
+            while True:
+                nxt = goto[state].get(ch)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def matched_words(self, text: str) -> Tuple[set, set]:
+        """
+        (ids of all patterns occurring in `text`, ids of those with at least
+        one whole-word occurrence); `text` is already lowercased.
+        """
+        goto, fail, outputs, lengths = self.goto, self.fail, self.outputs, self.lengths
+        found = set(self.always)
+        whole = set()
+        last = len(text) - 1
+        state = 0
+        for i, ch in enumerate(text):
+            while True:
+                nxt = goto[state].get(ch)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            if outputs[state]:
+                found.update(outputs[state])
+                if i < last and _is_word_char(text[i + 1]):
+                    continue
+                for pattern in outputs[state]:
+                    start = i - lengths[pattern]
+                    if start < 0 or not _is_word_char(text[start]):
+                        whole.add(pattern)
+        return found, whole
+
+    def scores(self, query: str) -> List[int]:
+        """Keyword hits per category, in category order."""
+        scores = [0] * len(self.categories)
+        for pattern in self.matched_patterns(query.lower()):
+            for category in self.pattern_categories[pattern]:
+                scores[category] += 1
+        return scores
+
+    def best_match(self, query: str) -> Optional[str]:
+        """Category with the most keyword hits (first listed wins ties), or None."""
+        scores = self.scores(query)
+        best = max(scores, default=0)
+        if best == 0:
+            return None
+        return self.categories[scores.index(best)]
+
+
+def build_keyword_automaton(keywords: Mapping[str, Sequence[str]]) -> KeywordAutomaton:
+    """
+    Build the automaton for a category → keywords mapping.
+
+    Raises:
+        ValueError: A keyword that is not a string.
+    """
+    categories = tuple(keywords)
+    goto: List[Dict[str, int]] = [{}]
+    own_outputs: List[List[int]] = [[]]
+    pattern_ids: Dict[str, int] = {}
+    pattern_categories: List[List[int]] = []
+    lengths: List[int] = []
+
+    for category_index, category in enumerate(categories):
+        for keyword in keywords[category]:
+            if not isinstance(keyword, str):
+                raise ValueError(f"Keyword for {category!r} must be a string, got {keyword!r}")
+            text = keyword.lower()
+            pattern = pattern_ids.get(text)
+            if pattern is None:
+                pattern = pattern_ids[text] = len(pattern_categories)
+                pattern_categories.append([])
+                lengths.append(len(text))
+                state = 0
+                for ch in text:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = goto[state][ch] = len(goto)
+                        goto.append({})
+                        own_outputs.append([])
+                    state = nxt
+                own_outputs[state].append(pattern)
+            pattern_categories[pattern].append(category_index)
+
+    # Breadth-first: a state's failure target is always shallower
+    fail = [0] * len(goto)
+    outputs: List[Tuple[int, ...]] = [()] * len(goto)
+    queue = deque(goto[0].values())
+    for child in goto[0].values():
+        outputs[child] = tuple(own_outputs[child])
+    while queue:
+        state = queue.popleft()
+        for ch, child in goto[state].items():
+            target = fail[state]
+            while target and ch not in goto[target]:
+                target = fail[target]
+            fail[child] = goto[target].get(ch, 0) if goto[target].get(ch) != child else 0
+            outputs[child] = tuple(own_outputs[child]) + outputs[fail[child]]
+            queue.append(child)
+
+    return KeywordAutomaton(
+        goto=tuple(goto),
+        fail=tuple(fail),
+        outputs=tuple(outputs),
+        pattern_categories=tuple(tuple(c) for c in pattern_categories),
+        categories=categories,
+        always=tuple(own_outputs[0]),
+        lengths=tuple(lengths),
+    )
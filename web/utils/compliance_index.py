@@ -0,0 +1,289 @@
+"""
+NexSupply Compliance Index - Certifications per category × target market
+Joins the two compliance data files into one precomputed lookup table:
+
+- data/compliance/category_rules.json: researched rules per product
+  (required regulations, typical HTS codes, risk flags, target markets)
+- data/compliance_costs_2025.json: cost range and timeline per
+  certification (FCC, FDA, CPC, UL, CPSC), US market
+
+Each rule's regulation texts are matched to certification codes once, at
+build time. Profiles are stored under (rule id, market) and under
+(calculator category, market) for the rules in RULE_CATEGORY_MAP, so both
+the calculator and the results page resolve a profile with one dict lookup.
+
+The index is rebuilt only when either file changes (checked by os.stat at
+most every CHECK_INTERVAL seconds) and shared process-wide. A rebuild that
+fails (file missing or malformed) keeps serving the previous index.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+COMPLIANCE_COSTS_PATH = os.path.join(DATA_DIR, "compliance_costs_2025.json")
+CATEGORY_RULES_PATH = os.path.join(DATA_DIR, "compliance", "category_rules.json")
+
+CHECK_INTERVAL = 5.0
+
+logger = logging.getLogger(__name__)
+
+# Market the certification cost file is priced for
+COSTED_MARKET = "United States"
+
+MARKET_ALIASES = {
+    "usa": "United States",
+    "us": "United States",
+    "united states": "United States",
+    "eu": "European Union",
+    "european union": "European Union",
+    "uk": "United Kingdom",
+    "united kingdom": "United Kingdom",
+    "canada": "Canada",
+    "australia": "Australia",
+    "korea": "South Korea",
+    "south korea": "South Korea",
+    "japan": "Japan",
+}
+
+# Rule id (category_rules.json) → calculator category (cost table snapshot)
+RULE_CATEGORY_MAP = {
+    "baby_teether": "baby_infant_products",
+    "us_baby_teether_toy": "baby_infant_products",
+    "stainless_steel_tumbler": "home_food_container",
+    "stainless_steel_water_bottle": "home_food_container",
+    "auto_category_2": "automotive_accessory",
+    "led_desk_lamp_with_usb_charging": "lighting_led_fixture",
+    "wireless_phone_charger": "electronics_small_accessory",
+    "bluetooth_speaker_waterproof": "electronics_small_accessory",
+    "electric_kettle": "home_kitchen_utensil",
+    "yoga_mat": "sports_fitness_equipment",
+}
+
+# Regulation text → certification code in compliance_costs_2025.json
+CERTIFICATION_PATTERNS = {
+    "FCC": re.compile(r"\bFCC\b"),
+    "FDA": re.compile(r"\bFDA\b|\b21 CFR\b"),
+    "CPC": re.compile(r"\bCPSIA\b|\bASTM F963\b|Children'?s Product Certificate"),
+    "UL": re.compile(r"\bUL\s?\d|\bUL\b"),
+    "CPSC": re.compile(r"\bCPSC\b|\b16 CFR\b"),
+}
+
+# A CPC already covers the general CPSC testing
+_SUBSUMED_BY = {"CPSC": "CPC"}
+
+
+def normalize_market(market: Optional[str]) -> Optional[str]:
+    """Canonical market name ("USA" → "United States"), None if empty."""
+    if not market:
+        return None
+    return MARKET_ALIASES.get(market.strip().lower(), market.strip())
+
+
+def _regulation_text(entry: Any) -> str:
+    """Rules list regulations as strings or as {name, details, authority} objects."""
+    if isinstance(entry, Mapping):
+        return " - ".join(str(entry[k]) for k in ("name", "details") if entry.get(k))
+    return str(entry)
+
+
+def match_certifications(regulations: Sequence[str]) -> List[str]:
+    """Certification codes implied by a list of regulation texts."""
+    found = [
+        code for code, pattern in CERTIFICATION_PATTERNS.items()
+        if any(pattern.search(text) for text in regulations)
+    ]
+    return [code for code in found if _SUBSUMED_BY.get(code) not in found]
+
+
+@dataclass(frozen=True)
+class ComplianceIndex:
+    """Immutable (category or rule id, market) → compliance profile map."""
+    profiles: Mapping[Tuple[str, str], Mapping[str, Any]]
+    certifications: Mapping[str, Mapping[str, Any]]
+    version: str
+
+    def lookup(self, key: str, market: Optional[str]) -> Optional[Mapping[str, Any]]:
+        """Profile for a calculator category or rule id in a market, or None."""
+        return self.profiles.get((key, normalize_market(market)))
+
+    def certification_cost(self, key: str, market: Optional[str]) -> Optional[float]:
+        """Average certification cost per SKU, or None when not known."""
+        profile = self.profiles.get((key, normalize_market(market)))
+        if profile is None or profile["cert_cost_usd"] is None:
+            return None
+        return profile["cert_cost_usd"]["average"]
+
+    def certification_costs(self, keys: Sequence[str], markets: Any) -> List[Optional[float]]:
+        """Batch certification_cost (markets: one for all or one per key)."""
+        if markets is None or isinstance(markets, str):
+            markets = [markets] * len(keys)
+        elif len(markets) != len(keys):
+            raise ValueError(f"Column length {len(markets)} does not match {len(keys)} rows")
+        memo: Dict[Tuple[str, Any], Optional[float]] = {}
+        out = []
+        for key, market in zip(keys, markets):
+            pair = (key, market)
+            if pair not in memo:
+                memo[pair] = self.certification_cost(key, market)
+            out.append(memo[pair])
+        return out
+
+
+def _profile(
+    key: str,
+    market: str,
+    rules: Sequence[Mapping[str, Any]],
+    certifications: Mapping[str, Mapping[str, Any]],
+) -> Dict[str, Any]:
+    regulations = list(dict.fromkeys(
+        _regulation_text(r) for rule in rules for r in rule.get("requiredRegulations", [])
+    ))
+    codes = match_certifications(regulations)
+    certs = []
+    cost = None
+    if market == COSTED_MARKET:
+        for code in codes:
+            info = certifications.get(code)
+            if info is None:
+                continue
+            cost_range = info.get("cost_range", {})
+            certs.append({
+                "code": code,
+                "name": info.get("name", code),
+                "cost_low_usd": float(cost_range.get("low", 0)),
+                "cost_high_usd": float(cost_range.get("high", 0)),
+                "cost_average_usd": float(cost_range.get("average", 0)),
+                "timeline_weeks": info.get("timeline_weeks"),
+            })
+        if certs:
+            cost = {
+                "low": sum(c["cost_low_usd"] for c in certs),
+                "average": sum(c["cost_average_usd"] for c in certs),
+                "high": sum(c["cost_high_usd"] for c in certs),
+            }
+    else:
+        certs = [{"code": code, "name": certifications.get(code, {}).get("name", code)} for code in codes]
+
+    weeks = [c["timeline_weeks"] for c in certs if c.get("timeline_weeks")]
+    return {
+        "key": key,
+        "market": market,
+        "certifications": certs,
+        "cert_cost_usd": cost,  # None outside the costed market or without priced certifications
+        "timeline_weeks": max(weeks) if weeks else 0,  # tests run in parallel
+        "regulations": regulations,
+        "typical_hts_codes": list(dict.fromkeys(c for rule in rules for c in rule.get("typicalHtsCodes", []))),
+        "high_risk_flags": list(dict.fromkeys(f for rule in rules for f in rule.get("highRiskFlags", []))),
+        "source_rules": [rule["id"] for rule in rules],
+    }
+
+
+def build_compliance_index(
+    costs: Mapping[str, Any],
+    rules: Mapping[str, Any],
+    version: Optional[str] = None,
+) -> ComplianceIndex:
+    """
+    Precompute every (rule id / category, market) profile.
+
+    Raises:
+        ValueError: Rules without an id or target markets, or duplicate ids.
+    """
+    certifications = costs.get("certifications") or {}
+    entries = rules.get("categories") or []
+
+    by_key: Dict[Tuple[str, str], List[Mapping[str, Any]]] = {}
+    seen = set()
+    for rule in entries:
+        rule_id = rule.get("id")
+        if not rule_id:
+            raise ValueError("Compliance rule without an 'id'")
+        if rule_id in seen:
+            raise ValueError(f"Duplicate compliance rule id: {rule_id!r}")
+        seen.add(rule_id)
+        markets = [normalize_market(m) for m in rule.get("targetMarkets", [])]
+        if not markets:
+            raise ValueError(f"Compliance rule {rule_id!r} has no targetMarkets")
+        category_id = RULE_CATEGORY_MAP.get(rule_id)
+        for market in markets:
+            by_key.setdefault((rule_id, market), []).append(rule)
+            if category_id:
+                by_key.setdefault((category_id, market), []).append(rule)
+
+    profiles = {
+        key: MappingProxyType(_profile(key[0], key[1], matched, certifications))
+        for key, matched in by_key.items()
+    }
+    return ComplianceIndex(
+        profiles=MappingProxyType(profiles),
+        certifications=MappingProxyType({k: MappingProxyType(dict(v)) for k, v in certifications.items()}),
+        version=version or str(costs.get("lastUpdated") or costs.get("version", "unknown")),
+    )
+
+
+_lock = threading.Lock()
+_state: Dict[str, Any] = {"index": None, "stat": None, "next_check": 0.0, "failed_reloads": 0}
+
+
+def _stat(paths: Sequence[str]) -> Tuple:
+    """(mtime, size) per path; None for a missing file."""
+    stats = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stats.append(None)
+        else:
+            stats.append((st.st_mtime_ns, st.st_size))
+    return tuple(stats)
+
+
+def get_compliance_index(
+    costs_path: str = COMPLIANCE_COSTS_PATH,
+    rules_path: str = CATEGORY_RULES_PATH,
+) -> ComplianceIndex:
+    """
+    The shared compliance index, rebuilt only when a source file changes.
+
+    Non-default paths always build a fresh index (useful for tests/tools).
+
+    Raises:
+        ValueError / OSError: Only on the very first load, when there is no
+        previous index to keep serving.
+    """
+    if (costs_path, rules_path) != (COMPLIANCE_COSTS_PATH, CATEGORY_RULES_PATH):
+        return _load(costs_path, rules_path)
+
+    index = _state["index"]
+    if index is not None and time.monotonic() < _state["next_check"]:
+        return index
+    with _lock:
+        _state["next_check"] = time.monotonic() + CHECK_INTERVAL
+        stat = _stat((costs_path, rules_path))
+        if _state["index"] is None or stat != _state["stat"]:
+            try:
+                _state["index"] = _load(costs_path, rules_path)
+            except (OSError, ValueError) as e:
+                if _state["index"] is None:
+                    raise
+                _state["failed_reloads"] += 1
+                logger.warning(f"Compliance index reload failed, keeping {_state['index'].version}: {e}")
+            _state["stat"] = stat  # after a failure, retry only once the files change again
+        return _state["index"]
+
+
+def _load(costs_path: str, rules_path: str) -> ComplianceIndex:
+    with open(costs_path, encoding="utf-8") as f:
+        costs = json.load(f)
+    with open(rules_path, encoding="utf-8") as f:
+        rules = json.load(f)
+    return build_compliance_index(costs, rules)
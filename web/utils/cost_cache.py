@@ -0,0 +1,178 @@
+"""
+NexSupply Landed Cost Cache - Process-wide memoization of deterministic results
+compute_landed_cost is a pure function of the order and the cost tables, and
+the same category × route × standard-volume combinations are requested over
+and over (hybrid analysis and result builder price the same order twice).
+
+- Bounded LRU keyed on the normalized OrderParams tuple
+- Hit / miss / eviction counters for monitoring
+- Entries are tagged with the versions of every data source a result is
+  priced with (cost tables, tariff, FBA fee and compliance indexes); a
+  change in any of them drops every entry
+- Callers always receive a private copy, so shared entries cannot be corrupted
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.cost_index import get_compiled_cost_tables
+from utils.compliance_index import get_compliance_index
+from utils.fba_fees import get_fee_schedule
+from utils.tariff_index import get_tariff_index
+
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy nested dict/list result data (faster than copy.deepcopy)."""
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    return value
+
+
+class LandedCostCache:
+    """Thread-safe bounded LRU cache with version-based invalidation."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        version: str,
+        compute: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Return a copy of the cached result for `key`, computing it on a miss.
+
+        Args:
+            key: Normalized order key
+            version: Data version the result is priced with (pricing_version())
+            compute: Zero-argument function producing the result
+        """
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_result(entry)
+            self.misses += 1
+
+        # Compute outside the lock; a concurrent duplicate just recomputes
+        result = compute()
+        stored = _copy_result(result)
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = stored
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return result
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "table_version": self._version,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_landed_cost_cache = LandedCostCache()
+
+
+def order_cache_key(order: OrderParams) -> Tuple:
+    """
+    Normalized, hashable key for an order.
+
+    Values that compute_landed_cost treats as "not provided" (retail <= 0,
+    weight override 0/None) collapse to None so they share an entry.
+    """
+    retail = order.retail_price_per_unit
+    retail = float(retail) if retail is not None and retail > 0 else None
+    weight = float(order.custom_unit_weight_kg) if order.custom_unit_weight_kg else None
+    return (
+        order.category_id,
+        int(order.units),
+        order.route,
+        order.incoterm,
+        retail,
+        weight,
+        order.hs_code or None,
+        order.channel or None,
+        order.target_market or None,
+    )
+
+
+def pricing_version() -> str:
+    """Combined version of the cost tables and the indexes compute_landed_cost reads."""
+    return "|".join((
+        get_compiled_cost_tables().version,
+        get_tariff_index().version,
+        get_fee_schedule().version,
+        get_compliance_index().version,
+    ))
+
+
+def compute_landed_cost_cached(order: OrderParams) -> Dict[str, Any]:
+    """Memoized compute_landed_cost; returns a private copy of the result."""
+    return _landed_cost_cache.get_or_compute(
+        order_cache_key(order),
+        pricing_version(),
+        lambda: compute_landed_cost(order),
+    )
+
+
+def get_landed_cost_cache() -> LandedCostCache:
+    """The process-wide landed cost cache."""
+    return _landed_cost_cache
+
+
+def get_cost_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters of the process-wide cache."""
+    return _landed_cost_cache.stats()
+
+
+def invalidate_cost_cache() -> None:
+    """Drop cached results, e.g. after editing cost tables in place."""
+    _landed_cost_cache.clear()
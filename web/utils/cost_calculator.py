@@ -9,9 +9,46 @@ SECURITY NOTE: This module contains proprietary calculation logic.
 Do not expose calculation formulas or coefficients to client-side code.
 """
 
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
-from utils.cost_tables import COST_TABLES, classify_category, get_category_config
+import copy
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from utils.cost_tables import classify_category
+from utils.cost_index import CompiledCostTables, get_compiled_cost_tables
+from utils.tariff_index import get_tariff_index
+from utils.fba_fees import FBA_CHANNEL, compute_fba_fees, fba_fees_for, get_fee_schedule, is_fba_channel
+from utils.compliance_index import get_compliance_index
+
+
+# Result keys shared by the scalar and batch calculators
+COMPONENT_KEYS = ("product", "packing", "shipping", "handling", "duty_and_tax")
+DETAILED_KEYS = (
+    "product_fob",
+    "packing_outer",
+    "packing_inner",
+    "sea_freight",
+    "origin_charges",
+    "destination_charges",
+    "customs_broker",
+    "port_misc",
+    "qc_inspection",
+    "certification",
+    "import_duty",
+    "extra_taxes",
+)
+
+# Batch columns describing channel fees rather than landed cost components
+CHANNEL_FEE_COLUMNS = (
+    "fulfillment_fee_per_unit_usd",
+    "referral_rate_percent",
+    "referral_fee_per_unit_usd",
+    "fulfillment_tier",
+    "channel_fees_per_unit_usd",
+    "net_margin_per_unit_usd",
+    "net_margin_percent",
+)
 
 
 @dataclass
@@ -23,6 +60,9 @@ class OrderParams:
     incoterm: str = None
     retail_price_per_unit: Optional[float] = None
     custom_unit_weight_kg: Optional[float] = None  # Override default
+    hs_code: Optional[str] = None  # Known HS code → duty from the tariff index (else the category's hs_code_hint)
+    channel: Optional[str] = None  # "Amazon FBA" → referral/fulfillment fees in margins
+    target_market: Optional[str] = None  # "United States" → certification cost from the compliance index
     
     def __post_init__(self):
         """Set defaults from AppSettings if not provided."""
@@ -33,65 +73,138 @@ class OrderParams:
             self.incoterm = AppSettings.DEFAULT_INCOTERM
     
 
-def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
+@dataclass(frozen=True)
+class OrderOverrides:
     """
-    Compute landed cost breakdown using rule-based tables.
+    What an order's hs_code, target market and channel change about the
+    category defaults, and where each value came from.
     
-    Returns a structured dictionary with:
-    - Total cost and per-unit cost
-    - Component breakdown (product, packing, shipping, handling, duty)
-    - Percentage shares for visualization
-    - Margin estimates (if retail price provided)
-    - Assumptions and metadata
+    Every pricing path (scalar, batch, volume curve, scenarios, Monte
+    Carlo) goes through resolve_order_overrides, so they price an order
+    with the same coefficients.
     """
-    cfg = get_category_config(order.category_id)
+    category_id: str
+    coefficients: Mapping[str, float]             # duty_rate_percent, cert_cost_per_sku_usd
+    tariff: Optional[Mapping[str, Any]] = None    # TariffIndex.lookup() match
+    compliance: Optional[Mapping[str, Any]] = None  # ComplianceIndex.lookup() profile
+    compliance_version: Optional[str] = None
+    fba: bool = False                             # Amazon FBA fees apply to margins
+    
+    def apply(self, coeffs: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Category coefficients with the overrides applied."""
+        return dict(coeffs, **self.coefficients) if self.coefficients else coeffs
     
-    units = order.units
-    unit_weight = order.custom_unit_weight_kg or cfg["default_unit_weight_kg"]
-    units_per_carton = cfg["default_units_per_carton"]
-    cartons_per_cbm = cfg["default_cartons_per_cbm"]
+    def channel_fees(self, unit_weight_kg: float, retail_price: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Per-unit channel fees (fba_fees_for), or None without a fee-bearing channel."""
+        if not self.fba:
+            return None
+        return fba_fees_for(self.category_id, unit_weight_kg, retail_price)
+
+
+def resolve_order_overrides(
+    category_id: str,
+    route: Optional[str] = None,
+    hs_code: Optional[str] = None,
+    target_market: Optional[str] = None,
+    channel: Optional[str] = None,
+    tables: Optional[CompiledCostTables] = None,
+) -> OrderOverrides:
+    """
+    Coefficient overrides for an order.
+    
+    - hs_code, or else the category's hs_code_hint, listed in the tariff
+      index for the route → duty rate; otherwise the category's flat
+      duty_rate_percent stays
+    - target_market with a costed compliance profile → certification cost
+    - Amazon FBA channel → referral/fulfillment fees in margins
+    
+    `tables` is the snapshot the hint is read from (default: current tables).
+    """
+    if hs_code:
+        hs_code_source = "order"
+    else:
+        tables = tables or get_compiled_cost_tables()
+        hs_code = tables.configs[tables.category_id_of(category_id)].get("hs_code_hint")
+        hs_code_source = "category_hint"
+    tariff = get_tariff_index().lookup(hs_code, route) if hs_code else None
+    if tariff is not None:
+        tariff = dict(tariff, hs_code_source=hs_code_source)
+    compliance_index = get_compliance_index() if target_market else None
+    compliance = (
+        compliance_index.lookup(category_id, target_market)
+        if compliance_index is not None else None
+    )
+    coefficients = {}
+    if tariff is not None:
+        coefficients["duty_rate_percent"] = tariff["duty_rate_percent"]
+    if compliance is not None and compliance["cert_cost_usd"] is not None:
+        coefficients["cert_cost_per_sku_usd"] = compliance["cert_cost_usd"]["average"]
+    return OrderOverrides(
+        category_id=category_id,
+        coefficients=coefficients,
+        tariff=tariff,
+        compliance=compliance,
+        compliance_version=compliance_index.version if compliance_index is not None else None,
+        fba=is_fba_channel(channel),
+    )
+
+
+def order_overrides(order: "OrderParams") -> OrderOverrides:
+    """resolve_order_overrides for an OrderParams."""
+    return resolve_order_overrides(
+        order.category_id, order.route, order.hs_code, order.target_market, order.channel
+    )
+
+
+def _landed_cost_components(
+    coeffs: Mapping[str, Any],
+    units: Any,
+    unit_weight: Any,
+    sea_freight_rate: Any,
+    origin_rate: Any,
+    destination_rate: Any,
+) -> Dict[str, Any]:
+    """
+    Core landed cost arithmetic shared by the scalar and batch calculators.
     
+    Uses only elementwise operators so it works on Python floats and on
+    NumPy arrays alike, in the same evaluation order. This is what keeps
+    `compute_landed_cost_batch` bit-identical to `compute_landed_cost`.
+    """
     # ===========================================
     # BASIC CALCULATIONS
     # ===========================================
     total_weight_kg = units * unit_weight
-    total_cartons = units / units_per_carton
-    total_cbm = total_cartons / cartons_per_cbm
+    total_cartons = units / coeffs["default_units_per_carton"]
+    total_cbm = total_cartons / coeffs["default_cartons_per_cbm"]
     
     # ===========================================
     # PRODUCT COST (FOB)
     # ===========================================
-    product_cost = total_weight_kg * cfg["base_fob_cost_per_kg"]
+    product_cost = total_weight_kg * coeffs["base_fob_cost_per_kg"]
     
     # ===========================================
     # PACKING COSTS
     # ===========================================
-    packing_cost = total_cartons * cfg["packing_cost_per_carton_usd"]
-    inner_carton_cost = total_cartons * cfg["inner_carton_cost_usd"]
+    packing_cost = total_cartons * coeffs["packing_cost_per_carton_usd"]
+    inner_carton_cost = total_cartons * coeffs["inner_carton_cost_usd"]
     total_packing = packing_cost + inner_carton_cost
     
     # ===========================================
     # FREIGHT & LOGISTICS
     # ===========================================
-    # Get freight profile for the route
-    freight_cfg = cfg["freight_profile"].get(
-        order.route, 
-        cfg["freight_profile"]["cn_to_us_west_coast"]  # Fallback
-    )
-    handling_cfg = cfg["handling_profile"]
-    
-    sea_freight = total_cbm * freight_cfg["sea_freight_per_cbm_usd"]
-    origin_charges = total_cbm * freight_cfg["origin_charges_per_cbm_usd"]
-    destination_charges = total_cbm * freight_cfg["destination_charges_per_cbm_usd"]
+    sea_freight = total_cbm * sea_freight_rate
+    origin_charges = total_cbm * origin_rate
+    destination_charges = total_cbm * destination_rate
     total_shipping = sea_freight + origin_charges + destination_charges
     
     # ===========================================
     # HANDLING & FIXED COSTS
     # ===========================================
-    docs_and_broker = handling_cfg["docs_and_broker_per_shipment_usd"]
-    port_misc = handling_cfg["port_misc_per_shipment_usd"]
-    qc_cost = cfg["qc_cost_per_order_usd"]
-    cert_cost = cfg["cert_cost_per_sku_usd"]
+    docs_and_broker = coeffs["docs_and_broker_per_shipment_usd"]
+    port_misc = coeffs["port_misc_per_shipment_usd"]
+    qc_cost = coeffs["qc_cost_per_order_usd"]
+    cert_cost = coeffs["cert_cost_per_sku_usd"]
     total_handling = docs_and_broker + port_misc + qc_cost + cert_cost
     
     # ===========================================
@@ -99,8 +212,8 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
     # ===========================================
     # Dutiable value = FOB + Freight (simplified)
     dutiable_base = product_cost + sea_freight
-    duty = dutiable_base * cfg["duty_rate_percent"] / 100.0
-    extra_taxes = dutiable_base * cfg["extra_taxes_percent"] / 100.0
+    duty = dutiable_base * coeffs["duty_rate_percent"] / 100.0
+    extra_taxes = dutiable_base * coeffs["extra_taxes_percent"] / 100.0
     total_duty = duty + extra_taxes
     
     # ===========================================
@@ -114,18 +227,66 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
         + total_duty
     )
     
-    cost_per_unit = total_cost / units
-    
-    # ===========================================
-    # COMPONENT BREAKDOWN
-    # ===========================================
-    components = {
+    return {
+        "total_weight_kg": total_weight_kg,
+        "total_cartons": total_cartons,
+        "total_cbm": total_cbm,
+        "product_fob": product_cost,
+        "packing_outer": packing_cost,
+        "packing_inner": inner_carton_cost,
+        "sea_freight": sea_freight,
+        "origin_charges": origin_charges,
+        "destination_charges": destination_charges,
+        "customs_broker": docs_and_broker,
+        "port_misc": port_misc,
+        "qc_inspection": qc_cost,
+        "certification": cert_cost,
+        "import_duty": duty,
+        "extra_taxes": extra_taxes,
         "product": product_cost,
         "packing": total_packing,
         "shipping": total_shipping,
         "handling": total_handling,
         "duty_and_tax": total_duty,
+        "total_landed_cost_usd": total_cost,
+        "landed_cost_per_unit_usd": total_cost / units,
     }
+
+
+def _assemble_result(
+    cfg: Mapping[str, Any],
+    category_id: str,
+    route: str,
+    incoterm: str,
+    units: int,
+    unit_weight: float,
+    retail_price: Optional[float],
+    raw: Mapping[str, float],
+    table_version: str,
+    tariff: Optional[Mapping[str, Any]] = None,
+    channel_fees: Optional[Mapping[str, Any]] = None,
+    compliance: Optional[Mapping[str, Any]] = None,
+    compliance_version: Optional[str] = None,
+    fallbacks: Sequence[Mapping[str, Any]] = (),
+) -> Dict[str, Any]:
+    """
+    Build the rounded result dictionary from raw component values.
+    
+    `tariff` is the TariffIndex.lookup() match that set the duty rate, or
+    None when the category default was used. `channel_fees` are the
+    per-unit sales channel fees (fba_fees_for), or None for no channel.
+    `compliance` is the ComplianceIndex.lookup() profile for the target
+    market, or None when no market was given or none is on file.
+    `fallbacks` lists unknown category/route IDs that were priced as the
+    generic category / default lane (CompiledCostTables.fallbacks).
+    """
+    total_cost = raw["total_landed_cost_usd"]
+    cost_per_unit = raw["landed_cost_per_unit_usd"]
+    
+    # ===========================================
+    # COMPONENT BREAKDOWN
+    # ===========================================
+    components = {name: raw[name] for name in COMPONENT_KEYS}
     
     # Calculate percentage shares (for pie chart)
     cost_share_percent = {
@@ -139,36 +300,34 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
     result = {
         "calculation_method": "rule_based",
         "accuracy_estimate": "±20-25%",
+        "cost_table_version": table_version,
         "units": units,
-        "total_weight_kg": round(total_weight_kg, 2),
-        "total_cbm": round(total_cbm, 3),
-        "total_cartons": round(total_cartons, 1),
+        "total_weight_kg": round(raw["total_weight_kg"], 2),
+        "total_cbm": round(raw["total_cbm"], 3),
+        "total_cartons": round(raw["total_cartons"], 1),
         "total_landed_cost_usd": round(total_cost, 2),
         "landed_cost_per_unit_usd": round(cost_per_unit, 4),
         "components_usd": {k: round(v, 2) for k, v in components.items()},
         "components_share_percent": {k: round(v, 1) for k, v in cost_share_percent.items()},
-        "cost_breakdown_detailed": {
-            "product_fob": round(product_cost, 2),
-            "packing_outer": round(packing_cost, 2),
-            "packing_inner": round(inner_carton_cost, 2),
-            "sea_freight": round(sea_freight, 2),
-            "origin_charges": round(origin_charges, 2),
-            "destination_charges": round(destination_charges, 2),
-            "customs_broker": round(docs_and_broker, 2),
-            "port_misc": round(port_misc, 2),
-            "qc_inspection": round(qc_cost, 2),
-            "certification": round(cert_cost, 2),
-            "import_duty": round(duty, 2),
-            "extra_taxes": round(extra_taxes, 2),
-        },
+        "cost_breakdown_detailed": {k: round(raw[k], 2) for k in DETAILED_KEYS},
         "assumptions": {
             "category": cfg["label"],
-            "category_id": order.category_id,
-            "route": order.route,
-            "incoterm": order.incoterm,
+            "category_id": category_id,
+            "route": route,
+            "incoterm": incoterm,
             "unit_weight_kg": unit_weight,
-            "duty_rate_percent": cfg["duty_rate_percent"],
+            "duty_rate_percent": tariff["duty_rate_percent"] if tariff else cfg["duty_rate_percent"],
+            "duty_rate_source": tariff["source"] if tariff else "category_default",
+            "hs_code": tariff["matched_hs_code"] if tariff else cfg.get("hs_code_hint", "N/A"),
             "hs_code_hint": cfg.get("hs_code_hint", "N/A"),
+            "hs_code_source": tariff["hs_code_source"] if tariff else "category_hint",
+            "target_market": compliance["market"] if compliance else None,
+            "certification_cost_source": (
+                f"compliance_costs {compliance_version}"
+                if compliance and compliance["cert_cost_usd"] is not None
+                else "category_default"
+            ),
+            "fallbacks": [dict(entry) for entry in fallbacks],
         },
         "benchmarks": {
             "moq_units": cfg.get("moq_units", 1000),
@@ -179,12 +338,21 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
         }
     }
     
+    if compliance is not None:
+        # Profiles are shared by the index; hand out a copy
+        result["compliance"] = copy.deepcopy(dict(compliance, index_version=compliance_version))
+    
+    if channel_fees is not None:
+        result["channel_fees"] = {
+            k: round(v, 4) if isinstance(v, float) else v for k, v in channel_fees.items()
+        }
+    
     # ===========================================
     # MARGIN ESTIMATE (if retail price provided)
     # ===========================================
-    if order.retail_price_per_unit is not None and order.retail_price_per_unit > 0:
-        margin = order.retail_price_per_unit - cost_per_unit
-        margin_pct = (margin / order.retail_price_per_unit) * 100.0
+    if retail_price is not None and retail_price > 0:
+        margin = retail_price - cost_per_unit
+        margin_pct = (margin / retail_price) * 100.0
         
         # Compare to benchmarks
         margin_benchmarks = cfg.get("margin_benchmarks", {})
@@ -196,69 +364,658 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
             margin_assessment = "Within typical range for this category"
         
         result["margin_estimate"] = {
-            "retail_price_per_unit_usd": round(order.retail_price_per_unit, 2),
+            "retail_price_per_unit_usd": round(retail_price, 2),
             "gross_margin_per_unit_usd": round(margin, 4),
             "gross_margin_percent": round(margin_pct, 1),
             "assessment": margin_assessment,
         }
+        if channel_fees is not None:
+            net_margin = margin - channel_fees["total_fees_per_unit_usd"]
+            result["margin_estimate"].update({
+                "channel": channel_fees["channel"],
+                "channel_fees_per_unit_usd": round(channel_fees["total_fees_per_unit_usd"], 4),
+                "net_margin_per_unit_usd": round(net_margin, 4),
+                "net_margin_percent": round(net_margin / retail_price * 100.0, 1),
+            })
     
     return result
 
 
-def compute_sensitivity(order: OrderParams, base_result: Dict[str, Any]) -> Dict[str, Any]:
+def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
+    """
+    Compute landed cost breakdown using rule-based tables.
+    
+    Returns a structured dictionary with:
+    - Total cost and per-unit cost
+    - Component breakdown (product, packing, shipping, handling, duty)
+    - Percentage shares for visualization
+    - Margin estimates (if retail price provided)
+    - Assumptions and metadata
+    
+    If `order.hs_code` (or, without one, the category's hs_code_hint) is
+    listed in the tariff index for the route's origin, its rate replaces
+    the category's default duty rate. For the Amazon FBA
+    channel, referral and fulfillment fees are added to the margin estimate.
+    With `order.target_market`, the certification cost comes from the
+    compliance index (certifications the category needs in that market)
+    and the result gains a "compliance" block.
+    """
+    tables = get_compiled_cost_tables()
+    category_index = tables.category_id_of(order.category_id)
+    coeffs = tables.view(category_index)
+    sea_rate, origin_rate, destination_rate = coeffs.freight_rates(
+        tables.route_id_of(order.route)
+    )
+    unit_weight = order.custom_unit_weight_kg or coeffs.default_unit_weight_kg
+    overrides = order_overrides(order)
+    
+    raw = _landed_cost_components(
+        overrides.apply(coeffs.to_dict()) if overrides.coefficients else coeffs,
+        order.units,
+        unit_weight,
+        sea_rate,
+        origin_rate,
+        destination_rate,
+    )
+    
+    return _assemble_result(
+        tables.configs[category_index],
+        order.category_id,
+        order.route,
+        order.incoterm,
+        order.units,
+        unit_weight,
+        order.retail_price_per_unit,
+        raw,
+        tables.version,
+        overrides.tariff,
+        overrides.channel_fees(unit_weight, order.retail_price_per_unit),
+        overrides.compliance,
+        overrides.compliance_version,
+        tables.fallbacks(order.category_id, order.route),
+    )
+
+
+# =============================================================================
+# BATCH (COLUMNAR) CALCULATION
+# =============================================================================
+
+@dataclass
+class LandedCostBatch:
+    """
+    Columnar landed cost results for many orders.
+    
+    `columns` maps the raw (unrounded) component names used in
+    `cost_breakdown_detailed` / `components_usd` plus the order totals to
+    float arrays of equal length. Per-row dictionaries are only built on
+    request via `to_records()`.
+    """
+    category_ids: List[str]
+    routes: List[str]
+    category_index: np.ndarray
+    incoterm: str
+    units: np.ndarray
+    unit_weight_kg: np.ndarray
+    retail_prices: np.ndarray
+    columns: Dict[str, np.ndarray]
+    tables: Optional[CompiledCostTables] = None
+    hs_codes: Optional[List[Optional[str]]] = None
+    channels: Optional[List[Optional[str]]] = None
+    target_markets: Optional[List[Optional[str]]] = None
+    
+    @property
+    def table_version(self) -> str:
+        """Version of the cost tables this batch was priced with."""
+        return self.tables.version
+    
+    def __len__(self) -> int:
+        return len(self.category_ids)
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Build one `compute_landed_cost`-shaped dict per row."""
+        raw_lists = {k: v.tolist() for k, v in self.columns.items()}
+        units = self.units.tolist()
+        weights = self.unit_weight_kg.tolist()
+        retail = self.retail_prices.tolist()
+        
+        configs = self.tables.configs
+        category_index = self.category_index.tolist()
+        fee_schedule = get_fee_schedule() if self.channels is not None else None
+        overrides = _row_overrides(self.category_ids, self.routes, self.hs_codes, self.target_markets, self.tables)
+        if fee_schedule is not None:
+            fee_lists = {name: raw_lists.pop(name) for name in CHANNEL_FEE_COLUMNS}
+        
+        records = []
+        for i, category_id in enumerate(self.category_ids):
+            raw = {k: v[i] for k, v in raw_lists.items()}
+            retail_price = retail[i] if retail[i] == retail[i] else None  # NaN = not provided
+            row = overrides[i]
+            channel_fees = None
+            if fee_schedule is not None and is_fba_channel(self.channels[i]):
+                channel_fees = {
+                    "channel": FBA_CHANNEL,
+                    "fulfillment_tier": fee_schedule.tier_names[int(fee_lists["fulfillment_tier"][i])],
+                    "fulfillment_fee_per_unit_usd": fee_lists["fulfillment_fee_per_unit_usd"][i],
+                    "referral_rate_percent": fee_lists["referral_rate_percent"][i],
+                    "referral_fee_per_unit_usd": fee_lists["referral_fee_per_unit_usd"][i],
+                    "total_fees_per_unit_usd": fee_lists["channel_fees_per_unit_usd"][i],
+                    "fee_schedule_version": fee_schedule.version,
+                }
+            records.append(_assemble_result(
+                configs[category_index[i]],
+                category_id,
+                self.routes[i],
+                self.incoterm,
+                units[i],
+                weights[i],
+                retail_price,
+                raw,
+                self.tables.version,
+                row.tariff,
+                channel_fees,
+                row.compliance,
+                row.compliance_version,
+                self.tables.fallbacks(category_id, self.routes[i]),
+            ))
+        return records
+    
+    def to_dataframe(self):
+        """Return the columnar result as a pandas DataFrame."""
+        import pandas as pd
+        
+        frame = pd.DataFrame({
+            "category_id": self.category_ids,
+            "route": self.routes,
+            "units": self.units,
+            "unit_weight_kg": self.unit_weight_kg,
+            "retail_price_per_unit_usd": self.retail_prices,
+        })
+        for name, values in self.columns.items():
+            frame[name] = values
+        return frame
+
+
+def _row_overrides(
+    category_ids: Sequence[str],
+    routes: Sequence[str],
+    hs_codes: Optional[Sequence[Optional[str]]],
+    target_markets: Optional[Sequence[Optional[str]]],
+    tables: Optional[CompiledCostTables] = None,
+) -> List[OrderOverrides]:
+    """resolve_order_overrides per row, resolved once per distinct combination."""
+    size = len(category_ids)
+    hs_codes = hs_codes if hs_codes is not None else [None] * size
+    target_markets = target_markets if target_markets is not None else [None] * size
+    memo: Dict[tuple, OrderOverrides] = {}
+    rows = []
+    for key in zip(category_ids, routes, hs_codes, target_markets):
+        resolved = memo.get(key)
+        if resolved is None:
+            resolved = memo[key] = resolve_order_overrides(*key, tables=tables)
+        rows.append(resolved)
+    return rows
+
+
+def _as_column(values: Any, size: int, fill: Any, dtype=float) -> np.ndarray:
+    """Broadcast a scalar / sequence / None to a 1-D array of `size`."""
+    if values is None:
+        return np.full(size, fill, dtype=dtype)
+    arr = np.asarray(values, dtype=dtype)
+    if arr.ndim == 0:
+        return np.full(size, arr.item(), dtype=dtype)
+    if arr.shape != (size,):
+        raise ValueError(f"Column length {arr.shape[0]} does not match {size} orders")
+    return arr
+
+
+def compute_landed_cost_batch(
+    category_ids: Sequence[str],
+    units: Any,
+    routes: Any = None,
+    unit_weights_kg: Any = None,
+    retail_prices: Any = None,
+    incoterm: str = None,
+    tables: Optional[CompiledCostTables] = None,
+    hs_codes: Optional[Sequence[Optional[str]]] = None,
+    channels: Any = None,
+    target_markets: Any = None,
+) -> LandedCostBatch:
+    """
+    Compute landed costs for many orders in one vectorized pass.
+    
+    Args:
+        category_ids: Category ID (or compiled category index) per order;
+            unknown IDs fall back to generic
+        units: Order quantity per order (array-like or scalar)
+        routes: Route (or compiled route index) per order, a single route
+            for all, or None for the default
+        unit_weights_kg: Per-unit weight override (NaN/0/None = category default)
+        retail_prices: Retail price per unit (NaN/None = no margin estimate)
+        incoterm: Incoterm recorded in the assumptions (default from AppSettings)
+        tables: Cost table snapshot to price with (default: current tables);
+            pass one in to keep several batches on the same version
+        hs_codes: HS code per order (None = the category's hs_code_hint);
+            listed codes take their duty rate from the tariff index, others
+            keep the category default duty
+        channels: Sales channel per order or one for all; Amazon FBA rows
+            get fee and net margin columns (NaN for other channels)
+        target_markets: Target market per order or one for all; the
+            certification cost comes from the compliance index where the
+            category has a costed profile for that market
+    
+    Returns:
+        LandedCostBatch with one value per order in every column.
+        Call `.to_records()` for dicts identical to `compute_landed_cost`.
+    """
+    from utils.config import AppSettings
+    
+    category_ids = list(category_ids)
+    size = len(category_ids)
+    incoterm = incoterm or AppSettings.DEFAULT_INCOTERM
+    
+    if routes is None or isinstance(routes, str):
+        routes = [routes or AppSettings.DEFAULT_ROUTE] * size
+    else:
+        routes = list(routes)
+        if len(routes) != size:
+            raise ValueError(f"Column length {len(routes)} does not match {size} orders")
+    
+    units_arr = _as_column(units, size, 0, dtype=np.int64)
+    if np.any(units_arr <= 0):
+        raise ValueError("All order quantities must be positive")
+    retail_arr = _as_column(retail_prices, size, np.nan)
+    weight_arr = _as_column(unit_weights_kg, size, np.nan)
+    
+    # Gather per-row coefficients by index from the compiled tables
+    tables = tables or get_compiled_cost_tables()
+    category_index = tables.category_indices(category_ids)
+    route_index = tables.route_indices(routes)
+    if np.asarray(category_ids).dtype.kind in "iu":
+        category_ids = [tables.category_ids[i] for i in category_index.tolist()]
+    if np.asarray(routes).dtype.kind in "iu":
+        routes = [tables.route_ids[j] for j in route_index.tolist()]
+    
+    coeffs = {name: values[category_index] for name, values in tables.coefficients.items()}
+    if hs_codes is not None:
+        hs_codes = list(hs_codes)
+        if len(hs_codes) != size:
+            raise ValueError(f"Column length {len(hs_codes)} does not match {size} orders")
+    if target_markets is not None:
+        if isinstance(target_markets, str):
+            target_markets = [target_markets] * size
+        else:
+            target_markets = list(target_markets)
+            if len(target_markets) != size:
+                raise ValueError(f"Column length {len(target_markets)} does not match {size} orders")
+    # Category hs_code_hints can carry a tariff rate even without hs_codes
+    for i, row in enumerate(_row_overrides(category_ids, routes, hs_codes, target_markets, tables)):
+        for name, value in row.coefficients.items():
+            coeffs[name][i] = value  # fancy indexing above copied the columns
+    rates = {name: values[category_index, route_index] for name, values in tables.freight.items()}
+    
+    # Same truthiness rule as `custom_unit_weight_kg or default`
+    use_default = np.isnan(weight_arr) | (weight_arr == 0)
+    weight_arr = np.where(use_default, coeffs["default_unit_weight_kg"], weight_arr)
+    
+    columns = _landed_cost_components(
+        coeffs,
+        units_arr,
+        weight_arr,
+        rates["sea_freight_per_cbm_usd"],
+        rates["origin_charges_per_cbm_usd"],
+        rates["destination_charges_per_cbm_usd"],
+    )
+    # Fixed per-shipment costs come back as the coefficient arrays themselves
+    columns = {k: np.array(v, dtype=float, copy=True) for k, v in columns.items()}
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = columns["total_landed_cost_usd"]
+        for name in COMPONENT_KEYS:
+            columns[f"{name}_share_percent"] = np.where(
+                total > 0, columns[name] / total * 100.0, 0.0
+            )
+        has_retail = retail_arr > 0
+        margin = retail_arr - columns["landed_cost_per_unit_usd"]
+        columns["gross_margin_per_unit_usd"] = np.where(has_retail, margin, np.nan)
+        columns["gross_margin_percent"] = np.where(
+            has_retail, margin / retail_arr * 100.0, np.nan
+        )
+        
+        if channels is not None:
+            if isinstance(channels, str):
+                channels = [channels] * size
+            else:
+                channels = list(channels)
+                if len(channels) != size:
+                    raise ValueError(f"Column length {len(channels)} does not match {size} orders")
+            fba = np.fromiter((is_fba_channel(c) for c in channels), dtype=bool, count=size)
+            fees = compute_fba_fees(category_ids, weight_arr, retail_arr)
+            for name in ("fulfillment_fee_per_unit_usd", "referral_rate_percent", "referral_fee_per_unit_usd"):
+                columns[name] = np.where(fba, fees[name], np.nan)
+            columns["fulfillment_tier"] = np.where(fba, fees["fulfillment_tier"], np.nan)
+            columns["channel_fees_per_unit_usd"] = np.where(fba, fees["total_fees_per_unit_usd"], np.nan)
+            net = margin - columns["channel_fees_per_unit_usd"]
+            columns["net_margin_per_unit_usd"] = np.where(has_retail, net, np.nan)
+            columns["net_margin_percent"] = np.where(has_retail, net / retail_arr * 100.0, np.nan)
+    
+    return LandedCostBatch(
+        category_ids=category_ids,
+        routes=routes,
+        category_index=category_index,
+        incoterm=incoterm,
+        units=units_arr,
+        unit_weight_kg=weight_arr,
+        retail_prices=retail_arr,
+        columns=columns,
+        tables=tables,
+        hs_codes=hs_codes,
+        channels=channels,
+        target_markets=target_markets,
+    )
+
+
+# =============================================================================
+# VOLUME PRICE-BREAK CURVE
+# =============================================================================
+
+# Per-order costs that do not scale with volume
+FIXED_COST_KEYS = ("customs_broker", "port_misc", "qc_inspection", "certification")
+
+
+def default_volume_grid(units: Optional[int] = None, points: int = 200) -> np.ndarray:
+    """
+    Log-spaced order volumes from 500 to 100,000 units.
+    
+    If `units` is given it is inserted so the curve passes through the
+    order the user actually asked about.
+    """
+    grid = np.unique(np.round(np.geomspace(500, 100_000, points)).astype(np.int64))
+    if units:
+        grid = np.union1d(grid, [int(units)])
+    return grid
+
+
+def compute_volume_curve(
+    category_id: str,
+    route: str = None,
+    units_grid: Any = None,
+    fixed_share_threshold: float = 0.05,
+    custom_unit_weight_kg: Optional[float] = None,
+    hs_code: Optional[str] = None,
+    target_market: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Per-unit landed cost across a grid of order volumes in one batch pass.
+    
+    Every component except the fixed per-order costs (QC, certification,
+    docs/broker, port misc) is linear in volume, so the fixed-cost share of
+    the total falls as F / (F + v·units). The volume where it drops below
+    `fixed_share_threshold` is solved in closed form.
+    
+    Args:
+        category_id: Category ID
+        route: Shipping route (default from AppSettings)
+        units_grid: Order volumes to evaluate (default: default_volume_grid())
+        fixed_share_threshold: Target fixed-cost share of total cost (0-1)
+        custom_unit_weight_kg: Per-unit weight override
+        hs_code: HS code (tariff index duty rate, as in compute_landed_cost)
+        target_market: Target market (compliance certification cost)
+    
+    Returns:
+        Dict with lists aligned to `units`: per-unit landed cost, per-unit
+        component split and fixed-cost share, plus the threshold volume.
+    """
+    if not 0 < fixed_share_threshold < 1:
+        raise ValueError("fixed_share_threshold must be between 0 and 1")
+    
+    grid = default_volume_grid() if units_grid is None else np.asarray(units_grid, dtype=np.int64)
+    if grid.ndim != 1 or grid.size == 0:
+        raise ValueError("units_grid must be a non-empty 1-D sequence of volumes")
+    grid = np.sort(grid)
+    
+    batch = compute_landed_cost_batch(
+        [category_id] * grid.size,
+        grid,
+        routes=route,
+        unit_weights_kg=custom_unit_weight_kg,
+        hs_codes=[hs_code] * grid.size if hs_code else None,
+        target_markets=target_market,
+    )
+    units = batch.units.astype(float)
+    total = batch["total_landed_cost_usd"]
+    fixed = sum(batch[name] for name in FIXED_COST_KEYS)
+    fixed_share = fixed / total
+    
+    # F / (F + v·u) < s  <=>  u > F·(1 - s) / (s·v)
+    fixed_cost = float(fixed[0])
+    variable_per_unit = float((total[0] - fixed[0]) / units[0])
+    threshold_units = None
+    if variable_per_unit > 0:
+        threshold_units = int(np.floor(
+            fixed_cost * (1 - fixed_share_threshold) / (fixed_share_threshold * variable_per_unit)
+        )) + 1
+    below = np.nonzero(fixed_share < fixed_share_threshold)[0]
+    
+    return {
+        "category_id": category_id,
+        "route": batch.routes[0],
+        "cost_table_version": batch.table_version,
+        "units": grid.tolist(),
+        "landed_cost_per_unit_usd": np.round(batch["landed_cost_per_unit_usd"], 4).tolist(),
+        "components_per_unit_usd": {
+            name: np.round(batch[name] / units, 4).tolist() for name in COMPONENT_KEYS
+        },
+        "fixed_cost_share_percent": np.round(fixed_share * 100.0, 2).tolist(),
+        "fixed_costs_usd": round(fixed_cost, 2),
+        "variable_cost_per_unit_usd": round(variable_per_unit, 4),
+        "fixed_share_threshold_percent": round(fixed_share_threshold * 100.0, 2),
+        "units_for_fixed_share_threshold": threshold_units,
+        "first_grid_units_below_threshold": int(grid[below[0]]) if below.size else None,
+    }
+
+
+# =============================================================================
+# SENSITIVITY SCENARIOS
+# =============================================================================
+
+@dataclass
+class CostScenario:
+    """
+    A what-if perturbation of the cost coefficients.
+    
+    `multipliers` scale a coefficient (freight ×1.2 → {"sea_freight_per_cbm_usd": 1.2}),
+    `shifts` add to it (duty −5 pts → {"duty_rate_percent": -5}). Keys are the
+    compiled coefficient names (see utils.cost_index); results are floored at 0.
+    """
+    name: str
+    multipliers: Dict[str, float] = field(default_factory=dict)
+    shifts: Dict[str, float] = field(default_factory=dict)
+    trigger: str = ""
+    recommendation: str = ""
+    
+    def __post_init__(self):
+        from utils.cost_index import CATEGORY_FIELDS, HANDLING_FIELDS, FREIGHT_FIELDS
+        allowed = set(CATEGORY_FIELDS + HANDLING_FIELDS + FREIGHT_FIELDS) - {
+            "default_units_per_carton", "default_cartons_per_cbm"
+        }
+        unknown = (set(self.multipliers) | set(self.shifts)) - allowed
+        if unknown:
+            raise ValueError(f"Unknown scenario coefficient(s): {', '.join(sorted(unknown))}")
+
+
+DEFAULT_SCENARIOS = (
+    CostScenario(
+        name="Shipping cost +20%",
+        multipliers={
+            "sea_freight_per_cbm_usd": 1.2,
+            "origin_charges_per_cbm_usd": 1.2,
+            "destination_charges_per_cbm_usd": 1.2,
+        },
+        trigger="Peak season, port congestion, fuel surcharge",
+        recommendation="Consider off-peak shipping or larger batch sizes",
+    ),
+    CostScenario(
+        name="Duty reduced by 5 points",
+        shifts={"duty_rate_percent": -5},
+        trigger="Trade agreement, tariff negotiation",
+        recommendation="Monitor trade policy changes",
+    ),
+    CostScenario(
+        name="Product cost +10%",
+        multipliers={"base_fob_cost_per_kg": 1.1},
+        trigger="Raw material price increase, supplier renegotiation",
+        recommendation="Lock in pricing with longer contracts",
+    ),
+)
+
+
+def compute_scenarios(
+    order: OrderParams,
+    scenarios: Sequence[CostScenario] = DEFAULT_SCENARIOS,
+) -> Dict[str, Any]:
+    """
+    Re-price an order under many coefficient perturbations in one batch.
+    
+    Row 0 is the unperturbed order; every scenario is an extra row in the
+    same vectorized evaluation, so dozens of scenarios cost about the same
+    as one.
+    
+    The base row carries the same tariff/compliance overrides as
+    compute_landed_cost (resolve_order_overrides). For a fee-bearing
+    channel (Amazon FBA) margins are also reported net of channel fees and
+    the deltas are measured on the net margin.
+    
+    If the order has no retail price, margins are measured against a retail
+    price implied by the category's typical margin at the base cost (net of
+    channel fees when they apply).
+    
+    Returns:
+        Base cost/margin and, per scenario, the exact per-unit cost, total
+        cost and margin with their deltas vs. the base.
+    """
+    tables = get_compiled_cost_tables()
+    category_index = tables.category_id_of(order.category_id)
+    coeffs = tables.view(category_index)
+    cfg = tables.configs[category_index]
+    rates = dict(zip(
+        ("sea_freight_per_cbm_usd", "origin_charges_per_cbm_usd", "destination_charges_per_cbm_usd"),
+        coeffs.freight_rates(tables.route_id_of(order.route)),
+    ))
+    overrides = order_overrides(order)
+    base = dict(overrides.apply(coeffs.to_dict()), **rates)
+    
+    rows = 1 + len(scenarios)
+    columns = {name: np.full(rows, value, dtype=float) for name, value in base.items()}
+    for i, scenario in enumerate(scenarios, start=1):
+        for name, factor in scenario.multipliers.items():
+            columns[name][i] *= factor
+        for name, delta in scenario.shifts.items():
+            columns[name][i] += delta
+    for values in columns.values():
+        np.maximum(values, 0.0, out=values)
+    
+    unit_weight = order.custom_unit_weight_kg or coeffs.default_unit_weight_kg
+    unit_weights = unit_weight * columns["default_unit_weight_kg"] / coeffs.default_unit_weight_kg
+    raw = _landed_cost_components(
+        columns,
+        order.units,
+        unit_weights,
+        columns["sea_freight_per_cbm_usd"],
+        columns["origin_charges_per_cbm_usd"],
+        columns["destination_charges_per_cbm_usd"],
+    )
+    per_unit = raw["landed_cost_per_unit_usd"]
+    total = raw["total_landed_cost_usd"]
+    base_cost = float(per_unit[0])
+    
+    fba_category = [order.category_id] * rows
+    if order.retail_price_per_unit is not None and order.retail_price_per_unit > 0:
+        retail_price = float(order.retail_price_per_unit)
+        retail_basis = "provided"
+    else:
+        typical = cfg.get("margin_benchmarks", {}).get("typical", 0.30)
+        retail_price = base_cost / (1.0 - typical)
+        if overrides.fba:
+            # Net margin = typical: r·(1 - typical - referral rate) = cost + fulfillment
+            fees = compute_fba_fees(fba_category[:1], unit_weights[:1])
+            denominator = 1.0 - typical - float(fees["referral_rate_percent"][0]) / 100.0
+            if denominator > 0:
+                retail_price = (base_cost + float(fees["fulfillment_fee_per_unit_usd"][0])) / denominator
+        retail_basis = "implied_by_typical_margin"
+    margin_pct = (retail_price - per_unit) / retail_price * 100.0
+    channel_fees = None
+    net_pct = margin_pct
+    if overrides.fba:
+        channel_fees = compute_fba_fees(fba_category, unit_weights, retail_price)["total_fees_per_unit_usd"]
+        net_pct = (retail_price - per_unit - channel_fees) / retail_price * 100.0
+    
+    results = []
+    for i, scenario in enumerate(scenarios, start=1):
+        results.append({
+            "name": scenario.name,
+            "trigger": scenario.trigger,
+            "recommendation": scenario.recommendation,
+            "landed_cost_per_unit_usd": round(float(per_unit[i]), 4),
+            "cost_delta_per_unit_usd": round(float(per_unit[i]) - base_cost, 4),
+            "cost_delta_percent": round((float(per_unit[i]) / base_cost - 1.0) * 100.0, 2),
+            "total_landed_cost_usd": round(float(total[i]), 2),
+            "gross_margin_percent": round(float(margin_pct[i]), 2),
+            "net_margin_percent": round(float(net_pct[i]), 2) if channel_fees is not None else None,
+            "margin_delta_points": round(float(net_pct[i] - net_pct[0]), 2),
+        })
+    
+    return {
+        "cost_table_version": tables.version,
+        "base": {
+            "landed_cost_per_unit_usd": round(base_cost, 4),
+            "total_landed_cost_usd": round(float(total[0]), 2),
+            "gross_margin_percent": round(float(margin_pct[0]), 2),
+            "channel_fees_per_unit_usd": round(float(channel_fees[0]), 4) if channel_fees is not None else None,
+            "net_margin_percent": round(float(net_pct[0]), 2) if channel_fees is not None else None,
+            "retail_price_per_unit_usd": round(retail_price, 4),
+            "retail_price_basis": retail_basis,
+        },
+        "scenarios": results,
+    }
+
+
+def compute_sensitivity(
+    order: OrderParams,
+    base_result: Dict[str, Any] = None,
+    scenarios: Sequence[CostScenario] = DEFAULT_SCENARIOS,
+) -> Dict[str, Any]:
     """
     Compute sensitivity scenarios: what if costs change?
     
-    Returns scenarios showing impact of:
+    Scenarios are re-priced exactly with compute_scenarios. By default:
     - Shipping cost +20%
     - Duty rate -5 points
     - Product cost +10%
+    
+    `base_result` is accepted for backward compatibility and not needed.
     """
-    cfg = get_category_config(order.category_id)
-    base_cost = base_result["landed_cost_per_unit_usd"]
-    base_margin = base_result.get("margin_estimate", {}).get("gross_margin_percent", 30)
-    
-    scenarios = []
-    
-    # Scenario 1: Shipping +20%
-    shipping_share = base_result["components_share_percent"].get("shipping", 15)
-    shipping_impact_pct = shipping_share * 0.20  # 20% of shipping component
-    new_margin_shipping = base_margin - shipping_impact_pct
-    scenarios.append({
-        "name": "Shipping cost +20%",
-        "trigger": "Peak season, port congestion, fuel surcharge",
-        "margin_impact": f"-{shipping_impact_pct:.1f}%",
-        "new_margin": f"{new_margin_shipping:.1f}%",
-        "recommendation": "Consider off-peak shipping or larger batch sizes"
-    })
-    
-    # Scenario 2: Duty reduced by 5 points
-    duty_reduction = 5
-    duty_impact_pct = (cfg["duty_rate_percent"] - duty_reduction) / cfg["duty_rate_percent"] * base_result["components_share_percent"].get("duty_and_tax", 10) if cfg["duty_rate_percent"] > 0 else 0
-    new_margin_duty = base_margin + min(duty_impact_pct, 3)  # Cap at 3% improvement
-    scenarios.append({
-        "name": "Duty reduced by 5 points",
-        "trigger": "Trade agreement, tariff negotiation",
-        "margin_impact": f"+{min(duty_impact_pct, 3):.1f}%",
-        "new_margin": f"{new_margin_duty:.1f}%",
-        "recommendation": "Monitor trade policy changes"
-    })
-    
-    # Scenario 3: Product cost +10%
-    product_share = base_result["components_share_percent"].get("product", 50)
-    product_impact_pct = product_share * 0.10
-    new_margin_product = base_margin - product_impact_pct
-    scenarios.append({
-        "name": "Product cost +10%",
-        "trigger": "Raw material price increase, supplier renegotiation",
-        "margin_impact": f"-{product_impact_pct:.1f}%",
-        "new_margin": f"{new_margin_product:.1f}%",
-        "recommendation": "Lock in pricing with longer contracts"
-    })
+    exact = compute_scenarios(order, scenarios)
+    # Net of channel fees when the order's channel has them
+    margin_key = "net_margin_percent" if exact["base"]["net_margin_percent"] is not None else "gross_margin_percent"
     
     return {
-        "base_margin": f"{base_margin:.1f}%",
-        "scenarios": scenarios
+        "base_margin": f"{exact['base'][margin_key]:.1f}%",
+        "retail_price_basis": exact["base"]["retail_price_basis"],
+        "scenarios": [
+            {
+                "name": s["name"],
+                "trigger": s["trigger"],
+                "margin_impact": f"{s['margin_delta_points']:+.1f}%",
+                "new_margin": f"{s[margin_key]:.1f}%",
+                "recommendation": s["recommendation"],
+                "cost_per_unit_usd": s["landed_cost_per_unit_usd"],
+                "cost_delta_per_unit_usd": s["cost_delta_per_unit_usd"],
+            }
+            for s in exact["scenarios"]
+        ],
     }
 
 
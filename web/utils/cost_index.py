@@ -0,0 +1,303 @@
+"""
+NexSupply Compiled Cost Tables - Index-addressed coefficient arrays
+Turns the nested cost table dict (data/cost_tables.json) into an immutable
+structure-of-arrays.
+
+Structure:
+- Category name → integer category index (row)
+- Route name → integer route index (column of the freight matrices)
+- Coefficient name → contiguous float64 array, one value per category
+- Freight rate name → float64 matrix [category, route]
+
+The table is validated once when it is built: a category missing a
+coefficient or a route, or holding a non-numeric / negative value, raises
+ValueError here instead of being papered over on every request.
+
+SECURITY NOTE: Coefficients are proprietary. Keep this module server-side.
+"""
+
+import hashlib
+import json
+import math
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+GENERIC_CATEGORY_ID = "generic_consumer_product"
+FALLBACK_ROUTE_ID = "cn_to_us_west_coast"
+
+# Routes every category prices unless a snapshot lists its own
+DEFAULT_ROUTE_IDS: Tuple[str, ...] = (
+    "cn_to_us_west_coast",
+    "cn_to_us_east_coast",
+    "cn_to_eu",
+)
+
+# Scalar coefficients, one value per category
+CATEGORY_FIELDS: Tuple[str, ...] = (
+    "default_unit_weight_kg",
+    "default_units_per_carton",
+    "default_cartons_per_cbm",
+    "base_fob_cost_per_kg",
+    "packing_cost_per_carton_usd",
+    "inner_carton_cost_usd",
+    "qc_cost_per_order_usd",
+    "cert_cost_per_sku_usd",
+    "duty_rate_percent",
+    "extra_taxes_percent",
+)
+
+# Fixed per-shipment costs from each category's handling_profile
+HANDLING_FIELDS: Tuple[str, ...] = (
+    "docs_and_broker_per_shipment_usd",
+    "port_misc_per_shipment_usd",
+)
+
+# Per-CBM rates from each category's freight_profile, one value per route
+FREIGHT_FIELDS: Tuple[str, ...] = (
+    "sea_freight_per_cbm_usd",
+    "origin_charges_per_cbm_usd",
+    "destination_charges_per_cbm_usd",
+)
+
+# Fields that must be strictly positive (they are divisors or weights)
+_POSITIVE_FIELDS = {
+    "default_unit_weight_kg",
+    "default_units_per_carton",
+    "default_cartons_per_cbm",
+}
+
+
+class CategoryCoefficients:
+    """
+    Read-only scalar view of one compiled category row.
+
+    Supports attribute access (`view.duty_rate_percent`) and item access
+    (`view["duty_rate_percent"]`) so it can stand in for the category dict
+    in the shared landed-cost arithmetic.
+    """
+
+    __slots__ = (
+        "category_id",
+        "index",
+        *CATEGORY_FIELDS,
+        *HANDLING_FIELDS,
+        "freight",
+    )
+
+    def __init__(self, category_id: str, index: int, values: Mapping[str, float],
+                 freight: Tuple[Tuple[float, float, float], ...]):
+        object.__setattr__(self, "category_id", category_id)
+        object.__setattr__(self, "index", index)
+        for name in CATEGORY_FIELDS + HANDLING_FIELDS:
+            object.__setattr__(self, name, values[name])
+        object.__setattr__(self, "freight", freight)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CategoryCoefficients is read-only")
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def to_dict(self) -> Dict[str, float]:
+        """Coefficient values as a plain dict (for overriding single fields)."""
+        return {name: getattr(self, name) for name in CATEGORY_FIELDS + HANDLING_FIELDS}
+
+    def freight_rates(self, route_index: int) -> Tuple[float, float, float]:
+        """(sea, origin, destination) per-CBM rates for a route index."""
+        return self.freight[route_index]
+
+    def __repr__(self) -> str:
+        return f"CategoryCoefficients({self.category_id!r}, index={self.index})"
+
+
+@dataclass(frozen=True)
+class CompiledCostTables:
+    """Immutable structure-of-arrays form of the cost tables."""
+    category_ids: Tuple[str, ...]
+    route_ids: Tuple[str, ...]
+    category_index: Mapping[str, int]
+    route_index: Mapping[str, int]
+    coefficients: Mapping[str, np.ndarray]   # name -> shape (n_categories,)
+    freight: Mapping[str, np.ndarray]        # name -> shape (n_categories, n_routes)
+    views: Tuple[CategoryCoefficients, ...]
+    configs: Tuple[Mapping[str, Any], ...]   # original per-category metadata
+    generic_index: int
+    fallback_route_index: int
+    version: str
+
+    def category_id_of(self, category_id: str) -> int:
+        """Category index, falling back to the generic category (reported by fallbacks())."""
+        return self.category_index.get(category_id, self.generic_index)
+
+    def route_id_of(self, route: Optional[str]) -> int:
+        """Route index, falling back to the US West Coast lane (reported by fallbacks())."""
+        return self.route_index.get(route, self.fallback_route_index)
+
+    def fallbacks(self, category_id: Any, route: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        The fallbacks category_id_of / route_id_of apply to these names, as
+        {"field", "requested", "used"} entries (empty when both are known).
+        A missing route (None) means the default lane and is not reported.
+        """
+        applied = []
+        if category_id not in self.category_index:
+            applied.append({
+                "field": "category_id",
+                "requested": category_id,
+                "used": self.category_ids[self.generic_index],
+            })
+        if route is not None and route not in self.route_index:
+            applied.append({
+                "field": "route",
+                "requested": route,
+                "used": self.route_ids[self.fallback_route_index],
+            })
+        return applied
+
+    def category_indices(self, category_ids: Any) -> np.ndarray:
+        """Map names (or pass through integer ids) to a category index array."""
+        arr = np.asarray(category_ids)
+        if arr.dtype.kind in "iu":
+            if arr.size and (arr.min() < 0 or arr.max() >= len(self.category_ids)):
+                raise ValueError("Category index out of range")
+            return arr.astype(np.intp, copy=False)
+        lookup = self.category_index.get
+        generic = self.generic_index
+        return np.fromiter((lookup(c, generic) for c in category_ids), dtype=np.intp, count=arr.size)
+
+    def route_indices(self, routes: Any) -> np.ndarray:
+        """Map route names (or pass through integer ids) to a route index array."""
+        arr = np.asarray(routes)
+        if arr.dtype.kind in "iu":
+            if arr.size and (arr.min() < 0 or arr.max() >= len(self.route_ids)):
+                raise ValueError("Route index out of range")
+            return arr.astype(np.intp, copy=False)
+        lookup = self.route_index.get
+        fallback = self.fallback_route_index
+        return np.fromiter((lookup(r, fallback) for r in routes), dtype=np.intp, count=arr.size)
+
+    def view(self, category_index: int) -> CategoryCoefficients:
+        """Scalar coefficient view for one category index."""
+        return self.views[category_index]
+
+
+def _checked_number(category_id: str, name: str, value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{category_id}.{name} must be a number, got {value!r}")
+    value = float(value)
+    if not math.isfinite(value) or value < 0:
+        raise ValueError(f"{category_id}.{name} must be a finite non-negative number, got {value!r}")
+    if name in _POSITIVE_FIELDS and value == 0:
+        raise ValueError(f"{category_id}.{name} must be greater than zero")
+    return value
+
+
+def table_checksum(tables: Mapping[str, Any]) -> str:
+    """Stable content hash of a cost table dict (used as its version)."""
+    payload = json.dumps(tables, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    arr = np.ascontiguousarray(arr, dtype=np.float64)
+    arr.setflags(write=False)
+    return arr
+
+
+def compile_cost_tables(
+    tables: Mapping[str, Mapping[str, Any]],
+    routes: Optional[Sequence[str]] = None,
+    version: Optional[str] = None,
+) -> CompiledCostTables:
+    """
+    Validate a cost table dict and compile it into index-addressed arrays.
+
+    Args:
+        tables: Category ID → config dict (snapshot "categories")
+        routes: Route IDs every category must price (default: DEFAULT_ROUTE_IDS)
+        version: Version label (default: content checksum of `tables`)
+
+    Raises:
+        ValueError: If any category is missing a field or route, or holds
+            an invalid value.
+    """
+    routes = tuple(routes or DEFAULT_ROUTE_IDS)
+    if GENERIC_CATEGORY_ID not in tables:
+        raise ValueError(f"Cost tables must define the '{GENERIC_CATEGORY_ID}' fallback category")
+    if FALLBACK_ROUTE_ID not in routes:
+        raise ValueError(f"Route list must include the '{FALLBACK_ROUTE_ID}' fallback route")
+    if len(set(routes)) != len(routes):
+        raise ValueError("Duplicate route IDs")
+
+    category_ids = tuple(tables.keys())
+    n_cat, n_route = len(category_ids), len(routes)
+
+    coefficients = {name: np.empty(n_cat) for name in CATEGORY_FIELDS + HANDLING_FIELDS}
+    freight = {name: np.empty((n_cat, n_route)) for name in FREIGHT_FIELDS}
+
+    for i, category_id in enumerate(category_ids):
+        cfg = tables[category_id]
+        if "label" not in cfg:
+            raise ValueError(f"{category_id} is missing 'label'")
+        for name in CATEGORY_FIELDS:
+            if name not in cfg:
+                raise ValueError(f"{category_id} is missing '{name}'")
+            coefficients[name][i] = _checked_number(category_id, name, cfg[name])
+        handling = cfg.get("handling_profile") or {}
+        for name in HANDLING_FIELDS:
+            if name not in handling:
+                raise ValueError(f"{category_id}.handling_profile is missing '{name}'")
+            coefficients[name][i] = _checked_number(category_id, name, handling[name])
+        profile = cfg.get("freight_profile") or {}
+        for j, route in enumerate(routes):
+            if route not in profile:
+                raise ValueError(f"{category_id}.freight_profile is missing route '{route}'")
+            for name in FREIGHT_FIELDS:
+                if name not in profile[route]:
+                    raise ValueError(f"{category_id}.freight_profile.{route} is missing '{name}'")
+                freight[name][i, j] = _checked_number(
+                    f"{category_id}.{route}", name, profile[route][name]
+                )
+
+    coefficients = {k: _read_only(v) for k, v in coefficients.items()}
+    freight = {k: _read_only(v) for k, v in freight.items()}
+
+    views = []
+    for i, category_id in enumerate(category_ids):
+        values = {name: float(coefficients[name][i]) for name in coefficients}
+        rates = tuple(
+            tuple(float(freight[name][i, j]) for name in FREIGHT_FIELDS)
+            for j in range(n_route)
+        )
+        views.append(CategoryCoefficients(category_id, i, values, rates))
+
+    return CompiledCostTables(
+        category_ids=category_ids,
+        route_ids=routes,
+        category_index=MappingProxyType({c: i for i, c in enumerate(category_ids)}),
+        route_index=MappingProxyType({r: j for j, r in enumerate(routes)}),
+        coefficients=MappingProxyType(coefficients),
+        freight=MappingProxyType(freight),
+        views=tuple(views),
+        configs=tuple(MappingProxyType(dict(tables[c])) for c in category_ids),
+        generic_index=category_ids.index(GENERIC_CATEGORY_ID),
+        fallback_route_index=routes.index(FALLBACK_ROUTE_ID),
+        version=version or table_checksum(tables),
+    )
+
+
+def get_compiled_cost_tables() -> CompiledCostTables:
+    """
+    Current cost tables from the process-wide store (see utils.cost_store).
+    
+    Call once per calculation and reuse the result; a hot reload swaps the
+    store's tables but never mutates a snapshot already handed out.
+    """
+    from utils.cost_store import get_cost_table_store
+    return get_cost_table_store().current()
@@ -0,0 +1,147 @@
+"""
+NexSupply Cost Simulation - Monte Carlo uncertainty for landed cost
+Replaces the fixed "±20-25%" label with percentile bands computed from the
+cost model itself.
+
+Drivers sampled per order (see COST_UNCERTAINTY_DEFAULTS in cost_tables):
+- Sea freight rate (multiplier)
+- FOB cost per kg (multiplier)
+- Unit weight (multiplier)
+- Duty rate (additive shift in percentage points, floored at 0)
+
+All samples are evaluated in one vectorized pass through the same
+arithmetic as compute_landed_cost. A seeded generator makes runs
+reproducible.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from utils.cost_calculator import OrderParams, _landed_cost_components, order_overrides
+from utils.cost_index import get_compiled_cost_tables
+from utils.cost_tables import get_uncertainty_profile
+
+
+DEFAULT_SAMPLES = 20_000
+MAX_SAMPLES = 200_000
+
+DRIVER_LABELS = {
+    "freight_multiplier": "Sea freight rate",
+    "fob_multiplier": "FOB price per kg",
+    "weight_multiplier": "Unit weight",
+    "duty_shift_points": "Duty rate",
+}
+
+
+def _sample_triangular(rng: np.random.Generator, params: Dict[str, float], size: int) -> np.ndarray:
+    low, mode, high = params["low"], params["mode"], params["high"]
+    if not low <= mode <= high:
+        raise ValueError(f"Invalid triangular parameters: {params}")
+    if low == high:
+        return np.full(size, mode)
+    return rng.triangular(low, mode, high, size)
+
+
+def _percentiles(values: np.ndarray, decimals: int) -> Dict[str, float]:
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {
+        "p10": round(float(p10), decimals),
+        "p50": round(float(p50), decimals),
+        "p90": round(float(p90), decimals),
+        "mean": round(float(values.mean()), decimals),
+    }
+
+
+def simulate_landed_cost(
+    order: OrderParams,
+    samples: int = DEFAULT_SAMPLES,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Monte Carlo landed cost distribution for one order.
+
+    Args:
+        order: Order parameters (same as compute_landed_cost)
+        samples: Number of draws (1,000 - 200,000)
+        seed: Seed for numpy's default_rng; same seed gives the same result
+
+    Returns:
+        Percentile bands for per-unit and total landed cost, the band
+        relative to the deterministic estimate, and each driver's
+        contribution to the variance.
+    """
+    if not 1_000 <= samples <= MAX_SAMPLES:
+        raise ValueError(f"samples must be between 1,000 and {MAX_SAMPLES:,}")
+
+    tables = get_compiled_cost_tables()
+    category_index = tables.category_id_of(order.category_id)
+    coeffs = tables.view(category_index)
+    sea_rate, origin_rate, destination_rate = coeffs.freight_rates(tables.route_id_of(order.route))
+    unit_weight = order.custom_unit_weight_kg or coeffs.default_unit_weight_kg
+    profile = get_uncertainty_profile(tables.category_ids[category_index])
+
+    rng = np.random.default_rng(seed)
+    draws = {driver: _sample_triangular(rng, profile[driver], samples) for driver in DRIVER_LABELS}
+    modes = {driver: profile[driver]["mode"] for driver in DRIVER_LABELS}
+
+    # Same tariff/compliance overrides as compute_landed_cost
+    base = order_overrides(order).apply(coeffs.to_dict())
+
+    def evaluate(values: Dict[str, Any]) -> np.ndarray:
+        sampled = dict(base)
+        sampled["base_fob_cost_per_kg"] = base["base_fob_cost_per_kg"] * values["fob_multiplier"]
+        sampled["duty_rate_percent"] = np.maximum(
+            base["duty_rate_percent"] + values["duty_shift_points"], 0.0
+        )
+        raw = _landed_cost_components(
+            sampled,
+            order.units,
+            unit_weight * values["weight_multiplier"],
+            sea_rate * values["freight_multiplier"],
+            origin_rate,
+            destination_rate,
+        )
+        return np.broadcast_to(raw["landed_cost_per_unit_usd"], (samples,))
+
+    deterministic = float(evaluate(modes)[0])
+    per_unit = evaluate(draws)
+
+    # One-at-a-time runs: vary a single driver, hold the rest at their mode
+    drivers = []
+    variances = {}
+    for driver in DRIVER_LABELS:
+        isolated = evaluate(dict(modes, **{driver: draws[driver]}))
+        variances[driver] = float(isolated.var())
+        p10, p90 = np.percentile(isolated, [10, 90])
+        drivers.append({
+            "driver": driver,
+            "label": DRIVER_LABELS[driver],
+            "distribution": profile[driver],
+            "p10_p90_swing_per_unit_usd": round(float(p90 - p10), 4),
+        })
+    total_variance = sum(variances.values())
+    for entry in drivers:
+        share = variances[entry["driver"]] / total_variance if total_variance > 0 else 0.0
+        entry["contribution_percent"] = round(share * 100.0, 1)
+    drivers.sort(key=lambda d: d["contribution_percent"], reverse=True)
+
+    per_unit_bands = _percentiles(per_unit, 4)
+    band_low = (per_unit_bands["p10"] / deterministic - 1.0) * 100.0 if deterministic else 0.0
+    band_high = (per_unit_bands["p90"] / deterministic - 1.0) * 100.0 if deterministic else 0.0
+
+    return {
+        "method": "monte_carlo",
+        "cost_table_version": tables.version,
+        "samples": samples,
+        "seed": seed,
+        "deterministic_per_unit_usd": round(deterministic, 4),
+        "per_unit_usd": per_unit_bands,
+        "total_usd": _percentiles(per_unit * order.units, 2),
+        "band_vs_estimate_percent": {
+            "p10": round(band_low, 1),
+            "p90": round(band_high, 1),
+        },
+        "accuracy_label": f"{band_low:+.0f}% / {band_high:+.0f}% (P10–P90, simulated)",
+        "drivers": drivers,
+    }
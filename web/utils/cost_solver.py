@@ -0,0 +1,269 @@
+"""
+NexSupply Cost Solver - Work backwards from a target margin or landed cost
+Answers the negotiation questions directly instead of re-running the
+calculator by hand:
+
+- Maximum FOB price ($/kg and $/unit) that still hits the target
+- Minimum order volume that hits the target at the current FOB
+
+The landed cost model is linear in both unknowns:
+
+    total(fob)  = units · weight · fob · (1 + r) + B        (r = duty + taxes)
+    per_unit(u) = v + F / u                                 (F = fixed per order)
+
+so both are solved in closed form, one row per SKU, over whole catalogs at
+once. A vectorized integer bisection over compute_landed_cost_batch is kept
+for the volume problem (method="search") as an independent check.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from utils.cost_calculator import (
+    FIXED_COST_KEYS,
+    OrderParams,
+    compute_landed_cost_batch,
+)
+from utils.cost_index import CompiledCostTables, get_compiled_cost_tables
+
+
+MAX_SEARCH_UNITS = 10_000_000
+
+
+def _target_per_unit(
+    size: int,
+    retail_prices: Any,
+    target_margin_percent: Any,
+    target_landed_cost_per_unit: Any,
+) -> np.ndarray:
+    """Resolve the target into a landed cost per unit for every row."""
+    if (target_margin_percent is None) == (target_landed_cost_per_unit is None):
+        raise ValueError("Give exactly one of target_margin_percent or target_landed_cost_per_unit")
+    if target_landed_cost_per_unit is not None:
+        target = np.broadcast_to(np.asarray(target_landed_cost_per_unit, dtype=float), (size,))
+    else:
+        if retail_prices is None:
+            raise ValueError("target_margin_percent needs retail_prices")
+        margin = np.broadcast_to(np.asarray(target_margin_percent, dtype=float), (size,))
+        if np.any(margin >= 100):
+            raise ValueError("target_margin_percent must be below 100")
+        retail = np.broadcast_to(np.asarray(retail_prices, dtype=float), (size,))
+        target = retail * (1.0 - margin / 100.0)
+    if np.any(~(target > 0)):
+        raise ValueError("Target landed cost per unit must be positive")
+    return np.array(target, dtype=float)
+
+
+def _rows(category_ids: Any) -> list:
+    return [category_ids] if isinstance(category_ids, str) else list(category_ids)
+
+
+def solve_max_fob(
+    category_ids: Sequence[str],
+    units: Any,
+    retail_prices: Any = None,
+    target_margin_percent: Any = None,
+    target_landed_cost_per_unit: Any = None,
+    routes: Any = None,
+    unit_weights_kg: Any = None,
+) -> Dict[str, Any]:
+    """
+    Highest FOB price per row that keeps landed cost at or below the target.
+
+    Args:
+        category_ids: Category ID per SKU
+        units: Order quantity per SKU (or one for all)
+        retail_prices: Retail price per unit (needed with target_margin_percent)
+        target_margin_percent: Target gross margin on retail, e.g. 40
+        target_landed_cost_per_unit: Target landed cost per unit in USD
+        routes: Route per SKU or one route for all
+        unit_weights_kg: Per-unit weight override (NaN/None = category default)
+
+    Returns:
+        Dict of arrays: target_landed_cost_per_unit_usd, current and maximum
+        FOB per kg / per unit, fob_headroom_percent and feasible (False when
+        even a zero FOB misses the target; max FOB is NaN there), plus the
+        cost_table_version string.
+    """
+    category_ids = _rows(category_ids)
+    batch = compute_landed_cost_batch(
+        category_ids, units, routes=routes, unit_weights_kg=unit_weights_kg
+    )
+    target = _target_per_unit(len(batch), retail_prices, target_margin_percent,
+                              target_landed_cost_per_unit)
+
+    coefficients = batch.tables.coefficients
+    idx = batch.category_index
+    rate = (coefficients["duty_rate_percent"][idx] + coefficients["extra_taxes_percent"][idx]) / 100.0
+    current_fob = coefficients["base_fob_cost_per_kg"][idx]
+
+    units_f = batch.units.astype(float)
+    weight = units_f * batch.unit_weight_kg
+    product = batch["product_fob"]
+    # Everything that does not depend on the FOB price
+    fob_free_total = batch["total_landed_cost_usd"] - product * (1.0 + rate)
+
+    max_fob = (target * units_f - fob_free_total) / (weight * (1.0 + rate))
+    feasible = max_fob >= 0
+    max_fob = np.where(feasible, max_fob, np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        headroom = np.where(current_fob > 0, (max_fob / current_fob - 1.0) * 100.0, np.nan)
+
+    return {
+        "target_landed_cost_per_unit_usd": target,
+        "current_fob_per_kg_usd": current_fob,
+        "max_fob_per_kg_usd": max_fob,
+        "current_fob_per_unit_usd": current_fob * batch.unit_weight_kg,
+        "max_fob_per_unit_usd": max_fob * batch.unit_weight_kg,
+        "fob_headroom_percent": headroom,
+        "feasible": feasible,
+        "cost_table_version": batch.table_version,
+    }
+
+
+def _min_units_search(
+    category_ids: list,
+    routes: Any,
+    unit_weights_kg: Any,
+    target: np.ndarray,
+    max_units: int,
+    tables: CompiledCostTables,
+) -> np.ndarray:
+    """Vectorized integer bisection: per-unit cost is non-increasing in units."""
+    size = len(category_ids)
+    lo = np.ones(size, dtype=np.int64)
+    hi = np.full(size, max_units, dtype=np.int64)
+
+    def per_unit(units: np.ndarray) -> np.ndarray:
+        batch = compute_landed_cost_batch(
+            category_ids, units, routes=routes, unit_weights_kg=unit_weights_kg, tables=tables
+        )
+        return batch["landed_cost_per_unit_usd"]
+
+    reachable = per_unit(hi) <= target
+    # Invariant: cost(hi) <= target; answer in [lo, hi]
+    while np.any(lo < hi):
+        mid = (lo + hi) // 2
+        ok = per_unit(mid) <= target
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid + 1)
+    return np.where(reachable, hi, -1)
+
+
+def solve_min_volume(
+    category_ids: Sequence[str],
+    retail_prices: Any = None,
+    target_margin_percent: Any = None,
+    target_landed_cost_per_unit: Any = None,
+    routes: Any = None,
+    unit_weights_kg: Any = None,
+    method: str = "closed_form",
+    max_units: int = MAX_SEARCH_UNITS,
+) -> Dict[str, Any]:
+    """
+    Smallest order volume per row whose landed cost per unit meets the target.
+
+    Args:
+        category_ids: Category ID per SKU
+        retail_prices: Retail price per unit (needed with target_margin_percent)
+        target_margin_percent: Target gross margin on retail, e.g. 40
+        target_landed_cost_per_unit: Target landed cost per unit in USD
+        routes: Route per SKU or one route for all
+        unit_weights_kg: Per-unit weight override (NaN/None = category default)
+        method: "closed_form" (u = F / (target - v)) or "search" (bisection)
+        max_units: Volumes above this are reported as unreachable
+
+    Returns:
+        Dict of arrays: target_landed_cost_per_unit_usd, min_units (-1 when
+        unreachable), variable_cost_per_unit_usd (the floor no volume can
+        beat), fixed_costs_usd and feasible, plus the cost_table_version string.
+    """
+    if method not in ("closed_form", "search"):
+        raise ValueError(f"method must be 'closed_form' or 'search', got {method!r}")
+    if max_units < 1:
+        raise ValueError("max_units must be positive")
+
+    category_ids = _rows(category_ids)
+    tables = get_compiled_cost_tables()  # one version for every pass below
+    # Any positive volume exposes F and v: per_unit = v + F / u
+    probe = compute_landed_cost_batch(
+        category_ids, 1, routes=routes, unit_weights_kg=unit_weights_kg, tables=tables
+    )
+    target = _target_per_unit(len(probe), retail_prices, target_margin_percent,
+                              target_landed_cost_per_unit)
+    fixed = sum(probe[name] for name in FIXED_COST_KEYS)
+    variable = probe["total_landed_cost_usd"] - fixed
+
+    if method == "search":
+        min_units = _min_units_search(category_ids, routes, unit_weights_kg, target, max_units, tables)
+    else:
+        gap = target - variable
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exact = np.where(gap > 0, fixed / gap, np.inf)
+        reachable = exact <= max_units
+        min_units = np.where(reachable, np.maximum(np.ceil(exact), 1), -1).astype(np.int64)
+        # Guard the ceiling against floating-point error at the boundary
+        check = np.where(reachable, min_units, 1)
+        cost = compute_landed_cost_batch(
+            category_ids, check, routes=routes, unit_weights_kg=unit_weights_kg, tables=tables
+        )["landed_cost_per_unit_usd"]
+        min_units = np.where(reachable & (cost > target), min_units + 1, min_units)
+        min_units = np.where(min_units > max_units, -1, min_units)
+
+    return {
+        "target_landed_cost_per_unit_usd": target,
+        "min_units": min_units,
+        "variable_cost_per_unit_usd": variable,
+        "fixed_costs_usd": fixed,
+        "feasible": min_units > 0,
+        "cost_table_version": tables.version,
+    }
+
+
+def solve_for_order(
+    order: OrderParams,
+    target_margin_percent: Optional[float] = None,
+    target_landed_cost_per_unit: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Both reverse solutions for a single order, as a rounded dict.
+
+    With target_margin_percent the order's retail_price_per_unit is used.
+    """
+    common = dict(
+        retail_prices=order.retail_price_per_unit,
+        target_margin_percent=target_margin_percent,
+        target_landed_cost_per_unit=target_landed_cost_per_unit,
+        routes=order.route,
+        unit_weights_kg=order.custom_unit_weight_kg,
+    )
+    fob = solve_max_fob([order.category_id], order.units, **common)
+    volume = solve_min_volume([order.category_id], **common)
+
+    def value(arr: np.ndarray, decimals: int) -> Optional[float]:
+        v = float(arr[0])
+        return round(v, decimals) if v == v else None
+
+    min_units = int(volume["min_units"][0])
+    return {
+        "category_id": order.category_id,
+        "units": order.units,
+        "cost_table_version": fob["cost_table_version"],
+        "target_landed_cost_per_unit_usd": value(fob["target_landed_cost_per_unit_usd"], 4),
+        "max_fob": {
+            "feasible": bool(fob["feasible"][0]),
+            "current_per_kg_usd": value(fob["current_fob_per_kg_usd"], 4),
+            "max_per_kg_usd": value(fob["max_fob_per_kg_usd"], 4),
+            "current_per_unit_usd": value(fob["current_fob_per_unit_usd"], 4),
+            "max_per_unit_usd": value(fob["max_fob_per_unit_usd"], 4),
+            "headroom_percent": value(fob["fob_headroom_percent"], 1),
+        },
+        "min_volume": {
+            "feasible": bool(volume["feasible"][0]),
+            "min_units": min_units if min_units > 0 else None,
+            "variable_cost_per_unit_usd": value(volume["variable_cost_per_unit_usd"], 4),
+            "fixed_costs_usd": value(volume["fixed_costs_usd"], 2),
+        },
+    }
@@ -0,0 +1,249 @@
+"""
+NexSupply Cost Table Store - Versioned, hot-reloadable cost tables
+Lets rates change without a code deploy: the calculator, category
+configs and classifier labels all read the snapshot file, which is the
+only cost table source at runtime.
+
+Snapshot file (JSON, or gzip-compressed JSON when the name ends in .gz):
+    {
+      "format": "nexsupply-cost-tables/1",
+      "version": "2025.11",
+      "checksum": "<sha256[:16] of categories, see table_checksum>",
+      "routes": ["cn_to_us_west_coast", ...],
+      "categories": {<category ID → config: label, hs_code_hint, weights,
+                     base costs, duty_rate_percent, freight profile, ...>}
+    }
+
+- Lazy: nothing is read until the first calculation asks for tables
+- Cheap change detection: one os.stat() at most every `check_interval` s
+- Atomic: a new file is read, checksum-verified and fully compiled before
+  the reference is swapped; a bad file is rejected and the old tables stay
+- Callers take one CompiledCostTables snapshot per calculation, so an
+  in-flight calculation finishes on the version it started with
+- The compiled version ("<version>+<checksum>") is recorded in results
+
+Path: NEXSUPPLY_COST_TABLES_PATH, else data/cost_tables.json. The bundled
+file is the source of the tables: edit its "categories", then restamp the
+version and checksum with scripts/export_cost_tables.py (an edited file
+with a stale checksum is rejected and the old tables stay in service).
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from utils.cost_index import CompiledCostTables, compile_cost_tables, table_checksum
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "nexsupply-cost-tables/1"
+COST_TABLES_PATH_ENV = "NEXSUPPLY_COST_TABLES_PATH"
+DEFAULT_COST_TABLES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cost_tables.json"
+)
+DEFAULT_CHECK_INTERVAL = 2.0
+
+
+def _open(path: str, mode: str, compressed: Optional[bool] = None):
+    if compressed is None:
+        compressed = path.endswith(".gz")
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_cost_table_snapshot(
+    path: str,
+    tables: Mapping[str, Mapping[str, Any]],
+    version: str,
+    routes: Optional[Sequence[str]] = None,
+) -> str:
+    """
+    Validate `tables` and write them as a snapshot file.
+
+    The file is written to a temporary name and renamed into place, so a
+    running store never sees a half-written snapshot.
+
+    Returns:
+        The content checksum written to the file.
+    """
+    compiled = compile_cost_tables(tables, routes=routes)  # validates
+    checksum = table_checksum(tables)
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "checksum": checksum,
+        "routes": list(compiled.route_ids),
+        "categories": tables,
+    }
+    compressed = path.endswith(".gz")
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cost_tables.", suffix=".tmp")
+    os.close(fd)
+    try:
+        with _open(tmp_path, "w", compressed) as f:
+            json.dump(payload, f, ensure_ascii=False, indent=None if compressed else 1)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return checksum
+
+
+def read_cost_table_snapshot(
+    path: str,
+    verify: bool = True,
+) -> Tuple[str, str, Dict[str, Any], Tuple[str, ...]]:
+    """
+    Read and verify a snapshot file.
+
+    Args:
+        path: Snapshot file
+        verify: Reject a checksum mismatch; False reads a hand-edited file
+            so it can be restamped
+
+    Returns:
+        (version, checksum of the content, categories, routes)
+
+    Raises:
+        ValueError: Wrong format, missing fields or checksum mismatch.
+    """
+    with _open(path, "r") as f:
+        payload = json.load(f)
+    if not isinstance(payload, dict) or payload.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"{path} is not a {SNAPSHOT_FORMAT} snapshot")
+    for key in ("version", "checksum", "routes", "categories"):
+        if key not in payload:
+            raise ValueError(f"{path} is missing '{key}'")
+    categories = payload["categories"]
+    actual = table_checksum(categories)
+    if verify and actual != payload["checksum"]:
+        raise ValueError(
+            f"{path} checksum mismatch: file says {payload['checksum']}, content is {actual}"
+        )
+    return str(payload["version"]), actual, categories, tuple(payload["routes"])
+
+
+class CostTableStore:
+    """Lazily loaded, atomically reloaded compiled cost tables for one file."""
+
+    def __init__(
+        self,
+        path: str,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        fallback: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ):
+        self.path = path
+        self.check_interval = check_interval
+        self._fallback = fallback
+        self._tables: Optional[CompiledCostTables] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error: Optional[str] = None
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _compile(self) -> CompiledCostTables:
+        if not os.path.exists(self.path) and self._fallback is not None:
+            return compile_cost_tables(self._fallback)
+        version, checksum, categories, routes = read_cost_table_snapshot(self.path)
+        return compile_cost_tables(categories, routes=routes, version=f"{version}+{checksum}")
+
+    def current(self) -> CompiledCostTables:
+        """
+        Tables to price one calculation with.
+
+        Take the return value once per calculation and use it throughout;
+        a concurrent reload will not change an already returned snapshot.
+        """
+        tables = self._tables
+        if tables is not None and time.monotonic() < self._next_check:
+            return tables
+        self.reload()
+        return self._tables
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload the file if it changed (or always with `force`).
+
+        Returns:
+            True if a new table version was installed.
+
+        Raises:
+            ValueError / OSError: Only on the very first load, when there is
+            no previous version to keep serving.
+        """
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            stat = self._file_stat()
+            if not force and self._tables is not None and stat == self._stat:
+                return False
+            try:
+                tables = self._compile()
+            except (OSError, ValueError) as e:
+                if self._tables is None:
+                    raise
+                self._stat = stat  # retry only once the file changes again
+                self.failed_reloads += 1
+                self.last_error = str(e)
+                logger.warning(f"Cost table reload failed, keeping {self._tables.version}: {e}")
+                return False
+
+            self._stat = stat
+            if self._tables is not None and tables.version == self._tables.version:
+                return False
+            if self._tables is not None:
+                self.reloads += 1
+            self._tables = tables
+            self.loaded_at = time.time()
+            self.last_error = None
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Store status for monitoring."""
+        return {
+            "path": self.path,
+            "version": self._tables.version if self._tables else None,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+        }
+
+
+_store: Optional[CostTableStore] = None
+_store_lock = threading.Lock()
+
+
+def get_cost_table_store() -> CostTableStore:
+    """The process-wide store (created on first use)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = os.getenv(COST_TABLES_PATH_ENV) or DEFAULT_COST_TABLES_PATH
+                _store = CostTableStore(path)
+    return _store
+
+
+def set_cost_table_store(store: Optional[CostTableStore]) -> None:
+    """Replace the process-wide store (None = recreate from the environment)."""
+    global _store
+    with _store_lock:
+        _store = store
@@ -266,12 +266,12 @@ Normalization rules:
   - "ريال", "SAR", "AED" → detect from context
   - "रुपया", "INR", "₹" → "INR"
 - Examples:
-  - "개당 1천원 이하" → {"min": null, "max": 1000, "currency": "KRW"}
-  - "5~10달러" → {"min": 5, "max": 10, "currency": "USD"}
-  - "개당 5000원 정도" → {"min": 4500, "max": 5500, "currency": "KRW"} (approximate)
+  - "개당 1천원 이하" → {{"min": null, "max": 1000, "currency": "KRW"}}
+  - "5~10달러" → {{"min": 5, "max": 10, "currency": "USD"}}
+  - "개당 5000원 정도" → {{"min": 4500, "max": 5500, "currency": "KRW"}} (approximate)
   - "저가로" → null (too vague, keep "price_range_raw": "저가로")
   - "프리미엄 제품" → null (too vague)
-  - "1만원대" → {"min": 10000, "max": 19999, "currency": "KRW"}
+  - "1만원대" → {{"min": 10000, "max": 19999, "currency": "KRW"}}
 - If not mentioned or too vague, set:
   - "price_range": null
   - "price_range_raw": original text (if provided)
@@ -0,0 +1,208 @@
+"""
+NexSupply FBA Fee Engine - Amazon referral and fulfillment fees per unit
+Reads data/amazon_fees_2025.json so channel-aware margins come from the
+same rate file the rest of the product uses.
+
+- Fulfillment: unit weight (kg → lb) is mapped to a size tier by a
+  sorted-breakpoint search over the tier upper bounds ("0-0.75" → 0.75);
+  a weight exactly on a breakpoint belongs to the lower tier
+- Referral: percentage of the retail price by referral group; each
+  category ID maps to a group (CATEGORY_REFERRAL_GROUPS), else "Default"
+
+fba_fees_for() prices one SKU with bisect; compute_fba_fees() prices
+arrays of SKUs with np.searchsorted. Both use the same arithmetic, so
+batch and scalar results are identical.
+"""
+
+import bisect
+import functools
+import json
+import math
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+AMAZON_FEES_PATH = os.path.join(DATA_DIR, "amazon_fees_2025.json")
+
+FBA_CHANNEL = "Amazon FBA"
+LBS_PER_KG = 2.20462
+
+# Category ID → referral fee group in amazon_fees_2025.json
+CATEGORY_REFERRAL_GROUPS = {
+    "electronics_small_accessory": "Electronics",
+    "lighting_led_fixture": "Electronics",
+    "phone_case_protector": "Electronics",
+    "home_food_container": "Home & Kitchen",
+    "home_kitchen_utensil": "Home & Kitchen",
+    "home_decor_decorative": "Home & Kitchen",
+    "furniture_small_storage": "Home & Kitchen",
+    "textiles_fabrics_towels": "Home & Kitchen",
+    "sports_fitness_equipment": "Sports & Outdoors",
+    "outdoor_camping_gear": "Sports & Outdoors",
+    "beauty_cosmetic_packaging": "Health & Beauty",
+    "medical_health_supplies": "Health & Beauty",
+    "apparel_tshirt_basic": "Fashion",
+    "apparel_hat_cap": "Fashion",
+    "bags_tote_backpack": "Fashion",
+    "footwear_shoes_sandals": "Fashion",
+    "jewelry_fashion_accessory": "Fashion",
+    "eyewear_sunglasses": "Fashion",
+    "watches_fashion": "Fashion",
+}
+
+
+def is_fba_channel(channel: Optional[str]) -> bool:
+    """True if fees should be applied for this sales channel."""
+    return bool(channel) and channel.strip().lower() in ("amazon fba", "amazon", "fba")
+
+
+def _tier_upper_bound(range_text: str) -> float:
+    text = range_text.strip()
+    if text.endswith("+"):
+        return math.inf
+    low, _, high = text.partition("-")
+    if not high:
+        raise ValueError(f"Invalid weight range {range_text!r}")
+    return float(high)
+
+
+@dataclass(frozen=True)
+class FBAFeeSchedule:
+    """Fulfillment tiers sorted by weight and referral rates by group."""
+    tier_names: Tuple[str, ...]
+    tier_upper_lbs: np.ndarray          # ascending upper bounds, last is inf
+    tier_fees: np.ndarray
+    referral_rates: Mapping[str, float]
+    default_referral_rate: float
+    version: str
+
+    def referral_rate(self, category_id: str) -> float:
+        """Referral fee rate (0-1) for a category ID."""
+        group = CATEGORY_REFERRAL_GROUPS.get(category_id, "Default")
+        return self.referral_rates.get(group, self.default_referral_rate)
+
+
+def build_fee_schedule(data: Mapping[str, Any]) -> FBAFeeSchedule:
+    """
+    Build a fee schedule from the parsed fee file.
+
+    Raises:
+        ValueError: Missing tiers, overlapping/unsorted ranges or bad values.
+    """
+    tiers = data.get("fulfillmentFees") or {}
+    if not tiers:
+        raise ValueError("Fee data has no 'fulfillmentFees'")
+    parsed = sorted(
+        ((_tier_upper_bound(t["weight_lbs"]), float(t["fee"]), name) for name, t in tiers.items()),
+        key=lambda item: item[0],
+    )
+    uppers = [p[0] for p in parsed]
+    if len(set(uppers)) != len(uppers):
+        raise ValueError("Fulfillment tiers have duplicate upper bounds")
+    if not math.isinf(uppers[-1]):
+        raise ValueError("The heaviest fulfillment tier must be open-ended (e.g. '70+')")
+
+    referral = {k: float(v) for k, v in (data.get("referralFees") or {}).items()}
+    for group, rate in referral.items():
+        if not 0 <= rate < 1:
+            raise ValueError(f"Referral rate for {group!r} must be between 0 and 1, got {rate}")
+
+    upper_arr = np.array(uppers)
+    fee_arr = np.array([p[1] for p in parsed])
+    upper_arr.setflags(write=False)
+    fee_arr.setflags(write=False)
+    return FBAFeeSchedule(
+        tier_names=tuple(p[2] for p in parsed),
+        tier_upper_lbs=upper_arr,
+        tier_fees=fee_arr,
+        referral_rates=MappingProxyType(referral),
+        default_referral_rate=referral.get("Default", 0.15),
+        version=str(data.get("lastUpdated") or data.get("version", "unknown")),
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def get_fee_schedule(path: str = AMAZON_FEES_PATH) -> FBAFeeSchedule:
+    """Fee schedule for a fee file (built once per path)."""
+    with open(path, encoding="utf-8") as f:
+        return build_fee_schedule(json.load(f))
+
+
+def fba_fees_for(
+    category_id: str,
+    unit_weight_kg: float,
+    retail_price: Optional[float],
+    schedule: Optional[FBAFeeSchedule] = None,
+) -> Dict[str, Any]:
+    """
+    FBA fees for one SKU (unrounded).
+
+    Referral is 0 when no retail price is known.
+    """
+    schedule = schedule or get_fee_schedule()
+    weight_lbs = unit_weight_kg * LBS_PER_KG
+    tier = bisect.bisect_left(schedule.tier_upper_lbs, weight_lbs)
+    fulfillment = float(schedule.tier_fees[tier])
+    rate = schedule.referral_rate(category_id)
+    referral = retail_price * rate if retail_price is not None and retail_price > 0 else 0.0
+    return {
+        "channel": FBA_CHANNEL,
+        "fulfillment_tier": schedule.tier_names[tier],
+        "fulfillment_fee_per_unit_usd": fulfillment,
+        "referral_rate_percent": rate * 100.0,
+        "referral_fee_per_unit_usd": referral,
+        "total_fees_per_unit_usd": fulfillment + referral,
+        "fee_schedule_version": schedule.version,
+    }
+
+
+def compute_fba_fees(
+    category_ids: Sequence[str],
+    unit_weights_kg: Any,
+    retail_prices: Any = None,
+    schedule: Optional[FBAFeeSchedule] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    FBA fees for many SKUs at once.
+
+    Args:
+        category_ids: Category ID per SKU
+        unit_weights_kg: Unit weight per SKU (or one for all)
+        retail_prices: Retail price per SKU (NaN/None = referral 0)
+        schedule: Fee schedule (default: bundled fee file)
+
+    Returns:
+        Dict of arrays: fulfillment_tier (index into schedule.tier_names),
+        fulfillment_fee_per_unit_usd, referral_rate_percent,
+        referral_fee_per_unit_usd and total_fees_per_unit_usd.
+    """
+    schedule = schedule or get_fee_schedule()
+    size = len(category_ids)
+    weights = np.broadcast_to(np.asarray(unit_weights_kg, dtype=float), (size,))
+    if retail_prices is None:
+        retail = np.full(size, np.nan)
+    else:
+        retail = np.broadcast_to(np.asarray(retail_prices, dtype=float), (size,))
+
+    tier = np.searchsorted(schedule.tier_upper_lbs, weights * LBS_PER_KG, side="left")
+    fulfillment = schedule.tier_fees[tier]
+
+    rate_memo: Dict[str, float] = {}
+    rates = np.fromiter(
+        (rate_memo.setdefault(c, schedule.referral_rate(c)) for c in category_ids),
+        dtype=float,
+        count=size,
+    )
+    referral = np.where(retail > 0, retail * rates, 0.0)
+    return {
+        "fulfillment_tier": tier,
+        "fulfillment_fee_per_unit_usd": fulfillment,
+        "referral_rate_percent": rates * 100.0,
+        "referral_fee_per_unit_usd": referral,
+        "total_fees_per_unit_usd": fulfillment + referral,
+    }
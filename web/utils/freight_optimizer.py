@@ -0,0 +1,292 @@
+"""
+NexSupply Freight Optimizer - Route × shipping-mode comparison
+Prices an order on every route and mode in data/freight_rates_2025.json
+(air per kg, LCL per CBM, FCL 20ft/40ft containers) in one vectorized pass.
+
+- Air is charged on chargeable weight (max of actual and volumetric)
+- Air and LCL respect the minimum charge
+- FCL uses the cheapest 40ft/20ft mix that fits both volume and payload
+- LCL ↔ FCL crossover volumes are found on a fine CBM grid
+
+Order volume and weight come from the category packing assumptions in the
+compiled cost tables, so results line up with compute_landed_cost.
+"""
+
+import functools
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.cost_index import get_compiled_cost_tables
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+FREIGHT_RATES_PATH = os.path.join(DATA_DIR, "freight_rates_2025.json")
+
+# Usable loading capacity (not nominal internal volume)
+CONTAINER_SPECS = {
+    "20ft": {"usable_cbm": 28.0, "max_payload_kg": 21_700.0},
+    "40ft": {"usable_cbm": 58.0, "max_payload_kg": 26_500.0},
+}
+
+# IATA volumetric divisor 6000 cm³/kg → 166.67 kg per CBM
+AIR_VOLUMETRIC_KG_PER_CBM = 1_000_000 / 6000
+
+# Calculator route IDs (cost table freight_profile) → freight file lanes
+CALCULATOR_ROUTE_LANES = {
+    "cn_to_us_west_coast": "china_to_us_west_coast",
+}
+
+MODES = ("air", "sea_lcl", "sea_fcl")
+MODE_LABELS = {"air": "Air freight", "sea_lcl": "Sea LCL", "sea_fcl": "Sea FCL"}
+
+# CBM grid used to locate LCL/FCL crossovers
+_CROSSOVER_GRID_CBM = np.round(np.arange(0.1, 3 * CONTAINER_SPECS["40ft"]["usable_cbm"], 0.1), 1)
+
+
+@dataclass(frozen=True)
+class FreightOptionTable:
+    """One row per (route, mode) option with its rate columns (NaN = not used)."""
+    routes: Tuple[str, ...]
+    modes: Tuple[str, ...]
+    per_kg: np.ndarray
+    per_cbm: np.ndarray
+    min_charge: np.ndarray
+    per_container_20ft: np.ndarray
+    per_container_40ft: np.ndarray
+    transit_days: np.ndarray
+    version: str
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+
+@functools.lru_cache(maxsize=4)
+def load_freight_options(path: str = FREIGHT_RATES_PATH) -> FreightOptionTable:
+    """Load and flatten the freight rate file (cached per path)."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    rows = []
+    for route, modes in data.get("routes", {}).items():
+        for mode in MODES:
+            if mode not in modes:
+                continue
+            rates = modes[mode]
+            if "transit_days" not in rates:
+                raise ValueError(f"{route}.{mode} is missing transit_days")
+            if mode == "air" and "per_kg" not in rates:
+                raise ValueError(f"{route}.air is missing per_kg")
+            if mode == "sea_lcl" and "per_cbm" not in rates:
+                raise ValueError(f"{route}.sea_lcl is missing per_cbm")
+            if mode == "sea_fcl" and not {"per_container_20ft", "per_container_40ft"} <= set(rates):
+                raise ValueError(f"{route}.sea_fcl needs per_container_20ft and per_container_40ft")
+            rows.append((route, mode, rates))
+
+    if not rows:
+        raise ValueError(f"No freight options found in {path}")
+
+    def column(name: str, default: float = np.nan) -> np.ndarray:
+        arr = np.array([float(r[2].get(name, default)) for r in rows])
+        arr.setflags(write=False)
+        return arr
+
+    return FreightOptionTable(
+        routes=tuple(r[0] for r in rows),
+        modes=tuple(r[1] for r in rows),
+        per_kg=column("per_kg"),
+        per_cbm=column("per_cbm"),
+        min_charge=column("min_charge", 0.0),
+        per_container_20ft=column("per_container_20ft"),
+        per_container_40ft=column("per_container_40ft"),
+        transit_days=column("transit_days"),
+        version=str(data.get("lastUpdated") or data.get("version", "unknown")),
+    )
+
+
+def freight_cost_matrix(
+    table: FreightOptionTable,
+    cbm: Any,
+    weight_kg: Any,
+) -> Dict[str, np.ndarray]:
+    """
+    Freight cost for every volume × option.
+
+    Args:
+        table: Flattened freight options
+        cbm: Shipment volumes, shape (V,)
+        weight_kg: Shipment gross weights, shape (V,)
+
+    Returns:
+        Dict of (V, O) arrays: cost_usd, containers_20ft, containers_40ft,
+        plus min_charge_applied (bool).
+    """
+    cbm = np.atleast_1d(np.asarray(cbm, dtype=float))[:, None]
+    kg = np.atleast_1d(np.asarray(weight_kg, dtype=float))[:, None]
+    shape = (cbm.shape[0], len(table))
+    mode = np.array(table.modes)
+
+    # Air: chargeable weight
+    chargeable = np.maximum(kg, cbm * AIR_VOLUMETRIC_KG_PER_CBM)
+    air = chargeable * table.per_kg
+    # LCL: per CBM
+    lcl = cbm * table.per_cbm
+    raw = np.where(mode == "air", air, lcl)
+    priced = np.maximum(raw, table.min_charge)
+    min_applied = (mode != "sea_fcl") & (raw < table.min_charge)
+
+    # FCL: full 40ft boxes, then the cheaper of a 20ft/40ft for the remainder
+    spec20, spec40 = CONTAINER_SPECS["20ft"], CONTAINER_SPECS["40ft"]
+    load40 = np.maximum(cbm / spec40["usable_cbm"], kg / spec40["max_payload_kg"])
+    full40 = np.floor(load40)
+    rem_cbm = np.maximum(cbm - full40 * spec40["usable_cbm"], 0.0)
+    rem_kg = np.maximum(kg - full40 * spec40["max_payload_kg"], 0.0)
+    has_rem = (rem_cbm > 1e-9) | (rem_kg > 1e-9)
+    fits20 = (rem_cbm <= spec20["usable_cbm"]) & (rem_kg <= spec20["max_payload_kg"])
+    use20 = has_rem & fits20 & (table.per_container_20ft <= table.per_container_40ft)
+    extra40 = has_rem & ~use20
+    n20 = np.broadcast_to(use20, shape).astype(np.int64)
+    n40 = np.broadcast_to(full40 + extra40, shape).astype(np.int64)
+    fcl = n40 * table.per_container_40ft + n20 * table.per_container_20ft
+
+    is_fcl = mode == "sea_fcl"
+    return {
+        "cost_usd": np.where(is_fcl, fcl, priced),
+        "containers_20ft": np.where(is_fcl, n20, 0),
+        "containers_40ft": np.where(is_fcl, n40, 0),
+        "min_charge_applied": np.broadcast_to(min_applied, shape),
+    }
+
+
+def _option_dict(table: FreightOptionTable, j: int, costs: Dict[str, np.ndarray], units: int) -> Dict[str, Any]:
+    option = {
+        "route": table.routes[j],
+        "mode": table.modes[j],
+        "mode_label": MODE_LABELS[table.modes[j]],
+        "cost_usd": round(float(costs["cost_usd"][0, j]), 2),
+        "cost_per_unit_usd": round(float(costs["cost_usd"][0, j]) / units, 4),
+        "transit_days": int(table.transit_days[j]),
+        "min_charge_applied": bool(costs["min_charge_applied"][0, j]),
+    }
+    if table.modes[j] == "sea_fcl":
+        option["containers"] = {
+            "20ft": int(costs["containers_20ft"][0, j]),
+            "40ft": int(costs["containers_40ft"][0, j]),
+        }
+    return option
+
+
+def find_lcl_fcl_crossovers(
+    table: FreightOptionTable,
+    kg_per_cbm: float,
+    units_per_cbm: float,
+) -> List[Dict[str, Any]]:
+    """
+    Volumes at which the cheaper of sea LCL and FCL changes, per route that
+    offers both, on a 0.1 CBM grid up to three 40ft containers.
+
+    FCL is priced per container, a step function of volume, so it can
+    undercut LCL, lose again just past a container's capacity and undercut
+    it once more. Every change on the grid is listed in `switches` (volume,
+    the mode that is cheaper from there on, and both costs). The top-level
+    cbm / units / costs are the first volume where FCL is no more expensive
+    than LCL (None if it never is).
+    """
+    grid = _CROSSOVER_GRID_CBM
+    costs = freight_cost_matrix(table, grid, grid * kg_per_cbm)["cost_usd"]
+
+    def point(i: int, lcl: int, fcl: int) -> Dict[str, Any]:
+        cbm = float(grid[i])
+        return {
+            "cbm": cbm,
+            "units": int(np.ceil(cbm * units_per_cbm)),
+            "lcl_cost_usd": round(float(costs[i, lcl]), 2),
+            "fcl_cost_usd": round(float(costs[i, fcl]), 2),
+        }
+
+    crossovers = []
+    for route in dict.fromkeys(table.routes):
+        idx = {m: j for j, (r, m) in enumerate(zip(table.routes, table.modes)) if r == route}
+        if "sea_lcl" not in idx or "sea_fcl" not in idx:
+            continue
+        lcl, fcl = idx["sea_lcl"], idx["sea_fcl"]
+        fcl_cheaper = costs[:, fcl] <= costs[:, lcl]
+        changes = np.nonzero(np.diff(fcl_cheaper.astype(np.int8)))[0] + 1
+        switches = [
+            dict(point(i, lcl, fcl), cheaper="sea_fcl" if fcl_cheaper[i] else "sea_lcl")
+            for i in changes.tolist()
+        ]
+        first = np.nonzero(fcl_cheaper)[0]
+        if first.size == 0:
+            crossovers.append({"route": route, "cbm": None, "units": None, "switches": switches})
+            continue
+        crossovers.append({"route": route, **point(int(first[0]), lcl, fcl), "switches": switches})
+    return crossovers
+
+
+def optimize_freight(
+    category_id: str,
+    units: int,
+    custom_unit_weight_kg: Optional[float] = None,
+    routes: Optional[Sequence[str]] = None,
+    rates_path: str = FREIGHT_RATES_PATH,
+) -> Dict[str, Any]:
+    """
+    Compare every route × mode for an order.
+
+    Args:
+        category_id: Category ID (packing density and unit weight)
+        units: Order quantity
+        custom_unit_weight_kg: Per-unit weight override
+        routes: Restrict to these routes (freight-file lanes or calculator
+            route IDs from CALCULATOR_ROUTE_LANES; default: all)
+        rates_path: Freight rate file
+
+    Returns:
+        Order volume/weight, all options sorted by cost, the cheapest and
+        fastest option, and LCL/FCL crossover volumes per route.
+    """
+    if units <= 0:
+        raise ValueError("units must be positive")
+
+    table = load_freight_options(rates_path)
+    compiled = get_compiled_cost_tables()
+    coeffs = compiled.view(compiled.category_id_of(category_id))
+    unit_weight = custom_unit_weight_kg or coeffs.default_unit_weight_kg
+    units_per_cbm = coeffs.default_units_per_carton * coeffs.default_cartons_per_cbm
+
+    total_cbm = units / units_per_cbm
+    total_kg = units * unit_weight
+    costs = freight_cost_matrix(table, [total_cbm], [total_kg])
+
+    lanes = None if routes is None else {CALCULATOR_ROUTE_LANES.get(r, r) for r in routes}
+    selected = [
+        j for j in range(len(table))
+        if lanes is None or table.routes[j] in lanes
+    ]
+    if not selected:
+        raise ValueError(f"No freight options for routes: {routes}")
+
+    options = [_option_dict(table, j, costs, units) for j in selected]
+    options.sort(key=lambda o: (o["cost_usd"], o["transit_days"]))
+    fastest = min(options, key=lambda o: (o["transit_days"], o["cost_usd"]))
+
+    return {
+        "rates_version": table.version,
+        "order": {
+            "category_id": category_id,
+            "units": units,
+            "total_cbm": round(total_cbm, 3),
+            "total_weight_kg": round(total_kg, 2),
+            "air_chargeable_weight_kg": round(max(total_kg, total_cbm * AIR_VOLUMETRIC_KG_PER_CBM), 2),
+        },
+        "options": options,
+        "cheapest": options[0],
+        "fastest": fastest,
+        "lcl_fcl_crossover": find_lcl_fcl_crossovers(
+            table, unit_weight * units_per_cbm, units_per_cbm
+        ),
+    }
@@ -8,6 +8,63 @@ from typing import Dict, Optional, Tuple
 from utils.config import AppSettings
 
 
+# Market mappings (first key found in the query wins)
+MARKET_MAP = {
+    # Korean
+    '미국': 'USA',
+    '미국시장': 'USA',
+    '미국 시장': 'USA',
+    'us': 'USA',
+    'usa': 'USA',
+    'united states': 'USA',
+    'u.s.': 'USA',
+    'u.s.a.': 'USA',
+    
+    # Other markets (add as needed)
+    'eu': 'EU',
+    '유럽': 'EU',
+    'europe': 'EU',
+    'uk': 'UK',
+    '영국': 'UK',
+    'united kingdom': 'UK',
+    'canada': 'Canada',
+    '캐나다': 'Canada',
+    'australia': 'Australia',
+    '호주': 'Australia',
+}
+
+# Channel mappings (first key found in the query wins)
+CHANNEL_MAP = {
+    # Korean
+    '편의점': 'Convenience Store',
+    '편의점 시장': 'Convenience Store',
+    '편의점시장': 'Convenience Store',
+    '온라인': 'Online',
+    '오프라인': 'Offline',
+    '소매': 'Retail',
+    '도매': 'Wholesale',
+    
+    # English
+    'amazon fba': 'Amazon FBA',
+    'amazon': 'Amazon FBA',
+    'fba': 'Amazon FBA',
+    'convenience store': 'Convenience Store',
+    'retail': 'Retail',
+    'wholesale': 'Wholesale',
+    'online': 'Online',
+    'offline': 'Offline',
+    'e-commerce': 'E-commerce',
+    'ecommerce': 'E-commerce',
+}
+
+# Default shipping route per parsed target market
+TARGET_MARKET_ROUTES = {
+    "USA": "cn_to_us_west_coast",
+    "EU": "cn_to_eu",
+    "UK": "cn_to_uk",
+}
+
+
 def parse_volume(text: str) -> Optional[int]:
     """
     Parse volume/quantity from text.
@@ -56,7 +113,7 @@ def parse_volume(text: str) -> Optional[int]:
             return int(number * multiplier)
     
     # Plain numbers (remove commas)
-    number_match = re.search(r'(\d{1,3}(?:,\d{3})*(?:\.\d+)?)', text)
+    number_match = re.search(r'(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)', text)
     if number_match:
         number_str = number_match.group(1).replace(',', '')
         try:
@@ -82,32 +139,7 @@ def parse_target_market(text: str) -> Optional[str]:
     
     text_lower = text.lower()
     
-    # Market mappings
-    market_map = {
-        # Korean
-        '미국': 'USA',
-        '미국시장': 'USA',
-        '미국 시장': 'USA',
-        'us': 'USA',
-        'usa': 'USA',
-        'united states': 'USA',
-        'u.s.': 'USA',
-        'u.s.a.': 'USA',
-        
-        # Other markets (add as needed)
-        'eu': 'EU',
-        '유럽': 'EU',
-        'europe': 'EU',
-        'uk': 'UK',
-        '영국': 'UK',
-        'united kingdom': 'UK',
-        'canada': 'Canada',
-        '캐나다': 'Canada',
-        'australia': 'Australia',
-        '호주': 'Australia',
-    }
-    
-    for key, value in market_map.items():
+    for key, value in MARKET_MAP.items():
         if key in text_lower:
             return value
     
@@ -129,31 +161,7 @@ def parse_channel(text: str) -> Optional[str]:
     
     text_lower = text.lower()
     
-    # Channel mappings
-    channel_map = {
-        # Korean
-        '편의점': 'Convenience Store',
-        '편의점 시장': 'Convenience Store',
-        '편의점시장': 'Convenience Store',
-        '온라인': 'Online',
-        '오프라인': 'Offline',
-        '소매': 'Retail',
-        '도매': 'Wholesale',
-        
-        # English
-        'amazon fba': 'Amazon FBA',
-        'amazon': 'Amazon FBA',
-        'fba': 'Amazon FBA',
-        'convenience store': 'Convenience Store',
-        'retail': 'Retail',
-        'wholesale': 'Wholesale',
-        'online': 'Online',
-        'offline': 'Offline',
-        'e-commerce': 'E-commerce',
-        'ecommerce': 'E-commerce',
-    }
-    
-    for key, value in channel_map.items():
+    for key, value in CHANNEL_MAP.items():
         if key in text_lower:
             return value
     
@@ -189,13 +197,7 @@ def parse_input_parameters(query: str) -> Dict[str, any]:
     channel = parse_channel(query_str)
     
     # Infer route from target_market
-    route = None
-    if target_market == "USA":
-        route = "cn_to_us_west_coast"
-    elif target_market == "EU":
-        route = "cn_to_eu"
-    elif target_market == "UK":
-        route = "cn_to_uk"
+    route = TARGET_MARKET_ROUTES.get(target_market)
     
     result = {}
     if volume:
@@ -0,0 +1,147 @@
+"""
+NexSupply JSON Stream - Incremental parsing of a streamed JSON object
+Lets the UI show parts of an LLM answer while it is still generating:
+text chunks are fed in as they arrive and every top-level member of the
+root object is returned as soon as its value is complete.
+
+- Anything before the first "{" (e.g. a ```json fence) is skipped, and
+  so is anything after the root object closes
+- A single forward scan tracks nesting depth and string/escape state, so
+  each character is looked at once; a member is parsed with json.loads
+  only when it is complete
+- A member that fails to parse is skipped (the caller still parses the
+  full text at the end)
+
+SectionCollector groups top-level keys into display sections and reports
+a section once all of its keys have arrived.
+"""
+
+import json
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+# Top-level keys of the hybrid insight schema (utils/prompts.py), grouped
+# into the sections the results page shows
+INSIGHT_SECTIONS = {
+    "product": ("product_name",),
+    "market_snapshot": (
+        "demand_level", "demand_notes", "margin_range_percent",
+        "competition_level", "competition_notes",
+    ),
+    "hidden_costs": ("hidden_cost_alerts",),
+    "suppliers": ("suppliers",),
+    "risk_overview": ("risk_overview",),
+}
+
+
+class IncrementalJSONObjectParser:
+    """Feed text chunks of one JSON object; get its completed top-level members."""
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0          # next character to scan
+        self._start = 0        # start of the current member
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.done = False
+        self.members = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk; returns the (key, value) pairs completed by it, in order."""
+        if self.done or not chunk:
+            return []
+        self._buffer += chunk
+        completed: List[Tuple[str, Any]] = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._start = i + 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._member(buffer[self._start:i]))
+                    self.done = True
+                    break
+            elif ch == "," and self._depth == 1:
+                completed.extend(self._member(buffer[self._start:i]))
+                # Drop the consumed prefix so the buffer holds one member at most
+                buffer = buffer[i + 1:]
+                i, self._start = -1, 0
+            i += 1
+
+        self._buffer = buffer
+        self._pos = i
+        return completed
+
+    def _member(self, text: str) -> List[Tuple[str, Any]]:
+        if not text.strip():
+            return []
+        try:
+            member = json.loads("{" + text + "}")
+        except json.JSONDecodeError:
+            return []
+        self.members += len(member)
+        return list(member.items())
+
+
+class SectionCollector:
+    """Collects top-level members and reports each section when it is complete."""
+
+    def __init__(self, sections: Mapping[str, Sequence[str]] = INSIGHT_SECTIONS):
+        self.sections = {name: tuple(keys) for name, keys in sections.items()}
+        self.values: Dict[str, Any] = {}
+        self.emitted: List[str] = []
+
+    def add(self, key: str, value: Any) -> List[Tuple[str, Dict[str, Any]]]:
+        """Record one member; returns the sections it completed as (name, {key: value})."""
+        self.values[key] = value
+        ready = []
+        for name, keys in self.sections.items():
+            if name in self.emitted or key not in keys:
+                continue
+            if all(k in self.values for k in keys):
+                self.emitted.append(name)
+                ready.append((name, {k: self.values[k] for k in keys}))
+        return ready
+
+    def flush(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Sections not yet reported that got at least one key (end of stream)."""
+        ready = []
+        for name, keys in self.sections.items():
+            present = {k: self.values[k] for k in keys if k in self.values}
+            if name not in self.emitted and present:
+                self.emitted.append(name)
+                ready.append((name, present))
+        return ready
+
+
+def stream_sections(
+    chunks: Sequence[str],
+    sections: Optional[Mapping[str, Sequence[str]]] = None,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """All sections from a sequence of chunks, in completion order (for tests and tools)."""
+    parser = IncrementalJSONObjectParser()
+    collector = SectionCollector(sections or INSIGHT_SECTIONS)
+    ready = []
+    for chunk in chunks:
+        for key, value in parser.feed(chunk):
+            ready.extend(collector.add(key, value))
+    ready.extend(collector.flush())
+    return ready
@@ -0,0 +1,263 @@
+"""
+NexSupply Lead Time Simulation - P50/P90 delivery times per order
+Replaces the fixed production + 28 + 5 + 7 day constants with a
+distribution sampled from the stage ranges in LEAD_TIME_BREAKDOWN.
+
+- Each stage is triangular on [min_days, max_days] with its mode chosen so
+  the mean equals avg_days (clipped to the range)
+- A supplier lead time quote ("25-35") replaces the factory stages
+  (raw material procurement + production), mode at the midpoint
+- P(on time) is the share of samples at or below the requested days
+
+All orders share one set of uniform draws (common random numbers), so
+orders with the same supplier quote share one sorted sample row: the work
+is one vectorized pass per distinct quote, and each order's on-time
+probability is a binary search in its row. A seeded generator makes runs
+reproducible.
+"""
+
+import math
+import numbers
+import re
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.cost_tables import LEAD_TIME_BREAKDOWN
+
+
+DEFAULT_SAMPLES = 10_000
+MAX_SAMPLES = 200_000
+DEFAULT_SEED = 0
+
+# Stages a supplier's quoted lead time covers
+FACTORY_STAGES = ("raw_material_procurement", "production")
+
+# Dashboard groups (stage names from LEAD_TIME_BREAKDOWN)
+STAGE_GROUPS = {
+    "production_days": (
+        "order_processing",
+        "raw_material_procurement",
+        "production",
+        "quality_control",
+        "packaging",
+    ),
+    "shipping_days": ("sea_freight",),
+    "customs_days": ("customs_clearance",),
+}
+
+SAFETY_STOCK_DAYS = 14
+
+_RANGE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:[-–~]|to)\s*(\d+(?:\.\d+)?)")
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+DayRange = Tuple[float, float]
+
+
+def parse_day_range(value: Any) -> Optional[DayRange]:
+    """
+    Parse a lead time quote into (min_days, max_days).
+
+    Accepts "25-35", "25–35", "25 to 35 days", a single number or a
+    (min, max) pair. Returns None when nothing usable is found.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, numbers.Real):  # numpy scalars too
+        return (float(value), float(value)) if value > 0 else None
+    if isinstance(value, (tuple, list)) and len(value) == 2:
+        low, high = float(value[0]), float(value[1])
+    else:
+        text = str(value)
+        match = _RANGE_PATTERN.search(text)
+        if match:
+            low, high = float(match.group(1)), float(match.group(2))
+        else:
+            match = _NUMBER_PATTERN.search(text)
+            if not match:
+                return None
+            low = high = float(match.group(0))
+    if low > high:
+        low, high = high, low
+    return (low, high) if high > 0 else None
+
+
+def _stage_params(stages: Mapping[str, Mapping[str, float]]) -> Dict[str, Tuple[float, float, float]]:
+    """(low, mode, high) per stage; the mode is solved from the average."""
+    params = {}
+    for name, stage in stages.items():
+        if name == "total":  # summary row, not a stage
+            continue
+        low, high = float(stage["min_days"]), float(stage["max_days"])
+        if not 0 <= low <= high:
+            raise ValueError(f"Invalid lead time range for {name!r}: {stage}")
+        mean = float(stage.get("avg_days", (low + high) / 2))
+        mode = min(max(3.0 * mean - low - high, low), high)
+        params[name] = (low, mode, high)
+    return params
+
+
+def _triangular(u: np.ndarray, low: float, mode: float, high: float) -> np.ndarray:
+    """Inverse CDF of the triangular distribution applied to uniforms."""
+    if high == low:
+        return np.full(u.shape, low)
+    width = high - low
+    split = (mode - low) / width
+    return np.where(
+        u < split,
+        low + np.sqrt(u * width * (mode - low)),
+        high - np.sqrt((1.0 - u) * width * (high - mode)),
+    )
+
+
+def _requested_days(value: Any, today: Optional[date] = None) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, date):
+        return float((value - (today or date.today())).days)
+    return float(value)
+
+
+def simulate_lead_times(
+    supplier_lead_times: Sequence[Any],
+    requested_days: Any = None,
+    samples: int = DEFAULT_SAMPLES,
+    seed: Optional[int] = None,
+    stages: Mapping[str, Mapping[str, float]] = LEAD_TIME_BREAKDOWN,
+) -> Dict[str, Any]:
+    """
+    Lead time distributions for many orders at once.
+
+    Args:
+        supplier_lead_times: Supplier quote per order ("25-35", number,
+            (min, max) or None for the benchmark factory stages)
+        requested_days: Days until the requested delivery per order, one
+            for all, or None; dates are converted relative to today
+        samples: Number of draws (1,000 - 200,000)
+        seed: Seed for numpy's default_rng; same seed gives the same result
+        stages: Stage ranges (default LEAD_TIME_BREAKDOWN)
+
+    Returns:
+        Dict of per-order arrays: p10_days, p50_days, p90_days, mean_days,
+        on_time_probability (NaN without a requested date) and the P50 of
+        each STAGE_GROUPS group, plus samples and seed.
+    """
+    if not 1_000 <= samples <= MAX_SAMPLES:
+        raise ValueError(f"samples must be between 1,000 and {MAX_SAMPLES:,}")
+    params = _stage_params(stages)
+    missing = [name for group in STAGE_GROUPS.values() for name in group if name not in params]
+    if missing:
+        raise ValueError(f"Lead time stages missing: {missing}")
+
+    size = len(supplier_lead_times)
+    if isinstance(requested_days, date) or np.ndim(requested_days) == 0:  # None, numpy scalars too
+        requested = np.full(size, _requested_days(requested_days))
+    else:
+        if len(requested_days) != size:
+            raise ValueError(f"Column length {len(requested_days)} does not match {size} orders")
+        today = date.today()
+        requested = np.array([_requested_days(d, today) for d in requested_days], dtype=float)
+
+    # Distinct quotes → one sample row each
+    keys: Dict[Optional[DayRange], int] = {}
+    row_of = np.fromiter(
+        (keys.setdefault(parse_day_range(q), len(keys)) for q in supplier_lead_times),
+        dtype=np.intp,
+        count=size,
+    )
+
+    rng = np.random.default_rng(seed)
+    names = list(params)
+    uniforms = dict(zip(names, rng.random((len(names), samples))))
+    draws = {name: _triangular(uniforms[name], *params[name]) for name in names}
+
+    default_factory = sum(draws[name] for name in FACTORY_STAGES)
+    shared = sum(draws[name] for name in names if name not in FACTORY_STAGES)
+    factory_u = uniforms[FACTORY_STAGES[-1]]
+
+    factory_rows = []
+    for quote in keys:
+        if quote is None:
+            factory_rows.append(default_factory)
+        else:
+            low, high = quote
+            factory_rows.append(_triangular(factory_u, low, (low + high) / 2.0, high))
+    factory = np.vstack(factory_rows) if factory_rows else np.empty((0, samples))
+    totals = np.sort(shared + factory, axis=1)
+
+    p10, p50, p90 = np.percentile(totals, [10, 50, 90], axis=1) if len(keys) else np.empty((3, 0))
+    on_time = np.full(size, np.nan)
+    has_date = ~np.isnan(requested)
+    for row in range(len(keys)):
+        picked = has_date & (row_of == row)
+        if picked.any():
+            on_time[picked] = np.searchsorted(totals[row], requested[picked], side="right") / samples
+
+    group_p50 = {}
+    for group, group_stages in STAGE_GROUPS.items():
+        if set(group_stages) & set(FACTORY_STAGES):
+            others = sum(draws[name] for name in group_stages if name not in FACTORY_STAGES)
+            values = np.median(others + factory, axis=1) if len(keys) else np.empty(0)
+        else:
+            values = np.full(len(keys), np.median(sum(draws[name] for name in group_stages)))
+        group_p50[group] = values[row_of]
+
+    return {
+        "p10_days": p10[row_of],
+        "p50_days": p50[row_of],
+        "p90_days": p90[row_of],
+        "mean_days": totals.mean(axis=1)[row_of] if len(keys) else np.empty(0),
+        "on_time_probability": on_time,
+        **group_p50,
+        "samples": samples,
+        "seed": seed,
+    }
+
+
+def estimate_lead_time(
+    supplier_lead_time: Any = None,
+    requested_days: Union[int, float, date, None] = None,
+    samples: int = DEFAULT_SAMPLES,
+    seed: Optional[int] = DEFAULT_SEED,
+) -> Dict[str, Any]:
+    """
+    Lead time summary for one order, in the dashboard's day fields.
+
+    production/shipping/customs are stage-group medians; buffer_days tops
+    them up to the P90, so total_days is the date to plan against.
+    """
+    sim = simulate_lead_times([supplier_lead_time], requested_days, samples=samples, seed=seed)
+    groups = {group: int(round(float(sim[group][0]))) for group in STAGE_GROUPS}
+    p50 = float(sim["p50_days"][0])
+    p90 = float(sim["p90_days"][0])
+    total = int(math.ceil(p90))
+    on_time = float(sim["on_time_probability"][0])
+
+    return {
+        "method": "monte_carlo",
+        "samples": samples,
+        "seed": seed,
+        **groups,
+        "buffer_days": max(total - sum(groups.values()), 0),
+        "total_days": total,
+        "p10_days": round(float(sim["p10_days"][0]), 1),
+        "p50_days": round(p50, 1),
+        "p90_days": round(p90, 1),
+        "requested_days": None if on_time != on_time else _requested_days(requested_days),
+        "on_time_probability": None if on_time != on_time else round(on_time, 3),
+        "safety_stock_days": SAFETY_STOCK_DAYS,
+    }
+
+
+def lead_time_records(sim: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Per-order rounded dicts from a simulate_lead_times() result."""
+    columns = ("p10_days", "p50_days", "p90_days", "mean_days", *STAGE_GROUPS)
+    lists = {name: np.round(sim[name], 1).tolist() for name in columns}
+    on_time = sim["on_time_probability"].tolist()
+    records = []
+    for i in range(len(on_time)):
+        record = {name: values[i] for name, values in lists.items()}
+        record["on_time_probability"] = None if on_time[i] != on_time[i] else round(on_time[i], 3)
+        records.append(record)
+    return records
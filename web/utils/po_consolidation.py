@@ -0,0 +1,159 @@
+"""
+NexSupply PO Consolidation - Multi-SKU shipments with shared fixed costs
+compute_landed_cost prices one SKU as if it shipped alone, so every SKU
+carries a full broker fee, port charges and QC visit. A real PO ships many
+SKUs together: volume and weight are pooled and the per-shipment costs are
+paid once, then allocated back to the lines.
+
+Shared once per PO (largest line value is used, since one broker / one QC
+visit must cover the most demanding SKU):
+- docs_and_broker_per_shipment_usd
+- port_misc_per_shipment_usd
+- qc_cost_per_order_usd
+
+Certification stays per SKU. Variable costs (FOB, packing, per-CBM freight,
+duty) are unchanged by pooling. All lines are priced in one
+compute_landed_cost_batch pass, so the work is linear in the line count.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from utils.cost_calculator import COMPONENT_KEYS, compute_landed_cost_batch
+
+
+# Per-shipment costs charged once for the whole PO
+SHARED_COST_KEYS = ("customs_broker", "port_misc", "qc_inspection")
+
+ALLOCATION_METHODS = ("cbm", "value", "units")
+
+
+@dataclass
+class POLine:
+    """One SKU line of a purchase order."""
+    category_id: str
+    units: int
+    sku: Optional[str] = None
+    custom_unit_weight_kg: Optional[float] = None
+    retail_price_per_unit: Optional[float] = None
+
+
+def _as_line(line: Union[POLine, Mapping[str, Any]]) -> POLine:
+    return line if isinstance(line, POLine) else POLine(**line)
+
+
+def compute_consolidated_po(
+    lines: Sequence[Union[POLine, Mapping[str, Any]]],
+    route: Optional[str] = None,
+    allocation: str = "cbm",
+    incoterm: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Landed cost for a multi-SKU PO shipped as one consolidated shipment.
+
+    Args:
+        lines: PO lines (POLine or dicts with the same fields)
+        route: Shipping route for the whole PO (default from AppSettings)
+        allocation: How shared costs are split: "cbm", "value" (FOB) or "units"
+        incoterm: Incoterm recorded in the assumptions (default from AppSettings)
+
+    Returns:
+        Dict with a "po" summary (pooled volume/weight, shared costs, totals
+        and savings vs. shipping each SKU alone) and per-SKU "lines".
+    """
+    if allocation not in ALLOCATION_METHODS:
+        raise ValueError(f"allocation must be one of {ALLOCATION_METHODS}, got {allocation!r}")
+    lines = [_as_line(line) for line in lines]
+    if not lines:
+        raise ValueError("A PO needs at least one line")
+
+    batch = compute_landed_cost_batch(
+        [line.category_id for line in lines],
+        [line.units for line in lines],
+        routes=route,
+        unit_weights_kg=[line.custom_unit_weight_kg or np.nan for line in lines],
+        retail_prices=[
+            line.retail_price_per_unit if line.retail_price_per_unit is not None else np.nan
+            for line in lines
+        ],
+        incoterm=incoterm,
+    )
+    cols = batch.columns
+    units = batch.units.astype(float)
+
+    # Shared costs: charged once, at the level of the most demanding line
+    shared = {key: float(cols[key].max()) for key in SHARED_COST_KEYS}
+    shared_total = sum(shared.values())
+    standalone_shared = sum(cols[key] for key in SHARED_COST_KEYS)
+
+    basis = {
+        "cbm": cols["total_cbm"],
+        "value": cols["product_fob"],
+        "units": units,
+    }[allocation]
+    basis_total = basis.sum()
+    if basis_total <= 0:
+        basis, basis_total = units, units.sum()
+    shares = basis / basis_total
+    allocated = shared_total * shares
+
+    standalone_total = cols["total_landed_cost_usd"]
+    landed_total = standalone_total - standalone_shared + allocated
+    per_unit = landed_total / units
+
+    retail = batch.retail_prices
+    with np.errstate(invalid="ignore", divide="ignore"):
+        margin_percent = np.where(retail > 0, (retail - per_unit) / retail * 100.0, np.nan)
+
+    components = {key: float(cols[key].sum()) for key in COMPONENT_KEYS}
+    components["handling"] += shared_total - float(standalone_shared.sum())
+
+    po_total = float(landed_total.sum())
+    po_standalone = float(standalone_total.sum())
+
+    columns = {
+        "total_cbm": cols["total_cbm"].round(4).tolist(),
+        "total_weight_kg": cols["total_weight_kg"].round(2).tolist(),
+        "allocation_share_percent": (shares * 100.0).round(2).tolist(),
+        "allocated_shared_cost_usd": allocated.round(2).tolist(),
+        "landed_cost_usd": landed_total.round(2).tolist(),
+        "landed_cost_per_unit_usd": per_unit.round(4).tolist(),
+        "standalone_cost_per_unit_usd": cols["landed_cost_per_unit_usd"].round(4).tolist(),
+        "savings_per_unit_usd": (cols["landed_cost_per_unit_usd"] - per_unit).round(4).tolist(),
+        "gross_margin_percent": margin_percent.round(1).tolist(),
+    }
+    result_lines: List[Dict[str, Any]] = []
+    for i, line in enumerate(lines):
+        entry = {
+            "sku": line.sku or f"line_{i + 1}",
+            "category_id": batch.category_ids[i],
+            "units": int(batch.units[i]),
+        }
+        for name, values in columns.items():
+            entry[name] = values[i]
+        if entry["gross_margin_percent"] != entry["gross_margin_percent"]:  # NaN
+            entry["gross_margin_percent"] = None
+        result_lines.append(entry)
+
+    total_units = int(batch.units.sum())
+    return {
+        "po": {
+            "line_count": len(lines),
+            "route": batch.routes[0],
+            "incoterm": batch.incoterm,
+            "cost_table_version": batch.table_version,
+            "allocation": allocation,
+            "total_units": total_units,
+            "total_cbm": round(float(cols["total_cbm"].sum()), 3),
+            "total_weight_kg": round(float(cols["total_weight_kg"].sum()), 2),
+            "shared_costs_usd": {k: round(v, 2) for k, v in shared.items()},
+            "components_usd": {k: round(v, 2) for k, v in components.items()},
+            "total_landed_cost_usd": round(po_total, 2),
+            "landed_cost_per_unit_usd": round(po_total / total_units, 4),
+            "standalone_total_usd": round(po_standalone, 2),
+            "consolidation_savings_usd": round(po_standalone - po_total, 2),
+        },
+        "lines": result_lines,
+    }
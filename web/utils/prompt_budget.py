@@ -0,0 +1,194 @@
+"""
+NexSupply Prompt Budget - Compact hybrid prompts within a token budget
+The hybrid insight prompt used to embed the full landed cost result as
+indented JSON (breakdown, assumptions, regulations text, fee schedule).
+The model only needs the totals, component shares, a few assumptions and
+short compliance/benchmark hints, so this module
+
+- reduces the landed cost result to those fields, in compact JSON
+- estimates prompt tokens locally before sending (no count_tokens round trip)
+- keeps each prompt within its mode's token budget by dropping landed cost
+  detail level by level, then shortening the user input
+- caps max_output_tokens per analysis mode
+
+Token counts are estimates (about 4 characters per token for Latin text,
+one per character for CJK/Hangul); budgets leave headroom for that.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from utils.prompts import HYBRID_SYSTEM_PROMPT, build_hybrid_prompt
+
+
+# Prompt token budgets per analysis mode (system prompt + user prompt).
+# The fixed instructions are ~1,800 tokens; verify keeps more compliance detail.
+PROMPT_TOKEN_BUDGETS = {
+    "general": 2600,
+    "cost": 2600,
+    "market": 2600,
+    "verify": 2800,
+    "leadtime": 2400,
+}
+DEFAULT_PROMPT_TOKEN_BUDGET = 2600
+
+# The insight JSON is ~1k tokens; the rest is headroom for model thinking
+MAX_OUTPUT_TOKENS = {
+    "general": 8192,
+    "cost": 6144,
+    "market": 8192,
+    "verify": 6144,
+    "leadtime": 6144,
+}
+DEFAULT_MAX_OUTPUT_TOKENS = 8192
+
+IMAGE_TOKENS = 258          # Gemini's fixed cost for one image part
+MIN_USER_INPUT_CHARS = 200  # user input is never shortened below this
+DETAIL_LEVELS = (2, 1, 0)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count: ~4 ASCII characters per token, 1 per other character."""
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def compact_json(obj: Any) -> str:
+    """JSON without indentation or spaces after separators."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_landed_cost(result: Dict[str, Any], detail: int = 2) -> Dict[str, Any]:
+    """
+    The parts of a compute_landed_cost() result the insight prompt needs.
+
+    Args:
+        result: Landed cost result
+        detail: 2 = totals, components, key assumptions, benchmarks,
+            compliance and channel fees; 1 = without risk flags and fee
+            details; 0 = totals and component shares only
+
+    Returns:
+        Dict ready for compact_json()
+    """
+    compact: Dict[str, Any] = {
+        "units": result.get("units"),
+        "total_landed_cost_usd": result.get("total_landed_cost_usd"),
+        "landed_cost_per_unit_usd": result.get("landed_cost_per_unit_usd"),
+        "components_share_percent": result.get("components_share_percent"),
+    }
+    if detail < 1:
+        return compact
+
+    compact["components_usd"] = {k: round(v) for k, v in (result.get("components_usd") or {}).items()}
+    assumptions = result.get("assumptions") or {}
+    compact["assumptions"] = {
+        k: assumptions[k]
+        for k in ("route", "incoterm", "target_market", "hs_code", "duty_rate_percent", "unit_weight_kg")
+        if assumptions.get(k) is not None
+    }
+    benchmarks = result.get("benchmarks")
+    if benchmarks:
+        compact["benchmarks"] = benchmarks
+
+    compliance = result.get("compliance") or {}
+    if compliance:
+        summary = {
+            "certifications": [c.get("code") for c in compliance.get("certifications") or [] if c.get("code")],
+            "cert_cost_usd": (compliance.get("cert_cost_usd") or {}).get("average"),
+            "timeline_weeks": compliance.get("timeline_weeks"),
+        }
+        if detail >= 2 and compliance.get("high_risk_flags"):
+            # Keep the flag names ("Painted Logos/Designs"), not the explanations
+            summary["risk_flags"] = [flag.split(":", 1)[0] for flag in compliance["high_risk_flags"]]
+        compact["compliance"] = summary
+
+    fees = result.get("channel_fees") or {}
+    if fees:
+        if detail >= 2:
+            compact["channel_fees"] = {
+                k: fees[k]
+                for k in ("channel", "fulfillment_fee_per_unit_usd", "referral_rate_percent",
+                          "total_fees_per_unit_usd")
+                if fees.get(k) is not None
+            }
+        else:
+            compact["channel_fees_per_unit_usd"] = fees.get("total_fees_per_unit_usd")
+    return compact
+
+
+@dataclass(frozen=True)
+class HybridPrompt:
+    """A hybrid insight prompt and how it was fitted to the budget."""
+
+    text: str
+    tokens: int             # estimated, including IMAGE_TOKENS for an image
+    budget: int
+    detail: int             # compact_landed_cost detail level used
+    input_truncated: bool
+
+    @property
+    def within_budget(self) -> bool:
+        return self.tokens <= self.budget
+
+
+def prompt_token_budget(mode: str) -> int:
+    return PROMPT_TOKEN_BUDGETS.get(mode, DEFAULT_PROMPT_TOKEN_BUDGET)
+
+
+def generation_config_for_mode(mode: str) -> Dict[str, Any]:
+    """Per-call generation_config overrides for the insight request."""
+    return {"max_output_tokens": MAX_OUTPUT_TOKENS.get(mode, DEFAULT_MAX_OUTPUT_TOKENS)}
+
+
+def build_budgeted_hybrid_prompt(
+    user_input: str,
+    category_id: str,
+    category_label: str,
+    landed_cost_result: Dict[str, Any],
+    mode: str = "general",
+    has_image: bool = False,
+    research_data: Optional[Dict[str, Any]] = None,
+    budget: Optional[int] = None,
+) -> HybridPrompt:
+    """
+    System prompt + hybrid user prompt with a compact landed cost, fitted
+    to the mode's token budget.
+
+    Landed cost detail is dropped first (DETAIL_LEVELS); if the prompt is
+    still too long the user input is shortened, down to
+    MIN_USER_INPUT_CHARS. The instructions themselves are never cut, so
+    the result can still exceed a very small budget (see within_budget).
+    """
+    budget = budget or prompt_token_budget(mode)
+    extra = IMAGE_TOKENS if has_image else 0
+
+    def render(text_input: str, detail: int) -> str:
+        prompt = build_hybrid_prompt(
+            user_input=text_input,
+            category_id=category_id,
+            category_label=category_label,
+            landed_cost_json=compact_json(compact_landed_cost(landed_cost_result, detail)),
+            image_summary="Image provided for analysis." if has_image else "",
+            suppliers_db_json="[]",  # Use default suppliers
+            research_data=research_data
+        )
+        return f"{HYBRID_SYSTEM_PROMPT}\n\n{prompt}"
+
+    for detail in DETAIL_LEVELS:
+        text = render(user_input, detail)
+        tokens = estimate_tokens(text) + extra
+        if tokens <= budget:
+            return HybridPrompt(text, tokens, budget, detail, False)
+
+    # Still over budget at the lowest detail: shorten the user input
+    over = tokens - budget
+    keep = max(MIN_USER_INPUT_CHARS, len(user_input) - over * 4 - 8)  # 8: room for " …"
+    if keep >= len(user_input):
+        return HybridPrompt(text, tokens, budget, DETAIL_LEVELS[-1], False)
+    text = render(user_input[:keep].rstrip() + " …", DETAIL_LEVELS[-1])
+    return HybridPrompt(text, estimate_tokens(text) + extra, budget, DETAIL_LEVELS[-1], True)
@@ -0,0 +1,250 @@
+"""
+NexSupply Query Understanding - parse a product query once
+Turns the raw query into one immutable ParsedQuery (analysis mode,
+category and ranked candidates, volume, target market, channel, route)
+that the service, the calculator and the result builder all read,
+instead of each re-deriving them from the text.
+
+- The query is lowercased once and scanned once by a combined keyword
+  automaton holding the mode keywords, CATEGORY_KEYWORDS, the category
+  classifier's terms and the market/channel maps of utils.input_parser
+- Results match the per-field functions: mode as detect_analysis_mode
+  (first mode in ANALYSIS_MODES with a keyword hit), category_id as
+  classify_category, classification as classify_category_top_k, the
+  parameters as parse_input_parameters (first map key found wins)
+- Volume stays with parse_volume's regexes
+
+parse_query() is memoized per cost table version; ParsedQuery is frozen
+and its mappings are read-only, so one instance can be shared between
+callers and threads.
+"""
+
+import functools
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from utils.category_classifier import CategoryClassifier, get_category_classifier
+from utils.category_matcher import KeywordAutomaton, build_keyword_automaton
+from utils.cost_index import get_compiled_cost_tables
+from utils.cost_tables import CATEGORY_KEYWORDS
+from utils.input_parser import CHANNEL_MAP, MARKET_MAP, TARGET_MARKET_ROUTES, parse_volume
+
+
+ANALYSIS_MODES = {
+    "verify": {
+        "keywords": ["verify", "verification", "check", "legitimate", "real factory",
+                     "trading company", "alibaba supplier", "검증", "확인", "scam", "fraud"],
+    },
+    "cost": {
+        "keywords": ["cost", "landed cost", "calculate", "price", "freight", "customs",
+                     "FOB", "duty", "tariff", "비용", "가격", "랜딩", "관세"],
+    },
+    "market": {
+        "keywords": ["market", "analysis", "demand", "trend", "competition", "margin",
+                     "opportunity", "시장", "분석", "트렌드", "수요"],
+    },
+    "leadtime": {
+        "keywords": ["lead time", "delivery", "timeline", "shipping", "production time",
+                     "when", "how long", "리드타임", "배송", "일정", "납기"],
+    }
+}
+
+DEFAULT_MODE = "general"
+FALLBACK_CATEGORY = "generic_consumer_product"
+PARSE_CACHE_SIZE = 1024
+
+# Group kinds in the combined automaton
+_MODE, _CATEGORY, _TERM, _MARKET, _CHANNEL = "mode", "category", "term", "market", "channel"
+
+
+@dataclass(frozen=True)
+class QueryLexicon:
+    """Combined automaton; each automaton category is a (kind, value) group."""
+    automaton: KeywordAutomaton
+    classifier: CategoryClassifier
+    kinds: Tuple[str, ...]        # group index -> kind
+    values: Tuple[Any, ...]       # group index -> mode / category id / term id / map value
+    categories: Tuple[str, ...]   # category ids in CATEGORY_KEYWORDS order
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """Everything derived from one product query."""
+    raw: str
+    text: str                                  # lowercased query
+    mode: str
+    category_id: str
+    classification: Mapping[str, Any]          # classify_category_top_k() shape, read-only
+    volume_units: Optional[int] = None
+    target_market: Optional[str] = None
+    channel: Optional[str] = None
+    route: Optional[str] = None
+
+    @property
+    def category_candidates(self) -> Tuple[str, ...]:
+        """Ranked candidate category ids, best first."""
+        return tuple(c["category_id"] for c in self.classification["candidates"])
+
+    def classification_dict(self) -> Dict[str, Any]:
+        """Mutable copy of the classification, e.g. for result JSON."""
+        return dict(
+            self.classification,
+            candidates=[dict(c) for c in self.classification["candidates"]],
+            matched_terms=list(self.classification["matched_terms"]),
+        )
+
+    def input_parameters(self) -> Dict[str, Any]:
+        """The parse_input_parameters() dict: only the fields that were found."""
+        fields = {
+            "volume_units": self.volume_units,
+            "target_market": self.target_market,
+            "channel": self.channel,
+            "route": self.route,
+        }
+        return {name: value for name, value in fields.items() if value}
+
+
+def build_query_lexicon(
+    modes: Mapping[str, Mapping[str, Sequence[str]]],
+    category_keywords: Mapping[str, Sequence[str]],
+    classifier: CategoryClassifier,
+    market_map: Mapping[str, str],
+    channel_map: Mapping[str, str],
+) -> QueryLexicon:
+    """
+    Build the combined automaton. Group order inside a kind is the
+    precedence order: modes and map keys are checked in listing order.
+
+    Raises:
+        ValueError: A keyword that is not a string.
+    """
+    groups: Dict[Tuple[str, Any], List[str]] = {}
+    for mode, config in modes.items():
+        groups[(_MODE, mode)] = list(config["keywords"])
+    for category, keywords in category_keywords.items():
+        groups[(_CATEGORY, category)] = list(keywords)
+    for term_id, term in enumerate(classifier.terms):
+        groups[(_TERM, term_id)] = [term]
+    # One group per map key, so the first key in map order can be picked
+    for key in market_map:
+        groups[(_MARKET, key)] = [key]
+    for key in channel_map:
+        groups[(_CHANNEL, key)] = [key]
+
+    automaton = build_keyword_automaton(groups)
+    values = []
+    for kind, value in automaton.categories:
+        if kind == _MARKET:
+            value = market_map[value]
+        elif kind == _CHANNEL:
+            value = channel_map[value]
+        values.append(value)
+    return QueryLexicon(
+        automaton=automaton,
+        classifier=classifier,
+        kinds=tuple(kind for kind, _ in automaton.categories),
+        values=tuple(values),
+        categories=tuple(category_keywords),
+    )
+
+
+_lexicon: Optional[Tuple[CategoryClassifier, QueryLexicon]] = None  # (classifier, lexicon)
+
+
+def get_query_lexicon() -> QueryLexicon:
+    """
+    Lexicon over ANALYSIS_MODES, CATEGORY_KEYWORDS and the input parser maps
+    (rebuilt when get_category_classifier() rebuilds for new cost tables).
+    """
+    global _lexicon
+    classifier = get_category_classifier()
+    cached = _lexicon
+    if cached is None or cached[0] is not classifier:
+        cached = _lexicon = (classifier, build_query_lexicon(
+            ANALYSIS_MODES, CATEGORY_KEYWORDS, classifier, MARKET_MAP, CHANNEL_MAP
+        ))
+    return cached[1]
+
+
+def _freeze_classification(classification: Dict[str, Any]) -> Mapping[str, Any]:
+    return MappingProxyType(dict(
+        classification,
+        candidates=tuple(MappingProxyType(c) for c in classification["candidates"]),
+        matched_terms=tuple(classification["matched_terms"]),
+    ))
+
+
+def parse_query_with(lexicon: QueryLexicon, query: str) -> ParsedQuery:
+    """Parse a query against an explicit lexicon (no memoization)."""
+    text = query.lower()
+    kinds, values = lexicon.kinds, lexicon.values
+    automaton = lexicon.automaton
+
+    # Lowest group index per kind = first in precedence order
+    first: Dict[str, int] = {}
+    category_hits: Dict[str, int] = {}
+    term_ids = []
+    whole_word_terms = set()
+    patterns, whole_words = automaton.matched_words(text)
+    for pattern in patterns:
+        for group in automaton.pattern_categories[pattern]:
+            kind = kinds[group]
+            if kind == _CATEGORY:
+                category_hits[values[group]] = category_hits.get(values[group], 0) + 1
+            elif kind == _TERM:
+                term_ids.append(values[group])
+                if pattern in whole_words:
+                    whole_word_terms.add(values[group])
+            elif group < first.get(kind, len(kinds)):
+                first[kind] = group
+
+    # Most keyword hits, first listed category wins ties (classify_category)
+    category_id = FALLBACK_CATEGORY
+    best = 0
+    for category in lexicon.categories:
+        hits = category_hits.get(category, 0)
+        if hits > best:
+            category_id, best = category, hits
+
+    def pick(kind: str) -> Optional[Any]:
+        return values[first[kind]] if kind in first else None
+
+    target_market = pick(_MARKET)
+    return ParsedQuery(
+        raw=query,
+        text=text,
+        mode=pick(_MODE) or DEFAULT_MODE,
+        category_id=category_id,
+        classification=_freeze_classification(
+            lexicon.classifier.classify_terms(term_ids, whole_word_ids=whole_word_terms)
+        ),
+        volume_units=parse_volume(query),
+        target_market=target_market,
+        channel=pick(_CHANNEL),
+        route=TARGET_MARKET_ROUTES.get(target_market),
+    )
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_query_cached(query: str, table_version: str) -> ParsedQuery:
+    # table_version only keys the cache: a cost table reload misses every old entry
+    return parse_query_with(get_query_lexicon(), query)
+
+
+def parse_query(query: Any) -> ParsedQuery:
+    """
+    Parse a product query once.
+
+    Args:
+        query: Query text; a list is joined with spaces like
+            parse_input_parameters, None is treated as empty
+
+    Returns:
+        ParsedQuery shared by every caller with the same query text.
+    """
+    if query is None:
+        query = ""
+    elif isinstance(query, list):
+        query = " ".join(str(q) for q in query)
+    return _parse_query_cached(str(query), get_compiled_cost_tables().version)
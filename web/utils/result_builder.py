@@ -15,12 +15,17 @@ import uuid
 
 from utils.cost_calculator import (
     OrderParams, 
-    compute_landed_cost, 
     compute_sensitivity,
+    compute_volume_curve,
+    default_volume_grid,
     format_for_pie_chart,
     format_for_cost_table
 )
-from utils.cost_tables import get_category_config, classify_category
+from utils.cost_cache import compute_landed_cost_cached
+from utils.cost_simulation import simulate_landed_cost
+from utils.lead_time import estimate_lead_time
+from utils.cost_tables import get_category_config
+from utils.query_understanding import ParsedQuery, parse_query
 from utils.config import Config
 
 
@@ -38,7 +43,10 @@ def build_nexsupply_result(
     target_market: str = None,
     channel: str = None,
     retail_price: Optional[float] = None,
-    ai_insights: Optional[Dict[str, Any]] = None
+    ai_insights: Optional[Dict[str, Any]] = None,
+    include_uncertainty: bool = False,
+    uncertainty_seed: Optional[int] = None,
+    parsed_query: Optional[ParsedQuery] = None
 ) -> Dict[str, Any]:
     """
     Build the complete NexSupply result JSON.
@@ -51,6 +59,9 @@ def build_nexsupply_result(
         channel: Sales channel (defaults to AppSettings.DEFAULT_CHANNEL)
         retail_price: Expected retail price for margin calculation
         ai_insights: AI-generated qualitative insights (optional)
+        include_uncertainty: Add a Monte Carlo P10/P50/P90 section to landed_cost
+        uncertainty_seed: Seed for the simulation (reproducible bands)
+        parsed_query: parse_query(user_query) if the caller already has it
     
     Returns:
         Complete result dictionary matching the NexSupply JSON schema
@@ -70,8 +81,12 @@ def build_nexsupply_result(
     # ===========================================
     # STEP 1: CLASSIFY CATEGORY
     # ===========================================
-    category_id = classify_category(user_query)
+    if parsed_query is None:
+        parsed_query = parse_query(user_query)
+    category_id = parsed_query.category_id
     cfg = get_category_config(category_id)
+    # Ranked alternatives with confidence; ambiguous queries can be flagged for review
+    classification = parsed_query.classification_dict()
     
     # ===========================================
     # STEP 2: COMPUTE LANDED COST (RULE-BASED)
@@ -81,10 +96,12 @@ def build_nexsupply_result(
         units=units,
         route=route,
         incoterm=AppSettings.DEFAULT_INCOTERM,
-        retail_price_per_unit=retail_price
+        retail_price_per_unit=retail_price,
+        channel=channel,
+        target_market=target_market,
     )
     
-    lc = compute_landed_cost(order)
+    lc = compute_landed_cost_cached(order)
     sensitivity = compute_sensitivity(order, lc)
     
     # ===========================================
@@ -97,8 +114,10 @@ def build_nexsupply_result(
         "product_name": ai_insights.get("product_name", f"{cfg['label']} product"),
         "parsed_category_id": category_id,
         "parsed_category_label": cfg["label"],
+        "category_classification": classification,
         "calculation_method": "hybrid",
         "cost_accuracy": "±20-25% (rule-based)",
+        "cost_table_version": lc.get("cost_table_version"),
         "insight_source": "AI-assisted",
         "source": {
             "text": True,
@@ -125,6 +144,8 @@ def build_nexsupply_result(
         "reliability_level": reliability_level,
         "reliability_score": reliability_score,
         "reliability_range": f"~{int(reliability_score*100-10)}–{int(reliability_score*100+5)}%",
+        # Unknown category/route IDs the cost tables priced as generic / default lane
+        "cost_fallbacks": lc["assumptions"]["fallbacks"],
         "data_coverage_notes": ai_insights.get(
             "data_coverage_notes",
             f"Based on {cfg['label']} category data with typical volume ranges."
@@ -207,12 +228,27 @@ def build_nexsupply_result(
         "detailed_breakdown": lc.get("cost_breakdown_detailed", {}),
         "current_margin_estimate": sensitivity.get("base_margin", "25-40%"),
         "sensitivity": sensitivity_scenarios,
-        "hidden_cost_alerts": ai_insights.get("hidden_cost_alerts", get_default_hidden_costs(cfg))
+        "hidden_cost_alerts": ai_insights.get("hidden_cost_alerts", get_default_hidden_costs(cfg)),
+        # Price-break curve so the results page can redraw other volumes without a rerun
+        "volume_curve": compute_volume_curve(
+            category_id, route, default_volume_grid(units),
+            hs_code=order.hs_code, target_market=target_market,
+        )
     }
     
     # Add margin estimate if available
     if "margin_estimate" in lc:
         landed_cost["margin_estimate"] = lc["margin_estimate"]
+    if "channel_fees" in lc:
+        landed_cost["channel_fees"] = lc["channel_fees"]
+    if "compliance" in lc:
+        landed_cost["compliance"] = lc["compliance"]
+    
+    # Optional Monte Carlo bands replace the fixed accuracy label
+    if include_uncertainty:
+        uncertainty = simulate_landed_cost(order, seed=uncertainty_seed)
+        landed_cost["uncertainty"] = uncertainty
+        meta["cost_accuracy"] = uncertainty["accuracy_label"]
     
     # ===========================================
     # STEP 7: BUILD SUPPLIERS SECTION
@@ -437,45 +473,16 @@ def _calculate_lead_time(result: Dict[str, Any]) -> Dict[str, Any]:
     Calculate consistent lead time from result data.
     Ensures Market Snapshot and Lead Time section show the same values.
     
+    The first supplier's quote ("25-35") sets the factory stages; the other
+    stages are sampled from LEAD_TIME_BREAKDOWN (see utils.lead_time).
+    
     Returns:
-        Dict with production_days, shipping_days, customs_days, buffer_days, total_days
+        Dict with production_days, shipping_days, customs_days, buffer_days,
+        total_days (P90) plus p50_days / p90_days
     """
-    # Try to get from suppliers first
     suppliers = result.get("suppliers", [])
-    if suppliers:
-        lead_time_str = suppliers[0].get("lead_time_days", "25-35")
-        # Parse "25-35" or "25–35" format
-        if isinstance(lead_time_str, str):
-            if "–" in lead_time_str:
-                production_days = int(lead_time_str.split("–")[0].strip())
-            elif "-" in lead_time_str:
-                production_days = int(lead_time_str.split("-")[0].strip())
-            else:
-                try:
-                    production_days = int(lead_time_str)
-                except ValueError:
-                    production_days = 30
-        else:
-            production_days = int(lead_time_str)
-    else:
-        production_days = 30
-    
-    # Standard shipping and customs times
-    shipping_days = 28  # Sea freight: 18-25 days average, use 28 for buffer
-    customs_days = 5    # Customs clearance
-    buffer_days = 7     # Port congestion and safety buffer
-    
-    # Calculate total
-    total_days = production_days + shipping_days + customs_days + buffer_days
-    
-    return {
-        "production_days": production_days,
-        "shipping_days": shipping_days,
-        "customs_days": customs_days,
-        "buffer_days": buffer_days,
-        "total_days": total_days,
-        "safety_stock_days": 14
-    }
+    quote = suppliers[0].get("lead_time_days") if suppliers else None
+    return estimate_lead_time(quote)
 
 
 def convert_to_dashboard_format(result: Dict[str, Any]) -> Dict[str, Any]:
@@ -513,7 +520,12 @@ def convert_to_dashboard_format(result: Dict[str, Any]) -> Dict[str, Any]:
                 comp["key"]: comp["share_percent"]
                 for comp in lc["components"]
             },
-            "hidden_cost_warnings": lc["hidden_cost_alerts"]
+            "hidden_cost_warnings": lc["hidden_cost_alerts"],
+            "volume_curve": lc.get("volume_curve"),
+            "uncertainty": lc.get("uncertainty"),
+            "channel_fees": lc.get("channel_fees"),
+            "compliance": lc.get("compliance"),
+            "margin_estimate": lc.get("margin_estimate")
         },
         "suppliers": [
             {
@@ -538,6 +550,7 @@ def convert_to_dashboard_format(result: Dict[str, Any]) -> Dict[str, Any]:
         # New fields for enhanced transparency
         "calculation_method": result["meta"]["calculation_method"],
         "cost_accuracy": result["meta"]["cost_accuracy"],
+        "cost_table_version": result["meta"].get("cost_table_version"),
         "assumptions": result["assumptions"],  # Use 'assumptions' key for consistency
         "assumptions_display": result["assumptions"],  # Keep for backward compatibility
         "sensitivity": lc.get("sensitivity", []),
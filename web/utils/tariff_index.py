@@ -0,0 +1,236 @@
+"""
+NexSupply Tariff Index - HS-code duty rates from tariff_rates_2025.json
+Resolves the most specific duty rate for an HS code and origin country.
+
+Structure:
+- HS codes are normalized to digits ("8518.30" → "851830")
+- Every listed code is one row of a float64 rate matrix [code, origin]
+- A prefix map (flattened trie) points each listed code to its row; a query
+  walks its own prefixes longest-first (10, 8, 6, 4, 2 digits), so lookup is
+  at most five dict probes
+- Batch lookups resolve each distinct code once, then gather rates by row
+
+Origins are the file's country columns; route IDs and ISO codes map onto
+them (cn_to_us_west_coast → china).
+
+The rates are import duties of one destination market (the bundled file is
+US duties). Routes importing elsewhere (cn_to_eu) get no rate, so callers
+keep the category default duty.
+"""
+
+import functools
+import json
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+TARIFF_RATES_PATH = os.path.join(DATA_DIR, "tariff_rates_2025.json")
+
+DEFAULT_ORIGIN = "china"
+DEFAULT_DESTINATION = "us"  # market whose duties the rate file lists, unless it says otherwise
+
+ORIGIN_ALIASES = {
+    "cn": "china",
+    "china": "china",
+    "vn": "vietnam",
+    "vietnam": "vietnam",
+    "kr": "south_korea",
+    "korea": "south_korea",
+    "south_korea": "south_korea",
+}
+
+# Prefix lengths tried from most to least specific
+_PREFIX_LENGTHS = (10, 8, 6, 4, 2)
+
+# Per-code fields that are not origin columns
+_META_FIELDS = {"description", "notes"}
+
+
+def normalize_hs_code(hs_code: Any) -> Optional[str]:
+    """Digits-only HS code, or None if it is not a usable code."""
+    if hs_code is None:
+        return None
+    digits = str(hs_code).replace(".", "").replace(" ", "").replace("-", "")
+    if len(digits) < 2 or not digits.isdigit():
+        return None
+    return digits
+
+
+def origin_for(value: Optional[str]) -> str:
+    """Map an origin name, ISO code or route ID ("cn_to_eu") to an origin column."""
+    if not value:
+        return DEFAULT_ORIGIN
+    key = value.lower()
+    if key in ORIGIN_ALIASES:
+        return ORIGIN_ALIASES[key]
+    prefix = key.split("_to_", 1)[0]
+    return ORIGIN_ALIASES.get(prefix, prefix)
+
+
+def destination_for(value: Optional[str]) -> Optional[str]:
+    """Import market of a route ID ("cn_to_us_west_coast" → "us"), or None for a bare origin."""
+    if not value or "_to_" not in value:
+        return None
+    return value.lower().split("_to_", 1)[1].split("_", 1)[0]
+
+
+@dataclass(frozen=True)
+class TariffIndex:
+    """Immutable HS-code → per-origin duty rate index."""
+    codes: Tuple[str, ...]                 # as written in the file
+    descriptions: Tuple[str, ...]
+    origins: Tuple[str, ...]
+    origin_index: Mapping[str, int]
+    rates: np.ndarray                      # shape (n_codes, n_origins), NaN = not listed
+    prefix_map: Mapping[str, int]          # normalized code -> row
+    version: str
+    destination: str = DEFAULT_DESTINATION  # import market the duties apply to
+
+    def column(self, origin: Optional[str] = None) -> Optional[int]:
+        """Rate column for an origin or route, or None (unlisted origin, other import market)."""
+        destination = destination_for(origin)
+        if destination is not None and destination != self.destination:
+            return None
+        return self.origin_index.get(origin_for(origin))
+
+    def resolve(self, hs_code: Any) -> int:
+        """Row of the most specific listed code for `hs_code`, or -1."""
+        digits = normalize_hs_code(hs_code)
+        if digits is None:
+            return -1
+        get = self.prefix_map.get
+        for length in _PREFIX_LENGTHS:
+            if length <= len(digits):
+                row = get(digits[:length])
+                if row is not None:
+                    return row
+        return -1
+
+    def rate(self, hs_code: Any, origin: Optional[str] = None) -> Optional[float]:
+        """Duty rate in percent, or None when the code or origin is not listed."""
+        row = self.resolve(hs_code)
+        col = self.column(origin)
+        if row < 0 or col is None:
+            return None
+        value = self.rates[row, col]
+        return None if value != value else float(value)
+
+    def lookup(self, hs_code: Any, origin: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Rate plus the matched code and its description."""
+        rate = self.rate(hs_code, origin)
+        if rate is None:
+            return None
+        row = self.resolve(hs_code)
+        return {
+            "hs_code": hs_code,
+            "matched_hs_code": self.codes[row],
+            "description": self.descriptions[row],
+            "origin": origin_for(origin),
+            "destination": self.destination,
+            "duty_rate_percent": rate,
+            "source": f"tariff_rates {self.version}",
+        }
+
+    def rates_for(self, hs_codes: Sequence[Any], origins: Any = None) -> np.ndarray:
+        """
+        Batch lookup.
+
+        Args:
+            hs_codes: HS code per row (None / unknown → NaN)
+            origins: Origin (or route ID) per row, or one for all; routes
+                into another import market get NaN
+
+        Returns:
+            float64 array of duty rates in percent, NaN where not listed.
+        """
+        size = len(hs_codes)
+        memo: Dict[Any, int] = {}
+        rows = np.empty(size, dtype=np.intp)
+        for i, code in enumerate(hs_codes):
+            row = memo.get(code)
+            if row is None:
+                row = memo[code] = self.resolve(code)
+            rows[i] = row
+
+        def column_or_missing(origin: Any) -> int:
+            col = self.column(origin)
+            return -1 if col is None else col
+
+        if origins is None or isinstance(origins, str):
+            cols = np.full(size, column_or_missing(origins), dtype=np.intp)
+        else:
+            if len(origins) != size:
+                raise ValueError(f"Column length {len(origins)} does not match {size} rows")
+            col_memo: Dict[Any, int] = {}
+            cols = np.fromiter(
+                (col_memo[o] if o in col_memo else col_memo.setdefault(o, column_or_missing(o))
+                 for o in origins),
+                dtype=np.intp,
+                count=size,
+            )
+
+        found = (rows >= 0) & (cols >= 0)
+        out = np.full(size, np.nan)
+        out[found] = self.rates[rows[found], cols[found]]
+        return out
+
+
+def build_tariff_index(data: Mapping[str, Any], version: Optional[str] = None) -> TariffIndex:
+    """
+    Build an index from the parsed tariff file.
+
+    Raises:
+        ValueError: Malformed HS code, duplicate code or non-numeric rate.
+    """
+    entries = data.get("rates") or {}
+    if not entries:
+        raise ValueError("Tariff data has no 'rates'")
+
+    origins = sorted({
+        key for entry in entries.values() for key in entry if key not in _META_FIELDS
+    })
+    origin_index = {o: j for j, o in enumerate(origins)}
+    rates = np.full((len(entries), len(origins)), np.nan)
+    prefix_map: Dict[str, int] = {}
+    codes, descriptions = [], []
+
+    for i, (code, entry) in enumerate(entries.items()):
+        digits = normalize_hs_code(code)
+        if digits is None or len(digits) not in _PREFIX_LENGTHS:
+            raise ValueError(f"Invalid HS code in tariff data: {code!r}")
+        if digits in prefix_map:
+            raise ValueError(f"Duplicate HS code in tariff data: {code!r}")
+        prefix_map[digits] = i
+        codes.append(code)
+        descriptions.append(entry.get("description", ""))
+        for origin in origins:
+            if origin not in entry:
+                continue
+            value = entry[origin]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{code}.{origin} must be a non-negative number, got {value!r}")
+            rates[i, origin_index[origin]] = float(value)
+
+    rates.setflags(write=False)
+    return TariffIndex(
+        codes=tuple(codes),
+        descriptions=tuple(descriptions),
+        origins=tuple(origins),
+        origin_index=MappingProxyType(origin_index),
+        rates=rates,
+        prefix_map=MappingProxyType(prefix_map),
+        version=version or str(data.get("lastUpdated") or data.get("version", "unknown")),
+        destination=str(data.get("destination", DEFAULT_DESTINATION)).lower(),
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def get_tariff_index(path: str = TARIFF_RATES_PATH) -> TariffIndex:
+    """Tariff index for a rate file (built once per path)."""
+    with open(path, encoding="utf-8") as f:
+        return build_tariff_index(json.load(f))